@@ -0,0 +1,13 @@
+"""
+Бенчмарки гарячих view та сервісів
+
+Запуск:
+    python manage.py run_benchmarks --sizes small,medium
+    python manage.py run_benchmarks --sizes large --compare benchmarks/results/<файл>.json
+
+Кожен сценарій виконується на згенерованих наборах даних зростаючого
+розміру (events/dataset_generator.py) в окремій тестовій БД. Фіксуються
+час виконання, кількість SQL-запитів та пік пам'яті; результати
+зберігаються у JSON для порівняння між комітами. Перевищення бюджету
+запитів (benchmarks/budgets.py) завершує команду з помилкою.
+"""
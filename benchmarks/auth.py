@@ -0,0 +1,83 @@
+"""
+Пропускна здатність API залежно від способу автентифікації
+
+Один і той самий запит до API виконується з Basic-автентифікацією
+(перевірка пароля хешером з PASSWORD_HASHERS на кожен запит) та з
+API-токеном (users/tokens.py) у двох станах:
+- token[lru] - токен у LRU процесу;
+- token[db] - LRU скидається перед кожним запитом, пошук у БД.
+"""
+from __future__ import annotations
+
+import base64
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.test import Client
+
+from users.models import ApiToken
+from users.tokens import ApiTokenService, get_local_cache, hash_key
+
+AUTH_USERNAME = "bench_api_auth"
+AUTH_PASSWORD = "bench-password-123"
+DEFAULT_PATH = "/api/events/?page_size=1"
+
+
+def _throughput(name: str, send: Callable[[], int], requests: int, before: Optional[Callable[[], None]] = None) -> Dict:
+    send()  # прогрів: імпорти, підключення, кеш схеми URL
+    timings = []
+    for _ in range(requests):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        status = send()
+        timings.append(time.perf_counter() - started)
+        assert status == 200, f"{name}: HTTP {status}"
+    total = sum(timings)
+    ordered = sorted(timings)
+    return {
+        "mode": name,
+        "requests": requests,
+        "rps": round(requests / total, 1) if total else 0.0,
+        "ms_median": round(statistics.median(timings) * 1000, 3),
+        "ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+    }
+
+
+def run_auth_benchmark(requests: int = 100, path: str = DEFAULT_PATH) -> List[Dict]:
+    """
+    Виміряти запити/с для кожного способу автентифікації
+
+    Користувач і токен створюються в поточній БД (команда benchmark_api_auth
+    запускає це в тестовій БД). Повертає рядки з rps, медіаною та p95.
+    """
+    User = get_user_model()
+    user, _created = User.objects.get_or_create(username=AUTH_USERNAME)
+    user.set_password(AUTH_PASSWORD)
+    user.save()
+    ApiToken.objects.filter(user=user).delete()
+    _token, key = ApiTokenService.issue(user, "benchmark", scopes=[ApiToken.READ], days=1)
+    key_hash = hash_key(key)
+
+    client = Client()
+    basic = "Basic " + base64.b64encode(f"{AUTH_USERNAME}:{AUTH_PASSWORD}".encode()).decode()
+
+    def send(header: str) -> Callable[[], int]:
+        return lambda: client.get(path, headers={"Authorization": header}).status_code
+
+    def drop_local():
+        get_local_cache().discard(key_hash)
+
+    rows = [
+        _throughput("basic", send(basic), requests),
+        _throughput("token[lru]", send(f"Token {key}"), requests),
+        _throughput("token[db]", send(f"Token {key}"), requests, before=drop_local),
+        _throughput("anonymous", lambda: client.get(path).status_code, requests),
+    ]
+    hasher = get_hasher().algorithm
+    for row in rows:
+        row["hasher"] = hasher
+    return rows
@@ -0,0 +1,24 @@
+"""
+Бюджети SQL-запитів для сценаріїв бенчмарків
+
+Ключ - група сценаріїв (частина імені до "["), значення - максимальна
+кількість запитів на холодний виклик (кеш очищено) без урахування
+INSERT-порцій bulk_create. Бюджет не повинен залежати від розміру даних:
+ріст кількості запитів разом з даними - ознака N+1.
+"""
+
+QUERY_BUDGETS = {
+    "event_list": 22,
+    "event_detail": 12,
+    "calendar": 4,  # + секрет URL підписок (CalendarFeedKey)
+    "calendar_events": 6,
+    "home_admin": 12,
+    "api_events": 3,
+    "can_create_rsvp": 4,
+    "notify_participants": 4,
+}
+
+
+def budget_for(scenario: str):
+    """Бюджет сценарію або None, якщо його не задано"""
+    return QUERY_BUDGETS.get(scenario.split("[", 1)[0])
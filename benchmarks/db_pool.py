@@ -0,0 +1,106 @@
+"""
+Вартість з'єднання з БД: нове з'єднання на кожен запит проти пулу
+
+Кожен цикл імітує HTTP-запит: connect (з пулу або новий), один SELECT,
+close (повернення в пул або закриття). Час циклу включає встановлення
+з'єднання, тож різниця - саме вартість TCP/автентифікації/init_command.
+Цикли виконуються в кількох потоках, як у threaded WSGI.
+"""
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+from django.db import connections
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from event_organizer.mysql_pool.base import DatabaseWrapper as PooledDatabaseWrapper
+
+BENCH_ALIAS = "__pool_benchmark__"
+
+
+def _run_threads(make_wrapper, cycles: int, threads: int) -> List[float]:
+    timings: List[float] = []
+    lock = threading.Lock()
+    errors: List[BaseException] = []
+
+    def worker():
+        wrapper = make_wrapper()
+        local = []
+        try:
+            for _ in range(cycles):
+                started = time.perf_counter()
+                wrapper.ensure_connection()
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                wrapper.close()
+                local.append(time.perf_counter() - started)
+        except BaseException as exc:  # noqa: BLE001 - помилку потоку передати викликачу
+            errors.append(exc)
+        finally:
+            wrapper.close()
+        with lock:
+            timings.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return timings
+
+
+def _row(mode: str, timings: List[float], wall: float, connections_created: int, extra: Dict = None) -> Dict:
+    ordered = sorted(timings)
+    row = {
+        "mode": mode,
+        "cycles": len(timings),
+        "cycles_per_s": round(len(timings) / wall, 1) if wall else 0.0,
+        "ms_median": round(statistics.median(ordered) * 1000, 3),
+        "ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "connections_created": connections_created,
+    }
+    row.update(extra or {})
+    return row
+
+
+def run_pool_benchmark(alias: str = "default", cycles: int = 200, threads: int = 4, max_size: int = 0) -> List[Dict]:
+    """
+    Порівняти цикли "запиту" без пулу та з пулом на MySQL-аліасі alias
+
+    max_size=0 - розмір пулу дорівнює кількості потоків.
+    """
+    settings_dict = dict(connections[alias].settings_dict)
+    if connections[alias].vendor != "mysql":
+        raise ValueError(f"Аліас {alias} не MySQL ({connections[alias].vendor})")
+    settings_dict["CONN_MAX_AGE"] = 0
+    options = {key: value for key, value in settings_dict["OPTIONS"].items() if key != "pool"}
+
+    direct_settings = {**settings_dict, "OPTIONS": options}
+    started = time.perf_counter()
+    direct = _run_threads(lambda: MySQLDatabaseWrapper(dict(direct_settings), alias=BENCH_ALIAS), cycles, threads)
+    direct_wall = time.perf_counter() - started
+
+    pool_options = {"min_size": 0, "max_size": max_size or threads, "timeout": 30, "check_after": 5}
+    pooled_settings = {**settings_dict, "OPTIONS": {**options, "pool": pool_options}}
+    probe = PooledDatabaseWrapper(dict(pooled_settings), alias=BENCH_ALIAS)
+    probe.close_pool()
+    started = time.perf_counter()
+    pooled = _run_threads(lambda: PooledDatabaseWrapper(dict(pooled_settings), alias=BENCH_ALIAS), cycles, threads)
+    pooled_wall = time.perf_counter() - started
+    snapshot = probe.pool.snapshot()
+    probe.close_pool()
+
+    return [
+        _row("direct", direct, direct_wall, len(direct)),
+        _row("pooled", pooled, pooled_wall, snapshot["created"], {
+            "pool_size": pool_options["max_size"],
+            "waits": snapshot["waits"],
+            "wait_ms_max": round(snapshot["wait_seconds_max"] * 1000, 3),
+        }),
+    ]
@@ -0,0 +1,192 @@
+"""
+Вимірювання сценаріїв: час, кількість SQL-запитів, пік пам'яті
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils import timezone
+
+from monitoring.sql_profiler import collect_queries
+
+from .budgets import budget_for
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Службові запити транзакції-обгортки mutates-сценаріїв не рахуються
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+
+
+def _statements(collector) -> List[str]:
+    statements = [sql.lstrip().upper() for sql, _params, _duration in collector.queries]
+    return [sql for sql in statements if not sql.startswith(_TRANSACTION_CONTROL)]
+
+
+@dataclass
+class Scenario:
+    """Сценарій бенчмарку; mutates - виконується в транзакції з відкатом"""
+
+    name: str
+    func: Callable[[], object]
+    mutates: bool = False
+
+
+@dataclass
+class Measurement:
+    scenario: str
+    size: str
+    wall_ms_median: float
+    wall_ms_min: float
+    queries: int
+    queries_warm: int
+    insert_batches: int
+    peak_kb: float
+    budget: Optional[int] = None
+
+    @property
+    def budgeted_queries(self) -> int:
+        """Запити без INSERT-порцій: їх кількість залежить від ліміту параметрів бекенду, а не від коду"""
+        return self.queries - self.insert_batches
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.budgeted_queries > self.budget
+
+
+def _call(scenario: Scenario):
+    if not scenario.mutates:
+        return scenario.func()
+    with transaction.atomic():
+        result = scenario.func()
+        transaction.set_rollback(True)
+    return result
+
+
+def clear_caches() -> None:
+    """
+    Очистити всі кеші settings.CACHES
+
+    Спільний кеш (знімки розкладу, сторінки подій, HTTP-штампи) переживає
+    процес і набір даних: без очищення "холодний" виклик не холодний, а після
+    flush записи з попереднього набору відповідали б подіям з тими самими id.
+    """
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+def measure(scenario: Scenario, size: str, repeat: int = 5) -> Measurement:
+    """
+    Виміряти сценарій
+
+    Холодний виклик (після clear_caches()) дає кількість запитів для бюджету,
+    наступні repeat викликів - час (медіана та мінімум) і "теплу" кількість
+    запитів. Пік пам'яті рахується окремим викликом під tracemalloc, щоб
+    трасування не спотворювало час.
+    """
+    clear_caches()
+    with collect_queries() as cold:
+        _call(scenario)
+
+    timings = []
+    warm_queries = 0
+    for _ in range(max(1, repeat)):
+        with collect_queries() as warm:
+            started = time.perf_counter()
+            _call(scenario)
+            timings.append(time.perf_counter() - started)
+        warm_queries = len(_statements(warm))
+
+    tracemalloc.start()
+    try:
+        _call(scenario)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    cold_statements = _statements(cold)
+    return Measurement(
+        scenario=scenario.name,
+        size=size,
+        wall_ms_median=round(statistics.median(timings) * 1000, 3),
+        wall_ms_min=round(min(timings) * 1000, 3),
+        queries=len(cold_statements),
+        queries_warm=warm_queries,
+        insert_batches=sum(1 for sql in cold_statements if sql.startswith("INSERT")),
+        peak_kb=round(peak / 1024, 1),
+        budget=budget_for(scenario.name),
+    )
+
+
+def check_budgets(measurements: Iterable[Measurement]) -> List[str]:
+    """Повідомлення про перевищення бюджету запитів"""
+    return [
+        f"{m.scenario} [{m.size}]: {m.budgeted_queries} запитів > бюджет {m.budget}"
+        for m in measurements
+        if m.over_budget
+    ]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_report(measurements: List[Measurement]) -> dict:
+    return {
+        "commit": _git_commit(),
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "results": [asdict(m) for m in measurements],
+    }
+
+
+def save_report(report: dict, path: Optional[Path] = None) -> Path:
+    if path is None:
+        stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{stamp}-{report['commit']}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def compare_reports(baseline: dict, current: dict) -> List[Dict[str, object]]:
+    """
+    Порівняти два звіти по (scenario, size)
+
+    Повертає рядки з відносною зміною медіанного часу та різницею запитів;
+    сценарії, яких немає в базовому звіті, пропускаються.
+    """
+    before = {(row["scenario"], row["size"]): row for row in baseline.get("results", [])}
+    rows = []
+    for row in current.get("results", []):
+        old = before.get((row["scenario"], row["size"]))
+        if old is None:
+            continue
+        base_ms = old["wall_ms_median"] or 1e-9
+        rows.append({
+            "scenario": row["scenario"],
+            "size": row["size"],
+            "wall_ms": row["wall_ms_median"],
+            "wall_change_pct": round((row["wall_ms_median"] - base_ms) / base_ms * 100, 1),
+            "queries_delta": row["queries"] - old["queries"],
+            "peak_kb_delta": round(row["peak_kb"] - old["peak_kb"], 1),
+        })
+    return rows
@@ -0,0 +1,81 @@
+"""
+Обробка зображень відгуків: зображень/с загалом і на ядро
+
+Синтетичні "фото з телефона" (за замовчуванням 4032x3024 JPEG з EXIF
+Orientation=6 і шумом, щоб стиснення не було тривіальним) обробляються
+events.image_processing.process_image з налаштуваннями REVIEW_IMAGES:
+- serial - у поточному процесі, одне ядро;
+- pool[N] - ProcessPoolExecutor з N процесами (як у фоновій обробці
+  та команді process_review_images).
+
+Запуск пулу (spawn) не входить у вимірювання - пул прогрівається
+однією задачею на процес. У демонічному процесі (паралельний запуск
+тестів) пул створити не можна - лишається тільки serial.
+"""
+from __future__ import annotations
+
+import time
+from functools import partial
+from io import BytesIO
+from typing import Dict, List, Sequence, Tuple
+
+from PIL import Image
+
+from events.image_processing import process_image
+from events.review_images import make_pool, pool_available, processing_options
+
+PHONE_SIZE = (4032, 3024)
+
+
+def make_photo(size: Tuple[int, int] = PHONE_SIZE, seed: int = 0) -> bytes:
+    """JPEG з шумом і EXIF (орієнтація, модель камери) - як фото з телефона"""
+    width, height = size
+    noise = Image.effect_noise((width, height), 40 + seed % 20)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (noise, gradient, Image.blend(noise, gradient, 0.5)))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: повернути на 90°
+    exif[0x0110] = "Benchmark Phone"
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def _row(mode: str, workers: int, images: int, seconds: float, source_bytes: int, output_bytes: int) -> Dict:
+    ips = images / seconds if seconds else 0.0
+    return {
+        "mode": mode,
+        "workers": workers,
+        "images": images,
+        "seconds": round(seconds, 3),
+        "images_per_sec": round(ips, 2),
+        "images_per_sec_per_core": round(ips / workers, 2),
+        "source_mb": round(source_bytes / 1024 / 1024, 2),
+        "output_mb": round(output_bytes / 1024 / 1024, 2),
+    }
+
+
+def run_image_benchmark(
+    images: int = 16, workers: Sequence[int] = (1, 2, 4), size: Tuple[int, int] = PHONE_SIZE
+) -> List[Dict]:
+    """Зображень/с послідовно та в пулах заданих розмірів"""
+    options = processing_options()
+    photos = [make_photo(size, seed) for seed in range(min(images, 4))]
+    batch = [photos[index % len(photos)] for index in range(images)]
+    source_bytes = sum(len(photo) for photo in batch)
+
+    started = time.perf_counter()
+    results = [process_image(photo, **options) for photo in batch]
+    serial = time.perf_counter() - started
+    output_bytes = sum(len(content) for result in results for content in result.files.values())
+    rows = [_row("serial", 1, images, serial, source_bytes, output_bytes)]
+
+    for count in workers if pool_available() else ():
+        with make_pool(count) as pool:
+            list(pool.map(process_image, photos[:1] * count, chunksize=1))  # прогрів процесів
+            started = time.perf_counter()
+            results = list(pool.map(partial(process_image, **options), batch))
+            elapsed = time.perf_counter() - started
+        output_bytes = sum(len(content) for result in results for content in result.files.values())
+        rows.append(_row(f"pool[{count}]", count, images, elapsed, source_bytes, output_bytes))
+    return rows
@@ -0,0 +1,51 @@
+"""
+Прогін сценаріїв на наборах даних зростаючого розміру
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterable, List, Optional
+
+from django.core.management import call_command
+
+from events.dataset_generator import DatasetGenerator
+
+from .harness import Measurement, clear_caches, measure
+from .scenarios import SIZES, BenchmarkFixtures, build_scenarios
+
+
+def run_suite(
+    sizes: Iterable[str],
+    repeat: int = 5,
+    seed: int = 42,
+    only: Optional[str] = None,
+    reset: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> List[Measurement]:
+    """
+    Згенерувати кожен набір даних і виміряти всі сценарії
+
+    Args:
+        sizes: імена наборів з SIZES у порядку зростання
+        only: підрядок імені сценарію для вибіркового запуску
+        reset: очищати БД (flush) перед кожним набором
+    """
+    progress = progress or (lambda message: None)
+    measurements: List[Measurement] = []
+    for size_name in sizes:
+        if reset:
+            call_command("flush", interactive=False, verbosity=0)
+            clear_caches()
+        progress(f"Набір {size_name}: генерація даних")
+        DatasetGenerator(SIZES[size_name], seed=seed, batch_size=5000).generate()
+        fixtures = BenchmarkFixtures()
+
+        for scenario in build_scenarios(fixtures):
+            if only and only not in scenario.name:
+                continue
+            result = measure(scenario, size_name, repeat=repeat)
+            measurements.append(result)
+            progress(
+                f"  {result.scenario:<40} {result.wall_ms_median:>9.2f} ms  "
+                f"{result.queries:>3} q (теплий {result.queries_warm})  {result.peak_kb:>9.1f} KiB"
+            )
+    return measurements
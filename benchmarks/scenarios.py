@@ -0,0 +1,143 @@
+"""
+Набори даних та сценарії бенчмарків
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test import Client
+from django.utils import timezone
+
+from events.dataset_generator import DatasetSize
+from events.models import Event
+from events.services import RSVPService
+from events.strategies import AVAILABLE_STRATEGIES
+from notifications.models import Notification
+from notifications.services import NotificationService
+
+from .harness import Scenario
+
+SIZES: Dict[str, DatasetSize] = {
+    "tiny": DatasetSize(users=40, events=30, rsvps=300, reviews=20, notifications=50),
+    "small": DatasetSize(users=500, events=1000, rsvps=10_000, reviews=500, notifications=2_000),
+    "medium": DatasetSize(users=5_000, events=10_000, rsvps=150_000, reviews=5_000, notifications=20_000),
+    "large": DatasetSize(users=20_000, events=50_000, rsvps=1_000_000, reviews=50_000, notifications=100_000),
+}
+
+EVENT_LIST_FILTERS = (
+    ("q", "Мітап"),
+    ("status", Event.PUBLISHED),
+    ("location", "Київ"),
+    ("category", "Конференція"),
+    ("date_filter", "this_month"),
+    ("popularity", "popular"),
+    ("availability", "available"),
+    ("view", "upcoming"),
+    ("view", "my"),
+    ("view", "archived"),
+)
+
+
+class BenchmarkFixtures:
+    """
+    Типові об'єкти згенерованого набору
+
+    - attendee: користувач з найбільшою кількістю RSVP (найважчий розклад);
+    - organizer: організатор з найбільшою кількістю подій;
+    - popular_event: подія з найбільшою кількістю учасників;
+    - open_event: майбутня опублікована подія без обмеження місць,
+      на яку attendee ще не зареєструвався (повна перевірка can_create_rsvp).
+    """
+
+    def __init__(self):
+        User = get_user_model()
+        self.staff = User.objects.filter(is_staff=True).order_by("id").first()
+        self.attendee = User.objects.annotate(n=Count("rsvps")).order_by("-n", "id").first()
+        self.organizer = User.objects.annotate(n=Count("organized_events")).order_by("-n", "id").first()
+        self.popular_event = (
+            Event.objects.filter(status=Event.PUBLISHED).annotate(n=Count("rsvps")).order_by("-n", "id").first()
+        )
+        self.open_event = (
+            Event.objects.filter(status=Event.PUBLISHED, starts_at__gt=timezone.now(), capacity__isnull=True)
+            .exclude(rsvps__user=self.attendee)
+            .order_by("starts_at", "id")
+            .first()
+        ) or self.popular_event
+
+        self.anonymous = Client()
+        self.user_client = Client()
+        self.user_client.force_login(self.attendee)
+        self.organizer_client = Client()
+        self.organizer_client.force_login(self.organizer)
+        self.staff_client = Client()
+        if self.staff is not None:
+            self.staff_client.force_login(self.staff)
+
+
+def _get(client: Client, path: str, **params):
+    def run():
+        response = client.get(path, params)
+        assert response.status_code == 200, f"{path} {params}: {response.status_code}"
+        # Шаблонні відповіді рендеряться ліниво - примусово, щоб виміряти повний цикл
+        return len(response.content)
+
+    return run
+
+
+def build_scenarios(fixtures: BenchmarkFixtures) -> List[Scenario]:
+    scenarios: List[Scenario] = []
+
+    for strategy in AVAILABLE_STRATEGIES:
+        scenarios.append(Scenario(
+            f"event_list[sort={strategy.slug}]", _get(fixtures.user_client, "/events/", sort=strategy.slug)
+        ))
+    for param, value in EVENT_LIST_FILTERS:
+        client = fixtures.organizer_client if value == "my" else fixtures.user_client
+        scenarios.append(Scenario(f"event_list[{param}={value}]", _get(client, "/events/", **{param: value})))
+    scenarios.append(Scenario("event_list[anonymous]", _get(fixtures.anonymous, "/events/")))
+
+    detail = f"/events/{fixtures.popular_event.pk}/"
+    # Вікно календаря - поточний місяць (як перше завантаження сторінки)
+    today = timezone.localdate()
+    month = {
+        "start": today.replace(day=1).isoformat(),
+        "end": (today.replace(day=28) + timedelta(days=4)).replace(day=1).isoformat(),
+    }
+    scenarios += [
+        Scenario("event_detail[user]", _get(fixtures.user_client, detail)),
+        Scenario("event_detail[anonymous]", _get(fixtures.anonymous, detail)),
+        Scenario("calendar[user]", _get(fixtures.user_client, "/calendar/")),
+        Scenario(
+            "calendar[upcoming+popular]",
+            _get(fixtures.user_client, "/calendar/", schedule_filter="upcoming", highlight="popular"),
+        ),
+        Scenario("calendar[anonymous]", _get(fixtures.anonymous, "/calendar/")),
+        Scenario("calendar_events[user]", _get(fixtures.user_client, "/calendar/events/", **month)),
+        Scenario(
+            "calendar_events[upcoming+popular]",
+            _get(fixtures.user_client, "/calendar/events/", schedule_filter="upcoming", highlight="popular", **month),
+        ),
+        Scenario("calendar_events[anonymous]", _get(fixtures.anonymous, "/calendar/events/", **month)),
+        Scenario("api_events[list]", _get(fixtures.anonymous, "/api/events/")),
+        Scenario("api_events[ordering]", _get(fixtures.anonymous, "/api/events/", ordering="-starts_at")),
+        Scenario(
+            "can_create_rsvp[open_event]",
+            lambda: RSVPService.can_create_rsvp(fixtures.attendee, fixtures.open_event),
+        ),
+        Scenario(
+            "notify_participants[popular_event]",
+            lambda: NotificationService.notify_event_participants_with_factory(
+                fixtures.popular_event, Notification.EVENT_UPDATED, {"event": fixtures.popular_event}
+            ),
+            mutates=True,
+        ),
+    ]
+    if fixtures.staff is not None:
+        scenarios += [
+            Scenario("home_admin[events]", _get(fixtures.staff_client, "/")),
+            Scenario("home_admin[users]", _get(fixtures.staff_client, "/", tab="users")),
+        ]
+    return scenarios
@@ -0,0 +1,250 @@
+"""
+Персональний розклад користувача з великою історією подій
+
+Порівнюються два способи отримати розклад з фільтрами календаря:
+- legacy - попередня реалізація: organizer=user OR rsvps__user=user,
+  COUNT + DISTINCT по всьому рядку, фільтри декораторів у Python над
+  усією історією;
+- union - PersonalScheduleService: UNION ALL двох індексних вибірок,
+  фільтри ланцюжка декораторів виконуються в SQL.
+
+Користувач отримує `events` подій: половина організовані ним, половина -
+RSVP на чужі опубліковані події; події розкидані на роки назад і вперед.
+
+run_encoding_benchmark порівнює побудову JSON календаря: ORM-об'єкти,
+dataclass з описом, to_dict() і json.dumps проти кортежів values_list,
+ScheduleEntry зі __slots__ без опису та ScheduleJsonEncoder.
+"""
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from events.models import Event
+from events.schedule_services import (
+    BaseScheduleProvider,
+    FilteredScheduleDecorator,
+    PersonalScheduleService,
+    ScheduleEntry,
+    ScheduleJsonEncoder,
+    ScheduleWindow,
+)
+from tickets.models import RSVP
+
+SCHEDULE_USERNAME = "bench_schedule"
+OTHER_USERNAME = "bench_schedule_other"
+BATCH_SIZE = 2000
+
+FILTERS = {
+    "all": {},
+    "upcoming": {"only_upcoming": True},
+    "organized": {"only_organizer": True},
+    "published": {"only_published": True},
+}
+
+
+@dataclass
+class LegacyScheduleEntry:
+    """ScheduleEntry до оптимізації: звичайний dataclass з __dict__ та описом"""
+
+    event_id: int
+    title: str
+    starts_at: object
+    ends_at: object
+    status: str
+    location: str
+    description: str
+    is_organizer: bool
+    has_rsvp: bool
+    highlight_reason: str = ""
+    rsvp_count: int = 0
+
+    def to_dict(self) -> dict:
+        result = {
+            "id": self.event_id,
+            "title": self.title,
+            "starts_at": self.starts_at.isoformat(),
+            "ends_at": self.ends_at.isoformat(),
+            "status": self.status,
+            "location": self.location,
+            "description": self.description,
+            "is_organizer": self.is_organizer,
+            "has_rsvp": self.has_rsvp,
+        }
+        if self.highlight_reason:
+            result["highlight_reason"] = self.highlight_reason
+        return result
+
+
+def legacy_schedule_entries(user, **filters) -> List[ScheduleEntry]:
+    """Розклад так, як його будували до UNION: усі рядки з БД, фільтри в Python"""
+    events = (
+        Event.objects.filter(Q(organizer=user) | Q(status=Event.PUBLISHED, rsvps__user=user))
+        .annotate(rsvp_count=Count("rsvps", filter=Q(rsvps__status="going")))
+        .distinct()
+        .order_by("starts_at")
+    )
+    rsvp_ids = set(RSVP.objects.filter(user=user).values_list("event_id", flat=True))
+    entries = [
+        LegacyScheduleEntry(
+            event_id=event.id, title=event.title, starts_at=event.starts_at, ends_at=event.ends_at,
+            status=event.status, location=event.location or "", description=event.description or "",
+            is_organizer=event.organizer_id == user.id, has_rsvp=event.id in rsvp_ids,
+            rsvp_count=event.rsvp_count,
+        )
+        for event in events
+    ]
+    now = timezone.now()
+    if filters.get("only_upcoming"):
+        entries = [e for e in entries if e.starts_at > now]
+    if filters.get("only_organizer"):
+        entries = [e for e in entries if e.is_organizer]
+    if filters.get("only_published"):
+        entries = [e for e in entries if e.status == Event.PUBLISHED]
+    return entries
+
+
+def build_schedule_dataset(events: int, seed: int = 42):
+    """Створити користувача з `events` подіями в розкладі; повертає користувача"""
+    User = get_user_model()
+    user, _created = User.objects.get_or_create(username=SCHEDULE_USERNAME)
+    other, _created = User.objects.get_or_create(username=OTHER_USERNAME)
+    # Спочатку RSVP: сповіщення про скасування, створені їхнім видаленням,
+    # мають потрапити в каскад видалення подій
+    RSVP.objects.filter(event__organizer__in=[user, other]).delete()
+    Event.objects.filter(organizer__in=[user, other]).delete()
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    statuses = [Event.PUBLISHED] * 6 + [Event.DRAFT, Event.CANCELLED, Event.ARCHIVED]
+
+    def make(organizer, index, status):
+        starts_at = now + timedelta(days=rng.randint(-1500, 400), hours=rng.randint(0, 23))
+        return Event(
+            title=f"Розклад {index}", description="Опис події " * 20, location="Київ",
+            starts_at=starts_at, ends_at=starts_at + timedelta(hours=rng.randint(1, 30)),
+            status=status, organizer=organizer,
+        )
+
+    organized = events // 2
+    Event.objects.bulk_create(
+        [make(user, i, rng.choice(statuses)) for i in range(organized)], batch_size=BATCH_SIZE
+    )
+    foreign = Event.objects.bulk_create(
+        [make(other, i, Event.PUBLISHED) for i in range(events - organized)], batch_size=BATCH_SIZE
+    )
+    RSVP.objects.bulk_create(
+        [RSVP(user=user, event=event, status="going") for event in foreign], batch_size=BATCH_SIZE
+    )
+    return user
+
+
+def _timed(run: Callable[[], List[ScheduleEntry]], repeat: int) -> Dict:
+    run()  # прогрів
+    timings, rows = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = len(run())
+        timings.append(time.perf_counter() - started)
+    return {"ms_median": round(statistics.median(timings) * 1000, 3), "entries": rows}
+
+
+def run_schedule_benchmark(events: int = 10_000, repeat: int = 5) -> List[Dict]:
+    """
+    Виміряти legacy та union для кожного фільтра календаря та для вікна місяця
+
+    Дані створюються в поточній БД (команда benchmark_schedule запускає це
+    в тестовій БД). Повертає рядки з медіаною часу та кількістю записів;
+    кількості записів обох способів мають збігатися.
+    """
+    user = build_schedule_dataset(events)
+    rows = []
+    for name, flags in FILTERS.items():
+        provider = FilteredScheduleDecorator(BaseScheduleProvider(), **flags) if flags else BaseScheduleProvider()
+        legacy = _timed(lambda: legacy_schedule_entries(user, **flags), repeat)
+        union = _timed(lambda: provider.get_entries(user), repeat)
+        rows.append({"filter": name, "events": events, "legacy": legacy, "union": union})
+
+    today = timezone.localdate()
+    start = timezone.make_aware(timezone.datetime(today.year, today.month, 1))
+    window = ScheduleWindow(start, start + timedelta(days=31))
+    legacy = _timed(
+        lambda: [e for e in legacy_schedule_entries(user) if e.starts_at < window.end and e.ends_at > window.start],
+        repeat,
+    )
+    union = _timed(lambda: BaseScheduleProvider().get_entries(user, window), repeat)
+    rows.append({"filter": "window[month]", "events": events, "legacy": legacy, "union": union})
+    return rows
+
+
+def _legacy_payload(user, window: ScheduleWindow) -> bytes:
+    entries = legacy_schedule_entries(user)
+    return json.dumps({
+        "start": window.start.isoformat(),
+        "end": window.end.isoformat(),
+        "events": [entry.to_dict() for entry in entries],
+    }).encode()
+
+
+def _compact_payload(user, window: ScheduleWindow) -> bytes:
+    entries = PersonalScheduleService.get_user_schedule_entries(user)
+    return ScheduleJsonEncoder.encode(window, entries=entries)
+
+
+def _entry_bytes(entry) -> int:
+    """Розмір об'єкта запису разом із __dict__ (якщо він є)"""
+    size = sys.getsizeof(entry)
+    if hasattr(entry, "__dict__"):
+        size += sys.getsizeof(entry.__dict__)
+    return size
+
+
+def run_encoding_benchmark(events: int = 10_000, repeat: int = 5) -> List[Dict]:
+    """
+    Час, пікова пам'ять (tracemalloc) і розмір JSON календаря для розкладу з `events` записів
+
+    Обидва способи повертають однакові записи; legacy додатково несе описи.
+    """
+    user = build_schedule_dataset(events)
+    now = timezone.now()
+    window = ScheduleWindow(now - timedelta(days=2000), now + timedelta(days=500))
+    legacy_entry = legacy_schedule_entries(user)[0]
+    compact_entry = PersonalScheduleService.get_user_schedule_entries(user)[0]
+    assert asdict(compact_entry)["event_id"] == legacy_entry.event_id
+
+    rows = []
+    for name, build, entry in (
+        ("legacy", _legacy_payload, legacy_entry),
+        ("compact", _compact_payload, compact_entry),
+    ):
+        build(user, window)  # прогрів
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payload = build(user, window)
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        build(user, window)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({
+            "mode": name,
+            "events": events,
+            "ms_median": round(statistics.median(timings) * 1000, 3),
+            "peak_kb": round(peak / 1024, 1),
+            "payload_kb": round(len(payload) / 1024, 1),
+            "entry_bytes": _entry_bytes(entry),
+            "entries": len(json.loads(payload)["events"]),
+        })
+    return rows
@@ -1 +1,16 @@
 from django.contrib import admin
+from .models import Category
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'normalized_name', 'created_at')
+    search_fields = ('name', 'normalized_name')
+    readonly_fields = ('normalized_name', 'created_at')
+    prepopulated_fields = {'slug': ('name',)}
+
+    def save_model(self, request, obj, form, change):
+        from .normalization import normalize_category_name
+
+        obj.normalized_name = normalize_category_name(obj.name)[:100]
+        super().save_model(request, obj, form, change)
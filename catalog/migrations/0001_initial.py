@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(help_text="Канонічна назва категорії", max_length=100)),
+                ("slug", models.SlugField(allow_unicode=True, max_length=120, unique=True)),
+                (
+                    "normalized_name",
+                    models.CharField(
+                        help_text="Ключ порівняння (casefold, без пунктуації та зайвих пробілів)",
+                        max_length=100,
+                        unique=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Категорія",
+                "verbose_name_plural": "Категорії",
+                "ordering": ["name"],
+            },
+        ),
+    ]
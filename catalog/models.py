@@ -1 +1,28 @@
 from django.db import models
+
+
+class Category(models.Model):
+    """
+    Нормалізована категорія подій
+
+    Event.category залишається вільним текстом для відображення, а
+    Event.category_ref вказує на кластер, до якого належить цей текст.
+    Фільтрація та фасети працюють з цілочисельним ключем.
+    """
+
+    name = models.CharField(max_length=100, help_text="Канонічна назва категорії")
+    slug = models.SlugField(max_length=120, unique=True, allow_unicode=True)
+    normalized_name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Ключ порівняння (casefold, без пунктуації та зайвих пробілів)",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "Категорія"
+        verbose_name_plural = "Категорії"
+
+    def __str__(self):
+        return self.name
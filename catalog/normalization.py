@@ -0,0 +1,98 @@
+"""
+Нормалізація назв категорій подій
+
+Чисті функції без залежності від моделей - використовуються і в
+CategoryService, і в міграції, що кластеризує існуючі вільнотекстові
+значення Event.category.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Mapping, Optional
+
+SIMILARITY_THRESHOLD = 0.8
+MIN_FUZZY_LENGTH = 5
+PREFIX_LENGTH = 4
+
+
+def normalize_category_name(value: str) -> str:
+    """
+    Ключ порівняння категорії: NFKC, casefold, без пунктуації та зайвих пробілів
+
+    "Конференція", "конференція " та "КОНФЕРЕНЦІЯ!" дають однаковий ключ.
+    """
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    value = re.sub(r"[\W_]+", " ", value)
+    return " ".join(value.split())
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Схожість двох нормалізованих ключів (0..1)
+
+    Нечітко порівнюються лише достатньо довгі ключі зі спільним
+    префіксом - різні короткі теги не зливаються; для решти 0.
+    """
+    if a == b:
+        return 1.0
+    if min(len(a), len(b)) < MIN_FUZZY_LENGTH or a[:PREFIX_LENGTH] != b[:PREFIX_LENGTH]:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def is_similar(a: str, b: str) -> bool:
+    """
+    Чи є два нормалізовані ключі варіантами однієї категорії
+
+    Окрім точного збігу, об'єднує близькі написання ("конференція" /
+    "конференции", "вебінар" / "вебінари"). Лише для кластеризації
+    наявних значень і пошуку - при збереженні події категорія
+    визначається тільки точним збігом ключа (CategoryService.resolve).
+    """
+    return similarity(a, b) >= SIMILARITY_THRESHOLD
+
+
+def find_similar(key: str, candidates: Iterable[str]) -> Optional[str]:
+    """Найсхожіший на ключ кандидат не нижче порогу (або None)"""
+    best, best_ratio = None, 0.0
+    for candidate in candidates:
+        ratio = similarity(key, candidate)
+        if ratio == 1.0:
+            return candidate
+        if ratio >= SIMILARITY_THRESHOLD and ratio > best_ratio:
+            best, best_ratio = candidate, ratio
+    return best
+
+
+def cluster_category_names(value_counts: Mapping[str, int]) -> Dict[str, List[str]]:
+    """
+    Групує вільнотекстові значення категорій у кластери
+
+    Args:
+        value_counts: {вихідне значення: кількість подій з ним}
+
+    Returns:
+        Словник {канонічна назва: [усі вихідні значення кластера]}.
+        Канонічна назва - найчастіший варіант написання (без пробілів по краях).
+    """
+    counts: Counter = Counter()
+    for value, count in value_counts.items():
+        counts[value.strip()] += count
+
+    clusters: Dict[str, List[str]] = {}
+    ordered = sorted(value_counts, key=lambda v: (-counts[v.strip()], v))
+    for value in ordered:
+        key = normalize_category_name(value)
+        if not key:
+            continue
+        target = find_similar(key, clusters)
+        clusters.setdefault(target or key, []).append(value)
+
+    result = {}
+    for members in clusters.values():
+        canonical = max(members, key=lambda v: (counts[v.strip()], -len(v.strip()))).strip()
+        result[canonical] = members
+    return result
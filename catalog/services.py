@@ -0,0 +1,169 @@
+"""
+Сервіс для роботи з нормалізованим каталогом категорій
+"""
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+from .models import Category
+from .normalization import find_similar, normalize_category_name
+
+CATALOG_CACHE_KEY = "catalog:categories"
+CATALOG_CACHE_TIMEOUT = 60 * 60
+
+
+class CategoryInfo(NamedTuple):
+    """Легкий запис каталогу для кешу (без ORM-об'єкта)"""
+
+    id: int
+    name: str
+    slug: str
+    normalized_name: str
+
+
+class CategoryService:
+    """
+    Сервіс каталогу категорій
+
+    Тримає весь (невеликий) каталог у кеші, тож перетворення
+    тексту/slug у цілочисельний ключ не потребує запитів до БД.
+    """
+
+    @staticmethod
+    def get_catalog() -> List[CategoryInfo]:
+        """Всі категорії з кешу (один запит при промаху)"""
+        catalog = cache.get(CATALOG_CACHE_KEY)
+        if catalog is None:
+            catalog = CategoryService.reload_catalog()
+        return catalog
+
+    @staticmethod
+    def reload_catalog() -> List[CategoryInfo]:
+        """Прочитати каталог з БД та оновити кеш"""
+        catalog = [
+            CategoryInfo(*row)
+            for row in Category.objects.order_by("name").values_list(
+                "id", "name", "slug", "normalized_name"
+            )
+        ]
+        # Категорія з ще не зафіксованої транзакції не потрапляє в кеш:
+        # після відкату там лишився б id неіснуючого рядка
+        if not CategoryService._has_uncommitted():
+            cache.set(CATALOG_CACHE_KEY, catalog, CATALOG_CACHE_TIMEOUT)
+        return catalog
+
+    @staticmethod
+    def _has_uncommitted() -> bool:
+        """Чи створила поточна транзакція категорію, яку ще не зафіксовано"""
+        return any(
+            callback == CategoryService.invalidate
+            for _sids, callback, _robust in transaction.get_connection().run_on_commit
+        )
+
+    @staticmethod
+    def get_by_id() -> Dict[int, CategoryInfo]:
+        """Каталог, проіндексований за id"""
+        return {info.id: info for info in CategoryService.get_catalog()}
+
+    @staticmethod
+    def invalidate() -> None:
+        cache.delete(CATALOG_CACHE_KEY)
+
+    @staticmethod
+    def find(value: str, catalog: Optional[List[CategoryInfo]] = None) -> Optional[CategoryInfo]:
+        """
+        Знайти категорію лише за точним slug або нормалізованою назвою
+
+        Без пошуку схожих написань - для фільтрів, де "music" не має
+        підхоплювати "musical".
+        """
+        value = (value or "").strip()
+        key = normalize_category_name(value)
+        if not key:
+            return None
+
+        if catalog is None:
+            catalog = CategoryService.get_catalog()
+        for info in catalog:
+            if info.slug == value or info.normalized_name == key:
+                return info
+        return None
+
+    @staticmethod
+    def match(value: str, catalog: Optional[List[CategoryInfo]] = None) -> Optional[CategoryInfo]:
+        """
+        Знайти категорію за slug, назвою або схожим написанням
+
+        Args:
+            value: Slug або вільний текст
+            catalog: Каталог для пошуку (за замовчуванням - з кешу)
+
+        Returns:
+            CategoryInfo або None, якщо значення не схоже на жодну категорію
+        """
+        key = normalize_category_name((value or "").strip())
+        if not key:
+            return None
+
+        if catalog is None:
+            catalog = CategoryService.get_catalog()
+        info = CategoryService.find(value, catalog)
+        if info:
+            return info
+
+        by_key = {info.normalized_name: info for info in catalog}
+        similar = find_similar(key, by_key)
+        return by_key[similar] if similar else None
+
+    @staticmethod
+    def resolve(value: str) -> Optional[int]:
+        """
+        Повертає id категорії для вільного тексту, створюючи її за потреби
+
+        Використовується при збереженні події: "конференція " та
+        "Конференція" потрапляють в одну категорію. Лише точний збіг
+        нормалізованого ключа - схожі, але різні назви ("music" і
+        "musical") не зливаються мовчки. Каталог береться з кешу; запит
+        до БД - тільки для ключа, якого в ньому немає.
+        """
+        name = " ".join((value or "").split())
+        key = normalize_category_name(name)[:100]
+        if not key:
+            return None
+
+        for info in CategoryService.get_catalog():
+            if info.normalized_name == key:
+                return info.id
+        # Кеш міг не встигнути побачити категорію з іншого процесу
+        existing = Category.objects.filter(normalized_name=key).values_list("id", flat=True).first()
+        if existing is not None:
+            CategoryService.invalidate()
+            return existing
+
+        try:
+            with transaction.atomic():
+                category = Category.objects.create(
+                    name=name[:100],
+                    slug=CategoryService._unique_slug(name),
+                    normalized_name=key,
+                )
+        except IntegrityError:
+            # Паралельний запит уже створив цю категорію
+            category = Category.objects.get(normalized_name=key)
+        CategoryService.invalidate()
+        transaction.on_commit(CategoryService.invalidate)
+        return category.id
+
+    @staticmethod
+    def _unique_slug(name: str) -> str:
+        base = slugify(name, allow_unicode=True)[:110] or "category"
+        slug = base
+        suffix = 2
+        while Category.objects.filter(slug=slug).exists():
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        return slug
@@ -0,0 +1,15 @@
+"""
+Інвалідація кешу каталогу при зміні категорій (наприклад, через адмінку)
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    from .services import CategoryService
+
+    CategoryService.invalidate()
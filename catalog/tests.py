@@ -1 +1,167 @@
+"""
+Тести для нормалізованого каталогу категорій
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from catalog.models import Category
+from catalog.normalization import cluster_category_names, find_similar, is_similar, normalize_category_name
+from catalog.services import CategoryService
+from events.models import Event
+
+
+class NormalizationTests(TestCase):
+    """Тести чистих функцій нормалізації"""
+
+    def test_normalize_case_and_whitespace(self):
+        self.assertEqual(normalize_category_name("  Конференція "), "конференція")
+        self.assertEqual(normalize_category_name("Веб -  розробка!"), "веб розробка")
+        self.assertEqual(normalize_category_name("   "), "")
+
+    def test_similar_spellings(self):
+        """Близькі написання довгих назв об'єднуються, короткі - ні"""
+        self.assertTrue(is_similar("конференція", "конференции"))
+        self.assertTrue(is_similar("вебінар", "вебінари"))
+        self.assertFalse(is_similar("концерт", "конференція"))
+        self.assertFalse(is_similar("tech", "techno"))
+
+    def test_find_similar_picks_best_match(self):
+        self.assertEqual(find_similar("webinars", ["webinarx", "webinar", "webin"]), "webinar")
+        self.assertEqual(find_similar("tech", ["techno", "tech"]), "tech")
+        self.assertIsNone(find_similar("концерт", ["конференція"]))
+
+    def test_cluster_picks_most_common_spelling(self):
+        clusters = cluster_category_names({
+            "Конференція": 3,
+            "конференція ": 1,
+            "конференции": 1,
+            "вебінар": 2,
+            "": 5,
+        })
+
+        self.assertEqual(set(clusters), {"Конференція", "вебінар"})
+        self.assertEqual(
+            sorted(clusters["Конференція"]),
+            sorted(["Конференція", "конференція ", "конференции"]),
+        )
+
+
+class CategoryServiceTests(TestCase):
+    """Тести CategoryService та прив'язки подій"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="org", password="testpass123")
+
+    def _event(self, category):
+        now = timezone.now()
+        return Event.objects.create(
+            title="Event",
+            starts_at=now + timedelta(days=1),
+            ends_at=now + timedelta(days=1, hours=1),
+            organizer=self.user,
+            status=Event.PUBLISHED,
+            category=category,
+        )
+
+    def test_events_share_normalized_category(self):
+        """Написання з тим самим нормалізованим ключем отримують той самий FK"""
+        first = self._event("Конференція")
+        second = self._event("конференція ")
+        third = self._event("КОНФЕРЕНЦІЯ!")
+
+        self.assertIsNotNone(first.category_ref_id)
+        self.assertEqual(first.category_ref_id, second.category_ref_id)
+        self.assertEqual(first.category_ref_id, third.category_ref_id)
+        self.assertEqual(Category.objects.count(), 1)
+        self.assertEqual(Category.objects.get().slug, "конференція")
+
+    def test_similar_names_are_not_merged_on_save(self):
+        """Нечіткий збіг не зливає різні категорії при збереженні"""
+        music = self._event("music")
+        musical = self._event("musical")
+
+        self.assertNotEqual(music.category_ref_id, musical.category_ref_id)
+        self.assertEqual(Category.objects.count(), 2)
+
+    def test_resolve_known_category_uses_cache(self):
+        category = Category.objects.create(name="tech", slug="tech", normalized_name="tech")
+        CategoryService.get_catalog()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(CategoryService.resolve("Tech"), category.pk)
+
+    def test_rolled_back_category_is_not_cached(self):
+        """Категорія з відкоченої транзакції не лишається в кеші каталогу"""
+        with transaction.atomic():
+            self._event("tech")
+            self.assertEqual([info.name for info in CategoryService.get_catalog()], ["tech"])
+            transaction.set_rollback(True)
+
+        self.assertFalse(Category.objects.exists())
+        self.assertEqual(CategoryService.get_catalog(), [])
+
+    def test_resolve_finds_category_missing_from_cache(self):
+        CategoryService.get_catalog()
+        category = Category.objects.create(name="Tech", slug="tech", normalized_name="tech")
+
+        self.assertEqual(CategoryService.resolve("tech"), category.pk)
+        self.assertEqual(Category.objects.count(), 1)
+
+    def test_blank_category_has_no_ref(self):
+        self.assertIsNone(self._event("").category_ref_id)
+
+    def test_category_change_rebinds_ref(self):
+        event = self._event("tech")
+        event.category = "music"
+        event.save()
+
+        self.assertEqual(event.category_ref.name, "music")
+
+    def test_match_uses_cache(self):
+        """Пошук категорії за slug після прогріву кешу не робить запитів"""
+        Category.objects.create(name="tech", slug="tech", normalized_name="tech")
+        CategoryService.get_catalog()
+
+        with self.assertNumQueries(0):
+            info = CategoryService.match("tech")
+        self.assertEqual(info.name, "tech")
+        self.assertIsNone(CategoryService.match("unknown-tag"))
+
+    def test_unique_slug(self):
+        Category.objects.create(name="Tech", slug="tech", normalized_name="tech old")
+        category_id = CategoryService.resolve("Tech!")
+
+        self.assertEqual(Category.objects.get(pk=category_id).slug, "tech-2")
+
+    def test_list_filters_by_category_key(self):
+        """Фільтр списку за slug категорії повертає всі варіанти написання"""
+        self._event("Конференція")
+        self._event("конференція ")
+        self._event("music")
+
+        response = self.client.get("/events/?category=конференція")
+
+        self.assertEqual(len(response.context["events"]), 2)
+
+    def test_list_unknown_category_is_empty(self):
+        """Невідоме значення категорії - порожній список, без текстового пошуку"""
+        self._event("Data Science")
+
+        response = self.client.get("/events/?category=scie")
+
+        self.assertEqual(len(response.context["events"]), 0)
+
+    def test_list_ignores_similar_category(self):
+        """Фільтр не підхоплює схоже написання іншої категорії"""
+        self._event("music")
+
+        response = self.client.get("/events/?category=musik")
+
+        self.assertEqual(len(response.context["events"]), 0)
+        self.assertEqual(CategoryService.match("musik").name, "music")
@@ -0,0 +1,199 @@
+"""
+Читання з реплік БД з гарантією read-your-writes
+
+PrimaryReplicaRouter відправляє на репліку лише читання всередині
+"репліка-сумісного" запиту: GET/HEAD до view, позначеного replica_reads
+(список і деталі подій, календар, дашборди, GET до API подій). Усе інше -
+записи, транзакції, management-команди, фонові задачі, POST-запити - іде
+в default (primary).
+
+Read-your-writes:
+- після першого запису в межах запиту подальші читання цього запиту йдуть
+  на primary;
+- відповідь на запит із записом ставить cookie COOKIE_NAME на
+  STICKY_SECONDS секунд - наступні запити цього клієнта читають з primary,
+  доки репліка не наздожене;
+- моделі з PRIMARY_MODELS (сесії, API-токени) завжди читаються з primary:
+  щойно створена сесія чи токен мають працювати одразу.
+
+Репліки - звичайні аліаси DATABASES, перелічені в DATABASE_ROUTING["REPLICAS"];
+без реплік роутер і middleware нічого не роблять (MiddlewareNotUsed).
+Локально дві SQLite-бази: event_organizer/settings_replica.py.
+"""
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from typing import Optional
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+
+DEFAULTS = {
+    "REPLICAS": [],
+    "STICKY_SECONDS": 15,
+    "COOKIE_NAME": "db_primary",
+    "PRIMARY_MODELS": ("sessions.session", "users.apitoken"),
+}
+
+SAFE_METHODS = ("GET", "HEAD")
+
+# Стан поточного запиту: asgiref Local ізолює і потоки WSGI, і корутини ASGI
+_state = Local()
+_config: Optional[dict] = None
+
+
+def get_config() -> dict:
+    """Налаштування: settings.DATABASE_ROUTING поверх DEFAULTS (кешується до зміни settings)"""
+    global _config
+    if _config is None:
+        config = dict(DEFAULTS)
+        config.update(getattr(settings, "DATABASE_ROUTING", {}) or {})
+        config["REPLICAS"] = list(config["REPLICAS"])
+        config["PRIMARY_MODELS"] = frozenset(config["PRIMARY_MODELS"])
+        _config = config
+    return _config
+
+
+@receiver(setting_changed)
+def _reset_config(setting, **kwargs):
+    global _config
+    if setting == "DATABASE_ROUTING":
+        _config = None
+
+
+def reset_routing_state() -> None:
+    _state.replica = False
+    _state.pinned = False
+    _state.wrote = False
+
+
+@contextmanager
+def replica_reads_scope(pinned: bool = False):
+    """
+    Дозволити читання з реплік у блоці (поза HTTP-запитом)
+
+    pinned=True - клієнт щойно писав, читати з primary.
+    """
+    previous = (getattr(_state, "replica", False), getattr(_state, "pinned", False), getattr(_state, "wrote", False))
+    _state.replica, _state.pinned, _state.wrote = True, pinned, False
+    try:
+        yield
+    finally:
+        _state.replica, _state.pinned, _state.wrote = previous
+
+
+@contextmanager
+def service_writes():
+    """
+    Службові записи всередині запиту (напр. архівування при перегляді списку)
+
+    Не вважаються записом клієнта: не ставлять sticky-cookie і не
+    перемикають подальші читання запиту на primary.
+    """
+    wrote = getattr(_state, "wrote", False)
+    try:
+        yield
+    finally:
+        _state.wrote = wrote
+
+
+def wrote_to_primary() -> bool:
+    return getattr(_state, "wrote", False)
+
+
+def replica_reads(view_func):
+    """
+    Позначити view як репліка-сумісний: GET/HEAD-читання можуть іти на репліку
+
+    Для class-based view та DRF viewset - атрибут класу replica_reads = True.
+    """
+    view_func.replica_reads = True
+    return view_func
+
+
+def _allows_replica(view_func) -> bool:
+    if getattr(view_func, "replica_reads", False):
+        return True
+    view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+    return bool(getattr(view_class, "replica_reads", False))
+
+
+class PrimaryReplicaRouter:
+    """Роутер: записи й транзакції на primary, читання репліка-сумісних view - на репліки"""
+
+    def db_for_read(self, model, **hints):
+        config = get_config()
+        replicas = config["REPLICAS"]
+        if not replicas:
+            return None
+        if (
+            not getattr(_state, "replica", False)
+            or _state.pinned
+            or _state.wrote
+            or model._meta.label_lower in config["PRIMARY_MODELS"]
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            # Явно primary: інакше Django взяв би БД з instance-підказки (об'єкт з репліки)
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in replicas:
+            # Пов'язані об'єкти читаються з тієї ж репліки - узгоджений знімок
+            return instance._state.db
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if not get_config()["REPLICAS"]:
+            return None
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        replicas = get_config()["REPLICAS"]
+        if not replicas:
+            return None
+        pool = {DEFAULT_DB_ALIAS, *replicas}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплік приходить реплікацією; тут не обмежуємо (тестові БД)
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Вмикає читання з реплік для GET/HEAD до позначених view та ставить
+    sticky-cookie після запитів із записом
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not get_config()["REPLICAS"]:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        config = get_config()
+        reset_routing_state()
+        _state.pinned = request.method not in SAFE_METHODS or config["COOKIE_NAME"] in request.COOKIES
+        try:
+            response = self.get_response(request)
+            wrote = _state.wrote
+        finally:
+            reset_routing_state()
+
+        if wrote:
+            response.set_cookie(
+                config["COOKIE_NAME"], "1",
+                max_age=config["STICKY_SECONDS"], httponly=True, samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS and _allows_replica(view_func):
+            _state.replica = True
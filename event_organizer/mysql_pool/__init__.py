@@ -0,0 +1,3 @@
+"""
+MySQL-бекенд з пулом з'єднань: ENGINE "event_organizer.mysql_pool"
+"""
@@ -0,0 +1,170 @@
+"""
+MySQL-бекенд Django з пулом з'єднань
+
+Без пулу кожен HTTP-запит відкриває нове з'єднання PyMySQL: TCP,
+автентифікація, init_command та SET сесії. Тут з'єднання береться з пулу
+процесу (pool.py) при connect() і повертається в нього при close(),
+тож наприкінці запиту (CONN_MAX_AGE=0) з'єднання не закривається, а
+повертається для наступного запиту.
+
+    DATABASES["default"] = {
+        "ENGINE": "event_organizer.mysql_pool",
+        ...
+        "OPTIONS": {"pool": {"min_size": 2, "max_size": 10, "timeout": 5}},
+    }
+
+Без OPTIONS["pool"] бекенд поводиться як django.db.backends.mysql.
+Пул окремий для кожного аліасу та набору параметрів з'єднання: зміна NAME
+(тестова БД) чи HOST закриває старий пул. Сесійні SET (ізоляція,
+SQL_AUTO_IS_NULL) виконуються лише для нових з'єднань.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.mysql import base as mysql_base
+from django.db.backends.mysql.base import Database
+
+from .pool import ConnectionPool, PoolClosed, PoolOptions, PoolTimeout
+
+# Біт SERVER_STATUS_IN_TRANS у статусі сервера MySQL
+SERVER_STATUS_IN_TRANS = 1
+
+
+def _connect(conn_params: dict):
+    """Нове з'єднання драйвера - як у django.db.backends.mysql"""
+    connection = Database.connect(**conn_params)
+    if connection.encoders.get(bytes) is bytes:
+        connection.encoders.pop(bytes)
+    return connection
+
+
+def _ping(raw) -> None:
+    # reconnect=False: тихе перепідключення обійшло б облік пулу та сесійні SET
+    raw.ping(False)
+
+
+def _reset(raw) -> None:
+    """Відкат незавершеної транзакції та autocommit перед поверненням у пул"""
+    status = getattr(raw, "server_status", None)
+    if status is None or status & SERVER_STATUS_IN_TRANS:
+        raw.rollback()
+    if not raw.get_autocommit():
+        raw.autocommit(True)
+
+
+def _listener(alias: str):
+    def listener(event: str, value: float) -> None:
+        from monitoring.metrics import record_pool_event
+
+        record_pool_event(alias, event, value)
+
+    return listener
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    # alias -> (ключ параметрів, пул)
+    _connection_pools: Dict[str, Tuple[tuple, ConnectionPool]] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pooled_fresh = True
+        self._connection_pool: Optional[ConnectionPool] = None
+
+    @property
+    def pool_options(self) -> Optional[PoolOptions]:
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not options:
+            return None
+        if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
+            raise ImproperlyConfigured("Пул з'єднань несумісний з CONN_MAX_AGE != 0")
+        try:
+            return PoolOptions.from_settings(options)
+        except (TypeError, ValueError) as exc:
+            raise ImproperlyConfigured(f"OPTIONS['pool'] для {self.alias}: {exc}") from exc
+
+    def _pool_key(self, conn_params: dict) -> tuple:
+        return tuple(sorted((key, repr(value)) for key, value in conn_params.items() if key != "conv"))
+
+    def get_pool(self, conn_params: Optional[dict] = None) -> Optional[ConnectionPool]:
+        """Пул цього аліасу (створюється при першому зверненні) або None без OPTIONS["pool"]"""
+        options = self.pool_options
+        if options is None:
+            return None
+        conn_params = conn_params if conn_params is not None else self.get_connection_params()
+        key = (self._pool_key(conn_params), repr(options))
+
+        stale = None
+        with self._pools_lock:
+            current = self._connection_pools.get(self.alias)
+            if current is not None and current[0] == key and not current[1].closed:
+                return current[1]
+            pool = ConnectionPool(
+                self.alias,
+                connect=lambda: _connect(conn_params),
+                options=options,
+                ping=_ping,
+                reset=_reset,
+                listener=_listener(self.alias),
+            )
+            self._connection_pools[self.alias] = (key, pool)
+            if current is not None:
+                stale = current[1]
+        if stale is not None:
+            stale.close()
+        return pool
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        return self.get_pool()
+
+    def close_pool(self) -> None:
+        with self._pools_lock:
+            current = self._connection_pools.pop(self.alias, None)
+        if current is not None:
+            current[1].close()
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop("pool", None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        self._connection_pool = pool
+        if pool is None:
+            self._pooled_fresh = True
+            return super().get_new_connection(conn_params)
+        try:
+            connection, self._pooled_fresh = pool.getconn()
+        except (PoolTimeout, PoolClosed) as exc:
+            self._connection_pool = None
+            raise Database.OperationalError(str(exc)) from exc
+        return connection
+
+    def init_connection_state(self):
+        if self._pooled_fresh:
+            return super().init_connection_state()
+        # З'єднання з пулу: сесійні SET уже виконані при його створенні
+        return super(mysql_base.DatabaseWrapper, self).init_connection_state()
+
+    def _close(self):
+        pool, self._connection_pool = self._connection_pool, None
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # Після помилок (крім IntegrityError/DataError) з'єднання може бути зламане;
+            # з'єднання повертається в той пул, з якого видане
+            pool.putconn(self.connection, discard=self.errors_occurred)
+            self.connection = None
+        return None
+
+    def close_if_health_check_failed(self):
+        if self.settings_dict["OPTIONS"].get("pool"):
+            # Пул перевіряє з'єднання при видачі
+            return None
+        return super().close_if_health_check_failed()
@@ -0,0 +1,350 @@
+"""
+Потокобезпечний пул з'єднань, незалежний від драйвера БД
+
+Пул отримує фабрику connect() та функції ping/close/reset для "сирих"
+з'єднань драйвера; усе, що стосується Django та MySQL, - у base.py.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class PoolTimeout(Exception):
+    """Усі з'єднання зайняті довше, ніж timeout"""
+
+
+class PoolClosed(Exception):
+    """Пул закрито (зміна налаштувань, завершення тестової БД)"""
+
+
+@dataclass
+class PoolOptions:
+    """
+    Параметри пулу
+
+    min_size - скільки з'єднань відкрити одразу й тримати відкритими;
+    max_size - межа одночасно відкритих з'єднань процесу;
+    timeout - скільки чекати вільного з'єднання, с;
+    max_lifetime - вік, після якого з'єднання закривається при поверненні, с;
+    max_idle - скільки з'єднання понад min_size може простоювати, с;
+    check_after - ping при видачі, якщо з'єднання простоювало довше, с
+                  (0 - перевіряти завжди, None - не перевіряти).
+    """
+
+    min_size: int = 0
+    max_size: int = 10
+    timeout: float = 5.0
+    max_lifetime: float = 1800.0
+    max_idle: float = 600.0
+    check_after: Optional[float] = 0.0
+
+    @classmethod
+    def from_settings(cls, options) -> "PoolOptions":
+        """OPTIONS["pool"]: True або dict з полями класу"""
+        if options is True:
+            return cls()
+        known = set(cls.__dataclass_fields__)
+        unknown = set(options) - known
+        if unknown:
+            raise ValueError(f"Невідомі параметри пулу: {', '.join(sorted(unknown))}")
+        pool_options = cls(**options)
+        if pool_options.max_size < 1 or not 0 <= pool_options.min_size <= pool_options.max_size:
+            raise ValueError("Потрібно 0 <= min_size <= max_size, max_size >= 1")
+        return pool_options
+
+
+@dataclass
+class PoolStats:
+    """Лічильники пулу з моменту створення"""
+
+    created: int = 0
+    closed: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = 0
+    check_failures: int = 0
+
+
+@dataclass
+class _Entry:
+    raw: object
+    created_at: float
+    last_used_at: float = field(default=0.0)
+
+
+# Усі пули процесу - для gauge'ів /metrics
+_POOLS: "weakref.WeakSet[ConnectionPool]" = weakref.WeakSet()
+
+
+def all_pools() -> List["ConnectionPool"]:
+    return list(_POOLS)
+
+
+class ConnectionPool:
+    """
+    Пул з'єднань з перевіркою при видачі, обмеженням віку та простою
+
+    Використання:
+        pool = ConnectionPool("default", connect, ping=..., close=..., reset=...)
+        raw, fresh = pool.getconn()
+        ...
+        pool.putconn(raw)
+
+    Блокування тримається лише на операціях зі списками; створення,
+    ping та закриття з'єднань відбуваються поза ним. Після fork (gunicorn
+    --preload) дочірній процес забуває успадковані з'єднання, не закриваючи
+    їх: сокет спільний з батьківським процесом.
+
+    listener(event, value) отримує події для метрик: created, closed,
+    check_failed, timeout, wait (value - секунди очікування).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], object],
+        options: Optional[PoolOptions] = None,
+        ping: Optional[Callable[[object], None]] = None,
+        close: Optional[Callable[[object], None]] = None,
+        reset: Optional[Callable[[object], None]] = None,
+        listener: Optional[Callable[[str, float], None]] = None,
+    ):
+        self.name = name
+        self.options = options or PoolOptions()
+        self._connect = connect
+        self._ping = ping
+        self._close_raw = close or (lambda raw: raw.close())
+        self._reset = reset
+        self._listener = listener
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: List[_Entry] = []
+        self._in_use: Dict[int, _Entry] = {}
+        self._size = 0
+        self._opened = False
+        self._closed = False
+        self._pid = os.getpid()
+        self.stats = PoolStats()
+        _POOLS.add(self)
+
+    # --- службове ---
+
+    def _emit(self, event: str, value: float = 1) -> None:
+        if self._listener is not None:
+            try:
+                self._listener(event, value)
+            except Exception:  # noqa: BLE001 - метрики не ламають видачу з'єднань
+                pass
+
+    def _check_fork(self) -> None:
+        """Викликається під блокуванням"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = []
+            self._in_use = {}
+            self._size = 0
+            self._opened = False
+
+    def _create(self) -> _Entry:
+        """Нове з'єднання; місце в _size має бути зарезервоване викликачем"""
+        try:
+            raw = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        now = time.monotonic()
+        with self._cond:
+            self.stats.created += 1
+        self._emit("created")
+        return _Entry(raw=raw, created_at=now, last_used_at=now)
+
+    def _discard(self, entry: _Entry) -> None:
+        """Закрити з'єднання, що вже не рахується в пулі (_size зменшено)"""
+        try:
+            self._close_raw(entry.raw)
+        except Exception:  # noqa: BLE001 - з'єднання могло вже обірватися
+            pass
+        with self._cond:
+            self.stats.closed += 1
+        self._emit("closed")
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.options.max_lifetime is not None and now - entry.created_at >= self.options.max_lifetime
+
+    def _healthy(self, entry: _Entry, now: float) -> bool:
+        check_after = self.options.check_after
+        if self._ping is None or check_after is None or now - entry.last_used_at < check_after:
+            return True
+        try:
+            self._ping(entry.raw)
+            return True
+        except Exception:  # noqa: BLE001 - будь-яка помилка ping означає непридатне з'єднання
+            with self._cond:
+                self.stats.check_failures += 1
+            self._emit("check_failed")
+            return False
+
+    def _prefill(self) -> None:
+        """Відкрити min_size з'єднань (один раз на процес)"""
+        with self._cond:
+            if self._opened:
+                return
+            self._opened = True
+            missing = max(0, self.options.min_size - self._size)
+            self._size += missing
+        for _ in range(missing):
+            entry = self._create()
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    # --- публічний API ---
+
+    def getconn(self) -> Tuple[object, bool]:
+        """
+        Видати з'єднання: (сире з'єднання, щойно створене)
+
+        Raises:
+            PoolTimeout: вільного з'єднання не з'явилося за timeout
+            PoolClosed: пул закрито
+        """
+        with self._cond:
+            self._check_fork()
+            opened = self._opened
+        if not opened:
+            self._prefill()
+
+        started = time.monotonic()
+        deadline = started + self.options.timeout
+        waited = False
+        while True:
+            entry = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise PoolClosed(f"Пул {self.name} закрито")
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO: найсвіжіші в роботі, старі доживають max_idle
+                elif self._size < self.options.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        self._emit("timeout")
+                        raise PoolTimeout(
+                            f"Пул {self.name}: усі {self.options.max_size} з'єднань зайняті "
+                            f"довше {self.options.timeout} с"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            if create:
+                entry = self._create()
+                fresh = True
+            else:
+                now = time.monotonic()
+                if self._expired(entry, now) or not self._healthy(entry, now):
+                    with self._cond:
+                        self._size -= 1
+                    self._discard(entry)
+                    continue
+                fresh = False
+
+            waited_for = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(entry.raw)] = entry
+                self.stats.checkouts += 1
+                if waited:
+                    self.stats.waits += 1
+                    self.stats.wait_seconds_total += waited_for
+                    self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited_for)
+            self._emit("wait", waited_for)
+            return entry.raw, fresh
+
+    def putconn(self, raw, discard: bool = False) -> None:
+        """
+        Повернути з'єднання
+
+        discard=True - закрити (після помилок з'єднання). Перед поверненням
+        у пул викликається reset(raw) (відкат незавершеної транзакції);
+        помилка reset теж закриває з'єднання.
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(raw), None)
+        if entry is None:
+            # Чуже з'єднання (видане до fork або до закриття пулу)
+            try:
+                self._close_raw(raw)
+            except Exception:  # noqa: BLE001
+                pass
+            return
+
+        now = time.monotonic()
+        if not discard and self._reset is not None:
+            try:
+                self._reset(raw)
+            except Exception:  # noqa: BLE001 - непридатне з'єднання не повертається в пул
+                discard = True
+
+        to_close = []
+        with self._cond:
+            if discard or self._closed or self._expired(entry, now):
+                self._size -= 1
+                to_close.append(entry)
+            else:
+                entry.last_used_at = now
+                self._idle.append(entry)
+            to_close.extend(self._trim_idle(now))
+            self._cond.notify()
+        for stale in to_close:
+            self._discard(stale)
+
+    def _trim_idle(self, now: float) -> List[_Entry]:
+        """Вилучити (під блокуванням) з'єднання понад min_size, що простоюють довше max_idle"""
+        max_idle = self.options.max_idle
+        if max_idle is None:
+            return []
+        stale = []
+        # _idle впорядковано від найдавніше використаного до найсвіжішого
+        while self._idle and self._size > self.options.min_size and now - self._idle[0].last_used_at >= max_idle:
+            stale.append(self._idle.pop(0))
+            self._size -= 1
+        return stale
+
+    def close(self) -> None:
+        """Закрити вільні з'єднання; зайняті закриються при поверненні"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def snapshot(self) -> dict:
+        """Поточний стан і лічильники (для метрик та бенчмарку)"""
+        with self._cond:
+            return {
+                "name": self.name,
+                "size": self._size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "min_size": self.options.min_size,
+                "max_size": self.options.max_size,
+                **self.stats.__dict__,
+            }
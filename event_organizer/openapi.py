@@ -0,0 +1,248 @@
+"""
+Попередньо згенерована OpenAPI-схема
+
+SpectacularAPIView будує схему інтроспекцією всіх viewset'ів і серіалізаторів
+на кожен запит, а /api/docs/ та /api/redoc/ запитують її при кожному
+відкритті. Тут схема генерується один раз (management-команда
+generate_openapi_schema на етапі збирання/старту) у статичні файли
+schema.yaml та schema.json і віддається з ETag та довгими Cache-Control.
+
+Поруч зі схемою зберігається контрольна сума джерел (urls/views/serializers/
+models застосунків проєкту, налаштування DRF/drf-spectacular, версія
+drf-spectacular). Якщо при першому зверненні процесу сума не збігається,
+схема перегенеровується автоматично.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import drf_spectacular
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from drf_spectacular.plumbing import set_query_parameters
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+DEFAULTS = {
+    "DIR": None,
+    "MAX_AGE": 3600,
+    "AUTO_REGENERATE": True,
+}
+
+FORMATS = {
+    "yaml": ("schema.yaml", "application/vnd.oai.openapi; charset=utf-8"),
+    "json": ("schema.json", "application/vnd.oai.openapi+json; charset=utf-8"),
+}
+META_FILE = "schema.meta.json"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Файли застосунків, від яких залежить схема (models.py - help_text, choices,
+# max_length полів потрапляють у схему через ModelSerializer)
+SOURCE_FILES = (
+    "urls.py", "views.py", "serializers.py", "models.py", "filters.py", "permissions.py", "pagination.py",
+)
+
+
+def get_config() -> dict:
+    """Налаштування: settings.OPENAPI_SCHEMA поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "OPENAPI_SCHEMA", {}) or {})
+    if not config["DIR"]:
+        config["DIR"] = Path(settings.BASE_DIR) / "static" / "openapi"
+    config["DIR"] = Path(config["DIR"])
+    return config
+
+
+def source_checksum() -> str:
+    """
+    Контрольна сума всього, від чого залежить схема
+
+    Читає лише вихідні файли (мілісекунди) - без імпорту та інтроспекції
+    серіалізаторів.
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    digest = hashlib.sha256()
+    digest.update(drf_spectacular.__version__.encode())
+    for name in ("REST_FRAMEWORK", "SPECTACULAR_SETTINGS", "ROOT_URLCONF"):
+        digest.update(repr(getattr(settings, name, None)).encode())
+
+    for path in source_paths():
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_paths() -> List[Path]:
+    """Наявні вихідні файли застосунків проєкту, що входять у контрольну суму"""
+    base_dir = Path(settings.BASE_DIR).resolve()
+    paths = {Path(settings.BASE_DIR) / (settings.ROOT_URLCONF.replace(".", "/") + ".py")}
+    for app_config in apps.get_app_configs():
+        app_path = Path(app_config.path).resolve()
+        if base_dir not in app_path.parents:
+            continue
+        for name in SOURCE_FILES:
+            paths.add(app_path / name)
+        paths.update(app_path.glob("*urls.py"))
+    return [path for path in sorted(p.resolve() for p in paths) if path.exists()]
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def generate_schema(directory: Optional[Path] = None, checksum: Optional[str] = None) -> dict:
+    """Згенерувати схему у файли; повертає метадані"""
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    directory = Path(directory or get_config()["DIR"])
+    directory.mkdir(parents=True, exist_ok=True)
+    checksum = checksum or source_checksum()
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    rendered = {
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+    for fmt, content in rendered.items():
+        _write_atomic(directory / FORMATS[fmt][0], content)
+
+    meta = {
+        "checksum": checksum,
+        "etags": {fmt: hashlib.sha256(content).hexdigest()[:32] for fmt, content in rendered.items()},
+    }
+    # Метадані пишуться останніми: наявність актуального meta означає готові файли
+    _write_atomic(directory / META_FILE, json.dumps(meta).encode())
+    return meta
+
+
+def read_meta(directory: Path) -> Optional[dict]:
+    try:
+        return json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass
+class SchemaDocument:
+    content: bytes
+    etag: str
+    checksum: str
+
+
+class SchemaStore:
+    """
+    Схема в пам'яті процесу
+
+    Перевірка контрольної суми та читання файлів відбуваються один раз на
+    процес; далі запит обслуговується з пам'яті.
+    """
+
+    def __init__(self):
+        self._documents: Optional[Dict[str, SchemaDocument]] = None
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        self._documents = None
+
+    def _load(self) -> Dict[str, SchemaDocument]:
+        config = get_config()
+        directory = config["DIR"]
+        meta = read_meta(directory)
+        if meta is None or config["AUTO_REGENERATE"]:
+            checksum = source_checksum()
+            if meta is None or meta.get("checksum") != checksum:
+                meta = generate_schema(directory, checksum)
+
+        try:
+            return self._read(directory, meta)
+        except (OSError, KeyError):
+            # Файли схеми видалено або пошкоджено - згенерувати заново
+            return self._read(directory, generate_schema(directory))
+
+    @staticmethod
+    def _read(directory: Path, meta: dict) -> Dict[str, SchemaDocument]:
+        return {
+            fmt: SchemaDocument(
+                content=(directory / filename).read_bytes(),
+                etag=meta["etags"][fmt],
+                checksum=meta["checksum"],
+            )
+            for fmt, (filename, _content_type) in FORMATS.items()
+        }
+
+    def get(self, fmt: str) -> SchemaDocument:
+        documents = self._documents
+        if documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._documents = self._load()
+                documents = self._documents
+        return documents[fmt]
+
+    def checksum(self) -> str:
+        return self.get("yaml").checksum
+
+
+STORE = SchemaStore()
+
+
+def _negotiate_format(request) -> str:
+    fmt = request.GET.get("format")
+    if fmt in FORMATS:
+        return fmt
+    return "json" if "json" in request.META.get("HTTP_ACCEPT", "") else "yaml"
+
+
+def schema_view(request):
+    """
+    OpenAPI-схема з файлу: ETag, 304 та довгий кеш
+
+    ?format=json|yaml (або Accept). Запит з ?v=<контрольна сума> (так схему
+    запитують /api/docs/ та /api/redoc/) кешується як незмінний.
+    """
+    fmt = _negotiate_format(request)
+    document = STORE.get(fmt)
+    etag = f'"{document.etag}"'
+
+    if request.GET.get("v") == document.checksum:
+        cache_control = {"public": True, "max_age": IMMUTABLE_MAX_AGE, "immutable": True}
+    else:
+        cache_control = {"public": True, "max_age": get_config()["MAX_AGE"]}
+
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document.content, content_type=FORMATS[fmt][1])
+        title = getattr(settings, "SPECTACULAR_SETTINGS", {}).get("TITLE") or "schema"
+        response["Content-Disposition"] = f'inline; filename="{title}.{fmt}"'
+    response["ETag"] = etag
+    response["Vary"] = "Accept"
+    patch_cache_control(response, **cache_control)
+    return response
+
+
+class _VersionedSchemaUrlMixin:
+    """Посилання на схему з ?v=<контрольна сума> - браузер кешує її назавжди"""
+
+    def _get_schema_url(self, request):
+        return set_query_parameters(url=super()._get_schema_url(request), v=STORE.checksum())
+
+
+class CachedSwaggerView(_VersionedSchemaUrlMixin, SpectacularSwaggerView):
+    pass
+
+
+class CachedRedocView(_VersionedSchemaUrlMixin, SpectacularRedocView):
+    pass
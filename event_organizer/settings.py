@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -52,16 +54,21 @@ INSTALLED_APPS = [
     "orders",
     "notifications",
     "catalog",
+    "monitoring",
 ]
 
 MIDDLEWARE = [
+    "monitoring.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "event_organizer.db_routing.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "monitoring.middleware.SQLProfilerMiddleware",
+    "monitoring.middleware.SlowQueryMiddleware",
 ]
 
 ROOT_URLCONF = "event_organizer.urls"
@@ -87,9 +94,12 @@ WSGI_APPLICATION = "event_organizer.wsgi.application"
 
 
 
+# Пул з'єднань (event_organizer/mysql_pool): з'єднання повертаються в пул
+# наприкінці запиту замість закриття; CONN_MAX_AGE має лишатися 0.
+# check_after - ping при видачі після стількох секунд простою
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": "event_organizer.mysql_pool",
         "NAME": "event_organizer",
         "USER": "root",
         "PASSWORD": "",  # Залиште порожнім або встановіть пароль
@@ -98,10 +108,29 @@ DATABASES = {
         "OPTIONS": {
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
             "charset": "utf8mb4",
+            "pool": {
+                "min_size": 2,
+                "max_size": 10,
+                "timeout": 5,
+                "max_lifetime": 1800,
+                "max_idle": 600,
+                "check_after": 5,
+            },
         },
     }
 }
 
+# Репліки для читання (event_organizer/db_routing.py): аліаси DATABASES з
+# REPLICAS, наприклад
+#     "replica": {**DATABASES["default"], "HOST": "replica-1", "TEST": {"MIRROR": "default"}}
+# STICKY_SECONDS - скільки клієнт читає з primary після власного запису
+DATABASE_ROUTERS = ["event_organizer.db_routing.PrimaryReplicaRouter"]
+DATABASE_ROUTING = {
+    "REPLICAS": [],
+    "STICKY_SECONDS": 15,
+    "COOKIE_NAME": "db_primary",
+}
+
 
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.Argon2PasswordHasher',  # Найкращий (рекомендовано OWASP)
@@ -171,6 +200,7 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
+        "users.authentication.ApiTokenAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -187,4 +217,149 @@ SPECTACULAR_SETTINGS = {
     "TITLE": "Event Organizer API",
     "DESCRIPTION": "API для організації подій з демонстрацією патернів проектування",
     "VERSION": "1.0.0",
-}
\ No newline at end of file
+}
+
+# Попередньо згенерована схема (event_organizer/openapi.py, manage.py generate_openapi_schema).
+# AUTO_REGENERATE - перегенерувати при першому запиті, якщо змінилися urls/views/serializers
+OPENAPI_SCHEMA = {
+    "DIR": BASE_DIR / "static" / "openapi",
+    "MAX_AGE": 3600,
+    "AUTO_REGENERATE": True,
+}
+
+# API-токени (users/tokens.py): TTL_DAYS - термін дії нового токена,
+# LOCAL_CACHE_* - LRU процесу (LOCAL_CACHE_TTL - найдовша затримка відкликання
+# для інших процесів), CACHE_TIMEOUT - відмова в Django-кеші
+API_TOKENS = {
+    "TTL_DAYS": 90,
+    "LOCAL_CACHE_SIZE": 1024,
+    "LOCAL_CACHE_TTL": 30,
+    "CACHE_TIMEOUT": 300,
+    "LAST_USED_RESOLUTION": 300,
+}
+
+# Архівування завершених подій з GET списку (events/services.py): не частіше
+# раз на LIST_INTERVAL_SECONDS для всіх воркерів (None - лише cron-команда
+# archive_past_events); CACHE_ALIAS - спільний кеш мітки останнього запуску
+EVENT_ARCHIVE = {
+    "LIST_INTERVAL_SECONDS": 60,
+    "CACHE_ALIAS": "shared",
+}
+
+# Матеріалізований розклад користувача для календаря (events/schedule_cache.py):
+# TIMEOUT - життя знімка в кеші, MAX_ENTRIES - більші розклади читаються з БД вікнами;
+# CACHE_ALIAS має бути спільним для воркерів, інакше інвалідація не дійде до інших процесів
+SCHEDULE_CACHE = {
+    "ENABLED": True,
+    "TIMEOUT": 3600,
+    "MAX_ENTRIES": 5000,
+    "CACHE_ALIAS": "shared",
+}
+
+# Кеш сторінки події (events/detail_cache.py): спільна частина сторінки
+# під ключем з версією події; REVIEWS_LIMIT - відгуків на сторінці;
+# CACHE_ALIAS - спільний для воркерів кеш (див. SCHEDULE_CACHE)
+EVENT_DETAIL_CACHE = {
+    "ENABLED": True,
+    "TIMEOUT": 600,
+    "REVIEWS_LIMIT": 20,
+    "CACHE_ALIAS": "shared",
+}
+
+# HTTP-кешування публічних сторінок (events/http_cache.py): ETag/304 для
+# анонімів і Cache-Control для reverse proxy; PURGE_HANDLER - dotted path
+# callable(keys), що очищає зовнішній кеш за сурогатними ключами;
+# CACHE_ALIAS - спільний для воркерів кеш штампів (див. SCHEDULE_CACHE)
+HTTP_CACHE = {
+    "ENABLED": True,
+    "MAX_AGE": 0,
+    "S_MAXAGE": 60,
+    "REVALIDATE_SECONDS": 300,
+    "SURROGATE_KEY_HEADER": "Surrogate-Key",
+    "PURGE_HANDLER": None,
+    "CACHE_ALIAS": "shared",
+}
+
+# Зображення відгуків (events/review_images.py): обробка в пулі з WORKERS
+# процесів, варіанти ширин WIDTHS; ASYNC=False - одразу в поточному процесі
+REVIEW_IMAGES = {
+    "ENABLED": True,
+    "ASYNC": True,
+    "WORKERS": 2,
+    "MAX_DIMENSION": 2048,
+    "WIDTHS": [320, 640, 1280],
+    "FORMATS": ["webp", "jpeg"],
+    "QUALITY": 82,
+}
+
+# Підписки iCalendar (events/ics_feeds.py); зміна SALT відкликає всі URL
+ICS_FEEDS = {
+    "ENABLED": True,
+    "SALT": "",
+    "PAST_DAYS": 30,
+    "FUTURE_DAYS": 365,
+    "MAX_AGE": 900,
+}
+
+# Повторювані події (events/recurrence.py): MAX_OCCURRENCES - межа розгортки
+# однієї серії у відповіді, MATERIALIZE_DAYS - горизонт EventOccurrence (0 - вимкнено)
+RECURRENCE = {
+    "MAX_OCCURRENCES": 500,
+    "MATERIALIZE_DAYS": 0,
+}
+
+# Профілювання SQL (monitoring.middleware.SQLProfilerMiddleware)
+# ENABLED=False - middleware вимикається при старті; SAMPLE_RATE - частка запитів
+SQL_PROFILER = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.05,
+    "LOG_PATH": BASE_DIR / "logs" / "sql_profile.jsonl",
+    "EXPOSE_HEADER": DEBUG,
+    "N_PLUS_ONE_THRESHOLD": 5,
+}
+
+# Захоплення повільних SQL (monitoring/slow_queries.py): сторінка
+# /dashboard/monitoring/slow/ та команда slow_queries
+SLOW_QUERIES = {
+    "ENABLED": True,
+    "THRESHOLD_MS": 200,
+    "EXPLAIN_SAMPLE_RATE": 0.1,
+    "BUFFER_SIZE": 500,
+    "CACHE_ALIAS": "monitoring",
+}
+
+# Метрики Prometheus (/metrics). DIR - спільний каталог для воркерів gunicorn
+# (за замовчуванням $METRICS_DIR або системний tmp)
+METRICS = {
+    "ENABLED": True,
+    "FLUSH_INTERVAL": 5.0,
+    "ALLOWED_IPS": ("127.0.0.1", "::1"),
+}
+
+# Кеш з обліком hit/miss для метрик (monitoring.cache.MetricsCacheMixin).
+# default - локальний кеш процесу; shared - спільний для всіх воркерів кеш
+# даних з інвалідацією (знімки розкладу, сторінки подій, штампи HTTP-кешу):
+# у продакшні з кількома хостами задайте REDIS_URL, без нього - файловий
+# кеш у tmp (спільний лише для процесів одного хоста)
+REDIS_URL = os.environ.get("REDIS_URL", "")
+CACHES = {
+    "default": {
+        "BACKEND": "monitoring.cache.InstrumentedLocMemCache",
+        "LOCATION": "default",
+    },
+    "shared": {
+        "BACKEND": "monitoring.cache.InstrumentedRedisCache",
+        "LOCATION": REDIS_URL,
+    } if REDIS_URL else {
+        "BACKEND": "monitoring.cache.InstrumentedFileBasedCache",
+        "LOCATION": str(Path(tempfile.gettempdir()) / "event_organizer_shared"),
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+    # Спільний для воркерів і management-команд кеш службових даних
+    # моніторингу (кільцевий буфер повільних запитів)
+    "monitoring": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(Path(tempfile.gettempdir()) / "event_organizer_monitoring"),
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
@@ -6,3 +6,17 @@ DATABASES = {
         "NAME": ":memory:",
     }
 }
+
+# Друга SQLite-база для тестів маршрутизації на репліки (events/test_db_routing.py);
+# DATABASE_ROUTING["REPLICAS"] вмикається в самих тестах
+DATABASES["replica"] = {
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": ":memory:",
+}
+
+# Спільний кеш у тестах - окреме сховище LocMem: тести, що пишуть у нього
+# (знімки розкладу, сторінки подій, HTTP-штампи), очищають caches["shared"]
+CACHES["shared"] = {
+    "BACKEND": "monitoring.cache.InstrumentedLocMemCache",
+    "LOCATION": "shared",
+}
@@ -0,0 +1,30 @@
+"""
+Локальна перевірка маршрутизації на репліки: дві SQLite-бази
+
+    DJANGO_SETTINGS_MODULE=event_organizer.settings_replica python manage.py migrate
+    DJANGO_SETTINGS_MODULE=event_organizer.settings_replica python manage.py generate_dataset
+    sqlite3 db_primary.sqlite3 ".backup db_replica.sqlite3"    # "реплікація"
+    DJANGO_SETTINGS_MODULE=event_organizer.settings_replica python manage.py runserver
+
+Репліка оновлюється лише повторним .backup, тож відставання видно наочно:
+зміни після останньої копії видно тільки клієнту, що їх зробив (sticky-cookie),
+доки не мине STICKY_SECONDS.
+"""
+from .settings import *  # noqa
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_primary.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+DATABASE_ROUTING = {
+    **DATABASE_ROUTING,  # noqa: F405
+    "REPLICAS": ["replica"],
+}
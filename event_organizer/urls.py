@@ -20,26 +20,33 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from django.views.generic.base import RedirectView
 from users.admin_site import CustomAdminSite
+from monitoring.views import metrics_view
+from event_organizer.openapi import CachedRedocView, CachedSwaggerView, schema_view
 
 admin_site = CustomAdminSite(name='custom_admin')
 
 from django.contrib.auth.models import User, Group
 from events.models import Event
 from tickets.models import RSVP
+from catalog.models import Category
 from events.admin import EventAdmin
 from tickets.admin import RSVPAdmin
+from catalog.admin import CategoryAdmin
 
 admin_site.register(User, admin.ModelAdmin)
 admin_site.register(Group, admin.ModelAdmin)
 admin_site.register(Event, EventAdmin)
 admin_site.register(RSVP, RSVPAdmin)
+admin_site.register(Category, CategoryAdmin)
 
 urlpatterns = [
     path("", include("events.ui_urls")),
     path("accounts/", include("users.urls")),
+    path("dashboard/", include("users.admin_urls")),
+    path("dashboard/monitoring/", include("monitoring.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("notifications/", include("notifications.urls")),
     path("accounts/logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("accounts/password_change/", auth_views.PasswordChangeView.as_view(), name="password_change"),
@@ -49,9 +56,10 @@ urlpatterns = [
     path("accounts/reset/<uidb64>/<token>/", auth_views.PasswordResetConfirmView.as_view(), name="password_reset_confirm"),
     path("accounts/reset/done/", auth_views.PasswordResetCompleteView.as_view(), name="password_reset_complete"),
     path("admin/", admin_site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    # Схема генерується заздалегідь (manage.py generate_openapi_schema), див. event_organizer/openapi.py
+    path("api/schema/", schema_view, name="schema"),
+    path("api/docs/", CachedSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+    path("api/redoc/", CachedRedocView.as_view(url_name="schema"), name="redoc"),
     # REST API endpoints
     path("api/events/", include("events.urls")),
     # Примітка: /api/users/ та /api/notifications/ ведуть на web views, не REST API
@@ -7,7 +7,7 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ('title', 'organizer', 'location', 'starts_at', 'status', 'created_at')
     list_filter = ('status', 'starts_at', 'created_at')
     search_fields = ('title', 'description', 'location', 'organizer__username')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'rating_sum', 'reviews_count')
     date_hierarchy = 'starts_at'
     
     fieldsets = (
@@ -18,7 +18,7 @@ class EventAdmin(admin.ModelAdmin):
             'fields': ('location', 'starts_at', 'ends_at', 'status')
         }),
         ('Метадані', {
-            'fields': ('created_at', 'updated_at'),
+            'fields': ('created_at', 'updated_at', 'rating_sum', 'reviews_count'),
             'classes': ('collapse',)
         }),
     )
\ No newline at end of file
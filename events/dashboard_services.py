@@ -0,0 +1,135 @@
+"""
+Сервіс статистики для staff-дашбордів
+
+Головна сторінка адміна (home_view), users.admin_views.admin_dashboard та
+CustomAdminSite.index рендеряться з одного знімка статистики:
+- один запит з умовною агрегацією на кожну таблицю (Event, User, RSVP),
+  а для обраного періоду - один запит до денних rollup-рядків;
+- один запит для топ-подій;
+- знімок кешується з коротким TTL та захистом від stampede.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Event
+
+
+class DashboardStatsService:
+    """
+    Сервіс знімків статистики для дашбордів
+
+    Захист від stampede: після закінчення SNAPSHOT_TTL знімок ще STALE_TTL
+    секунд лежить у кеші. Перерахунок робить лише той запит, що отримав
+    блокування (cache.add), решта в цей час віддає застарілий знімок.
+    """
+
+    SNAPSHOT_TTL = 30
+    STALE_TTL = 300
+    LOCK_TIMEOUT = 15
+    TOP_EVENTS_LIMIT = 5
+
+    CACHE_PREFIX = "dashboard:stats"
+
+    @staticmethod
+    def compute(start: Optional[datetime] = None, end: Optional[datetime] = None) -> dict:
+        """
+        Порахувати статистику
+
+        Без періоду - поточний стан таблиць (один агрегат на таблицю).
+        З періодом - потоки за період з DailyRollup (див. RollupService.period_stats)
+        та майбутні опубліковані події, створені за період.
+
+        Returns:
+            {"stats": {...лічильники...}, "top_events": [Event, ...], "computed_at": datetime}
+        """
+        from tickets.models import RSVP
+
+        User = get_user_model()
+        now = timezone.now()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+
+        events_qs = Event.objects.all()
+        if start:
+            # Лічильники за період - сума денних rollup-рядків, без сканування сирих таблиць
+            from .rollup_services import RollupService
+
+            stats = RollupService.period_stats(start, end)
+            events_qs = events_qs.filter(created_at__gte=start)
+            if end:
+                events_qs = events_qs.filter(created_at__lte=end)
+            # Стан, а не потік - з таблиці подій, щоб ключі знімка не залежали від режиму
+            stats["upcoming_events"] = events_qs.filter(status=Event.PUBLISHED, starts_at__gte=now).count()
+        else:
+            stats = {}
+            stats.update(events_qs.aggregate(
+                total_events=Count("id"),
+                published_events=Count("id", filter=Q(status=Event.PUBLISHED)),
+                upcoming_events=Count("id", filter=Q(status=Event.PUBLISHED, starts_at__gte=now)),
+                archived_events=Count("id", filter=Q(status=Event.ARCHIVED)),
+            ))
+            stats.update(User.objects.aggregate(
+                total_users=Count("id"),
+                new_users_week=Count("id", filter=Q(date_joined__gte=week_ago)),
+                new_users_month=Count("id", filter=Q(date_joined__gte=month_ago)),
+            ))
+            stats.update(RSVP.objects.aggregate(
+                total_rsvps=Count("id"),
+                rsvps_week=Count("id", filter=Q(created_at__gte=week_ago)),
+                rsvps_month=Count("id", filter=Q(created_at__gte=month_ago)),
+            ))
+
+        top_events = list(
+            events_qs.select_related("organizer")
+            .annotate(rsvp_count=Count("rsvps", filter=Q(rsvps__status="going")))
+            .order_by("-rsvp_count", "-starts_at")[:DashboardStatsService.TOP_EVENTS_LIMIT]
+        )
+
+        return {"stats": stats, "top_events": top_events, "computed_at": now}
+
+    @staticmethod
+    def get_snapshot(
+        period_key: str = "all",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> dict:
+        """
+        Отримати знімок статистики з кешу (або перерахувати)
+
+        Args:
+            period_key: Ключ періоду для кешу (наприклад "week" або "custom:2025-01-01:")
+            start, end: Межі періоду, що передаються в compute()
+        """
+        key = f"{DashboardStatsService.CACHE_PREFIX}:{period_key}"
+        lock_key = f"{key}:lock"
+
+        cached = cache.get(key)
+        if cached and cached["fresh_until"] > time.time():
+            return cached["snapshot"]
+
+        if cache.add(lock_key, 1, DashboardStatsService.LOCK_TIMEOUT):
+            try:
+                snapshot = DashboardStatsService.compute(start, end)
+                cache.set(
+                    key,
+                    {"snapshot": snapshot, "fresh_until": time.time() + DashboardStatsService.SNAPSHOT_TTL},
+                    DashboardStatsService.SNAPSHOT_TTL + DashboardStatsService.STALE_TTL,
+                )
+            finally:
+                cache.delete(lock_key)
+            return snapshot
+
+        if cached:
+            # Інший запит уже перераховує - віддаємо застарілий знімок
+            return cached["snapshot"]
+
+        # Холодний старт без знімка: рахуємо без запису в кеш
+        return DashboardStatsService.compute(start, end)
@@ -0,0 +1,471 @@
+"""
+Генератор синтетичних даних для локального відтворення продакшн-навантаження
+
+- детермінований: усі випадкові значення беруться з random.Random(seed);
+- bulk_create порціями та один заздалегідь обчислений хеш пароля на всіх;
+- популярність подій за законом Zipf: кілька подій збирають більшість RSVP;
+- події перетинаються в часі (типові години початку, різна тривалість);
+- кириличні назви, категорії та міста.
+
+bulk_create не викликає сигнали, тому категорії прив'язуються до catalog
+напряму, агрегати рейтингів перераховуються одним rebuild, а в кінці
+generate() збільшує версію фасетів, оновлює штампи спільного кешу
+(розклад, сторінки подій, HTTP-валідатори) для згенерованих id і скидає
+знімки розкладу користувачів - після flush нові події отримують ті самі
+id, що й старі закешовані. Денні
+rollup-лічильники перебудовує команда generate_dataset.
+"""
+from __future__ import annotations
+
+import random
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import accumulate, islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Event, Review
+
+CATEGORIES = (
+    "Конференція", "Воркшоп", "Мітап", "Вебінар", "Концерт", "Виставка",
+    "Лекція", "Хакатон", "Волонтерство", "Спорт", "Кінопоказ", "Майстер-клас",
+    "Фестиваль", "Networking", "Дегустація",
+)
+CITIES = (
+    "Київ", "Львів", "Одеса", "Харків", "Дніпро", "Вінниця", "Запоріжжя",
+    "Івано-Франківськ", "Тернопіль", "Ужгород", "Чернівці", "Полтава", "Онлайн",
+)
+TITLE_TOPICS = (
+    "з Python", "про дизайн інтерфейсів", "з фотографії", "про стартапи",
+    "з української літератури", "про штучний інтелект", "для початківців",
+    "з кераміки", "про сучасне мистецтво", "з бігу", "про кібербезпеку",
+    "з кулінарії", "про історію міста", "з настільних ігор", "про DevOps",
+)
+DESCRIPTION_SENTENCES = (
+    "Запрошуємо всіх охочих долучитися.",
+    "Кількість місць обмежена, реєструйтеся заздалегідь.",
+    "Під час заходу буде кава та неформальне спілкування.",
+    "Спікери поділяться практичним досвідом.",
+    "Матеріали зустрічі надішлемо учасникам після події.",
+    "Вхід вільний за попередньою реєстрацією.",
+)
+REVIEW_COMMENTS = (
+    "Дуже сподобалось, прийду ще!",
+    "Корисно та цікаво.",
+    "Організація могла б бути кращою.",
+    "Чудова атмосфера та спікери.",
+    "Забагато людей, але загалом добре.",
+    "",
+)
+START_HOURS = (9, 10, 11, 12, 14, 16, 18, 18, 19, 19, 20)
+DURATIONS_HOURS = (1, 1, 2, 2, 2, 3, 4, 6, 8, 26)
+
+ZIPF_EXPONENT = 1.1
+DEFAULT_PASSWORD = "password123"
+
+DEMO_ACCOUNTS = (
+    # username, email, is_staff/is_superuser, пароль
+    ("admin", "admin@example.com", True, "admin123"),
+    ("Katerina_demianik", "katerina@example.com", False, DEFAULT_PASSWORD),
+    ("ivan_petrov", "ivan@example.com", False, DEFAULT_PASSWORD),
+)
+
+
+@dataclass
+class DatasetSize:
+    users: int = 1000
+    events: int = 2000
+    rsvps: int = 20000
+    reviews: int = 2000
+    notifications: int = 5000
+
+
+def zipf_weights(count: int, exponent: float = ZIPF_EXPONENT) -> List[float]:
+    """Ваги Zipf для рангів 1..count"""
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def allocate(total: int, weights: List[float], caps: List[int]) -> List[int]:
+    """
+    Розподілити total між кошиками пропорційно вагам з обмеженням caps
+
+    Метод найбільших залишків; те, що не влізло під обмеження, переходить
+    до наступних кошиків у порядку спадання ваги.
+    """
+    weight_sum = sum(weights) or 1.0
+    raw = [total * weight / weight_sum for weight in weights]
+    counts = [min(int(value), cap) for value, cap in zip(raw, caps)]
+
+    order = sorted(range(len(weights)), key=lambda i: raw[i] - int(raw[i]), reverse=True)
+    left = total - sum(counts)
+    for i in order:
+        if left <= 0:
+            break
+        if counts[i] < caps[i]:
+            counts[i] += 1
+            left -= 1
+
+    if left > 0:
+        for i in sorted(range(len(weights)), key=lambda i: -weights[i]):
+            room = caps[i] - counts[i]
+            if room > 0:
+                take = min(room, left)
+                counts[i] += take
+                left -= take
+                if left == 0:
+                    break
+    return counts
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Тимчасово вимкнути auto_now/auto_now_add, щоб записати історичні дати
+
+    bulk_create викликає pre_save полів, тож без цього created_at усіх
+    рядків дорівнював би моменту генерації.
+    """
+    saved = []
+    for model in models:
+        for model_field in model._meta.concrete_fields:
+            if getattr(model_field, "auto_now", False) or getattr(model_field, "auto_now_add", False):
+                saved.append((model_field, model_field.auto_now, model_field.auto_now_add))
+                model_field.auto_now = model_field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for model_field, auto_now, auto_now_add in saved:
+            model_field.auto_now = auto_now
+            model_field.auto_now_add = auto_now_add
+
+
+class DatasetGenerator:
+    """
+    Детермінований генератор користувачів, подій, RSVP, відгуків та сповіщень
+
+    Використання:
+        counts = DatasetGenerator(DatasetSize(users=10_000, rsvps=1_000_000), seed=42).generate()
+    """
+
+    def __init__(
+        self,
+        size: DatasetSize,
+        seed: int = 42,
+        batch_size: int = 5000,
+        prefix: str = "gen",
+        password: str = DEFAULT_PASSWORD,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.password = password
+        self.progress = progress or (lambda message: None)
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+    # --- Допоміжне ---
+
+    def _batches(self, items: Iterator, model) -> int:
+        """bulk_create порціями з генератора; повертає кількість рядків"""
+        created = 0
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                created += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+        return created
+
+    def _insert_rows(self, model, fields: Tuple[str, ...], rows: Iterator[tuple]) -> int:
+        """
+        INSERT кортежів через cursor.executemany порціями
+
+        Для таблиць на мільйони рядків (RSVP, сповіщення) створення екземплярів
+        моделей і підготовка кожного значення в bulk_create коштують більше,
+        ніж сама вставка. Значення мають бути вже у форматі БД (див. _db_datetime).
+        """
+        columns = ", ".join(connection.ops.quote_name(model._meta.get_field(name).column) for name in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        sql = f"INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+
+        created = 0
+        with connection.cursor() as cursor:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                cursor.executemany(sql, batch)
+                created += len(batch)
+        return created
+
+    @staticmethod
+    def _db_datetime(value):
+        return connection.ops.adapt_datetimefield_value(value)
+
+    # --- Кроки генерації ---
+
+    def create_demo_accounts(self) -> List[int]:
+        """
+        Облікові записи з README (колишній load_test_data.py), ідемпотентно
+
+        Returns:
+            id демо-користувачів без прав staff - вони потрапляють у загальний
+            пул організаторів та учасників, щоб у демо-акаунтів були події
+        """
+        User = get_user_model()
+        usernames = [row[0] for row in DEMO_ACCOUNTS]
+        existing = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+        User.objects.bulk_create([
+            User(
+                username=username, email=email, is_staff=staff, is_superuser=staff,
+                password=make_password(password), date_joined=self.now - timedelta(days=400),
+            )
+            for username, email, staff, password in DEMO_ACCOUNTS
+            if username not in existing
+        ])
+        self.progress(f"Демо-акаунти: створено {len(usernames) - len(existing)}")
+        return list(
+            User.objects.filter(username__in=usernames, is_staff=False).order_by("username").values_list("id", flat=True)
+        )
+
+    def create_users(self) -> List[int]:
+        User = get_user_model()
+        password_hash = make_password(self.password)  # один хеш на всіх - без Argon2 на кожного
+        rng = self.rng
+
+        def users():
+            for i in range(self.size.users):
+                yield User(
+                    username=f"{self.prefix}{i:07d}",
+                    email=f"{self.prefix}{i:07d}@example.com",
+                    password=password_hash,
+                    date_joined=self.now - timedelta(days=rng.randint(0, 720), minutes=rng.randint(0, 1439)),
+                )
+
+        self._batches(users(), User)
+        ids = list(
+            User.objects.filter(username__startswith=self.prefix)
+            .order_by("username")
+            .values_list("id", flat=True)[: self.size.users]
+        )
+        self.progress(f"Користувачі: {len(ids)}")
+        return ids
+
+    def _category_refs(self) -> Dict[str, int]:
+        from catalog.services import CategoryService
+
+        return {name: CategoryService.resolve(name) for name in CATEGORIES}
+
+    def _event_status(self, starts_at) -> str:
+        roll = self.rng.random()
+        if starts_at < self.now:
+            return Event.ARCHIVED if roll < 0.7 else (Event.PUBLISHED if roll < 0.9 else Event.CANCELLED)
+        return Event.PUBLISHED if roll < 0.8 else (Event.DRAFT if roll < 0.92 else Event.CANCELLED)
+
+    def create_events(self, user_ids: List[int]) -> List[dict]:
+        """Події з перетином розкладів; повертає легкі описи для наступних кроків"""
+        rng = self.rng
+        category_refs = self._category_refs()
+        # Організаторів менше, ніж користувачів: ~10% людей створюють події
+        organizers = user_ids[: max(1, len(user_ids) // 10)]
+        plans = []
+
+        def events():
+            for i in range(self.size.events):
+                day_offset = rng.randint(-365, 180)
+                starts_at = (self.now + timedelta(days=day_offset)).replace(hour=rng.choice(START_HOURS))
+                ends_at = starts_at + timedelta(hours=rng.choice(DURATIONS_HOURS))
+                created_at = starts_at - timedelta(days=rng.randint(3, 60), hours=rng.randint(0, 23))
+                created_at = min(created_at, self.now)
+                category = rng.choice(CATEGORIES)
+                status = self._event_status(starts_at)
+                plans.append({"starts_at": starts_at, "ends_at": ends_at, "created_at": created_at, "status": status})
+                yield Event(
+                    title=f"{category} {rng.choice(TITLE_TOPICS)} #{rng.randint(1, 40)}",
+                    description=" ".join(rng.sample(DESCRIPTION_SENTENCES, 2)),
+                    location=rng.choice(CITIES),
+                    starts_at=starts_at,
+                    ends_at=ends_at,
+                    status=status,
+                    category=category,
+                    category_ref_id=category_refs[category],
+                    organizer_id=rng.choice(organizers),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        first_id = (Event.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+        self._batches(events(), Event)
+        ids = list(Event.objects.filter(id__gte=first_id).order_by("id").values_list("id", flat=True))
+        for plan, event_id in zip(plans, ids):
+            plan["id"] = event_id
+        self.progress(f"Події: {len(ids)}")
+        return plans
+
+    def create_rsvps(self, user_ids: List[int], plans: List[dict]) -> Tuple[int, List[tuple]]:
+        """
+        RSVP за Zipf-популярністю подій
+
+        Returns:
+            (кількість RSVP, вибірка (user_id, event_id, ends_at) минулих подій - кандидати для відгуків)
+        """
+        from tickets.models import RSVP, SINGLE_OCCURRENCE
+
+        rng = self.rng
+        ranks = list(range(len(plans)))
+        rng.shuffle(ranks)
+        weights = [0.0] * len(plans)
+        for rank, index in zip(range(len(plans)), ranks):
+            weights[index] = 1.0 / ((rank + 1) ** ZIPF_EXPONENT)
+        # Чернетки не збирають реєстрацій
+        weights = [0.0 if plan["status"] == Event.DRAFT else w for plan, w in zip(plans, weights)]
+        caps = [0 if plan["status"] == Event.DRAFT else len(user_ids) for plan in plans]
+        counts = allocate(self.size.rsvps, weights, caps)
+
+        review_rate = min(1.0, 2.0 * self.size.reviews / max(1, self.size.rsvps))
+        review_candidates: List[tuple] = []
+        capacity_updates = []
+
+        db_datetime = self._db_datetime
+        random_ = rng.random
+        single_occurrence = db_datetime(SINGLE_OCCURRENCE)
+
+        def rsvps():
+            for plan, count in zip(plans, counts):
+                if not count:
+                    continue
+                if random_() < 0.4:
+                    # Частина подій з обмеженням місць, приблизно кожна четверта з них - заповнена
+                    capacity = count if random_() < 0.25 else count + rng.randint(1, max(2, count))
+                    capacity_updates.append((plan["id"], capacity))
+                event_id = plan["id"]
+                opened = plan["created_at"]
+                window = max(1, int((min(plan["starts_at"], self.now) - opened).total_seconds()))
+                is_past = plan["ends_at"] < self.now
+                for user_id in rng.sample(user_ids, count):
+                    created_at = opened + timedelta(seconds=int(random_() * window))
+                    if is_past and random_() < review_rate:
+                        review_candidates.append((user_id, event_id, plan["ends_at"]))
+                    created_at = db_datetime(created_at)
+                    yield (user_id, event_id, "going", single_occurrence, created_at, created_at)
+
+        total = self._insert_rows(
+            RSVP, ("user", "event", "status", "occurrence_start", "created_at", "updated_at"), rsvps()
+        )
+
+        by_capacity: Dict[int, List[int]] = {}
+        for event_id, capacity in capacity_updates:
+            by_capacity.setdefault(capacity, []).append(event_id)
+        for capacity, event_ids in by_capacity.items():
+            for start in range(0, len(event_ids), 500):
+                Event.objects.filter(id__in=event_ids[start:start + 500]).update(capacity=capacity)
+
+        self.progress(f"RSVP: {total}")
+        return total, review_candidates
+
+    def create_reviews(self, candidates: List[tuple]) -> int:
+        rng = self.rng
+        chosen = candidates if len(candidates) <= self.size.reviews else rng.sample(candidates, self.size.reviews)
+        no_variants = Review._meta.get_field("image_variants").get_db_prep_save({}, connection)
+
+        def reviews():
+            for user_id, event_id, ended_at in chosen:
+                created_at = min(ended_at + timedelta(hours=rng.randint(1, 72)), self.now)
+                created_at = self._db_datetime(created_at)
+                rating = rng.choices((1, 2, 3, 4, 5), weights=(3, 5, 15, 37, 40))[0]
+                yield (user_id, event_id, rating, rng.choice(REVIEW_COMMENTS), no_variants, created_at, created_at)
+
+        total = self._insert_rows(
+            Review, ("user", "event", "rating", "comment", "image_variants", "created_at", "updated_at"), reviews()
+        )
+        self.progress(f"Відгуки: {total}")
+        return total
+
+    def create_notifications(self, user_ids: List[int], plans: List[dict]) -> int:
+        from notifications.models import Notification
+
+        rng = self.rng
+        candidates = [plan for plan in plans if plan["status"] != Event.DRAFT]
+        if not candidates or not user_ids:
+            return 0
+        types = [value for value, _label in Notification.NOTIFICATION_TYPES]
+        cum_weights = list(accumulate(1.0 / ((rank + 1) ** ZIPF_EXPONENT) for rank in range(len(candidates))))
+
+        def notifications():
+            for _ in range(self.size.notifications):
+                plan = candidates[bisect_left(cum_weights, rng.random() * cum_weights[-1])]
+                notification_type = Notification.EVENT_CANCELLED if plan["status"] == Event.CANCELLED else rng.choice(types)
+                created_at = min(plan["created_at"] + timedelta(hours=rng.randint(1, 240)), self.now)
+                yield (
+                    rng.choice(user_ids), plan["id"], notification_type,
+                    f"Оновлення події #{plan['id']}", rng.random() < 0.6, self._db_datetime(created_at),
+                )
+
+        total = self._insert_rows(
+            Notification, ("user", "event", "notification_type", "message", "is_read", "created_at"), notifications()
+        )
+        self.progress(f"Сповіщення: {total}")
+        return total
+
+    def invalidate_caches(self, event_ids: List[int]) -> None:
+        """
+        Версія фасетів і штампи спільного кешу замість сигналів, яких bulk_create не шле
+
+        Знімки розкладу скидаються всім користувачам, включно з демо-адміном
+        і тими, що існували до генерації.
+        """
+        from .detail_cache import EventDetailCacheService
+        from .facets import bump_facets_version
+        from .http_cache import PublicPageCacheService
+        from .schedule_cache import ScheduleCacheService
+
+        bump_facets_version()
+        for start in range(0, len(event_ids), self.batch_size):
+            batch = event_ids[start:start + self.batch_size]
+            ScheduleCacheService.touch_events(batch)
+            EventDetailCacheService.touch(batch)
+            PublicPageCacheService.purge_events(batch)
+        user_ids = get_user_model().objects.values_list("id", flat=True).iterator(chunk_size=self.batch_size)
+        while True:
+            batch = list(islice(user_ids, self.batch_size))
+            if not batch:
+                break
+            ScheduleCacheService.invalidate_users(batch)
+
+    def generate(self, demo_accounts: bool = True) -> Dict[str, int]:
+        """Згенерувати весь набір даних в одній транзакції"""
+        User = get_user_model()
+        with transaction.atomic(), explicit_timestamps(Event):
+            demo_ids = self.create_demo_accounts() if demo_accounts else []
+            generated_ids = self.create_users()
+            user_ids = demo_ids + generated_ids if generated_ids else []
+            plans = self.create_events(user_ids) if user_ids else []
+            rsvps, candidates = self.create_rsvps(user_ids, plans) if plans else (0, [])
+            reviews = self.create_reviews(candidates)
+            if reviews:
+                # Відгуки вставлені без сигналів - агрегати одним перерахунком
+                from .ratings import RatingService
+                RatingService.rebuild()
+            notifications = self.create_notifications(user_ids, plans)
+
+        self.invalidate_caches([plan["id"] for plan in plans])
+
+        return {
+            "users": len(generated_ids),
+            "events": len(plans),
+            "rsvps": rsvps,
+            "reviews": reviews,
+            "notifications": notifications,
+            "total_users": User.objects.count(),
+        }
@@ -70,13 +70,15 @@ def event_not_cancelled(view_func):
 def event_not_started(view_func):
     """
     Декоратор для заборони дій з подіями, які вже розпочались.
+    Серія доступна, доки не завершилось її останнє повторення
+    (окреме повторення перевіряє сама дія).
     """
     from django.utils import timezone
 
     @wraps(view_func)
     def wrapper(request, pk, *args, **kwargs):
         event = getattr(request, 'event', None) or get_object_or_404(Event, pk=pk)
-        if event.starts_at <= timezone.now():
+        if (event.series_ends_at if event.is_recurring else event.starts_at) <= timezone.now():
             messages.warning(request, "Дія недоступна: подія вже розпочалась")
             return redirect('event_detail', pk=pk)
         request.event = event
@@ -0,0 +1,164 @@
+"""
+Кеш сторінки події (EventDetailView)
+
+Сторінка події складається з двох частин:
+- спільна для всіх відвідувачів: подія з організатором, кількість "going"
+  (для серії - ще й по повтореннях), середній рейтинг (збережені агрегати,
+  events/ratings.py) і перша сторінка відгуків з авторами. Будується
+  кількома запитами й кешується під ключем з версією події;
+- персональна: RSVP користувача та чи залишав він відгук - один запит
+  (overlay) на кожен перегляд.
+
+Версія - час зміни в наносекундах (як штампи schedule_cache): сигнали
+Event, RSVP та Review записують нову версію, і наступний перегляд
+перебудовує спільну частину. Старі ключі просто витісняються з кешу.
+Перейменування користувачів версію не змінює - застарілі імена
+в організаторі чи відгуках живуть не довше за TIMEOUT.
+
+Репліки БД (event_organizer/db_routing.py): частина, прочитана з primary,
+і частина з репліки зберігаються під різними ключами, тож клієнт, що
+щойно писав, бачить свої зміни. Частина з репліки не кешується, доки
+версія молодша за STICKY_SECONDS - репліка могла ще не наздогнати primary.
+
+Версії та спільні частини зберігаються в кеші CACHE_ALIAS, спільному для
+всіх воркерів (CACHES["shared"] у settings, як і schedule_cache).
+
+Налаштування: settings.EVENT_DETAIL_CACHE поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional, Set
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models import Count, Exists, OuterRef
+
+from event_organizer.db_routing import get_config as get_routing_config
+from tickets.models import RSVP
+
+from .models import Event, Review
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+
+DEFAULTS = {
+    "ENABLED": True,
+    "TIMEOUT": 600,
+    # Відгуків у спільній частині (решта - лише в лічильнику)
+    "REVIEWS_LIMIT": 20,
+    # Кеш, спільний для всіх воркерів: версію, змінену в одному процесі,
+    # мають бачити всі (settings.CACHES)
+    "CACHE_ALIAS": "shared",
+}
+
+FORMAT = 2
+VERSION_KEY = "events:detail:version:{}"
+DATA_KEY = "events:detail:{}:{}:{}:{}"
+
+
+def get_config() -> dict:
+    """Налаштування: settings.EVENT_DETAIL_CACHE поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "EVENT_DETAIL_CACHE", {}) or {})
+    return config
+
+
+def _cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+
+class DetailOverlay(NamedTuple):
+    """Персональна частина сторінки події"""
+
+    user_rsvp: Optional[RSVP]
+    occurrence_starts: Set
+    has_review: bool
+
+
+class EventDetailCacheService:
+    """Спільна частина сторінки події в кеші та персональний overlay"""
+
+    @staticmethod
+    def build(event_id: int) -> Optional[dict]:
+        """
+        Спільна частина сторінки з БД (None - події не існує)
+
+        Подія з організатором (і збереженими агрегатами відгуків), "going"
+        по повтореннях і - якщо відгуки є - перша сторінка відгуків з авторами.
+        """
+        event = Event.objects.select_related("organizer").filter(pk=event_id).first()
+        if event is None:
+            return None
+
+        going = dict(
+            RSVP.objects.filter(event_id=event_id, status="going")
+            .order_by()
+            .values_list("occurrence_start")
+            .annotate(n=Count("pk"))
+        )
+        reviews = event.reviews.select_related("user")[: get_config()["REVIEWS_LIMIT"]] if event.reviews_count else []
+        return {
+            "event": event,
+            "rsvp_count": sum(going.values()),
+            "occurrence_going": going if event.is_recurring else {},
+            "avg_rating": event.avg_rating,
+            "reviews_count": event.reviews_count,
+            "reviews": list(reviews),
+        }
+
+    @staticmethod
+    def get(event_id: int) -> Optional[dict]:
+        """Спільна частина з кешу або щойно побудована (і збережена)"""
+        config = get_config()
+        if not config["ENABLED"]:
+            return EventDetailCacheService.build(event_id)
+
+        version = _cache().get(VERSION_KEY.format(event_id))
+        if version is None:
+            version = time.time_ns()
+            _cache().set(VERSION_KEY.format(event_id), version, None)
+        from_replica = (router.db_for_read(Event) or DEFAULT_DB_ALIAS) != DEFAULT_DB_ALIAS
+        key = DATA_KEY.format(FORMAT, event_id, version, "replica" if from_replica else "primary")
+        data = _cache().get(key)
+        if data is None:
+            data = EventDetailCacheService.build(event_id)
+            settled = time.time_ns() - version >= get_routing_config()["STICKY_SECONDS"] * 1_000_000_000
+            if data is not None and (settled or not from_replica):
+                _cache().set(key, data, config["TIMEOUT"])
+        return data
+
+    @staticmethod
+    def overlay(user: "AbstractUser", event) -> DetailOverlay:
+        """
+        RSVP користувача на подію та наявність його відгуку - один запит
+
+        Відгук потрібен лише учаснику (can_review вимагає RSVP), тому
+        він перевіряється підзапитом у рядках RSVP.
+        """
+        if not user.is_authenticated:
+            return DetailOverlay(None, set(), False)
+        rsvps = list(
+            RSVP.objects.filter(event=event, user=user)
+            .annotate(has_review=Exists(Review.objects.filter(event_id=OuterRef("event_id"), user_id=user.pk)))
+            .order_by("occurrence_start")
+        )
+        return DetailOverlay(
+            rsvps[0] if rsvps else None,
+            {rsvp.occurrence_start for rsvp in rsvps},
+            any(rsvp.has_review for rsvp in rsvps),
+        )
+
+    @staticmethod
+    def touch(event_ids: Iterable[int]) -> None:
+        """Нова версія подій - одразу й ще раз після коміту (див. schedule_cache)"""
+        keys = [VERSION_KEY.format(event_id) for event_id in set(event_ids) if event_id is not None]
+        if not keys:
+            return
+
+        def bump():
+            _cache().set_many({key: time.time_ns() for key in keys}, None)
+
+        bump()
+        transaction.on_commit(bump)
@@ -0,0 +1,283 @@
+"""
+Потокові експорти учасників, подій та RSVP у CSV і XLSX
+
+Рядки читаються через values_list(...).iterator(chunk_size=...) - без
+створення моделей і без завантаження всієї вибірки в пам'ять. Відповідь
+віддається StreamingHttpResponse, тож пам'ять процесу не залежить від
+кількості рядків.
+
+XLSX пишеться без сторонніх бібліотек: zipfile вміє писати у потік без
+seek (data descriptor після кожного файлу), а аркуш складається з
+inline-рядків, тому sharedStrings не потрібен.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+
+from .facets import going_count_subquery
+from .models import Event
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Символи, заборонені в XML 1.0 (керуючі, крім \t \n \r)
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Початок комірки, з якого Excel/LibreOffice читають CSV-значення як формулу
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportDataset(NamedTuple):
+    """Набір даних для експорту: ім'я файлу без розширення, заголовок, рядки"""
+
+    filename: str
+    header: Sequence[str]
+    rows: Iterable[Sequence]
+
+
+def _format_value(value):
+    """Привести значення до вигляду для таблиці (дати - в локальному часі)"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime("%Y-%m-%d %H:%M")
+    return value
+
+
+def _csv_value(value):
+    """
+    Значення для CSV без ін'єкції формул
+
+    Назва, місце та категорія задаються організатором: текст, що
+    починається з =, +, -, @, табуляції чи CR, отримує префікс ' і
+    лишається текстом. У XLSX рядки пишуться як inlineStr - табличні
+    редактори не обчислюють їх як формули.
+    """
+    value = _format_value(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """Псевдо-буфер для csv.writer: write() повертає рядок замість запису"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """CSV по рядку; BOM на початку - щоб Excel правильно показав кирилицю"""
+    writer = csv.writer(_Echo())
+    yield "\ufeff".encode("utf-8")
+    yield writer.writerow(header).encode("utf-8")
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row]).encode("utf-8")
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Непереміщуваний потік, з якого генератор забирає накопичені байти"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_cell(value) -> str:
+    value = _format_value(value)
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_XML_ILLEGAL.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(row: Sequence) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in row) + "</row>"
+
+
+def stream_xlsx(
+    header: Sequence[str],
+    rows: Iterable[Sequence],
+    sheet_name: str = "Export",
+    flush_every: int = 500,
+) -> Iterator[bytes]:
+    """
+    XLSX-книга з одним аркушем, що віддається шматками
+
+    Стиснений аркуш пишеться у zip без seek; накопичені байти віддаються
+    кожні flush_every рядків.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(name=escape(sheet_name[:31])))
+        archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        yield buffer.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            sheet.write(_xlsx_row(header).encode("utf-8"))
+            for index, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode("utf-8"))
+                if index % flush_every == 0:
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            sheet.write(b"</sheetData></worksheet>")
+    yield buffer.drain()
+
+
+STREAM_WRITERS: dict[str, Callable[..., Iterator[bytes]]] = {
+    "csv": stream_csv,
+    "xlsx": stream_xlsx,
+}
+
+
+def export_response(dataset: ExportDataset, fmt: str) -> StreamingHttpResponse:
+    """StreamingHttpResponse з файлом експорту (Http404 для невідомого формату)"""
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Невідомий формат експорту")
+
+    response = StreamingHttpResponse(
+        STREAM_WRITERS[fmt](dataset.header, dataset.rows),
+        content_type=CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{dataset.filename}.{fmt}"'
+    return response
+
+
+class ExportService:
+    """
+    Набори даних для експорту
+
+    Використання:
+        return export_response(ExportService.participants(event), "csv")
+    """
+
+    @staticmethod
+    def participants(event: Event) -> ExportDataset:
+        """Учасники події (усі RSVP) - новіші першими"""
+        from tickets.models import RSVP
+
+        rows = (
+            RSVP.objects.filter(event=event)
+            .order_by("-created_at")
+            .values_list("user__username", "user__email", "status", "created_at")
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return ExportDataset(
+            filename=f"event-{event.pk}-participants",
+            header=("Користувач", "Email", "Статус", "Дата реєстрації"),
+            rows=rows,
+        )
+
+    @staticmethod
+    def events(status: Optional[str] = None) -> ExportDataset:
+        """Усі події (опційно за статусом) з кількістю RSVP 'going'"""
+        events_qs = Event.objects.all()
+        if status:
+            events_qs = events_qs.filter(status=status)
+        rows = (
+            events_qs.annotate(going_count=going_count_subquery())
+            .order_by("-created_at")
+            .values_list(
+                "id", "title", "organizer__username", "location", "category",
+                "status", "starts_at", "ends_at", "capacity", "going_count",
+            )
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return ExportDataset(
+            filename=f"events-{status}" if status else "events",
+            header=(
+                "ID", "Назва", "Організатор", "Локація", "Категорія",
+                "Статус", "Початок", "Кінець", "Місткість", "RSVP",
+            ),
+            rows=rows,
+        )
+
+    @staticmethod
+    def rsvps() -> ExportDataset:
+        """Усі RSVP - новіші першими"""
+        from tickets.models import RSVP
+
+        rows = (
+            RSVP.objects.order_by("-created_at")
+            .values_list("id", "user__username", "event_id", "event__title", "status", "created_at")
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return ExportDataset(
+            filename="rsvps",
+            header=("ID", "Користувач", "ID події", "Подія", "Статус", "Дата реєстрації"),
+            rows=rows,
+        )
@@ -0,0 +1,299 @@
+"""
+Facet engine для бічної панелі списку подій
+
+Рахує всі фасети (категорія, статус, дата, популярність, наявність місць)
+для поточного набору фільтрів ОДНИМ запитом з умовною агрегацією:
+події групуються за нормалізованою категорією (catalog.Category),
+а лічильники решти фасетів рахуються через Count(filter=...) у кожній
+групі й підсумовуються в Python.
+
+Фасети диз'юнктивні: лічильники виміру рахуються з фільтрами всіх
+інших вимірів, але без власного - вибрана категорія не ховає решту
+категорій, вибраний статус - решту статусів.
+
+Результат кешується за нормалізованим ключем фільтрів. Ключ містить
+версію, яку сигнали збільшують при зміні подій та RSVP. Самі фасети
+лежать у кеші процесу, а версія - у спільному кеші (CACHES["shared"]):
+інкремент в одному воркері мусить інвалідувати фасети в усіх. Початкова
+версія - час у наносекундах, щоб після втрати ключа в спільному кеші
+нова версія не збіглася зі старою, під якою ще лежать локальні фасети.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping, Optional
+
+from django.core.cache import cache, caches
+from django.db.models import Count, F, IntegerField, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Event
+from .specifications import EventByCategorySpecification, EventByStatusSpecification
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+
+
+FACET_CACHE_TIMEOUT = 60
+FACET_VERSION_KEY = "events:facets:version"
+FACET_VERSION_CACHE_ALIAS = "shared"
+
+# GET-параметри, від яких залежить набір подій (page та sort не впливають)
+FACET_PARAMS = (
+    "view",
+    "q",
+    "status",
+    "location",
+    "category",
+    "date_filter",
+    "popularity",
+    "availability",
+)
+
+# Виміри фасетів, які водночас є фільтрами списку
+FACET_DIMENSIONS = ("category", "status", "date", "popularity", "availability")
+
+POPULAR_THRESHOLD = 5
+
+DATE_BUCKETS = ("upcoming", "today", "this_week", "this_month")
+POPULARITY_BUCKETS = ("popular", "medium", "none")
+AVAILABILITY_BUCKETS = ("available", "full")
+
+
+def date_bucket_q(bucket: str, now=None) -> Optional[Q]:
+    """Q-умова для фільтра за датою (None для невідомого значення)"""
+    now = now or timezone.now()
+    today = now.date()
+
+    if bucket == "upcoming":
+        # Серія, що вже почалася, лишається майбутньою до останнього повторення
+        return Q(starts_at__gte=now) | (~Q(recurrence_rule="") & Q(series_ends_at__gt=now))
+    if bucket == "today":
+        return Q(starts_at__date=today)
+    if bucket == "this_week":
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=7)
+        return Q(starts_at__date__gte=week_start, starts_at__date__lt=week_end)
+    if bucket == "this_month":
+        return Q(starts_at__year=today.year, starts_at__month=today.month)
+    return None
+
+
+def popularity_bucket_q(bucket: str, count_field: str = "rsvp_count") -> Optional[Q]:
+    """Q-умова для фільтра за популярністю по полю з кількістю RSVP"""
+    if bucket == "popular":
+        return Q(**{f"{count_field}__gte": POPULAR_THRESHOLD})
+    if bucket == "medium":
+        return Q(**{f"{count_field}__gte": 1, f"{count_field}__lt": POPULAR_THRESHOLD})
+    if bucket == "none":
+        return Q(**{count_field: 0})
+    return None
+
+
+def availability_bucket_q(bucket: str, count_field: str = "rsvp_count") -> Optional[Q]:
+    """Q-умова для фільтра за наявністю вільних місць"""
+    if bucket == "available":
+        return Q(capacity__isnull=True) | Q(capacity__gt=F(count_field))
+    if bucket == "full":
+        return Q(capacity__isnull=False, capacity__lte=F(count_field))
+    return None
+
+
+def facet_filters(params: Mapping[str, str], count_field: str = "going_count") -> Dict[str, Q]:
+    """
+    Q-умови вибраних фасетів за вимірами (невідомі значення відкидаються)
+
+    count_field - поле з кількістю RSVP: going_count у запиті фасетів,
+    rsvp_count в анотованому QuerySet списку подій.
+    """
+    filters = {}
+    category = params.get("category")
+    if category:
+        filters["category"] = EventByCategorySpecification(category).to_queryset_filter()
+    status = params.get("status")
+    if status:
+        filters["status"] = EventByStatusSpecification(status).to_queryset_filter()
+    builders = {
+        "date": lambda value: date_bucket_q(value),
+        "popularity": lambda value: popularity_bucket_q(value, count_field),
+        "availability": lambda value: availability_bucket_q(value, count_field),
+    }
+    for name, build in builders.items():
+        value = params.get(name)
+        condition = build(value) if value else None
+        if condition is not None:
+            filters[name] = condition
+    return filters
+
+
+def _count(condition: Q) -> Count:
+    return Count("id", filter=condition) if condition else Count("id")
+
+
+def _version_cache():
+    return caches[FACET_VERSION_CACHE_ALIAS]
+
+
+def get_facets_version() -> int:
+    """Поточна версія фасетів (змінюється при зміні подій/RSVP)"""
+    return _version_cache().get_or_set(FACET_VERSION_KEY, time.time_ns, None)
+
+
+def bump_facets_version() -> None:
+    """Інвалідує всі закешовані фасети одним інкрементом"""
+    try:
+        _version_cache().incr(FACET_VERSION_KEY)
+    except ValueError:
+        _version_cache().set(FACET_VERSION_KEY, time.time_ns(), None)
+
+
+def normalize_filter_key(params: Mapping[str, str], user: Optional["AbstractUser"] = None) -> str:
+    """
+    Нормалізований ключ набору фільтрів
+
+    Порожні значення відкидаються, решта обрізається та переводиться
+    в нижній регістр. Для view, що залежать від користувача, до ключа
+    додається область видимості, щоб не змішувати кеш різних людей.
+    """
+    parts = []
+    for name in FACET_PARAMS:
+        value = (params.get(name) or "").strip().lower()
+        if value:
+            parts.append(f"{name}={value}")
+
+    view = (params.get("view") or "all").strip()
+    if user is None or not user.is_authenticated:
+        scope = "anon"
+    elif view in ("my", "upcoming") or (view == "archived" and not user.is_staff):
+        scope = f"user:{user.pk}"
+    elif view == "archived":
+        scope = "staff"
+    else:
+        scope = "auth"
+    parts.append(f"scope={scope}")
+
+    return hashlib.md5("&".join(parts).encode("utf-8")).hexdigest()
+
+
+def going_count_subquery() -> Coalesce:
+    """Корельований підзапит з кількістю RSVP status='going' для події"""
+    from tickets.models import RSVP
+
+    going = (
+        RSVP.objects.filter(event=OuterRef("pk"), status="going")
+        .order_by()
+        .values("event")
+        .annotate(c=Count("id"))
+        .values("c")
+    )
+    return Coalesce(Subquery(going, output_field=IntegerField()), Value(0))
+
+
+class EventFacetService:
+    """
+    Сервіс підрахунку фасетів для списку подій
+
+    Використання:
+        facets = EventFacetService.get_facets(filtered_qs, request.GET, request.user)
+    """
+
+    @staticmethod
+    def _aggregations(now, filters: Mapping[str, Q]) -> Dict[str, Count]:
+        """Умовні агрегати фасетів; кожен вимір - з фільтрами решти вимірів"""
+
+        def without(dimension: Optional[str]) -> Q:
+            condition = Q()
+            for name, value in filters.items():
+                if name != dimension:
+                    condition &= value
+            return condition
+
+        aggregations = {
+            "total": _count(without(None)),
+            "category_count": _count(without("category")),
+        }
+        buckets = {
+            "status": {value: Q(status=value) for value, _label in Event.STATUS_CHOICES},
+            "date": {bucket: date_bucket_q(bucket, now) for bucket in DATE_BUCKETS},
+            "popularity": {bucket: popularity_bucket_q(bucket, "going_count") for bucket in POPULARITY_BUCKETS},
+            "availability": {
+                bucket: availability_bucket_q(bucket, "going_count") for bucket in AVAILABILITY_BUCKETS
+            },
+        }
+        for dimension, conditions in buckets.items():
+            others = without(dimension)
+            for bucket, condition in conditions.items():
+                aggregations[f"{dimension}__{bucket}"] = Count("id", filter=others & condition)
+        return aggregations
+
+    @staticmethod
+    def compute(queryset: QuerySet, filters: Optional[Mapping[str, Q]] = None) -> dict:
+        """
+        Порахувати фасети для QuerySet подій одним SQL-запитом
+
+        QuerySet може містити агрегатні анотації та HAVING-фільтри
+        (наприклад rsvp_count) - він використовується як підзапит по pk.
+
+        Args:
+            queryset: події без фільтрів FACET_DIMENSIONS
+            filters: умови вибраних фасетів (facet_filters); без них
+                лічильники рахуються по всьому queryset
+        """
+        now = timezone.now()
+        rows = (
+            Event.objects.filter(pk__in=queryset.order_by().values("pk"))
+            .annotate(going_count=going_count_subquery())
+            .values("category_ref_id", "category_ref__name", "category_ref__slug")
+            .annotate(**EventFacetService._aggregations(now, filters or {}))
+            .order_by()
+        )
+        return EventFacetService._collect(rows)
+
+    @staticmethod
+    def _collect(rows: Iterable[dict]) -> dict:
+        """Зібрати рядки GROUP BY category_ref у структуру фасетів"""
+        facets = {
+            "total": 0,
+            "category": [],
+            "status": {value: 0 for value, _label in Event.STATUS_CHOICES},
+            "date": {bucket: 0 for bucket in DATE_BUCKETS},
+            "popularity": {bucket: 0 for bucket in POPULARITY_BUCKETS},
+            "availability": {bucket: 0 for bucket in AVAILABILITY_BUCKETS},
+        }
+
+        for row in rows:
+            facets["total"] += row["total"]
+            if row["category_ref_id"] and row["category_count"]:
+                facets["category"].append({
+                    "id": row["category_ref_id"],
+                    "slug": row["category_ref__slug"],
+                    "label": row["category_ref__name"],
+                    "count": row["category_count"],
+                })
+            for key, value in row.items():
+                group, sep, bucket = key.partition("__")
+                if sep and group in facets:
+                    facets[group][bucket] += value
+
+        facets["category"].sort(key=lambda item: (-item["count"], item["label"]))
+        return facets
+
+    @staticmethod
+    def get_facets(
+        queryset: QuerySet,
+        params: Mapping[str, str],
+        user: Optional["AbstractUser"] = None,
+        filters: Optional[Mapping[str, Q]] = None,
+    ) -> dict:
+        """Отримати фасети з кешу або порахувати їх (аргументи - як у compute)"""
+        key = "events:facets:{}:{}".format(
+            get_facets_version(), normalize_filter_key(params, user)
+        )
+        facets = cache.get(key)
+        if facets is None:
+            facets = EventFacetService.compute(queryset, filters)
+            cache.set(key, facets, FACET_CACHE_TIMEOUT)
+        return facets
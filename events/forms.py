@@ -2,6 +2,7 @@ from django import forms
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .models import Event, Review
+from .recurrence import Recurrence
 
 User = get_user_model()
 
@@ -41,11 +42,16 @@ class EventForm(forms.ModelForm):
             "status",
             "category",
             "capacity",
+            "recurrence_rule",
         ]
         labels = {
             "title": "Назва події",
             "description": "Опис події",
             "location": "Локація",
+            "recurrence_rule": "Повторення",
+        }
+        help_texts = {
+            "recurrence_rule": "Напр. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10 або FREQ=MONTHLY;UNTIL=20301231. Порожнє - разова подія",
         }
     
     def __init__(self, *args, **kwargs):
@@ -92,6 +98,15 @@ class EventForm(forms.ModelForm):
             )
         return starts_at
     
+    def clean_recurrence_rule(self):
+        rule = (self.cleaned_data.get('recurrence_rule') or "").strip()
+        if rule:
+            try:
+                rule = Recurrence.parse(rule).to_rule()
+            except ValueError as exc:
+                raise forms.ValidationError(str(exc))
+        return rule
+    
     def clean(self):
         cleaned_data = super().clean()
         starts_at = cleaned_data.get('starts_at')
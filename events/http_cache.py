@@ -0,0 +1,205 @@
+"""
+HTTP-кешування публічних сторінок (список подій і сторінка події)
+
+Анонімні сторінки однакові для всіх відвідувачів, тож їх можна віддавати
+з ETag/Last-Modified, відповідати 304 без рендерингу шаблону та дозволити
+зберігати reverse proxy (Cache-Control public, s-maxage, Vary: Cookie).
+Персональні сторінки (користувач увійшов або має непоказані повідомлення)
+лише позначаються private.
+
+Валідатори будуються зі штампів сурогатних ключів у кеші, без запитів
+до БД: `event-<id>` - сторінка події, `event-list` - список. Сигнали
+Event, RSVP і Review викликають purge() - нові штампи та хук
+PURGE_HANDLER (dotted path, отримує список ключів після коміту), через
+який можна очистити CDN чи Varnish за тими самими ключами з заголовка
+SURROGATE_KEY_HEADER. Якщо штамп витіснено з кешу, він стає "зараз" -
+клієнт просто отримає сторінку заново.
+
+Сторінка, що читається з репліки, поки найновіший штамп молодший за
+DATABASE_ROUTING["STICKY_SECONDS"], віддається без валідаторів і як
+private: репліка могла ще не отримати зміну, після якої змінився штамп.
+
+Сторінки залежать і від часу (подія почалась, фільтр "сьогодні"), тому
+в ETag і Last-Modified входить ще й період REVALIDATE_SECONDS.
+
+Штампи зберігаються в кеші CACHE_ALIAS, спільному для всіх воркерів
+(CACHES["shared"] у settings): зі штампами в кеші процесу ETag змінювався б
+від воркера до воркера, а purge() доходив би лише до одного з них.
+
+Налаштування: settings.HTTP_CACHE поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Callable, Iterable, List, NamedTuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+
+from event_organizer.db_routing import get_config as get_routing_config
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Браузер щоразу перевіряє сторінку (дешевий 304)
+    "MAX_AGE": 0,
+    # Скільки reverse proxy тримає сторінку; з PURGE_HANDLER можна більше
+    "S_MAXAGE": 60,
+    # Період, після якого сторінка вважається зміненою навіть без сигналів
+    "REVALIDATE_SECONDS": 300,
+    "SURROGATE_KEY_HEADER": "Surrogate-Key",
+    # Dotted path до callable(keys: list[str]) - очищення зовнішнього кешу
+    "PURGE_HANDLER": None,
+    # Кеш штампів, спільний для всіх воркерів: інакше ETag сторінки
+    # залежить від того, який воркер відповів (settings.CACHES)
+    "CACHE_ALIAS": "shared",
+}
+
+# Частина ETag: зміна розмітки сторінок інвалідує збережені версії
+FORMAT = 1
+STAMP_KEY = "events:http:stamp:{}"
+LIST_KEY = "event-list"
+
+
+def get_config() -> dict:
+    """Налаштування: settings.HTTP_CACHE поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "HTTP_CACHE", {}) or {})
+    return config
+
+
+def _cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+
+def event_key(event_id: int) -> str:
+    """Сурогатний ключ сторінки події"""
+    return f"event-{event_id}"
+
+
+class PageValidators(NamedTuple):
+    """ETag і Last-Modified (секунди Unix) публічної сторінки; newest_stamp - наносекунди"""
+
+    etag: str
+    last_modified: int
+    newest_stamp: int = 0
+
+
+class PublicPageCacheService:
+    """Умовний GET, заголовки кешування та purge за сурогатними ключами"""
+
+    @staticmethod
+    def is_public(request: HttpRequest) -> bool:
+        """Сторінка однакова для всіх: анонім без непоказаних повідомлень"""
+        if not get_config()["ENABLED"] or request.method not in ("GET", "HEAD"):
+            return False
+        if request.user.is_authenticated:
+            return False
+        # len() не позначає повідомлення показаними
+        return len(messages.get_messages(request)) == 0
+
+    @staticmethod
+    def stamps(keys: Iterable[str]) -> List[int]:
+        """Штампи ключів (наносекунди); відсутні записуються поточним часом"""
+        cache_keys = {key: STAMP_KEY.format(key) for key in keys}
+        found = _cache().get_many(cache_keys.values())
+        now = time.time_ns()
+        stamps = []
+        for cache_key in cache_keys.values():
+            if cache_key not in found:
+                # add - щоб паралельний purge не був перезаписаний
+                _cache().add(cache_key, now, None)
+                found[cache_key] = _cache().get(cache_key, now)
+            stamps.append(found[cache_key])
+        return stamps
+
+    @staticmethod
+    def _maybe_stale(validators: PageValidators) -> bool:
+        """Читання з репліки, а найновіший штамп молодший за STICKY_SECONDS (як у detail_cache)"""
+        from .models import Event
+
+        if (router.db_for_read(Event) or DEFAULT_DB_ALIAS) == DEFAULT_DB_ALIAS:
+            return False
+        return time.time_ns() - validators.newest_stamp < get_routing_config()["STICKY_SECONDS"] * 1_000_000_000
+
+    @staticmethod
+    def validators(keys: Iterable[str]) -> PageValidators:
+        """Валідатори зі штампів ключів і поточного періоду REVALIDATE_SECONDS"""
+        keys = sorted(keys)
+        stamps = PublicPageCacheService.stamps(keys)
+        period = max(get_config()["REVALIDATE_SECONDS"], 1)
+        period_start = int(time.time()) // period * period
+        signature = "|".join([str(FORMAT), str(period_start), *(f"{k}={s}" for k, s in zip(keys, stamps))])
+        return PageValidators(
+            f'"{hashlib.sha256(signature.encode()).hexdigest()[:32]}"',
+            max([period_start, *(stamp // 1_000_000_000 for stamp in stamps)]),
+            max(stamps, default=0),
+        )
+
+    @staticmethod
+    def respond(request: HttpRequest, keys: Iterable[str], render: Callable[[], HttpResponse]) -> HttpResponse:
+        """
+        Відповідь сторінки: 304 без виклику render(), якщо клієнт має
+        актуальну версію, інакше render() із заголовками кешування
+        """
+        config = get_config()
+        if not PublicPageCacheService.is_public(request):
+            response = render()
+            patch_cache_control(response, private=True)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        keys = list(keys)
+        validators = PublicPageCacheService.validators(keys)
+        if PublicPageCacheService._maybe_stale(validators):
+            # Сторінка з репліки одразу після purge: валідатор уже новий, а
+            # дані можуть бути старими - без ETag і не для reverse proxy
+            response = render()
+            patch_cache_control(response, private=True, max_age=0)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+        response = get_conditional_response(request, etag=validators.etag, last_modified=validators.last_modified)
+        if response is None:
+            response = render()
+        if response.status_code not in (200, 304):
+            return response
+
+        response["ETag"] = validators.etag
+        response["Last-Modified"] = http_date(validators.last_modified)
+        response[config["SURROGATE_KEY_HEADER"]] = " ".join(keys)
+        patch_cache_control(response, public=True, max_age=config["MAX_AGE"], s_maxage=config["S_MAXAGE"])
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+    @staticmethod
+    def purge(keys: Iterable[str]) -> None:
+        """
+        Нові штампи ключів - одразу й ще раз після коміту (див. detail_cache);
+        PURGE_HANDLER викликається після коміту
+        """
+        keys = sorted(set(keys))
+        if not keys:
+            return
+
+        def bump():
+            _cache().set_many({STAMP_KEY.format(key): time.time_ns() for key in keys}, None)
+
+        def notify():
+            bump()
+            handler = get_config()["PURGE_HANDLER"]
+            if handler:
+                import_string(handler)(keys)
+
+        bump()
+        transaction.on_commit(notify)
+
+    @staticmethod
+    def purge_events(event_ids: Iterable[int]) -> None:
+        """Сторінки подій і список (кількість місць, статус, назва)"""
+        PublicPageCacheService.purge([LIST_KEY, *(event_key(pk) for pk in event_ids if pk is not None)])
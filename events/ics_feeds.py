@@ -0,0 +1,278 @@
+"""
+Підписки на календар у форматі iCalendar (RFC 5545)
+
+Зовнішні календарі (Google, Apple, Outlook) опитують URL підписки кожні
+кілька хвилин. Дві стрічки на користувача:
+- user - персональний розклад (організовані та зареєстровані події);
+- organizer - опубліковані події організатора, щоб ділитися з учасниками.
+
+URL містить токен - HMAC-SHA256 від (вид стрічки, id користувача,
+секрет користувача) з SECRET_KEY та SALT: без нього стрічку не вгадати.
+Секрет (CalendarFeedKey) користувач змінює кнопкою на сторінці календаря -
+це відкликає лише його посилання; зміна SALT відкликає всі. Секрет
+читається тим самим запитом, що й власник стрічки.
+
+Стрічка охоплює вікно [сьогодні - PAST_DAYS, сьогодні + FUTURE_DAYS)
+і пишеться потоково з ScheduleEntry: екранування тексту, згортання рядків
+до 75 октетів, CRLF, час у UTC (VTIMEZONE не потрібен). Серії розгорнуті
+в межах вікна, тож кожне повторення - окремий VEVENT без RRULE.
+
+Умовний GET: ETag і Last-Modified рахуються агрегатними запитами
+(кількість і найновіший updated_at подій та RSVP у вікні), тож незмінене
+опитування отримує 304 без побудови стрічки. Видалення події чи RSVP
+змінює кількість, а отже ETag; Last-Modified при цьому не зростає, тому
+клієнтам, що надсилають обидва заголовки, відповідає ETag (RFC 7232).
+
+Налаштування: settings.ICS_FEEDS поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.urls import reverse
+from django.utils import timezone
+
+from .schedule_services import PersonalScheduleService, ScheduleCriteria, ScheduleEntry, ScheduleWindow
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+    from django.http import HttpRequest
+
+DEFAULTS = {
+    "ENABLED": True,
+    # Зміна SALT робить недійсними всі видані URL підписок
+    "SALT": "",
+    "PAST_DAYS": 30,
+    "FUTURE_DAYS": 365,
+    # Cache-Control max-age та рекомендований інтервал опитування, секунди
+    "MAX_AGE": 900,
+    "UID_DOMAIN": "event-organizer",
+}
+
+USER_FEED = "user"
+ORGANIZER_FEED = "organizer"
+FEED_KINDS = (USER_FEED, ORGANIZER_FEED)
+
+# Частина ETag: зміна формату стрічки інвалідує збережені клієнтами версії
+FORMAT = 2
+LINE_LIMIT = 75
+
+ICS_STATUS = {
+    "draft": "TENTATIVE",
+    "published": "CONFIRMED",
+    "cancelled": "CANCELLED",
+    "archived": "CONFIRMED",
+}
+
+
+def get_config() -> dict:
+    """Налаштування: settings.ICS_FEEDS поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "ICS_FEEDS", {}) or {})
+    return config
+
+
+# --- запис iCalendar ---
+
+
+def escape_text(value: str) -> str:
+    """Екранування TEXT-значення (RFC 5545, 3.3.11)"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\r", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> bytes:
+    """
+    Рядок у UTF-8 з CRLF, згорнутий до 75 октетів
+
+    Продовження починається пробілом; багатобайтні символи не розриваються.
+    """
+    data = line.encode()
+    if len(data) <= LINE_LIMIT:
+        return data + b"\r\n"
+    parts = []
+    start, limit = 0, LINE_LIMIT
+    while len(data) - start > limit:
+        end = start + limit
+        while data[end] & 0xC0 == 0x80:  # середина символу UTF-8
+            end -= 1
+        parts.append(data[start:end])
+        start, limit = end, LINE_LIMIT - 1
+    parts.append(data[start:])
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def format_utc(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _uid(entry: ScheduleEntry) -> str:
+    """UID події; повторення серії - окремі VEVENT зі своїм UID"""
+    if entry.recurrence is None:
+        return f"event-{entry.event_id}"
+    return f"event-{entry.event_id}-{format_utc(entry.starts_at)}"
+
+
+def stream_ics(
+    entries: Iterable[ScheduleEntry],
+    name: str,
+    stamp: datetime,
+    event_url: Optional[Callable[[int], str]] = None,
+) -> Iterator[bytes]:
+    """
+    VCALENDAR по одній події
+
+    stamp - DTSTAMP усіх подій (час останньої зміни стрічки): однакові дані
+    дають однакові байти.
+    """
+    config = get_config()
+    uid_domain = config["UID_DOMAIN"]
+    dtstamp = format_utc(stamp)
+    refresh_minutes = max(config["MAX_AGE"] // 60, 1)
+
+    yield b"".join(fold_line(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Event Organizer//Calendar//UK",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:PT{refresh_minutes}M",
+        f"X-PUBLISHED-TTL:PT{refresh_minutes}M",
+    ))
+    for entry in entries:
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{_uid(entry)}@{uid_domain}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{format_utc(entry.starts_at)}",
+            f"DTEND:{format_utc(entry.ends_at)}",
+            f"SUMMARY:{escape_text(entry.title)}",
+            f"STATUS:{ICS_STATUS.get(entry.status, 'CONFIRMED')}",
+        ]
+        if entry.location:
+            lines.append(f"LOCATION:{escape_text(entry.location)}")
+        if entry.description:
+            lines.append(f"DESCRIPTION:{escape_text(entry.description)}")
+        if event_url is not None:
+            lines.append(f"URL:{event_url(entry.event_id)}")
+        lines.append("END:VEVENT")
+        yield b"".join(fold_line(line) for line in lines)
+    yield fold_line("END:VCALENDAR")
+
+
+# --- стрічки ---
+
+
+class FeedValidators(NamedTuple):
+    """Валідатори умовного GET стрічки"""
+
+    etag: str
+    last_modified: Optional[datetime]
+
+
+class IcsFeedService:
+    """Токени, вікно, валідатори та записи стрічок підписки"""
+
+    @staticmethod
+    def token(kind: str, user_id: int, secret: str = "") -> str:
+        """Токен URL стрічки (32 hex-символи); secret - CalendarFeedKey.secret"""
+        message = f"events:ics:{get_config()['SALT']}:{kind}:{user_id}:{secret}".encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+    @staticmethod
+    def check_token(kind: str, user_id: int, token: str, secret: str = "") -> bool:
+        return kind in FEED_KINDS and hmac.compare_digest(IcsFeedService.token(kind, user_id, secret), token)
+
+    @staticmethod
+    def secret(user_id: int) -> str:
+        """Поточний секрет стрічок користувача (порожній, доки його не змінювали)"""
+        from .models import CalendarFeedKey
+
+        return CalendarFeedKey.objects.filter(user_id=user_id).values_list("secret", flat=True).first() or ""
+
+    @staticmethod
+    def rotate(user: "AbstractUser") -> str:
+        """Новий секрет: усі видані URL стрічок користувача перестають діяти"""
+        from .models import CalendarFeedKey
+
+        secret = secrets.token_hex(16)
+        CalendarFeedKey.objects.update_or_create(user=user, defaults={"secret": secret})
+        return secret
+
+    @staticmethod
+    def feed_url(request: "HttpRequest", kind: str, user_id: int, secret: Optional[str] = None) -> str:
+        """Абсолютний URL стрічки з токеном (secret=None - прочитати з БД)"""
+        if secret is None:
+            secret = IcsFeedService.secret(user_id)
+        path = reverse("calendar-feed", kwargs={
+            "kind": kind, "user_id": user_id, "token": IcsFeedService.token(kind, user_id, secret),
+        })
+        return request.build_absolute_uri(path)
+
+    @staticmethod
+    def window() -> ScheduleWindow:
+        """Вікно стрічки від локальної опівночі: протягом дня вміст не зсувається"""
+        config = get_config()
+        today = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        return ScheduleWindow(
+            today - timedelta(days=config["PAST_DAYS"]), today + timedelta(days=config["FUTURE_DAYS"])
+        )
+
+    @staticmethod
+    def criteria(kind: str) -> Optional[ScheduleCriteria]:
+        if kind == ORGANIZER_FEED:
+            return ScheduleCriteria(only_organizer=True, only_published=True)
+        return None
+
+    @staticmethod
+    def validators(kind: str, user: "AbstractUser", window: ScheduleWindow) -> FeedValidators:
+        """
+        ETag і Last-Modified: один агрегатний запит на кожне плече розкладу
+
+        Події рахуються будь-якого статусу: зміна статусу оновлює updated_at
+        навіть тоді, коли подія зникає зі стрічки.
+        """
+        from tickets.models import RSVP
+        from .models import Event
+
+        organized = Event.objects.filter(window.overlap_q(), organizer=user).aggregate(
+            n=Count("pk"), changed=Max("updated_at")
+        )
+        parts = [organized["n"]]
+        changes = [organized["changed"]]
+        if kind == USER_FEED:
+            registered = (
+                RSVP.objects.filter(window.overlap_q("event__"), user=user)
+                .exclude(event__organizer=user)
+                .aggregate(n=Count("pk"), changed=Max("event__updated_at"), rsvp_changed=Max("updated_at"))
+            )
+            parts.append(registered["n"])
+            changes += [registered["changed"], registered["rsvp_changed"]]
+
+        changes = [changed for changed in changes if changed is not None]
+        last_modified = max(changes) if changes else None
+        signature = ":".join(str(part) for part in (
+            FORMAT, kind, user.pk, window.start.date().isoformat(), *parts,
+            last_modified.isoformat() if last_modified else "",
+        ))
+        return FeedValidators(f'"{hashlib.sha256(signature.encode()).hexdigest()[:32]}"', last_modified)
+
+    @staticmethod
+    def entries(kind: str, user: "AbstractUser", window: ScheduleWindow) -> List[ScheduleEntry]:
+        return PersonalScheduleService.get_user_schedule_entries(
+            user, window, IcsFeedService.criteria(kind), include_description=True
+        )
@@ -0,0 +1,74 @@
+"""
+Management команда для генерації синтетичного набору даних (замість load_test_data.py).
+
+Приклади:
+      python manage.py generate_dataset                                 # демо-акаунти + невеликий набір
+      python manage.py generate_dataset --users 20000 --events 50000 --rsvps 1000000 --seed 7
+      python manage.py generate_dataset --demo-only                     # лише admin/admin123 та демо-користувачі
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from events.dataset_generator import DatasetGenerator, DatasetSize
+
+DEFAULT_SIZE = DatasetSize()
+
+
+class Command(BaseCommand):
+    help = "Генерує детермінований синтетичний набір користувачів, подій, RSVP, відгуків та сповіщень"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=DEFAULT_SIZE.users, help="Кількість користувачів")
+        parser.add_argument("--events", type=int, default=DEFAULT_SIZE.events, help="Кількість подій")
+        parser.add_argument("--rsvps", type=int, default=DEFAULT_SIZE.rsvps, help="Кількість RSVP")
+        parser.add_argument("--reviews", type=int, default=DEFAULT_SIZE.reviews, help="Кількість відгуків")
+        parser.add_argument(
+            "--notifications", type=int, default=DEFAULT_SIZE.notifications, help="Кількість сповіщень"
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Seed генератора (однаковий seed - однакові дані)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Розмір порції bulk_create")
+        parser.add_argument("--prefix", default="gen", help="Префікс імен згенерованих користувачів")
+        parser.add_argument("--demo-only", action="store_true", help="Створити лише демо-акаунти з README")
+        parser.add_argument(
+            "--skip-rollups", action="store_true", help="Не перераховувати денні rollup-лічильники після генерації"
+        )
+
+    def handle(self, *args, **options):
+        for name in ("users", "events", "rsvps", "reviews", "notifications"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} не може бути від'ємним")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size має бути не менше 1")
+
+        size = DatasetSize(
+            users=0 if options["demo_only"] else options["users"],
+            events=0 if options["demo_only"] else options["events"],
+            rsvps=0 if options["demo_only"] else options["rsvps"],
+            reviews=0 if options["demo_only"] else options["reviews"],
+            notifications=0 if options["demo_only"] else options["notifications"],
+        )
+        if size.users and get_user_model().objects.filter(username__startswith=options["prefix"]).exists():
+            raise CommandError(
+                f"Користувачі з префіксом '{options['prefix']}' вже існують - оберіть інший --prefix"
+            )
+
+        started = time.perf_counter()
+        generator = DatasetGenerator(
+            size,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            prefix=options["prefix"],
+            progress=lambda message: self.stdout.write(f"  {message}"),
+        )
+        counts = generator.generate()
+
+        if not options["skip_rollups"] and size.events:
+            call_command("rollup_daily_stats", since="all", stdout=self.stdout)
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{name}={value}" for name, value in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Набір даних згенеровано за {elapsed:.1f} с: {summary}"))
+        self.stdout.write("Демо-акаунти: admin/admin123, Katerina_demianik/password123, ivan_petrov/password123")
@@ -0,0 +1,38 @@
+"""
+Management команда для попередньої генерації OpenAPI-схеми (event_organizer/openapi.py).
+
+Запускається на етапі збирання/деплою, перед collectstatic:
+      python manage.py generate_openapi_schema
+Перевірка в CI, що закомічена/зібрана схема актуальна:
+      python manage.py generate_openapi_schema --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from event_organizer.openapi import generate_schema, get_config, read_meta, source_checksum
+
+
+class Command(BaseCommand):
+    help = "Генерує OpenAPI-схему у статичні файли schema.yaml/schema.json"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Лише перевірити актуальність схеми")
+        parser.add_argument("--force", action="store_true", help="Перегенерувати навіть якщо схема актуальна")
+
+    def handle(self, *args, **options):
+        directory = get_config()["DIR"]
+        checksum = source_checksum()
+        meta = read_meta(directory)
+        up_to_date = meta is not None and meta.get("checksum") == checksum
+
+        if options["check"]:
+            if not up_to_date:
+                raise CommandError(f"Схема в {directory} застаріла - запустіть generate_openapi_schema")
+            self.stdout.write(self.style.SUCCESS("Схема актуальна"))
+            return
+
+        if up_to_date and not options["force"]:
+            self.stdout.write(f"Схема актуальна ({checksum[:12]}), генерацію пропущено")
+            return
+
+        generate_schema(directory, checksum)
+        self.stdout.write(self.style.SUCCESS(f"Схему згенеровано в {directory} ({checksum[:12]})"))
@@ -0,0 +1,29 @@
+"""
+Management команда: рядки EventOccurrence для повторень серій на горизонт.
+
+Приклади:
+      python manage.py materialize_occurrences
+      python manage.py materialize_occurrences --days 60
+
+Розклад і календар розгортають серії без цих рядків; команда потрібна,
+якщо повторення з'єднуються з іншими таблицями. Запускати періодично
+(cron), щоб горизонт зсувався разом із часом.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from events.recurrence import OccurrenceService, get_config
+
+
+class Command(BaseCommand):
+    help = "Матеріалізує повторення серій (EventOccurrence) на горизонт RECURRENCE['MATERIALIZE_DAYS']"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Горизонт у днях (за замовчуванням з налаштувань)")
+
+    def handle(self, *args, **options):
+        days = get_config()["MATERIALIZE_DAYS"] if options["days"] is None else options["days"]
+        if days <= 0:
+            raise CommandError("Горизонт вимкнено: задайте --days або RECURRENCE['MATERIALIZE_DAYS'] > 0")
+
+        created, deleted = OccurrenceService.materialize(horizon_days=days)
+        self.stdout.write(self.style.SUCCESS(f"Повторень створено: {created}, видалено: {deleted} (горизонт {days} дн.)"))
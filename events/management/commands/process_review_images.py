@@ -0,0 +1,52 @@
+"""
+Management команда: обробка наявних зображень відгуків (варіанти, без метаданих).
+
+Приклади:
+      python manage.py process_review_images
+      python manage.py process_review_images --workers 8 --limit 1000
+      python manage.py process_review_images --all
+
+Без --all обробляються лише зображення без варіантів або з варіантами
+для інших налаштувань REVIEW_IMAGES (WIDTHS, QUALITY, ...). Нові
+завантаження обробляються автоматично (events/review_images.py).
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from events.models import Review
+from events.review_images import ReviewImageService, config_version
+
+
+class Command(BaseCommand):
+    help = "Створює зменшені варіанти зображень відгуків у пулі процесів"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Процесів у пулі")
+        parser.add_argument("--limit", type=int, default=None, help="Не більше N відгуків")
+        parser.add_argument("--all", action="store_true", help="Обробити заново й актуальні зображення")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers має бути не менше 1")
+
+        reviews = Review.objects.exclude(image="").exclude(image__isnull=True).order_by("pk")
+        if not options["all"]:
+            # exclude() по ключу JSON пропустив би відгуки без ключа (NULL)
+            version = config_version()
+            reviews = reviews.filter(
+                Q(image_variants__version__isnull=True) | ~Q(image_variants__version=version)
+            )
+        review_ids = list(reviews.values_list("pk", flat=True)[: options["limit"]])
+        if not review_ids:
+            self.stdout.write(self.style.SUCCESS("Усі зображення відгуків оброблено"))
+            return
+
+        processed = failed = 0
+        for index, (_review_id, ok) in enumerate(ReviewImageService.backfill(review_ids, options["workers"]), 1):
+            processed += ok
+            failed += not ok
+            if index % 100 == 0:
+                self.stdout.write(f"  {index}/{len(review_ids)}")
+        self.stdout.write(self.style.SUCCESS(f"Оброблено: {processed}, з помилками чи пропущено: {failed}"))
@@ -0,0 +1,26 @@
+"""
+Management команда: перерахунок агрегатів відгуків з таблиці Review.
+
+Приклади:
+      python manage.py repair_ratings
+      python manage.py repair_ratings --dry-run
+
+Event.rating_sum/reviews_count та OrganizerRating підтримуються сигналами
+Review; команда виправляє розбіжності після змін в обхід сигналів
+(QuerySet.update/delete, сирий SQL, відновлення з резервної копії).
+"""
+from django.core.management.base import BaseCommand
+
+from events.ratings import RatingService
+
+
+class Command(BaseCommand):
+    help = "Перераховує агрегати відгуків подій та рейтинги організаторів"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Лише показати кількість розбіжностей")
+
+    def handle(self, *args, **options):
+        events, organizers = RatingService.rebuild(dry_run=options["dry_run"])
+        verb = "Розбіжностей знайдено" if options["dry_run"] else "Виправлено"
+        self.stdout.write(self.style.SUCCESS(f"{verb}: подій {events}, організаторів {organizers}"))
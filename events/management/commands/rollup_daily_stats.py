@@ -0,0 +1,65 @@
+"""
+Management команда для підтримки денних rollup-лічильників (DailyRollup).
+
+Режими:
+- за розкладом (cron): звіряє лічильники останніх --days днів з сирими таблицями
+      */15 * * * * cd /path/to/project && python manage.py rollup_daily_stats
+- backfill історії: перераховує період та оцінює переходи статусів
+      python manage.py rollup_daily_stats --since 2024-01-01
+"""
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from events.models import Event
+from events.rollup_services import RollupService
+
+
+class Command(BaseCommand):
+    help = "Оновлює денні rollup-лічильники для адмін-аналітики"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="Скільки останніх днів звірити (режим за розкладом, за замовчуванням 2)",
+        )
+        parser.add_argument(
+            "--since",
+            help="Backfill з дати YYYY-MM-DD (або 'all' - з першої події)",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options["since"]:
+            since = options["since"]
+            if since == "all":
+                first = Event.objects.aggregate(first=Min("created_at"))["first"]
+                start = timezone.localdate(first) if first else today
+            else:
+                try:
+                    start = datetime.strptime(since, "%Y-%m-%d").date()
+                except ValueError:
+                    raise CommandError("--since має бути у форматі YYYY-MM-DD або 'all'")
+
+            written = 0
+            # Порціями по ~пів року, щоб не тримати великі словники в пам'яті
+            chunk_start = start
+            while chunk_start <= today:
+                chunk_end = min(chunk_start + timedelta(days=180), today)
+                written += RollupService.rebuild(chunk_start, chunk_end, estimate_transitions=True)
+                chunk_start = chunk_end + timedelta(days=1)
+
+            self.stdout.write(self.style.SUCCESS(f"Backfill завершено: {written} днів з {start}"))
+            return
+
+        if options["days"] < 1:
+            raise CommandError("--days має бути не менше 1")
+
+        start = today - timedelta(days=options["days"] - 1)
+        written = RollupService.rebuild(start, today)
+        self.stdout.write(self.style.SUCCESS(f"Оновлено {written} днів ({start} - {today})"))
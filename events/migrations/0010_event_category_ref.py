@@ -0,0 +1,61 @@
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+from django.utils.text import slugify
+
+
+def cluster_existing_categories(apps, schema_editor):
+    """
+    Кластеризує наявні вільнотекстові категорії у записи catalog.Category
+
+    "Конференція", "конференція " та "конференции" потрапляють в одну категорію.
+    """
+    from catalog.normalization import cluster_category_names, normalize_category_name
+
+    Event = apps.get_model("events", "Event")
+    Category = apps.get_model("catalog", "Category")
+
+    value_counts = dict(
+        Event.objects.exclude(category="")
+        .values("category")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("category", "n")
+    )
+
+    used_slugs = set(Category.objects.values_list("slug", flat=True))
+    for canonical, members in cluster_category_names(value_counts).items():
+        key = normalize_category_name(canonical)[:100]
+        category = Category.objects.filter(normalized_name=key).first()
+        if category is None:
+            base = slugify(canonical, allow_unicode=True)[:110] or "category"
+            slug, suffix = base, 2
+            while slug in used_slugs:
+                slug, suffix = f"{base}-{suffix}", suffix + 1
+            used_slugs.add(slug)
+            category = Category.objects.create(name=canonical[:100], slug=slug, normalized_name=key)
+        Event.objects.filter(category__in=members).update(category_ref=category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0001_initial"),
+        ("events", "0009_review_image_alter_event_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="category_ref",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Нормалізована категорія (заповнюється автоматично з поля category)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="events",
+                to="catalog.category",
+            ),
+        ),
+        migrations.RunPython(cluster_existing_categories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_category_ref'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('events_created', models.PositiveIntegerField(default=0)),
+                ('events_published', models.PositiveIntegerField(default=0)),
+                ('events_cancelled', models.PositiveIntegerField(default=0)),
+                ('events_archived', models.PositiveIntegerField(default=0)),
+                ('rsvps_created', models.PositiveIntegerField(default=0)),
+                ('rsvps_cancelled', models.PositiveIntegerField(default=0)),
+                ('users_joined', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+    ]
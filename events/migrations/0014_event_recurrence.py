@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:46
+
+import django.db.models.deletion
+import events.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_series_ends_at(apps, schema_editor):
+    # Повторюваних подій ще немає: кінець серії - кінець події
+    Event = apps.get_model("events", "Event")
+    Event.objects.update(series_ends_at=models.F("ends_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+        ('events', '0013_event_organizer_starts_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['starts_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_even_starts__3365d7_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_exdates',
+            field=models.JSONField(blank=True, default=list, help_text='Початки скасованих повторень серії (ISO 8601)'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_rule',
+            field=models.CharField(blank=True, help_text='Правило повторення (RRULE), напр. FREQ=WEEKLY;COUNT=10. Порожнє - разова подія', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series_ends_at',
+            field=events.models.SeriesEndField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_series_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='series_ends_at',
+            field=events.models.SeriesEndField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['starts_at', 'series_ends_at'], name='events_even_starts__6fa6d8_idx'),
+        ),
+        migrations.AddField(
+            model_name='eventoccurrence',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='events.event'),
+        ),
+        migrations.AddIndex(
+            model_name='eventoccurrence',
+            index=models.Index(fields=['starts_at'], name='events_even_starts__2106e3_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventoccurrence',
+            unique_together={('event', 'starts_at')},
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_review_aggregates(apps, schema_editor):
+    # Початкові агрегати з наявних відгуків (далі - сигналами Review)
+    Event = apps.get_model("events", "Event")
+    Review = apps.get_model("events", "Review")
+    OrganizerRating = apps.get_model("events", "OrganizerRating")
+    totals = Review.objects.values("event").annotate(total=models.Sum("rating"), n=models.Count("id"))
+    for row in totals:
+        Event.objects.filter(pk=row["event"]).update(rating_sum=row["total"], reviews_count=row["n"])
+    OrganizerRating.objects.bulk_create([
+        OrganizerRating(organizer_id=row["organizer"], rating_sum=row["total"], reviews_count=row["n"])
+        for row in (
+            Event.objects.filter(reviews_count__gt=0)
+            .values("organizer")
+            .annotate(total=models.Sum("rating_sum"), n=models.Sum("reviews_count"))
+        )
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_event_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizerRating',
+            fields=[
+                ('organizer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='organizer_rating', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('reviews_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='reviews_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    """
+    Заповнює DailyRollup історією з сирих таблиць
+
+    Без цього після деплою 0011 дашборд за період показував нулі до ручного
+    rollup_daily_stats --since all. Лічильники, що точно відновлюються
+    (створені події, RSVP, нові користувачі), перераховуються для всіх днів;
+    переходи статусів оцінюються за поточним станом подій лише для днів,
+    яких ще немає (для решти їх уже рахували сигнали).
+    """
+    Event = apps.get_model("events", "Event")
+    DailyRollup = apps.get_model("events", "DailyRollup")
+    RSVP = apps.get_model("tickets", "RSVP")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    def daily(model, date_field, **filters):
+        rows = (
+            model.objects.filter(**filters)
+            .annotate(day=TruncDate(date_field))
+            .values("day")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        return {row["day"]: row["n"] for row in rows if row["day"]}
+
+    derived = {
+        "events_created": daily(Event, "created_at"),
+        "rsvps_created": daily(RSVP, "created_at"),
+        "users_joined": daily(User, "date_joined"),
+    }
+    estimated = {
+        "events_published": daily(Event, "created_at", status__in=["published", "archived"]),
+        "events_cancelled": daily(Event, "updated_at", status="cancelled"),
+        "events_archived": daily(Event, "ends_at", status="archived"),
+    }
+
+    existing = {row.date: row for row in DailyRollup.objects.all()}
+    days = set(existing).union(*derived.values(), *estimated.values())
+    to_create, to_update = [], []
+    for day in sorted(days):
+        values = {field: counts.get(day, 0) for field, counts in derived.items()}
+        row = existing.get(day)
+        if row is None:
+            values.update({field: counts.get(day, 0) for field, counts in estimated.items()})
+            to_create.append(DailyRollup(date=day, **values))
+        else:
+            for field, value in values.items():
+                setattr(row, field, value)
+            to_update.append(row)
+
+    DailyRollup.objects.bulk_create(to_create, batch_size=500)
+    DailyRollup.objects.bulk_update(to_update, list(derived), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0016_review_image_variants"),
+        ("tickets", "0003_rsvp_occurrence_start"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
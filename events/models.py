@@ -1,6 +1,23 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .recurrence import Recurrence
+
+
+class SeriesEndField(models.DateTimeField):
+    """
+    Кінець серії для віконних запитів; обчислюється при збереженні (як auto_now)
+
+    Разова подія - ends_at, серія - Recurrence.series_end. Працює для save()
+    та bulk_create, але не для QuerySet.update(starts_at=...).
+    """
+
+    def pre_save(self, model_instance, add):
+        compute = getattr(model_instance, "compute_series_ends_at", None)
+        value = compute() if compute is not None else model_instance.ends_at
+        setattr(model_instance, self.attname, value)
+        return value
+
 
 class Event(models.Model):
     DRAFT = "draft"
@@ -31,6 +48,14 @@ class Event(models.Model):
         blank=True,
         help_text="Тип події (вільний текст, наприклад: конференція, вебінар, воркшоп)",
     )
+    category_ref = models.ForeignKey(
+        "catalog.Category",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="events",
+        help_text="Нормалізована категорія (заповнюється автоматично з поля category)",
+    )
     latitude = models.FloatField(null=True, blank=True, help_text="Широта місця проведення (наприклад, 50.4501)")
     longitude = models.FloatField(null=True, blank=True, help_text="Довгота місця проведення (наприклад, 30.5234)")
     organizer = models.ForeignKey(
@@ -39,12 +64,78 @@ class Event(models.Model):
         related_name="organized_events",
         help_text="Користувач, який створив подію"
     )
+    recurrence_rule = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Правило повторення (RRULE), напр. FREQ=WEEKLY;COUNT=10. Порожнє - разова подія",
+    )
+    recurrence_exdates = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Початки скасованих повторень серії (ISO 8601)",
+    )
+    series_ends_at = SeriesEndField(editable=False)
+    # Агрегати відгуків (events/ratings.py): змінюються інкрементально сигналами Review
+    rating_sum = models.PositiveIntegerField(default=0, db_default=0, editable=False)
+    reviews_count = models.PositiveIntegerField(default=0, db_default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Вікна календаря: starts_at < end AND series_ends_at > start
+            models.Index(fields=["starts_at", "series_ends_at"]),
+            models.Index(fields=["status", "starts_at"]),
+            # Організовані події в персональному розкладі (гілка UNION)
+            models.Index(fields=["organizer", "starts_at"]),
+        ]
+
     def __str__(self):
         return self.title
 
+    @property
+    def is_recurring(self) -> bool:
+        return bool(self.recurrence_rule)
+
+    @property
+    def recurrence(self):
+        """Recurrence серії або None для разової події"""
+        if not self.recurrence_rule:
+            return None
+        return Recurrence.parse(self.recurrence_rule, self.recurrence_exdates or ())
+
+    @property
+    def avg_rating(self):
+        """Середній рейтинг зі збережених агрегатів (None - відгуків немає)"""
+        return self.rating_sum / self.reviews_count if self.reviews_count else None
+
+    def compute_series_ends_at(self):
+        recurrence = self.recurrence
+        if recurrence is None:
+            return self.ends_at
+        return recurrence.series_end(self.starts_at, self.ends_at - self.starts_at)
+
+
+class EventOccurrence(models.Model):
+    """
+    Матеріалізоване повторення серії в межах горизонту
+
+    Розклад і календар розгортають серії ліниво; рядки потрібні лише
+    там, де повторення з'єднуються з іншими таблицями (recurrence.OccurrenceService).
+    """
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="occurrences")
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("event", "starts_at")
+        ordering = ["starts_at"]
+        indexes = [models.Index(fields=["starts_at"])]
+
+    def __str__(self):
+        return f"EventOccurrence({self.event_id} @ {self.starts_at:%Y-%m-%d %H:%M})"
+
 
 class Review(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="reviews")
@@ -57,6 +148,8 @@ class Review(models.Model):
         blank=True,
         help_text="Необов'язково: додайте зображення до свого відгуку (скрін, фото з події тощо).",
     )
+    # Зменшені варіанти зображення (events/review_images.py); порожньо - ще не оброблено
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -66,3 +159,80 @@ class Review(models.Model):
 
     def __str__(self):
         return f"Review({self.user_id} -> {self.event_id}, rating={self.rating})"
+
+    @property
+    def image_picture(self):
+        """Джерела <picture> обробленого зображення або None (показується оригінал)"""
+        from .review_images import picture
+        return picture(self.image_variants)
+
+
+class OrganizerRating(models.Model):
+    """
+    Рейтинг організатора за відгуками на всі його події
+
+    Сума та кількість оцінок підтримуються інкрементально разом з
+    Event.rating_sum/reviews_count (events/ratings.py).
+    """
+
+    organizer = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="organizer_rating",
+    )
+    rating_sum = models.PositiveIntegerField(default=0)
+    reviews_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"OrganizerRating({self.organizer_id}: {self.rating_sum}/{self.reviews_count})"
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.reviews_count if self.reviews_count else None
+
+
+class DailyRollup(models.Model):
+    """
+    Попередньо агреговані денні лічильники активності для адмін-аналітики
+
+    Будь-який період відповідає сумі не більше кількох сотень рядків
+    замість сканування сирих таблиць Event, User та RSVP.
+    """
+
+    date = models.DateField(unique=True)
+    events_created = models.PositiveIntegerField(default=0)
+    events_published = models.PositiveIntegerField(default=0)
+    events_cancelled = models.PositiveIntegerField(default=0)
+    events_archived = models.PositiveIntegerField(default=0)
+    rsvps_created = models.PositiveIntegerField(default=0)
+    rsvps_cancelled = models.PositiveIntegerField(default=0)
+    users_joined = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"DailyRollup({self.date})"
+
+
+class CalendarFeedKey(models.Model):
+    """
+    Секрет URL підписок iCalendar користувача (events/ics_feeds.py)
+
+    Входить у HMAC токена: нове значення відкликає видані посилання лише
+    цього користувача. Без рядка діє порожній секрет.
+    """
+
+    user = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="calendar_feed_key",
+    )
+    secret = models.CharField(max_length=64)
+    rotated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"CalendarFeedKey({self.user_id})"
@@ -0,0 +1,145 @@
+"""
+Денормалізовані агрегати відгуків
+
+Event.rating_sum/reviews_count та OrganizerRating (усі події організатора)
+змінюються інкрементально: сигнали Review передають різницю, яку
+застосовує один UPDATE з F-виразами - без перерахунку Avg/Count при
+читанні сторінки події, профілю чи сортуванні за рейтингом.
+
+Зміни в обхід сигналів (QuerySet.update/delete відгуків, сирий SQL
+генератора даних) виправляє rebuild() - команда repair_ratings.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Greatest
+
+from .models import Event, OrganizerRating, Review
+
+BATCH_SIZE = 500
+
+
+def _shifted(field: str, delta: int):
+    """F-вираз поля з різницею; не нижче нуля, якщо агрегат розійшовся з відгуками"""
+    return Greatest(F(field) + delta, Value(0))
+
+
+class RatingService:
+    """Інкрементальні агрегати відгуків та їх відновлення"""
+
+    @staticmethod
+    def apply(event_id: int, rating_delta: int, count_delta: int, organizer_id: Optional[int] = None) -> None:
+        """Різниця суми та кількості оцінок для події та її організатора"""
+        if not rating_delta and not count_delta:
+            return
+        if organizer_id is None:
+            organizer_id = Event.objects.filter(pk=event_id).values_list("organizer_id", flat=True).first()
+            if organizer_id is None:
+                return
+        Event.objects.filter(pk=event_id).update(
+            rating_sum=_shifted("rating_sum", rating_delta),
+            reviews_count=_shifted("reviews_count", count_delta),
+        )
+        RatingService.apply_organizer(organizer_id, rating_delta, count_delta)
+
+    @staticmethod
+    def apply_organizer(organizer_id: int, rating_delta: int, count_delta: int) -> None:
+        """Різниця для рейтингу організатора; рядок створюється з першим відгуком"""
+        changes = {
+            "rating_sum": _shifted("rating_sum", rating_delta),
+            "reviews_count": _shifted("reviews_count", count_delta),
+        }
+        if OrganizerRating.objects.filter(organizer_id=organizer_id).update(**changes):
+            return
+        _rating, created = OrganizerRating.objects.get_or_create(
+            organizer_id=organizer_id,
+            defaults={"rating_sum": max(rating_delta, 0), "reviews_count": max(count_delta, 0)},
+        )
+        if not created:
+            # Рядок щойно створив паралельний запит
+            OrganizerRating.objects.filter(organizer_id=organizer_id).update(**changes)
+
+    @staticmethod
+    def review_saved(review: Review, previous: Optional[Tuple[int, int]]) -> None:
+        """
+        Відгук створено чи змінено
+
+        Args:
+            previous: (event_id, rating) до збереження або None для нового відгуку
+        """
+        if previous is None:
+            RatingService.apply(review.event_id, review.rating, 1)
+            return
+        previous_event_id, previous_rating = previous
+        if previous_event_id != review.event_id:
+            RatingService.apply(previous_event_id, -previous_rating, -1)
+            RatingService.apply(review.event_id, review.rating, 1)
+        elif previous_rating != review.rating:
+            RatingService.apply(review.event_id, review.rating - previous_rating, 0)
+
+    @staticmethod
+    def review_deleted(review: Review) -> None:
+        RatingService.apply(review.event_id, -review.rating, -1)
+
+    @staticmethod
+    def organizer_changed(event: Event, previous_organizer_id: int) -> None:
+        """Агрегати події переходять до нового організатора"""
+        if not event.reviews_count or previous_organizer_id == event.organizer_id:
+            return
+        RatingService.apply_organizer(previous_organizer_id, -event.rating_sum, -event.reviews_count)
+        RatingService.apply_organizer(event.organizer_id, event.rating_sum, event.reviews_count)
+
+    @staticmethod
+    def rebuild(dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Перерахунок агрегатів з таблиці Review; записуються лише розбіжності
+
+        Returns:
+            (кількість виправлених подій, кількість виправлених організаторів)
+        """
+        totals: Dict[int, Tuple[int, int]] = {
+            row["event"]: (row["total"], row["n"])
+            for row in Review.objects.order_by().values("event").annotate(total=Sum("rating"), n=Count("id"))
+        }
+
+        stale_events = []
+        organizer_totals: Dict[int, Tuple[int, int]] = {}
+        rows = Event.objects.order_by().values_list("pk", "organizer_id", "rating_sum", "reviews_count")
+        for pk, organizer_id, rating_sum, reviews_count in rows.iterator(chunk_size=2000):
+            expected = totals.get(pk, (0, 0))
+            if expected != (rating_sum, reviews_count):
+                stale_events.append(Event(pk=pk, rating_sum=expected[0], reviews_count=expected[1]))
+            if expected[1]:
+                current = organizer_totals.get(organizer_id, (0, 0))
+                organizer_totals[organizer_id] = (current[0] + expected[0], current[1] + expected[1])
+
+        stored = {
+            organizer_id: (rating_sum, reviews_count)
+            for organizer_id, rating_sum, reviews_count in OrganizerRating.objects.values_list(
+                "organizer_id", "rating_sum", "reviews_count"
+            )
+        }
+        stale_organizers = [
+            OrganizerRating(organizer_id=organizer_id, rating_sum=expected[0], reviews_count=expected[1])
+            for organizer_id, expected in organizer_totals.items()
+            if stored.get(organizer_id) != expected
+        ]
+        # Організатори без жодного відгуку - нулі замість застарілих значень
+        stale_organizers += [
+            OrganizerRating(organizer_id=organizer_id, rating_sum=0, reviews_count=0)
+            for organizer_id, value in stored.items()
+            if organizer_id not in organizer_totals and value != (0, 0)
+        ]
+
+        if not dry_run:
+            Event.objects.bulk_update(stale_events, ["rating_sum", "reviews_count"], batch_size=BATCH_SIZE)
+            missing = [rating for rating in stale_organizers if rating.organizer_id not in stored]
+            OrganizerRating.objects.bulk_create(missing, batch_size=BATCH_SIZE)
+            OrganizerRating.objects.bulk_update(
+                [rating for rating in stale_organizers if rating.organizer_id in stored],
+                ["rating_sum", "reviews_count"],
+                batch_size=BATCH_SIZE,
+            )
+        return len(stale_events), len(stale_organizers)
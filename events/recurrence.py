@@ -0,0 +1,440 @@
+"""
+Повторювані події: підмножина RRULE (RFC 5545) та лінива розгортка
+
+Серія - один рядок Event з recurrence_rule, а не рядок на кожне
+повторення. Підтримується:
+
+    FREQ=DAILY|WEEKLY|MONTHLY; INTERVAL=n; COUNT=n | UNTIL=20301231T000000Z;
+    BYDAY=MO,WE (лише WEEKLY)
+
+та винятки (recurrence_exdates - початки скасованих повторень).
+
+Повторення не зберігаються: calendar, список чи ICS розгортають серію
+лише для запитаного вікна (Recurrence.occurrences). Розгортка йде в
+місцевому часі settings.TIME_ZONE, тож щотижнева зустріч о 19:00
+лишається о 19:00 після переходу на літній час.
+
+Віконні запити відбирають серії за Event.series_ends_at (кінець
+останнього повторення, OPEN_END для серій без COUNT/UNTIL).
+
+Якщо повторенням потрібні рядки (звіти, JOIN), OccurrenceService
+матеріалізує EventOccurrence на обмежений горизонт
+(RECURRENCE["MATERIALIZE_DAYS"], 0 - вимкнено).
+
+Налаштування: settings.RECURRENCE поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+
+DEFAULTS = {
+    # Найбільше повторень однієї серії в одній відповіді (розклад без вікна, відкриті серії)
+    "MAX_OCCURRENCES": 500,
+    # Горизонт матеріалізації EventOccurrence, днів; 0 - не матеріалізувати
+    "MATERIALIZE_DAYS": 0,
+}
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_COUNT = 1000
+MAX_INTERVAL = 366
+
+# series_ends_at серії без COUNT/UNTIL (з запасом до datetime.max для зсуву часової зони)
+OPEN_END = datetime(9999, 12, 30, tzinfo=dt_timezone.utc)
+
+# Місяці поспіль без потрібного числа (31-ше тощо), після яких MONTHLY вважається порожнім
+_MONTHLY_SKIP_LIMIT = 48
+
+
+def get_config() -> dict:
+    """Налаштування: settings.RECURRENCE поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "RECURRENCE", {}) or {})
+    return config
+
+
+def _parse_until(value: str) -> datetime:
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y%m%d":
+            # Дата без часу - включно до кінця дня в місцевому часі
+            return timezone.make_aware(parsed + timedelta(days=1)) - timedelta(microseconds=1)
+        return parsed.replace(tzinfo=dt_timezone.utc)
+    raise ValueError(f"UNTIL: очікується YYYYMMDD або YYYYMMDDTHHMMSSZ, отримано {value!r}")
+
+
+def _parse_exdate(value) -> datetime:
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """
+    Правило повторення серії разом із винятками
+
+    Незмінне: серію можна кешувати (знімки розкладу) і ділити між записами.
+    """
+
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: Tuple[int, ...] = ()
+    exdates: FrozenSet[datetime] = frozenset()
+
+    @classmethod
+    def parse(cls, rule: str, exdates: Iterable = ()) -> "Recurrence":
+        """
+        Recurrence з рядка RRULE (з префіксом "RRULE:" чи без) та винятків
+
+        Raises:
+            ValueError: непідтримана чи некоректна частина правила
+        """
+        parts = {}
+        text = rule.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[len("RRULE:"):]
+        for part in filter(None, text.split(";")):
+            name, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Некоректна частина правила: {part!r}")
+            parts[name.strip().upper()] = value.strip().upper()
+
+        freq = parts.pop("FREQ", "")
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ має бути одним із {', '.join(FREQUENCIES)}")
+        kwargs = {"freq": freq}
+        try:
+            if "INTERVAL" in parts:
+                kwargs["interval"] = int(parts.pop("INTERVAL"))
+            if "COUNT" in parts:
+                kwargs["count"] = int(parts.pop("COUNT"))
+        except ValueError:
+            raise ValueError("INTERVAL та COUNT мають бути цілими числами") from None
+        if not 1 <= kwargs.get("interval", 1) <= MAX_INTERVAL:
+            raise ValueError(f"INTERVAL має бути від 1 до {MAX_INTERVAL}")
+        if "count" in kwargs and not 1 <= kwargs["count"] <= MAX_COUNT:
+            raise ValueError(f"COUNT має бути від 1 до {MAX_COUNT}")
+        if "UNTIL" in parts:
+            if "count" in kwargs:
+                raise ValueError("COUNT та UNTIL не можна поєднувати")
+            kwargs["until"] = _parse_until(parts.pop("UNTIL"))
+        if "BYDAY" in parts:
+            if freq != "WEEKLY":
+                raise ValueError("BYDAY підтримується лише для FREQ=WEEKLY")
+            days = parts.pop("BYDAY").split(",")
+            if any(day not in WEEKDAYS for day in days):
+                raise ValueError(f"BYDAY: дні тижня з {', '.join(WEEKDAYS)}")
+            kwargs["byday"] = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+        if parts:
+            raise ValueError(f"Непідтримані частини правила: {', '.join(sorted(parts))}")
+
+        kwargs["exdates"] = frozenset(_parse_exdate(value) for value in exdates)
+        return cls(**kwargs)
+
+    def to_rule(self) -> str:
+        """Рядок RRULE (без винятків)"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}")
+        if self.byday:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.byday))
+        return ";".join(parts)
+
+    # --- розгортка ---
+
+    def _local_starts(self, first: datetime, skip_before: Optional[datetime]) -> Iterator[datetime]:
+        """
+        Наївні місцеві початки повторень у порядку зростання (без COUNT/UNTIL)
+
+        skip_before - пропустити цілі періоди до цього моменту (лише без COUNT:
+        з COUNT повторення до вікна теж рахуються).
+        """
+        period = 0
+        if skip_before is not None and self.count is None:
+            if self.freq == "MONTHLY":
+                months = (skip_before.year - first.year) * 12 + skip_before.month - first.month
+                period = max(0, months // self.interval - 1)
+            else:
+                unit = 1 if self.freq == "DAILY" else 7
+                period = max(0, (skip_before - first).days // (unit * self.interval) - 1)
+
+        if self.freq == "DAILY":
+            while True:
+                yield first + timedelta(days=period * self.interval)
+                period += 1
+
+        elif self.freq == "WEEKLY":
+            days = self.byday or (first.weekday(),)
+            week_start = first - timedelta(days=first.weekday())
+            while True:
+                base = week_start + timedelta(weeks=period * self.interval)
+                for day in days:
+                    candidate = base + timedelta(days=day)
+                    if candidate >= first:
+                        yield candidate
+                period += 1
+
+        else:
+            skipped = 0
+            while skipped < _MONTHLY_SKIP_LIMIT:
+                month_index = first.month - 1 + period * self.interval
+                year, month = first.year + month_index // 12, month_index % 12 + 1
+                period += 1
+                if first.day > calendar.monthrange(year, month)[1]:
+                    skipped += 1
+                    continue
+                skipped = 0
+                yield first.replace(year=year, month=month)
+
+    def starts(self, dtstart: datetime, skip_before: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        Початки повторень (aware) з урахуванням COUNT, UNTIL та винятків
+
+        Перше повторення - сам dtstart. skip_before лише пришвидшує пошук:
+        повторення до нього можуть як видаватися, так і ні.
+        """
+        first = timezone.localtime(dtstart).replace(tzinfo=None)
+        skip = timezone.localtime(skip_before).replace(tzinfo=None) if skip_before is not None else None
+        produced = 0
+        for local in self._local_starts(first, skip):
+            start = timezone.make_aware(local)
+            if self.until is not None and start > self.until:
+                return
+            produced += 1
+            if self.count is not None and produced > self.count:
+                return
+            if start not in self.exdates:
+                yield start
+
+    def occurrences(
+        self,
+        dtstart: datetime,
+        duration: timedelta,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        """
+        (початок, кінець) повторень, що перетинаються з [window_start, window_end)
+
+        Лінива: зупиняється на кінці вікна або після limit повторень.
+        """
+        skip_before = window_start - duration if window_start is not None else None
+        produced = 0
+        for start in self.starts(dtstart, skip_before):
+            if window_end is not None and start >= window_end:
+                return
+            end = start + duration
+            if window_start is not None and end <= window_start:
+                continue
+            yield start, end
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+
+    def is_occurrence(self, dtstart: datetime, start: datetime) -> bool:
+        """Чи є start початком повторення серії"""
+        for candidate in self.starts(dtstart, skip_before=start - timedelta(seconds=1)):
+            if candidate >= start:
+                return candidate == start
+        return False
+
+    def series_end(self, dtstart: datetime, duration: timedelta) -> datetime:
+        """
+        Верхня межа кінця серії для віконних запитів
+
+        COUNT - кінець останнього повторення, UNTIL - UNTIL + тривалість,
+        без обмежень - OPEN_END.
+        """
+        if self.until is not None:
+            return self.until + duration
+        if self.count is None:
+            return OPEN_END
+        last = dtstart
+        for last in self.starts(dtstart):
+            pass
+        return max(last, dtstart) + duration
+
+
+# --- RSVP на повторення та матеріалізація ---
+
+
+class OccurrenceService:
+    """RSVP на окремі повторення серій і матеріалізація EventOccurrence"""
+
+    @staticmethod
+    def rsvp_keys(
+        user: Optional["AbstractUser"], event_ids: Iterable[int]
+    ) -> Tuple[Set[Tuple[int, datetime]], Dict[Tuple[int, datetime], int]]:
+        """
+        RSVP користувача та кількість "going" по повтореннях серій
+
+        Два запити (другий - лише для автентифікованого користувача).
+
+        Returns:
+            ({(event_id, occurrence_start)} користувача, {(event_id, occurrence_start): going})
+        """
+        from django.db.models import Count
+        from tickets.models import RSVP
+
+        event_ids = list(event_ids)
+        if not event_ids:
+            return set(), {}
+        going = {
+            (event_id, start): n
+            for event_id, start, n in RSVP.objects.filter(event_id__in=event_ids, status="going")
+            .order_by()
+            .values_list("event_id", "occurrence_start")
+            .annotate(n=Count("pk"))
+        }
+        own = set()
+        if user is not None and user.is_authenticated:
+            own = set(
+                RSVP.objects.filter(event_id__in=event_ids, user=user).values_list("event_id", "occurrence_start")
+            )
+        return own, going
+
+    @staticmethod
+    def remap_rsvps(event, previous_starts_at: datetime) -> Tuple[int, int]:
+        """
+        Ключі RSVP після зміни початку, правила чи винятків події
+
+        - разова подія: усі RSVP - на SINGLE_OCCURRENCE;
+        - серія: RSVP на повторення, що лишилося, не змінюється; решта
+          зсувається разом із початком серії (у місцевому часі), а RSVP на
+          разову подію, що стала серією, - на перше повторення;
+        - RSVP без відповідного повторення або дубль (користувач уже
+          зареєстрований на цільове повторення) видаляється - з сигналами,
+          як скасування.
+
+        Returns:
+            (переназначено, видалено)
+        """
+        from tickets.models import RSVP, SINGLE_OCCURRENCE
+
+        recurrence = event.recurrence
+        shift = (
+            timezone.localtime(event.starts_at).replace(tzinfo=None)
+            - timezone.localtime(previous_starts_at).replace(tzinfo=None)
+        )
+
+        def target(start: datetime) -> Optional[datetime]:
+            if recurrence is None:
+                return SINGLE_OCCURRENCE
+            if start == SINGLE_OCCURRENCE:
+                candidate = event.starts_at
+            elif recurrence.is_occurrence(event.starts_at, start):
+                return start
+            else:
+                candidate = timezone.make_aware(timezone.localtime(start).replace(tzinfo=None) + shift)
+            return candidate if recurrence.is_occurrence(event.starts_at, candidate) else None
+
+        rsvps = list(RSVP.objects.filter(event=event).order_by("created_at", "pk"))
+        targets = {rsvp.pk: target(rsvp.occurrence_start) for rsvp in rsvps}
+        # Незмінні ключі займаються першими; зсув - від краю серії, щоб
+        # ланцюжок A→B, B→C одного користувача не перетинався з ще не зсунутим рядком
+        unchanged = [rsvp for rsvp in rsvps if targets[rsvp.pk] == rsvp.occurrence_start]
+        moving = sorted(
+            (rsvp for rsvp in rsvps if targets[rsvp.pk] != rsvp.occurrence_start),
+            key=lambda rsvp: rsvp.occurrence_start,
+            reverse=shift > timedelta(0),
+        )
+        taken = {(rsvp.user_id, rsvp.occurrence_start) for rsvp in unchanged}
+        remapped, stale = [], []
+        for rsvp in moving:
+            key = (rsvp.user_id, targets[rsvp.pk])
+            if targets[rsvp.pk] is None or key in taken:
+                stale.append(rsvp.pk)
+                continue
+            taken.add(key)
+            rsvp.occurrence_start = targets[rsvp.pk]
+            remapped.append(rsvp)
+
+        deleted = RSVP.objects.filter(pk__in=stale).delete()[0] if stale else 0
+        for rsvp in remapped:
+            rsvp.save(update_fields=["occurrence_start", "updated_at"])
+        return len(remapped), deleted
+
+    @staticmethod
+    def upcoming(event, limit: int = 10, now: Optional[datetime] = None) -> List[Tuple[datetime, datetime]]:
+        """Найближчі повторення серії, що ще не почалися"""
+        recurrence = event.recurrence
+        if recurrence is None:
+            return []
+        now = now or timezone.now()
+        duration = event.ends_at - event.starts_at
+        # +1: повторення, що саме триває, перетинає вікно, але не підходить
+        return [
+            (start, end)
+            for start, end in recurrence.occurrences(event.starts_at, duration, now, limit=limit + 1)
+            if start > now
+        ][:limit]
+
+    @staticmethod
+    def materialize(events=None, horizon_days: Optional[int] = None, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Рядки EventOccurrence для повторень у [now, now + horizon_days)
+
+        Зайві рядки серії в межах горизонту (змінене правило, винятки,
+        скасована серія) видаляються; рядки поза горизонтом не чіпаються.
+
+        Args:
+            events: Серії (None - усі опубліковані повторювані події)
+            horizon_days: Горизонт (None - RECURRENCE["MATERIALIZE_DAYS"])
+
+        Returns:
+            (створено, видалено)
+        """
+        from .models import Event, EventOccurrence
+
+        horizon_days = get_config()["MATERIALIZE_DAYS"] if horizon_days is None else horizon_days
+        if horizon_days <= 0:
+            return 0, 0
+        now = now or timezone.now()
+        horizon = now + timedelta(days=horizon_days)
+        if events is None:
+            events = Event.objects.filter(status=Event.PUBLISHED, starts_at__lt=horizon, series_ends_at__gt=now).exclude(
+                recurrence_rule=""
+            )
+
+        created = deleted = 0
+        for event in events:
+            recurrence = event.recurrence if event.status == Event.PUBLISHED else None
+            wanted = {}
+            if recurrence is not None:
+                duration = event.ends_at - event.starts_at
+                wanted = dict(recurrence.occurrences(event.starts_at, duration, now, horizon))
+            existing = set(
+                EventOccurrence.objects.filter(event=event, starts_at__gte=now, starts_at__lt=horizon)
+                .values_list("starts_at", flat=True)
+            )
+            stale = existing - set(wanted)
+            if stale:
+                deleted += EventOccurrence.objects.filter(event=event, starts_at__in=stale).delete()[0]
+            missing = [
+                EventOccurrence(event=event, starts_at=start, ends_at=end)
+                for start, end in wanted.items()
+                if start not in existing and start >= now
+            ]
+            created += len(EventOccurrence.objects.bulk_create(missing, ignore_conflicts=True))
+        return created, deleted
@@ -0,0 +1,370 @@
+"""
+Фонова обробка зображень відгуків
+
+Завантажене фото (часто 5-10 МБ з телефона) після коміту відгуку
+обробляється в пулі процесів (events/image_processing.py): поворот за
+EXIF, зменшення до MAX_DIMENSION, варіанти ширин WIDTHS у форматах
+FORMATS, без метаданих. Нормалізоване зображення замінює оригінал
+у сховищі (EXIF з GPS не залишається на сервері), варіанти лежать
+у VARIANTS_DIR/<id відгуку>/, а їх опис - у Review.image_variants.
+
+Поки обробка не завершилась, сторінка показує оригінал. Пул - spawn:
+процеси не успадковують з'єднань з БД; результат записує потік пулу
+в батьківському процесі. ASYNC=False обробляє одразу (тести, скрипти).
+Якщо процес пулу аварійно завершився (OOM, segfault), пул стає зламаним
+(BrokenProcessPool): його файли отримують помилку, а наступне
+завантаження створює новий пул.
+
+Поле image_variants:
+    {"version": ..., "width": 1536, "height": 2048, "normalized": true,
+     "sizes": [{"width": 320, "height": 427, "webp": "<ім'я>", "jpeg": "<ім'я>"}, ...]}
+або {"version": ..., "error": "..."} для файлу, який не вдалося прочитати.
+version - відбиток налаштувань: зміна WIDTHS чи QUALITY робить варіанти
+застарілими для команди process_review_images.
+
+Налаштування: settings.REVIEW_IMAGES поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import PurePosixPath
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+
+from .image_processing import IMAGE_ERRORS, ProcessedImage, process_image
+
+DEFAULTS = {
+    "ENABLED": True,
+    # False - обробка одразу після коміту в поточному процесі
+    "ASYNC": True,
+    "WORKERS": 2,
+    "MAX_DIMENSION": 2048,
+    "WIDTHS": [320, 640, 1280],
+    "FORMATS": ["webp", "jpeg"],
+    "QUALITY": 82,
+    "VARIANTS_DIR": "review_photos/variants",
+}
+
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_config() -> dict:
+    """Налаштування: settings.REVIEW_IMAGES поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "REVIEW_IMAGES", {}) or {})
+    return config
+
+
+def config_version(config: Optional[dict] = None) -> str:
+    """Відбиток налаштувань, від яких залежать файли варіантів"""
+    config = config or get_config()
+    signature = repr([config[key] for key in ("MAX_DIMENSION", "WIDTHS", "FORMATS", "QUALITY")])
+    return hashlib.sha256(signature.encode()).hexdigest()[:12]
+
+
+def processing_options(config: Optional[dict] = None) -> dict:
+    """Аргументи process_image з налаштувань"""
+    config = config or get_config()
+    return {
+        "max_dimension": config["MAX_DIMENSION"],
+        "widths": tuple(config["WIDTHS"]),
+        "formats": tuple(config["FORMATS"]),
+        "quality": config["QUALITY"],
+    }
+
+
+def pool_available() -> bool:
+    """
+    Демонічний процес (воркер multiprocessing.Pool, prefork-воркер черги
+    задач) не може мати дочірніх процесів - тоді обробка йде в ньому самому
+    """
+    return not multiprocessing.current_process().daemon
+
+
+def make_pool(workers: int) -> ProcessPoolExecutor:
+    """Пул процесів spawn - без успадкованих з'єднань з БД і потоків"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Спільний пул процесу веб-сервера (створюється з першим завантаженням)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = make_pool(get_config()["WORKERS"])
+        return _pool
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
+
+
+def discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Прибрати зламаний спільний пул - get_pool() створить новий"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+class ReviewPicture(NamedTuple):
+    """Джерела <picture> для обробленого зображення відгуку"""
+
+    src: str
+    jpeg_srcset: str
+    webp_srcset: str
+    full: str
+    width: int
+    height: int
+
+
+def picture(variants: dict) -> Optional[ReviewPicture]:
+    """ReviewPicture з Review.image_variants (None - ще не оброблено)"""
+    sizes = variants.get("sizes") if variants else None
+    if not sizes:
+        return None
+
+    def srcset(fmt: str) -> str:
+        return ", ".join(f"{default_storage.url(size[fmt])} {size['width']}w" for size in sizes if size.get(fmt))
+
+    jpeg_sizes = [size for size in sizes if size.get("jpeg")]
+    if not jpeg_sizes:
+        return None
+    return ReviewPicture(
+        src=default_storage.url(jpeg_sizes[0]["jpeg"]),
+        jpeg_srcset=srcset("jpeg"),
+        webp_srcset=srcset("webp"),
+        full=default_storage.url(jpeg_sizes[-1]["jpeg"]),
+        width=variants["width"],
+        height=variants["height"],
+    )
+
+
+class ReviewImageService:
+    """Запуск обробки, збереження результатів і файли варіантів"""
+
+    @staticmethod
+    def needs_processing(image_name: str, variants: dict, config: Optional[dict] = None) -> bool:
+        return bool(image_name) and (variants or {}).get("version") != config_version(config)
+
+    @staticmethod
+    def schedule(review_id: int) -> None:
+        """Обробити зображення відгуку після коміту (у пулі або одразу)"""
+        config = get_config()
+        if not config["ENABLED"]:
+            return
+        transaction.on_commit(partial(ReviewImageService._submit, review_id, config))
+
+    @staticmethod
+    def _submit(review_id: int, config: dict) -> None:
+        loaded = ReviewImageService.load(review_id)
+        if loaded is None:
+            return
+        name, variants, data = loaded
+        if not config["ASYNC"] or not pool_available():
+            ReviewImageService.store(review_id, name, variants, ReviewImageService.run(data, config), config)
+            return
+        pool = get_pool()
+        try:
+            future = pool.submit(process_image, data, **processing_options(config))
+        except BrokenProcessPool:
+            discard_pool(pool)
+            pool = get_pool()
+            future = pool.submit(process_image, data, **processing_options(config))
+        future.add_done_callback(partial(ReviewImageService._done, review_id, name, variants, config, pool))
+
+    @staticmethod
+    def _done(
+        review_id: int, name: str, variants: dict, config: dict, pool: ProcessPoolExecutor, future: Future
+    ) -> None:
+        # Потік пулу, а не запиту - з'єднання з БД закриваються тут
+        try:
+            result = ReviewImageService.result(future)
+            if isinstance(result, BrokenProcessPool):
+                discard_pool(pool)
+            ReviewImageService.store(review_id, name, variants, result, config)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def run(data: bytes, config: dict):
+        """process_image у поточному процесі; помилка файлу повертається, а не піднімається"""
+        try:
+            return process_image(data, **processing_options(config))
+        except IMAGE_ERRORS as exc:
+            return exc
+
+    @staticmethod
+    def result(future: Future):
+        """Результат пулу; помилка файлу чи зламаний пул повертається, а не піднімається"""
+        try:
+            return future.result()
+        except (*IMAGE_ERRORS, BrokenProcessPool) as exc:
+            return exc
+
+    @staticmethod
+    def load(review_id: int) -> Optional[Tuple[str, dict, bytes]]:
+        """(ім'я файлу, поточні варіанти, байти) або None - зображення немає"""
+        from .models import Review
+
+        row = Review.objects.filter(pk=review_id).values_list("image", "image_variants").first()
+        if row is None or not row[0]:
+            return None
+        name, variants = row
+        try:
+            with default_storage.open(name, "rb") as source:
+                return name, variants or {}, source.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def store(review_id: int, name: str, previous: dict, result, config: Optional[dict] = None) -> bool:
+        """
+        Записати варіанти й нормалізоване зображення, оновити відгук
+
+        Відгук оновлюється лише якщо його зображення досі name (користувач
+        міг замінити чи видалити його, поки тривала обробка); інакше щойно
+        записані файли видаляються. Returns: чи оновлено відгук.
+        """
+        from .detail_cache import EventDetailCacheService
+        from .http_cache import PublicPageCacheService
+        from .models import Review
+
+        config = config or get_config()
+        version = config_version(config)
+        written: List[str] = []
+        image_name = name
+        if isinstance(result, ProcessedImage):
+            stem = PurePosixPath(name).stem
+            directory = f"{config['VARIANTS_DIR'].rstrip('/')}/{review_id}"
+            sizes = {}
+            for key, content in result.files.items():
+                if key == "original":
+                    continue
+                width, fmt = key
+                variant_name = f"{directory}/{stem}-{width}.{EXTENSIONS[fmt]}"
+                if default_storage.exists(variant_name):
+                    default_storage.delete(variant_name)
+                written.append(default_storage.save(variant_name, ContentFile(content)))
+                sizes.setdefault(width, {"width": width, "height": round(result.height * width / result.width)})
+                sizes[width][fmt] = written[-1]
+            if not previous.get("normalized"):
+                image_name = default_storage.save(
+                    str(PurePosixPath(name).with_suffix(".jpg")), ContentFile(result.files["original"])
+                )
+                written.append(image_name)
+            variants = {
+                "version": version,
+                "width": result.width,
+                "height": result.height,
+                "normalized": True,
+                "sizes": [sizes[width] for width in sorted(sizes)],
+            }
+        else:
+            variants = {"version": version, "error": str(result)}
+
+        event_id = Review.objects.filter(pk=review_id, image=name).values_list("event_id", flat=True).first()
+        updated = event_id is not None and Review.objects.filter(pk=review_id, image=name).update(
+            image=image_name, image_variants=variants
+        )
+        if not updated:
+            for written_name in written:
+                default_storage.delete(written_name)
+            return False
+
+        stale = set(ReviewImageService.variant_files(previous)) - set(written)
+        if image_name != name:
+            stale.add(name)
+        for stale_name in stale:
+            default_storage.delete(stale_name)
+        # update() не викликає сигнали Review - сторінку події інвалідуємо тут
+        EventDetailCacheService.touch([event_id])
+        PublicPageCacheService.purge_events([event_id])
+        return True
+
+    @staticmethod
+    def variant_files(variants: dict) -> List[str]:
+        return [size[fmt] for size in (variants or {}).get("sizes", ()) for fmt in EXTENSIONS if size.get(fmt)]
+
+    @staticmethod
+    def delete_variants(variants: dict) -> None:
+        """Файли варіантів видаленого відгуку чи заміненого зображення (після коміту)"""
+        names = ReviewImageService.variant_files(variants)
+        if names:
+            transaction.on_commit(lambda: [default_storage.delete(name) for name in names])
+
+    @staticmethod
+    def backfill(review_ids: Iterable[int], workers: int, in_flight: Optional[int] = None) -> Iterator[Tuple[int, bool]]:
+        """
+        Обробка наявних зображень окремим пулом; результати записуються
+        в поточному потоці
+
+        У пулі одночасно не більше in_flight файлів (за замовчуванням
+        2 x workers) - пам'ять не залежить від кількості відгуків.
+        Зламаний пул замінюється новим, а файли в ньому записуються з помилкою.
+        Без можливості створити пул (pool_available) - послідовно.
+
+        Yields: (id відгуку, чи вдалося обробити)
+        """
+        config = get_config()
+        options = processing_options(config)
+        in_flight = in_flight or 2 * workers
+        pending = {}
+
+        def drain(limit: int):
+            while len(pending) > limit:
+                done = next(as_completed(pending))
+                review_id, name, variants = pending.pop(done)
+                result = ReviewImageService.result(done)
+                stored = ReviewImageService.store(review_id, name, variants, result, config)
+                yield review_id, stored and isinstance(result, ProcessedImage)
+
+        if not pool_available():
+            for review_id in review_ids:
+                loaded = ReviewImageService.load(review_id)
+                if loaded is None:
+                    yield review_id, False
+                    continue
+                name, variants, data = loaded
+                result = ReviewImageService.run(data, config)
+                stored = ReviewImageService.store(review_id, name, variants, result, config)
+                yield review_id, stored and isinstance(result, ProcessedImage)
+            return
+
+        pool = make_pool(workers)
+        try:
+            for review_id in review_ids:
+                loaded = ReviewImageService.load(review_id)
+                if loaded is None:
+                    yield review_id, False
+                    continue
+                name, variants, data = loaded
+                try:
+                    future = pool.submit(process_image, data, **options)
+                except BrokenProcessPool:
+                    # Файли зламаного пулу вже отримали помилку - далі новим пулом
+                    pool.shutdown(wait=False)
+                    pool = make_pool(workers)
+                    future = pool.submit(process_image, data, **options)
+                pending[future] = (review_id, name, variants)
+                yield from drain(in_flight - 1)
+            yield from drain(0)
+        finally:
+            pool.shutdown()
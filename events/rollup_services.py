@@ -0,0 +1,197 @@
+"""
+Сервіс денних rollup-лічильників для адмін-аналітики
+
+Лічильники підтримуються інкрементально:
+- сигнали збільшують рядок поточного дня при кожній події (створення,
+  публікація, скасування, архівування, RSVP, реєстрація користувача);
+- команда rollup_daily_stats за розкладом (cron) звіряє лічильники,
+  що відновлюються з сирих таблиць, та виконує backfill історії.
+
+Будь-який період - це сума рядків DailyRollup (до кількох сотень).
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from .models import DailyRollup, Event
+
+COUNTER_FIELDS = (
+    "events_created",
+    "events_published",
+    "events_cancelled",
+    "events_archived",
+    "rsvps_created",
+    "rsvps_cancelled",
+    "users_joined",
+)
+
+# Лічильники, які можна точно відновити з сирих таблиць
+DERIVED_FIELDS = ("events_created", "rsvps_created", "users_joined")
+
+BUCKETS = ("day", "week")
+
+
+class RollupService:
+    """Запис, перерахунок та читання денних rollup-лічильників"""
+
+    @staticmethod
+    def record(field: str, amount: int = 1, day: Optional[date] = None) -> None:
+        """
+        Атомарно збільшити лічильник за день (за замовчуванням - сьогодні)
+
+        Рядок дня створюється за потреби; інкремент через F() безпечний
+        для паралельних запитів.
+        """
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Невідомий лічильник: {field}")
+        if amount <= 0:
+            return
+
+        day = day or timezone.localdate()
+        updated = DailyRollup.objects.filter(date=day).update(**{field: F(field) + amount})
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                DailyRollup.objects.create(date=day, **{field: amount})
+        except IntegrityError:
+            # Рядок дня щойно створив паралельний запит
+            DailyRollup.objects.filter(date=day).update(**{field: F(field) + amount})
+
+    @staticmethod
+    def _daily_counts(queryset, date_field: str, start: date, end: date, **filters) -> Dict[date, int]:
+        """GROUP BY день для сирої таблиці у межах [start, end]"""
+        rows = (
+            queryset.filter(
+                **{f"{date_field}__date__gte": start, f"{date_field}__date__lte": end},
+                **filters,
+            )
+            .annotate(day=TruncDate(date_field))
+            .values("day")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        return {row["day"]: row["n"] for row in rows}
+
+    @staticmethod
+    def rebuild(start: date, end: date, estimate_transitions: bool = False) -> int:
+        """
+        Перерахувати rollup-рядки за період з сирих таблиць
+
+        Args:
+            start, end: Межі періоду (включно, локальні дати)
+            estimate_transitions: Також оцінити публікації/скасування/архівування
+                за поточним станом подій (для первинного backfill - переходи
+                статусів в історії не зберігаються). Скасовані RSVP видаляються,
+                тому rsvps_cancelled не відновлюється.
+
+        Returns:
+            Кількість записаних днів
+        """
+        from tickets.models import RSVP
+
+        User = get_user_model()
+        counters = {
+            "events_created": RollupService._daily_counts(Event.objects, "created_at", start, end),
+            "rsvps_created": RollupService._daily_counts(RSVP.objects, "created_at", start, end),
+            "users_joined": RollupService._daily_counts(User.objects, "date_joined", start, end),
+        }
+        if estimate_transitions:
+            counters["events_published"] = RollupService._daily_counts(
+                Event.objects, "created_at", start, end,
+                status__in=[Event.PUBLISHED, Event.ARCHIVED],
+            )
+            counters["events_cancelled"] = RollupService._daily_counts(
+                Event.objects, "updated_at", start, end, status=Event.CANCELLED,
+            )
+            counters["events_archived"] = RollupService._daily_counts(
+                Event.objects, "ends_at", start, end, status=Event.ARCHIVED,
+            )
+
+        existing = {row.date: row for row in DailyRollup.objects.filter(date__range=(start, end))}
+        to_create, to_update = [], []
+        day = start
+        while day <= end:
+            values = {field: counts.get(day, 0) for field, counts in counters.items()}
+            row = existing.get(day)
+            if row is None:
+                if any(values.values()):
+                    to_create.append(DailyRollup(date=day, **values))
+            else:
+                for field, value in values.items():
+                    setattr(row, field, value)
+                to_update.append(row)
+            day += timedelta(days=1)
+
+        with transaction.atomic():
+            DailyRollup.objects.bulk_create(to_create, batch_size=500)
+            if to_update:
+                DailyRollup.objects.bulk_update(to_update, list(counters), batch_size=500)
+        return len(to_create) + len(to_update)
+
+    @staticmethod
+    def period_stats(start: datetime, end: Optional[datetime] = None) -> dict:
+        """
+        Статистика дашборда за період одним запитом до DailyRollup
+
+        Повертає ті самі ключі, що й DashboardStatsService, але як потоки
+        за період: створені/опубліковані/скасовані/архівовані події,
+        нові користувачі та RSVP (з розбивкою за останні тиждень/місяць).
+        """
+        start_day = timezone.localdate(start)
+        end_day = timezone.localdate(end) if end else timezone.localdate()
+        today = timezone.localdate()
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+
+        def total(field, since=None):
+            flt = Q(date__gte=since) if since else None
+            return Sum(field, filter=flt, default=0)
+
+        return DailyRollup.objects.filter(date__range=(start_day, end_day)).aggregate(
+            total_events=total("events_created"),
+            published_events=total("events_published"),
+            cancelled_events=total("events_cancelled"),
+            archived_events=total("events_archived"),
+            total_users=total("users_joined"),
+            new_users_week=total("users_joined", week_ago),
+            new_users_month=total("users_joined", month_ago),
+            total_rsvps=total("rsvps_created"),
+            rsvps_week=total("rsvps_created", week_ago),
+            rsvps_month=total("rsvps_created", month_ago),
+            cancelled_rsvps=total("rsvps_cancelled"),
+        )
+
+    @staticmethod
+    def time_series(start: date, end: date, bucket: str = "day") -> List[dict]:
+        """
+        Часовий ряд лічильників для графіків дашборда
+
+        Args:
+            bucket: "day" або "week" (тижні починаються з понеділка)
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Непідтримуваний bucket: {bucket}")
+
+        qs = DailyRollup.objects.filter(date__range=(start, end))
+        if bucket == "week":
+            qs = qs.annotate(period=TruncWeek("date"))
+        else:
+            qs = qs.annotate(period=F("date"))
+
+        rows = (
+            qs.values("period")
+            .annotate(**{field: Sum(field) for field in COUNTER_FIELDS})
+            .order_by("period")
+        )
+        return [
+            {"period": row["period"].isoformat(), **{field: row[field] for field in COUNTER_FIELDS}}
+            for row in rows
+        ]
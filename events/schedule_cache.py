@@ -0,0 +1,291 @@
+"""
+Матеріалізований персональний розклад у кеші
+
+Повторне відкриття календаря не повинно перебудовувати розклад з БД.
+Для кожного користувача в кеші зберігається знімок:
+
+    {"format": FORMAT, "rows": [компактні кортежі], "stamps": {event_id: штамп},
+     "occurrences": (RSVP користувача на повторення, "going" по повтореннях)}
+
+- rows - усі події користувача (організовані та зареєстровані будь-якого
+  статусу), відсортовані за starts_at; вікно календаря та фільтри
+  декораторів застосовуються до них у пам'яті, без запитів;
+- stamps - версії подій на момент побудови знімка;
+- occurrences - RSVP по повтореннях серій: серія зберігається одним
+  рядком з правилом і розгортається у вікно при читанні.
+
+Інвалідація точна:
+- змінився склад подій користувача (RSVP створено/видалено, подію
+  створено чи передано іншому організатору) - видаляється ключ саме цього
+  користувача;
+- змінилися поля події (час, статус, назва, місце) або кількість
+  учасників перетнула поріг "popular" - змінюється лише штамп події.
+  Знімок із застарілим штампом перебудовується при читанні, тож подія
+  з 50 тис. учасників інвалідується одним записом у кеш, а не 50 тис.
+  видаленнями.
+
+Штамп - час зміни в наносекундах, а не лічильник: витіснений з кешу штамп
+не може "повернутися" до значення, збереженого в старому знімку. Відсутній
+штамп при читанні означає перебудову.
+
+Знімки та штампи зберігаються в кеші CACHE_ALIAS, спільному для всіх
+воркерів (Redis/Memcached; див. CACHES["shared"] у settings): у кеші
+процесу (LocMem) інвалідація з одного воркера не дійшла б до інших.
+
+Налаштування: settings.SCHEDULE_CACHE поверх DEFAULTS.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from event_organizer.db_routing import get_config as get_routing_config
+
+from .recurrence import OccurrenceService, Recurrence
+from .schedule_services import (
+    HighlightedScheduleDecorator,
+    PersonalScheduleService,
+    ScheduleCriteria,
+    ScheduleEntry,
+    ScheduleWindow,
+)
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+
+DEFAULTS = {
+    "ENABLED": True,
+    "TIMEOUT": 3600,
+    # Розклад, більший за MAX_ENTRIES, не матеріалізується - вікна читаються з БД
+    "MAX_ENTRIES": 5000,
+    # Кеш, спільний для всіх воркерів: штамп, змінений в одному процесі,
+    # мають бачити всі (settings.CACHES)
+    "CACHE_ALIAS": "shared",
+}
+
+FORMAT = 3
+USER_KEY = "events:schedule:user:{}"
+EVENT_STAMP_KEY = "events:schedule:event:{}"
+
+# rsvp_count у знімку обрізається до порогу: підсвічуванню "popular" важливо
+# лише, чи досягнуто поріг, тож нові RSVP понад нього знімків не інвалідують
+RSVP_COUNT_CAP = HighlightedScheduleDecorator.POPULAR_THRESHOLD
+
+# Поля події, що потрапляють у знімок (опис - ні: календар завантажує його на вимогу)
+SNAPSHOT_FIELDS = (
+    "title", "starts_at", "ends_at", "status", "location", "series_ends_at", "recurrence_rule", "recurrence_exdates",
+)
+
+# Індекси полів компактного рядка
+(
+    ID, TITLE, STARTS_AT, ENDS_AT, STATUS, LOCATION, IS_ORGANIZER, HAS_RSVP, RSVP_COUNT, SERIES_ENDS_AT, RECURRENCE,
+) = range(11)
+
+
+def get_config() -> dict:
+    """Налаштування: settings.SCHEDULE_CACHE поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SCHEDULE_CACHE", {}) or {})
+    return config
+
+
+def _cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+
+def _new_stamp() -> int:
+    return time.time_ns()
+
+
+def _on_commit_too(action) -> None:
+    """
+    Виконати інвалідацію одразу й ще раз після коміту
+
+    Між сигналом і комітом інший запит може перебудувати знімок зі старих
+    даних; повторна інвалідація після коміту прибирає такий знімок.
+    """
+    action()
+    transaction.on_commit(action)
+
+
+class ScheduleCacheService:
+    """Побудова, читання та інвалідація матеріалізованого розкладу"""
+
+    @staticmethod
+    def build(user: "AbstractUser") -> dict:
+        """
+        Побудувати знімок розкладу з БД: один UNION-запит подій, один - RSVP
+        користувача, один get_many/set_many штампів подій (і два запити RSVP
+        по повтореннях, якщо є серії)
+        """
+        config = get_config()
+        rows_qs = PersonalScheduleService._events_union(user, Q(), registered_any_status=True).values_list(
+            "id", *SNAPSHOT_FIELDS, "organizer_id", "rsvp_count"
+        )
+        limit = config["MAX_ENTRIES"]
+        raw_rows = list(rows_qs[: limit + 1]) if limit else list(rows_qs)
+        if limit and len(raw_rows) > limit:
+            return {"format": FORMAT, "oversized": True, "rows": [], "stamps": {}, "occurrences": (set(), {})}
+
+        rsvp_ids = PersonalScheduleService.get_user_rsvp_event_ids(user)
+        rows = [
+            (
+                event_id, title, starts_at, ends_at, status, location or "",
+                organizer_id == user.pk, event_id in rsvp_ids, min(rsvp_count, RSVP_COUNT_CAP),
+                series_ends_at, Recurrence.parse(rule, exdates) if rule else None,
+            )
+            for event_id, title, starts_at, ends_at, status, location, series_ends_at, rule, exdates,
+            organizer_id, rsvp_count in raw_rows
+        ]
+        own, going = OccurrenceService.rsvp_keys(user, [row[ID] for row in rows if row[RECURRENCE] is not None])
+        # Зареєстровані неопубліковані події зберігаються, але не показуються:
+        # зміна їхнього статусу - це зміна штампа, а не складу подій користувача
+        return {
+            "format": FORMAT,
+            "rows": rows,
+            "stamps": ScheduleCacheService._stamps([row[ID] for row in rows]),
+            "occurrences": (own, {key: min(n, RSVP_COUNT_CAP) for key, n in going.items()}),
+        }
+
+    @staticmethod
+    def _stamps(event_ids: List[int]) -> Dict[int, int]:
+        """Поточні штампи подій; відсутні створюються"""
+        keys = {EVENT_STAMP_KEY.format(event_id): event_id for event_id in event_ids}
+        found = _cache().get_many(list(keys))
+        missing = {key: _new_stamp() for key in keys if key not in found}
+        if missing:
+            _cache().set_many(missing, None)
+            found.update(missing)
+        return {keys[key]: stamp for key, stamp in found.items()}
+
+    @staticmethod
+    def _is_fresh(snapshot: Optional[dict]) -> bool:
+        if not snapshot or snapshot.get("format") != FORMAT:
+            return False
+        stamps = snapshot["stamps"]
+        if not stamps:
+            return True
+        current = _cache().get_many([EVENT_STAMP_KEY.format(event_id) for event_id in stamps])
+        return all(current.get(EVENT_STAMP_KEY.format(event_id)) == stamp for event_id, stamp in stamps.items())
+
+    @staticmethod
+    def get_snapshot(user: "AbstractUser") -> dict:
+        """
+        Знімок з кешу або щойно побудований (і збережений)
+
+        Знімок, побудований з репліки, не зберігається, доки будь-який його
+        штамп молодший за STICKY_SECONDS: репліка могла ще не наздогнати
+        primary, а зі свіжими штампами застарілий знімок вважався б актуальним
+        (як у detail_cache).
+        """
+        from .models import Event
+
+        key = USER_KEY.format(user.pk)
+        snapshot = _cache().get(key)
+        if not ScheduleCacheService._is_fresh(snapshot):
+            snapshot = ScheduleCacheService.build(user)
+            from_replica = (router.db_for_read(Event) or DEFAULT_DB_ALIAS) != DEFAULT_DB_ALIAS
+            settled_before = _new_stamp() - get_routing_config()["STICKY_SECONDS"] * 1_000_000_000
+            if not from_replica or all(stamp <= settled_before for stamp in snapshot["stamps"].values()):
+                _cache().set(key, snapshot, get_config()["TIMEOUT"])
+        return snapshot
+
+    @staticmethod
+    def get_entries(
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
+        """
+        Записи розкладу зі знімка з тими ж правилами, що й SQL-шлях
+
+        Для завеликого розкладу (MAX_ENTRIES) - запит до БД з вікном.
+        """
+        snapshot = ScheduleCacheService.get_snapshot(user)
+        if snapshot.get("oversized"):
+            return PersonalScheduleService.get_user_schedule_entries(user, window, criteria)
+
+        criteria = criteria or ScheduleCriteria()
+        now: Optional[datetime] = timezone.now() if criteria.only_upcoming else None
+        entries = []
+        for row in snapshot["rows"]:
+            if not row[IS_ORGANIZER] and row[STATUS] != "published":
+                continue
+            if window is not None and not (row[STARTS_AT] < window.end and row[SERIES_ENDS_AT] > window.start):
+                continue
+            if now is not None and (row[SERIES_ENDS_AT] if row[RECURRENCE] else row[STARTS_AT]) <= now:
+                continue
+            if criteria.only_organizer and not row[IS_ORGANIZER]:
+                continue
+            if criteria.only_published and row[STATUS] != "published":
+                continue
+            entries.append(ScheduleEntry(
+                event_id=row[ID],
+                title=row[TITLE],
+                starts_at=row[STARTS_AT],
+                ends_at=row[ENDS_AT],
+                status=row[STATUS],
+                location=row[LOCATION],
+                is_organizer=row[IS_ORGANIZER],
+                has_rsvp=row[HAS_RSVP],
+                rsvp_count=row[RSVP_COUNT],
+                recurrence=row[RECURRENCE],
+            ))
+        return PersonalScheduleService.expand_occurrences(user, entries, window, now, snapshot["occurrences"])
+
+    # --- інвалідація ---
+
+    @staticmethod
+    def invalidate_users(user_ids: Iterable[int]) -> None:
+        """Змінився склад подій користувачів - видалити їхні знімки"""
+        keys = [USER_KEY.format(user_id) for user_id in set(user_ids) if user_id is not None]
+        if keys:
+            _on_commit_too(lambda: _cache().delete_many(keys))
+
+    @staticmethod
+    def touch_events(event_ids: Iterable[int]) -> None:
+        """Змінилися дані подій - нові штампи (знімки з ними перебудуються при читанні)"""
+        keys = [EVENT_STAMP_KEY.format(event_id) for event_id in set(event_ids)]
+        if keys:
+            _on_commit_too(lambda: _cache().set_many({key: _new_stamp() for key in keys}, None))
+
+    @staticmethod
+    def rsvp_changed(rsvp) -> None:
+        """
+        RSVP створено, видалено чи змінено статус
+
+        Склад подій змінюється лише для власника RSVP; для решти учасників
+        важливо тільки, чи кількість "going" перетнула поріг популярності
+        (для серії - на тому самому повторенні).
+        """
+        from tickets.models import RSVP
+
+        ScheduleCacheService.invalidate_users([rsvp.user_id])
+        going = RSVP.objects.filter(
+            event_id=rsvp.event_id, occurrence_start=rsvp.occurrence_start, status="going"
+        ).count()
+        if going in (RSVP_COUNT_CAP - 1, RSVP_COUNT_CAP):
+            ScheduleCacheService.touch_events([rsvp.event_id])
+
+
+class MaterializedScheduleProvider:
+    """
+    Провайдер розкладу з матеріалізованого знімка (замість BaseScheduleProvider)
+
+    Повторні завантаження календаря не виконують запитів до розкладу.
+    """
+
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
+        return ScheduleCacheService.get_entries(user, window, criteria)
@@ -7,6 +7,21 @@ DTO Pattern та PersonalScheduleService для роботи з персонал
 Також реалізує Decorator Pattern для обгорток розкладу:
 - FilteredScheduleDecorator: фільтрація за параметрами
 - HighlightedScheduleDecorator: підсвічування подій
+
+Календар отримує розклад вікнами (ScheduleWindow): лише записи, що
+перетинаються з видимим періодом, а не всю історію користувача.
+
+Фільтри декораторів не застосовуються до готового списку в Python:
+ланцюжок збирає їх у ScheduleCriteria, яка передається вниз до
+BaseScheduleProvider і стає умовами SQL-запиту.
+
+Записи будуються з кортежів values_list (без ORM-об'єктів), опис події
+не завантажується, доки його не попросять (load_descriptions), а JSON
+календаря пишеться ScheduleJsonEncoder одразу в байти, без проміжних
+словників.
+
+Повторювана подія (серія) - один рядок запиту; expand_occurrences
+розгортає його в записи повторень лише в межах вікна (events/recurrence.py).
 """
 from __future__ import annotations
 
@@ -14,22 +29,73 @@ import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, List, Protocol, Set
+from json.encoder import encode_basestring
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
 
 from django.db.models import Q, QuerySet
 from django.utils import timezone
 
+from .recurrence import OccurrenceService, Recurrence, get_config as get_recurrence_config
+
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractUser
 
 
-@dataclass
+@dataclass(frozen=True)
+class ScheduleWindow:
+    """
+    Період календаря [start, end)
+
+    Подія потрапляє у вікно, якщо перетинається з ним:
+    starts_at < end AND series_ends_at > start - діапазонна умова по
+    індексу (starts_at, series_ends_at), тож обсяг читання залежить від
+    вікна, а не від усієї історії подій. Для разової події series_ends_at
+    дорівнює ends_at; серія відбирається цілком і розгортається в Python.
+    """
+
+    start: datetime
+    end: datetime
+
+    def overlap_q(self, prefix: str = "") -> Q:
+        """Q-умова перетину з вікном (prefix - шлях до Event, напр. "event__")"""
+        return Q(**{f"{prefix}starts_at__lt": self.end, f"{prefix}series_ends_at__gt": self.start})
+
+    def overlaps(self, starts_at: datetime, ends_at: datetime) -> bool:
+        return starts_at < self.end and ends_at > self.start
+
+
+@dataclass(frozen=True)
+class ScheduleCriteria:
+    """
+    Умови відбору, зібрані декораторами ланцюжка до виконання запиту
+
+    Кожен FilteredScheduleDecorator лише звужує умови (логічне І),
+    тож порядок декораторів на результат не впливає.
+    """
+
+    only_upcoming: bool = False
+    only_organizer: bool = False
+    only_published: bool = False
+
+    def narrow(self, **flags: bool) -> "ScheduleCriteria":
+        """Нові умови: поточні та додаткові прапорці"""
+        return replace(self, **{name: getattr(self, name) or value for name, value in flags.items()})
+
+
+@dataclass(frozen=True, slots=True)
 class ScheduleEntry:
     """
     Data Transfer Object для запису в розкладі
     
     Інкапсулює дані про подію для відображення в календарі,
     уникаючи передачі повних ORM-об'єктів у presentation layer.
+    
+    Незмінний, зі __slots__: 10 тис. записів не тримають по __dict__ кожен.
+    description=None - опис не завантажено (календарю він не потрібен);
+    PersonalScheduleService.load_descriptions підвантажує його за потреби.
+    recurrence - правило серії: запис повторення має starts_at/ends_at
+    самого повторення (це й ключ RSVP на нього).
     """
     
     event_id: int
@@ -38,14 +104,15 @@ class ScheduleEntry:
     ends_at: datetime
     status: str
     location: str
-    description: str
     is_organizer: bool
     has_rsvp: bool
+    description: Optional[str] = None
     highlight_reason: str = ""
     rsvp_count: int = 0
+    recurrence: Optional[Recurrence] = None
     
     def to_dict(self) -> dict:
-        """Конвертує DTO в словник для JSON серіалізації"""
+        """Конвертує DTO в словник для JSON серіалізації (опис - лише завантажений)"""
         result = {
             "id": self.event_id,
             "title": self.title,
@@ -53,20 +120,99 @@ class ScheduleEntry:
             "ends_at": self.ends_at.isoformat(),
             "status": self.status,
             "location": self.location,
-            "description": self.description,
-            "is_organizer": self.is_organizer,
-            "has_rsvp": self.has_rsvp,
         }
+        if self.description is not None:
+            result["description"] = self.description
+        result["is_organizer"] = self.is_organizer
+        result["has_rsvp"] = self.has_rsvp
         if self.highlight_reason:
             result["highlight_reason"] = self.highlight_reason
+        if self.recurrence is not None:
+            result["recurring"] = True
         return result
 
 
+class ScheduleJsonEncoder:
+    """
+    JSON календаря одразу в байти
+    
+    Один прохід по записах чи кортежах values_list: рядки екрануються
+    C-функцією json.encoder.encode_basestring, фрагменти збираються в
+    список і кодуються в UTF-8 один раз. Формат збігається з
+    to_dict() + json.dumps (крім ensure_ascii: кирилиця не екранується).
+    """
+    
+    # Поля values_list для анонімного календаря (get_public_schedule_rows)
+    PUBLIC_FIELDS = ("id", "title", "starts_at", "ends_at", "status", "location")
+    
+    @staticmethod
+    def _bool(value: bool) -> str:
+        return "true" if value else "false"
+    
+    @staticmethod
+    def _entry(entry: ScheduleEntry, out: list) -> None:
+        out.append('{"id":%d,"title":%s,"starts_at":"%s","ends_at":"%s","status":%s,"location":%s' % (
+            entry.event_id, encode_basestring(entry.title), entry.starts_at.isoformat(),
+            entry.ends_at.isoformat(), encode_basestring(entry.status), encode_basestring(entry.location),
+        ))
+        if entry.description is not None:
+            out.append(',"description":' + encode_basestring(entry.description))
+        out.append(',"is_organizer":%s,"has_rsvp":%s' % (
+            ScheduleJsonEncoder._bool(entry.is_organizer), ScheduleJsonEncoder._bool(entry.has_rsvp),
+        ))
+        if entry.highlight_reason:
+            out.append(',"highlight_reason":' + encode_basestring(entry.highlight_reason))
+        if entry.recurrence is not None:
+            out.append(',"recurring":true')
+        out.append("}")
+    
+    @staticmethod
+    def _row(row: tuple, out: list) -> None:
+        # (id, title, starts_at, ends_at, status, location[, description])
+        out.append('{"id":%d,"title":%s,"starts_at":"%s","ends_at":"%s","status":%s,"location":%s' % (
+            row[0], encode_basestring(row[1]), row[2].isoformat(), row[3].isoformat(),
+            encode_basestring(row[4]), encode_basestring(row[5] or ""),
+        ))
+        if len(row) > 6:
+            out.append(',"description":' + encode_basestring(row[6] or ""))
+        out.append("}")
+    
+    @staticmethod
+    def encode(
+        window: "ScheduleWindow",
+        entries: Iterable[ScheduleEntry] = (),
+        rows: Iterable[tuple] = (),
+    ) -> bytes:
+        """
+        {"start": ..., "end": ..., "events": [...]} з записів розкладу
+        (entries) або кортежів PUBLIC_FIELDS (rows)
+        """
+        out = ['{"start":"%s","end":"%s","events":[' % (window.start.isoformat(), window.end.isoformat())]
+        first = True
+        for entry in entries:
+            if not first:
+                out.append(",")
+            ScheduleJsonEncoder._entry(entry, out)
+            first = False
+        for row in rows:
+            if not first:
+                out.append(",")
+            ScheduleJsonEncoder._row(row, out)
+            first = False
+        out.append("]}")
+        return "".join(out).encode()
+
+
 class ScheduleProvider(Protocol):
     """Протокол для провайдерів розкладу (Decorator Pattern)"""
     
-    def get_entries(self, user: "AbstractUser") -> List[ScheduleEntry]:
-        """Отримати записи розкладу для користувача"""
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
+        """Отримати записи розкладу для користувача (у межах window та criteria, якщо задано)"""
         ...
 
 
@@ -77,9 +223,14 @@ class BaseScheduleProvider:
     Адаптер до PersonalScheduleService для використання в ланцюжку декораторів.
     """
     
-    def get_entries(self, user: "AbstractUser") -> List[ScheduleEntry]:
-        """Отримати записи розкладу через PersonalScheduleService"""
-        return PersonalScheduleService.get_user_schedule_entries(user)
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
+        """Отримати записи розкладу через PersonalScheduleService (умови - в SQL)"""
+        return PersonalScheduleService.get_user_schedule_entries(user, window, criteria)
 
 
 class ScheduleDecorator(ABC):
@@ -93,7 +244,12 @@ class ScheduleDecorator(ABC):
         self._provider = provider
     
     @abstractmethod
-    def get_entries(self, user: "AbstractUser") -> List[ScheduleEntry]:
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
         """Отримати записи розкладу (має бути реалізовано в підкласах)"""
         pass
 
@@ -106,6 +262,9 @@ class FilteredScheduleDecorator(ScheduleDecorator):
     - only_upcoming: тільки майбутні події
     - only_organizer: тільки події, де користувач організатор
     - only_published: тільки опубліковані події
+    
+    Записи не відкидаються в Python: фільтри додаються до ScheduleCriteria
+    і виконуються базовим провайдером як умови запиту.
     """
     
     def __init__(
@@ -120,21 +279,19 @@ class FilteredScheduleDecorator(ScheduleDecorator):
         self._only_organizer = only_organizer
         self._only_published = only_published
     
-    def get_entries(self, user: "AbstractUser") -> List[ScheduleEntry]:
-        """Отримати відфільтровані записи розкладу"""
-        entries = self._provider.get_entries(user)
-        
-        if self._only_upcoming:
-            now = timezone.now()
-            entries = [e for e in entries if e.starts_at > now]
-        
-        if self._only_organizer:
-            entries = [e for e in entries if e.is_organizer]
-        
-        if self._only_published:
-            entries = [e for e in entries if e.status == "published"]
-        
-        return entries
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
+        """Отримати відфільтровані записи розкладу (фільтри передаються вниз до SQL)"""
+        criteria = (criteria or ScheduleCriteria()).narrow(
+            only_upcoming=self._only_upcoming,
+            only_organizer=self._only_organizer,
+            only_published=self._only_published,
+        )
+        return self._provider.get_entries(user, window, criteria)
 
 
 class HighlightedScheduleDecorator(ScheduleDecorator):
@@ -158,9 +315,14 @@ class HighlightedScheduleDecorator(ScheduleDecorator):
         super().__init__(provider)
         self._highlight_mode = highlight_mode
     
-    def get_entries(self, user: "AbstractUser") -> List[ScheduleEntry]:
+    def get_entries(
+        self,
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> List[ScheduleEntry]:
         """Отримати записи з підсвічуванням"""
-        entries = self._provider.get_entries(user)
+        entries = self._provider.get_entries(user, window, criteria)
         
         if not self._highlight_mode:
             return entries
@@ -208,33 +370,126 @@ class PersonalScheduleService:
     """
     
     @staticmethod
-    def get_user_events_queryset(user: "AbstractUser") -> QuerySet:
+    def get_user_events_queryset(
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+    ) -> QuerySet:
         """
         Отримати QuerySet подій користувача (організовані + зареєстровані)
         
+        UNION ALL двох вибірок, кожна з яких іде своїм індексом:
+        - організовані: Event (organizer_id, starts_at);
+        - зареєстровані: RSVP (user_id, event_id) -> Event за PK, крім
+          власних подій користувача - гілки не перетинаються, тож DISTINCT
+          і GROUP BY по всьому рядку не потрібні.
+        rsvp_count рахується корельованим підзапитом по RSVP (event_id).
+        
         Args:
             user: Користувач
+            window: Лише події, що перетинаються з вікном (None - усі)
+            criteria: Умови декораторів розкладу (None - без фільтрів)
             
         Returns:
-            QuerySet подій з анотацією rsvp_count
+            QuerySet подій з анотацією rsvp_count, відсортований за starts_at
+        """
+        from .models import Event
+        
+        criteria = criteria or ScheduleCriteria()
+        predicates = Q()
+        if window is not None:
+            predicates &= window.overlap_q()
+        if criteria.only_upcoming:
+            # Серія, що почалася раніше, може мати майбутні повторення
+            now = timezone.now()
+            predicates &= Q(starts_at__gt=now) | (~Q(recurrence_rule="") & Q(series_ends_at__gt=now))
+        if criteria.only_published:
+            predicates &= Q(status=Event.PUBLISHED)
+        
+        return PersonalScheduleService._events_union(
+            user, predicates, organized_only=criteria.only_organizer
+        )
+    
+    @staticmethod
+    def _events_union(
+        user: "AbstractUser",
+        predicates: Q,
+        organized_only: bool = False,
+        registered_any_status: bool = False,
+    ) -> QuerySet:
         """
-        from django.db.models import Count
+        UNION ALL організованих і зареєстрованих подій з анотацією rsvp_count
+        
+        registered_any_status=True - зареєстровані події будь-якого статусу
+        (матеріалізований розклад у schedule_cache сам відкидає неопубліковані).
+        """
+        from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+        from tickets.models import RSVP
         from .models import Event
         
-        user_events = Q(organizer=user)
-        registered_events = Q(
-            status=Event.PUBLISHED,
-            rsvps__user=user
+        going = (
+            RSVP.objects.filter(event=OuterRef("pk"), status="going")
+            .order_by()
+            .values("event")
+            .annotate(n=Count("pk"))
+            .values("n")
         )
+        rsvp_count = Coalesce(Subquery(going, output_field=IntegerField()), Value(0))
+        
+        organized = Event.objects.filter(predicates, organizer=user).annotate(rsvp_count=rsvp_count)
+        if organized_only:
+            return organized.order_by("starts_at")
+        
+        # Напівз'єднання: на серію у користувача може бути кілька RSVP (по повтореннях)
+        registered = Event.objects.filter(predicates, pk__in=RSVP.objects.filter(user=user).values("event"))
+        if not registered_any_status:
+            registered = registered.filter(status=Event.PUBLISHED)
+        registered = registered.exclude(organizer=user).annotate(rsvp_count=rsvp_count)
+        return organized.union(registered, all=True).order_by("starts_at")
+    
+    @staticmethod
+    def get_public_schedule_rows(window: ScheduleWindow, include_description: bool = False) -> List[tuple]:
+        """
+        Опубліковані події у вікні для анонімного календаря
+        
+        Один запит values_list() без ORM-об'єктів; кортежі пишуться
+        в JSON напряму ScheduleJsonEncoder.
+        
+        Args:
+            window: Період календаря
+            include_description: Додати опис останнім полем кортежу
+            
+        Returns:
+            Кортежі ScheduleJsonEncoder.PUBLIC_FIELDS (+ description);
+            серії - кортеж на кожне повторення у вікні
+        """
+        from .models import Event
         
-        return Event.objects.filter(
-            user_events | registered_events
-        ).annotate(
-            rsvp_count=Count("rsvps", filter=Q(rsvps__status="going"))
-        ).distinct().order_by("starts_at")
+        fields = ScheduleJsonEncoder.PUBLIC_FIELDS + (("description",) if include_description else ())
+        limit = get_recurrence_config()["MAX_OCCURRENCES"]
+        rows, recurring = [], False
+        for *row, rule, exdates in (
+            Event.objects.filter(window.overlap_q(), status=Event.PUBLISHED)
+            .order_by("starts_at")
+            .values_list(*fields, "recurrence_rule", "recurrence_exdates")
+        ):
+            if not rule:
+                rows.append(tuple(row))
+                continue
+            recurring = True
+            occurrences = Recurrence.parse(rule, exdates).occurrences(
+                row[2], row[3] - row[2], window.start, window.end, limit
+            )
+            rows.extend((row[0], row[1], start, end, *row[4:]) for start, end in occurrences)
+        if recurring:
+            rows.sort(key=itemgetter(2))
+        return rows
     
     @staticmethod
-    def get_user_rsvp_event_ids(user: "AbstractUser") -> Set[int]:
+    def get_user_rsvp_event_ids(
+        user: "AbstractUser", window: Optional[ScheduleWindow] = None
+    ) -> Set[int]:
         """
         Отримати множину ID подій, на які користувач зареєстрований
         
@@ -242,52 +497,145 @@ class PersonalScheduleService:
         
         Args:
             user: Користувач
+            window: Лише події, що перетинаються з вікном (None - усі)
             
         Returns:
             Set з ID подій
         """
         from tickets.models import RSVP
         
-        return set(
-            RSVP.objects.filter(user=user)
-            .values_list("event_id", flat=True)
-        )
+        rsvps = RSVP.objects.filter(user=user)
+        if window is not None:
+            rsvps = rsvps.filter(window.overlap_q("event__"))
+        return set(rsvps.values_list("event_id", flat=True))
     
     @staticmethod
-    def get_user_schedule_entries(user: "AbstractUser") -> List[ScheduleEntry]:
+    def get_user_schedule_entries(
+        user: "AbstractUser",
+        window: Optional[ScheduleWindow] = None,
+        criteria: Optional[ScheduleCriteria] = None,
+        include_description: bool = False,
+    ) -> List[ScheduleEntry]:
         """
         Отримати список ScheduleEntry для користувача
         
         Оптимізовано для уникнення N+1:
-        - Один запит для подій
+        - Один запит для подій (values_list, без ORM-об'єктів)
         - Один запит для RSVP event_ids
         
         Args:
             user: Користувач
+            window: Лише події, що перетинаються з вікном (None - усі)
+            criteria: Умови декораторів розкладу (None - без фільтрів)
+            include_description: Завантажити описи (інакше description=None)
             
         Returns:
             Список ScheduleEntry DTO
         """
-        events_qs = PersonalScheduleService.get_user_events_queryset(user)
-        rsvp_event_ids = PersonalScheduleService.get_user_rsvp_event_ids(user)
+        fields = [
+            "id", "title", "starts_at", "ends_at", "status", "location", "organizer_id", "rsvp_count",
+            "recurrence_rule", "recurrence_exdates",
+        ]
+        if include_description:
+            fields.append("description")
+        rows = PersonalScheduleService.get_user_events_queryset(user, window, criteria).values_list(*fields)
+        rsvp_event_ids = PersonalScheduleService.get_user_rsvp_event_ids(user, window)
+        
+        user_id = user.id
+        entries = [
+            ScheduleEntry(
+                event_id=row[0],
+                title=row[1],
+                starts_at=row[2],
+                ends_at=row[3],
+                status=row[4],
+                location=row[5] or "",
+                is_organizer=(row[6] == user_id),
+                has_rsvp=(row[0] in rsvp_event_ids),
+                description=(row[10] or "") if include_description else None,
+                rsvp_count=row[7],
+                recurrence=Recurrence.parse(row[8], row[9]) if row[8] else None,
+            )
+            for row in rows
+        ]
+        after = timezone.now() if criteria is not None and criteria.only_upcoming else None
+        return PersonalScheduleService.expand_occurrences(user, entries, window, after)
+    
+    @staticmethod
+    def expand_occurrences(
+        user: "AbstractUser",
+        entries: List[ScheduleEntry],
+        window: Optional[ScheduleWindow] = None,
+        after: Optional[datetime] = None,
+        rsvps: Optional[Tuple[Set[Tuple[int, datetime]], Dict[Tuple[int, datetime], int]]] = None,
+    ) -> List[ScheduleEntry]:
+        """
+        Розгорнути серії в записи повторень у межах вікна
+        
+        Організатор бачить усі повторення, учасник - ті, на які
+        зареєструвався. has_rsvp та rsvp_count - по повтореню.
+        Без вікна серія обмежується RECURRENCE["MAX_OCCURRENCES"].
+        
+        Args:
+            user: Користувач
+            entries: Записи, серед яких можуть бути серії (recurrence)
+            window: Вікно календаря (None - без меж)
+            after: Лише повторення, що починаються пізніше (фільтр "майбутні")
+            rsvps: Готовий результат OccurrenceService.rsvp_keys (знімок у кеші)
+            
+        Returns:
+            Записи, відсортовані за starts_at
+        """
+        series = {entry.event_id for entry in entries if entry.recurrence is not None}
+        if not series:
+            return entries
+        own, going = rsvps if rsvps is not None else OccurrenceService.rsvp_keys(user, series)
+        limit = get_recurrence_config()["MAX_OCCURRENCES"]
+        window_start = window.start if window is not None else after
+        window_end = window.end if window is not None else None
         
-        entries = []
-        for event in events_qs:
-            entry = ScheduleEntry(
-                event_id=event.id,
-                title=event.title,
-                starts_at=event.starts_at,
-                ends_at=event.ends_at,
-                status=event.status,
-                location=event.location or "",
-                description=event.description or "",
-                is_organizer=(event.organizer_id == user.id),
-                has_rsvp=(event.id in rsvp_event_ids),
-                rsvp_count=getattr(event, "rsvp_count", 0),
+        result = []
+        for entry in entries:
+            if entry.recurrence is None:
+                result.append(entry)
+                continue
+            occurrences = entry.recurrence.occurrences(
+                entry.starts_at, entry.ends_at - entry.starts_at, window_start, window_end, limit
             )
-            entries.append(entry)
+            for start, end in occurrences:
+                if after is not None and start <= after:
+                    continue
+                key = (entry.event_id, start)
+                if not entry.is_organizer and key not in own:
+                    continue
+                result.append(replace(
+                    entry, starts_at=start, ends_at=end, has_rsvp=key in own, rsvp_count=going.get(key, 0)
+                ))
+        result.sort(key=attrgetter("starts_at"))
+        return result
+    
+    @staticmethod
+    def load_descriptions(entries: Sequence[ScheduleEntry]) -> List[ScheduleEntry]:
+        """
+        Підвантажити описи записам, у яких їх немає (один запит)
+        
+        Args:
+            entries: Записи розкладу
+            
+        Returns:
+            Нові записи з description у тому ж порядку
+        """
+        from .models import Event
         
-        return entries
+        missing = [entry.event_id for entry in entries if entry.description is None]
+        if not missing:
+            return list(entries)
+        descriptions = dict(Event.objects.filter(pk__in=missing).values_list("pk", "description"))
+        return [
+            entry if entry.description is not None
+            else replace(entry, description=descriptions.get(entry.event_id) or "")
+            for entry in entries
+        ]
     
     @staticmethod
     def get_schedule_json_data(user: "AbstractUser") -> str:
@@ -300,6 +648,6 @@ class PersonalScheduleService:
         Returns:
             JSON-рядок з даними подій
         """
-        entries = PersonalScheduleService.get_user_schedule_entries(user)
+        entries = PersonalScheduleService.get_user_schedule_entries(user, include_description=True)
         data = [entry.to_dict() for entry in entries]
         return json.dumps(data)
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from rest_framework import serializers
 from .models import Event
+from .recurrence import Recurrence
 from .states import EventStateManager
 
 
@@ -25,6 +26,8 @@ class EventSerializer(serializers.ModelSerializer):
             "status",
             "organizer",
             "rsvp_count",
+            "recurrence_rule",
+            "recurrence_exdates",
             "created_at",
             "updated_at",
         ]
@@ -42,6 +45,25 @@ class EventSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def validate_recurrence_rule(self, value):
+        """Правило повторення - підтримувана підмножина RRULE (events/recurrence.py)"""
+        if value:
+            try:
+                Recurrence.parse(value)
+            except ValueError as exc:
+                raise serializers.ValidationError(str(exc))
+        return value
+
+    def validate_recurrence_exdates(self, value):
+        """Винятки серії - список дат-часів ISO 8601"""
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Очікується список дат-часів ISO 8601.")
+        try:
+            Recurrence.parse("FREQ=DAILY", value)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("Очікується список дат-часів ISO 8601.")
+        return value
+
     def validate_status(self, value):
         """
         Валідація зміни статусу події через State Pattern.
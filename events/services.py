@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import time
+from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models import Q
 from django.utils import timezone
 
 from .models import Event
 
+ARCHIVE_DEFAULTS = {
+    # Не частіше ніж раз на стільки секунд GET списку запускає архівування
+    # (0 - на кожному запиті, None - лише команда archive_past_events)
+    "LIST_INTERVAL_SECONDS": 60,
+    # Кеш, спільний для всіх воркерів: інакше кожен процес архівував би сам
+    "CACHE_ALIAS": "shared",
+}
+
+ARCHIVE_LAST_RUN_KEY = "events:archive:last_run"
+
+
+def get_archive_config() -> dict:
+    """Налаштування: settings.EVENT_ARCHIVE поверх ARCHIVE_DEFAULTS"""
+    config = dict(ARCHIVE_DEFAULTS)
+    config.update(getattr(settings, "EVENT_ARCHIVE", {}) or {})
+    return config
+
 
 class SingletonMeta(type):
     """Простий Singleton метаклас"""
@@ -23,18 +45,59 @@ class EventArchiveService(metaclass=SingletonMeta):
     """Сервіс для архівування подій"""
 
     def archive_past_events(self) -> int:
-        """Переводить завершені опубліковані події в архів"""
+        """
+        Переводить завершені опубліковані події в архів (серію - після останнього повторення)
+
+        Викликається і з GET списку (replica_reads, через
+        archive_past_events_throttled), тому кандидати читаються
+        з primary, а UPDATE повторно перевіряє статус: подія, скасована на
+        primary, але ще опублікована на репліці чи архівована паралельним
+        запитом, не перезаписується і не рахується в rollup двічі. Записи
+        службові - анонімний перегляд не отримує sticky-cookie.
+        """
+        from event_organizer.db_routing import service_writes
 
         now = timezone.now()
-        queryset = Event.objects.filter(
+        queryset = Event.objects.using(DEFAULT_DB_ALIAS).filter(
             status=Event.PUBLISHED,
-            ends_at__lt=now,
+            series_ends_at__lt=now,
         )
-        count = queryset.count()
-        if count:
-            queryset.update(status=Event.ARCHIVED)
+        event_ids = list(queryset.values_list("id", flat=True))
+        if not event_ids:
+            return 0
+        with service_writes():
+            count = Event.objects.filter(id__in=event_ids, status=Event.PUBLISHED).update(status=Event.ARCHIVED)
+            if count:
+                # update() не викликає сигнали - інвалідуємо фасети, розклади та пишемо rollup вручну
+                from .detail_cache import EventDetailCacheService
+                from .facets import bump_facets_version
+                from .http_cache import PublicPageCacheService
+                from .rollup_services import RollupService
+                from .schedule_cache import ScheduleCacheService
+                bump_facets_version()
+                EventDetailCacheService.touch(event_ids)
+                PublicPageCacheService.purge_events(event_ids)
+                ScheduleCacheService.touch_events(event_ids)
+                RollupService.record("events_archived", count)
         return count
 
+    def archive_past_events_throttled(self) -> int:
+        """
+        archive_past_events для GET списку - не частіше LIST_INTERVAL_SECONDS
+
+        Мітка останнього запуску ставиться через cache.add у спільному кеші:
+        за інтервал UPDATE виконує лише один запит з усіх воркерів, решта
+        показують список без запису. Прострочені події між запусками
+        дочищає команда archive_past_events (cron).
+        """
+        config = get_archive_config()
+        interval = config["LIST_INTERVAL_SECONDS"]
+        if interval is None:
+            return 0
+        if interval and not caches[config["CACHE_ALIAS"]].add(ARCHIVE_LAST_RUN_KEY, time.time_ns(), interval):
+            return 0
+        return self.archive_past_events()
+
     def archive_event(self, event: Event) -> tuple[bool, str | None]:
         """
         Архівує окрему подію з валідацією через State Pattern
@@ -57,37 +120,43 @@ class RSVPService:
     """Сервіс для роботи з RSVP (реєстрацією на події)"""
 
     @staticmethod
-    def get_conflicting_events(user, event: Event) -> List[Event]:
+    def get_conflicting_events(user, event: Event, occurrence_start: Optional[datetime] = None) -> List[Event]:
         """
         Повертає список подій, на які користувач вже зареєстрований
         і які перетинаються в часі з вказаною подією.
         
         Конфлікт часу: події перетинаються, якщо:
         - event.starts_at < other.ends_at AND event.ends_at > other.starts_at
+        
+        Для серій порівнюються повторення: occurrence_start - повторення
+        event, на яке реєструються; для RSVP на серію - його occurrence_start.
         """
         from tickets.models import RSVP
         
-        user_rsvp_event_ids = RSVP.objects.filter(
+        starts_at = occurrence_start or event.starts_at
+        ends_at = starts_at + (event.ends_at - event.starts_at)
+        rsvps = RSVP.objects.filter(
             user=user,
-            status="going"
-        ).values_list("event_id", flat=True)
-        
-        if not user_rsvp_event_ids:
-            return []
-        
-        conflicting = Event.objects.filter(
-            id__in=user_rsvp_event_ids
-        ).filter(
-            starts_at__lt=event.ends_at,
-            ends_at__gt=event.starts_at
+            status="going",
+            event__starts_at__lt=ends_at,
+            event__series_ends_at__gt=starts_at,
         ).exclude(
-            id=event.id
-        )
-        
-        return list(conflicting)
+            event_id=event.id
+        ).select_related("event")
+        
+        conflicting = []
+        for rsvp in rsvps:
+            other = rsvp.event
+            other_starts_at = rsvp.occurrence_start if other.is_recurring else other.starts_at
+            other_ends_at = other_starts_at + (other.ends_at - other.starts_at)
+            if other_starts_at < ends_at and other_ends_at > starts_at and other not in conflicting:
+                conflicting.append(other)
+        return conflicting
 
     @staticmethod
-    def check_time_conflict(user, event: Event) -> Tuple[bool, Optional[Event]]:
+    def check_time_conflict(
+        user, event: Event, occurrence_start: Optional[datetime] = None
+    ) -> Tuple[bool, Optional[Event]]:
         """
         Перевіряє чи є конфлікт часу для RSVP.
         
@@ -96,20 +165,59 @@ class RSVPService:
             - has_conflict: True якщо є конфлікт
             - conflicting_event: перша подія з конфліктом (або None)
         """
-        conflicts = RSVPService.get_conflicting_events(user, event)
+        conflicts = RSVPService.get_conflicting_events(user, event, occurrence_start)
         if conflicts:
             return True, conflicts[0]
         return False, None
 
     @staticmethod
-    def can_create_rsvp(user, event: Event) -> Tuple[bool, Optional[str]]:
+    def parse_occurrence(
+        event: Event, value: Optional[str], check_rule: bool = True
+    ) -> Tuple[Optional[datetime], Optional[str]]:
+        """
+        Ключ RSVP (occurrence_start) з параметра запиту
+        
+        Разова подія - SINGLE_OCCURRENCE (параметр ігнорується); серія
+        вимагає ISO-час початку свого повторення. check_rule=False - не
+        звіряти час із правилом (скасування наявного RSVP за збереженим ключем).
+        
+        Returns:
+            Tuple (occurrence_start, error_message)
+        """
+        from django.utils.dateparse import parse_datetime
+        from tickets.models import SINGLE_OCCURRENCE
+        
+        if not event.is_recurring:
+            return SINGLE_OCCURRENCE, None
+        try:
+            start = parse_datetime(value or "")
+        except ValueError:
+            start = None
+        if start is None:
+            return None, "Оберіть повторення події"
+        if timezone.is_naive(start):
+            start = timezone.make_aware(start)
+        if check_rule and not event.recurrence.is_occurrence(event.starts_at, start):
+            return None, "Подія не має повторення в цей час"
+        return start, None
+
+    @staticmethod
+    def can_create_rsvp(user, event: Event, occurrence_start: Optional[datetime] = None) -> Tuple[bool, Optional[str]]:
         """
         Комплексна перевірка чи можна створити RSVP.
         
+        Для серії перевірки (початок, наявність RSVP, місця, конфлікти)
+        стосуються повторення occurrence_start.
+        
         Returns:
             Tuple (can_create, error_message)
         """
-        from tickets.models import RSVP
+        from tickets.models import RSVP, SINGLE_OCCURRENCE
+        
+        occurrence = occurrence_start if event.is_recurring else None
+        key = occurrence or SINGLE_OCCURRENCE
+        if event.is_recurring and occurrence is None:
+            return False, "Оберіть повторення події"
         
         # Перевірка статусу події
         if event.status == Event.DRAFT:
@@ -122,18 +230,18 @@ class RSVPService:
             return False, "Реєстрація недоступна: подія архівована"
         
         # Перевірка чи подія вже розпочалась
-        if event.starts_at <= timezone.now():
+        if (occurrence or event.starts_at) <= timezone.now():
             return False, "Реєстрація недоступна: подія вже розпочалась"
         
-        if RSVP.objects.filter(user=user, event=event).exists():
+        if RSVP.objects.filter(user=user, event=event, occurrence_start=key).exists():
             return False, "Ви вже зареєстровані на цю подію"
         
         if event.capacity is not None:
-            current = RSVP.objects.filter(event=event, status="going").count()
+            current = RSVP.objects.filter(event=event, occurrence_start=key, status="going").count()
             if current >= event.capacity:
                 return False, "Реєстрація недоступна: всі місця зайняті"
         
-        has_conflict, conflicting_event = RSVPService.check_time_conflict(user, event)
+        has_conflict, conflicting_event = RSVPService.check_time_conflict(user, event, occurrence)
         if has_conflict:
             return False, f"Конфлікт часу: ви вже зареєстровані на подію \"{conflicting_event.title}\", яка перетинається в часі"
         
@@ -2,10 +2,11 @@
 Observer Pattern через Django Signals.
 Реагування на зміни в подіях та RSVP без жорстких залежностей.
 """
+from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 
-from .models import Event
+from .models import Event, Review
 from tickets.models import RSVP
 
 
@@ -15,30 +16,154 @@ def event_pre_save(sender, instance, **kwargs):
     Зберігає попередній стан події перед збереженням.
     Використовує атрибут на інстансі замість глобального словника.
     """
+    from .schedule_cache import SNAPSHOT_FIELDS
+    
+    previous_category = None
+    instance._previous_schedule = None
     if instance.pk:
         try:
             old_event = Event.objects.get(pk=instance.pk)
             # Зберігаємо попередній статус на самому інстансі
             instance._previous_status = old_event.status
+            previous_category = old_event.category
+            instance._previous_organizer_id = old_event.organizer_id
+            # Агрегати відгуків змінюються лише F-виразами (events/ratings.py):
+            # save() екземпляра, завантаженого раніше, не повертає старі значення
+            instance.rating_sum = old_event.rating_sum
+            instance.reviews_count = old_event.reviews_count
+            # Поля матеріалізованого розкладу - для точної інвалідації в post_save
+            instance._previous_schedule = (
+                old_event.organizer_id,
+                tuple(getattr(old_event, field) for field in SNAPSHOT_FIELDS),
+            )
         except Event.DoesNotExist:
             instance._previous_status = None
     else:
         instance._previous_status = None
 
+    # Прив'язка вільного тексту категорії до нормалізованого каталогу
+    if instance.category != previous_category or (instance.category and not instance.category_ref_id):
+        from catalog.services import CategoryService
+        instance.category_ref_id = CategoryService.resolve(instance.category)
+
 
 @receiver(post_save, sender=Event)
 def event_post_save(sender, instance, created, **kwargs):
     """Обробляє зміни в події після збереження"""
     from notifications.services import NotificationService
+    from .detail_cache import EventDetailCacheService
+    from .facets import bump_facets_version
+    from .http_cache import PublicPageCacheService
+    from .rollup_services import RollupService
+    
+    bump_facets_version()
+    EventDetailCacheService.touch([instance.pk])
+    PublicPageCacheService.purge_events([instance.pk])
+    _remap_rsvps(instance, created)
+    _invalidate_event_schedules(instance, created)
+    _materialize_occurrences(instance, created)
+    
+    previous_organizer_id = getattr(instance, "_previous_organizer_id", None)
+    if not created and previous_organizer_id is not None:
+        from .ratings import RatingService
+        RatingService.organizer_changed(instance, previous_organizer_id)
     
     if created:
         # Нова подія створена
-        pass
+        RollupService.record("events_created")
+        if instance.status == Event.PUBLISHED:
+            RollupService.record("events_published")
     else:
         # Подія оновлена - перевіряємо зміну статусу
         previous_status = getattr(instance, '_previous_status', None)
         if previous_status and previous_status != Event.CANCELLED and instance.status == Event.CANCELLED:
             NotificationService.create_event_cancelled_notification(instance)
+        
+        if previous_status and previous_status != instance.status:
+            transition_counters = {
+                Event.PUBLISHED: "events_published",
+                Event.CANCELLED: "events_cancelled",
+                Event.ARCHIVED: "events_archived",
+            }
+            if instance.status in transition_counters:
+                RollupService.record(transition_counters[instance.status])
+
+
+def _invalidate_event_schedules(instance, created):
+    """
+    Матеріалізовані розклади (schedule_cache), яких стосується зміна події
+    
+    Нова подія чи зміна організатора змінюють склад розкладу організаторів;
+    зміна полів розкладу - лише штамп події, без обходу учасників.
+    """
+    from .schedule_cache import SNAPSHOT_FIELDS, ScheduleCacheService
+    
+    previous = getattr(instance, "_previous_schedule", None)
+    if created or previous is None:
+        ScheduleCacheService.invalidate_users([instance.organizer_id])
+        ScheduleCacheService.touch_events([instance.pk])
+        return
+    
+    previous_organizer, previous_fields = previous
+    if previous_organizer != instance.organizer_id:
+        ScheduleCacheService.invalidate_users([previous_organizer, instance.organizer_id])
+    if previous_fields != tuple(getattr(instance, field) for field in SNAPSHOT_FIELDS):
+        ScheduleCacheService.touch_events([instance.pk])
+
+
+def _remap_rsvps(instance, created):
+    """
+    Ключі RSVP (occurrence_start) після зміни початку чи правила повторення
+
+    Без цього RSVP на зниклі повторення не можна скасувати, а користувач
+    міг зареєструватися вдруге поверх старого рядка.
+    """
+    from .recurrence import OccurrenceService
+    from .schedule_cache import SNAPSHOT_FIELDS
+    
+    previous = getattr(instance, "_previous_schedule", None)
+    if created or previous is None:
+        return
+    previous_fields = dict(zip(SNAPSHOT_FIELDS, previous[1]))
+    if any(
+        previous_fields[field] != getattr(instance, field)
+        for field in ("starts_at", "recurrence_rule", "recurrence_exdates")
+    ):
+        OccurrenceService.remap_rsvps(instance, previous_fields["starts_at"])
+
+
+def _materialize_occurrences(instance, created):
+    """Рядки EventOccurrence серії в межах горизонту (RECURRENCE["MATERIALIZE_DAYS"])"""
+    from .recurrence import OccurrenceService, get_config
+    
+    if get_config()["MATERIALIZE_DAYS"] <= 0:
+        return
+    # Разова подія могла бути серією - прибрати її повторення
+    if instance.is_recurring or not created:
+        OccurrenceService.materialize([instance])
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    """Видалена подія зникає з фасетів списку та з розкладів"""
+    from .detail_cache import EventDetailCacheService
+    from .facets import bump_facets_version
+    from .http_cache import PublicPageCacheService
+    from .schedule_cache import ScheduleCacheService
+    
+    bump_facets_version()
+    EventDetailCacheService.touch([instance.pk])
+    PublicPageCacheService.purge_events([instance.pk])
+    ScheduleCacheService.touch_events([instance.pk])
+
+
+@receiver(post_save, sender=get_user_model())
+def user_created(sender, instance, created, **kwargs):
+    """Новий користувач не успадковує знімок розкладу з тим самим id"""
+    if created:
+        from .schedule_cache import ScheduleCacheService
+        
+        ScheduleCacheService.invalidate_users([instance.pk])
 
 
 @receiver(post_save, sender=RSVP)
@@ -46,8 +171,20 @@ def rsvp_created(sender, instance, created, **kwargs):
     """Обробляє створення нового RSVP"""
     from notifications.factories import NotificationFactoryRegistry
     from notifications.models import Notification
+    from .detail_cache import EventDetailCacheService
+    from .facets import bump_facets_version
+    from .http_cache import PublicPageCacheService
+    from .rollup_services import RollupService
+    from .schedule_cache import ScheduleCacheService
+    
+    bump_facets_version()
+    EventDetailCacheService.touch([instance.event_id])
+    PublicPageCacheService.purge_events([instance.event_id])
+    ScheduleCacheService.rsvp_changed(instance)
     
     if created:
+        RollupService.record("rsvps_created")
+        
         # Сповіщення організатору про нову реєстрацію через фабрику
         context = {
             'event': instance.event,
@@ -66,6 +203,17 @@ def rsvp_deleted(sender, instance, **kwargs):
     """Обробляє видалення RSVP (скасування реєстрації)"""
     from notifications.factories import NotificationFactoryRegistry
     from notifications.models import Notification
+    from .detail_cache import EventDetailCacheService
+    from .facets import bump_facets_version
+    from .http_cache import PublicPageCacheService
+    from .rollup_services import RollupService
+    from .schedule_cache import ScheduleCacheService
+    
+    bump_facets_version()
+    EventDetailCacheService.touch([instance.event_id])
+    PublicPageCacheService.purge_events([instance.event_id])
+    ScheduleCacheService.rsvp_changed(instance)
+    RollupService.record("rsvps_cancelled")
     
     # Сповіщення організатору про скасування реєстрації через фабрику
     context = {
@@ -78,3 +226,61 @@ def rsvp_deleted(sender, instance, **kwargs):
         event=instance.event,
         context=context
     )
+
+
+@receiver(pre_save, sender=Review)
+def review_pre_save(sender, instance, **kwargs):
+    """
+    Попередні подія та оцінка - для різниці агрегатів у post_save;
+    нове зображення - варіанти попереднього більше не відповідають йому
+    """
+    instance._previous_rating = None
+    previous_image, previous_variants = "", {}
+    if instance.pk:
+        row = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("event_id", "rating", "image", "image_variants")
+            .first()
+        )
+        if row is not None:
+            instance._previous_rating = row[:2]
+            previous_image, previous_variants = row[2] or "", row[3] or {}
+    
+    uploaded = bool(instance.image) and not instance.image._committed
+    instance._image_changed = uploaded or (instance.image.name or "") != previous_image
+    if instance._image_changed:
+        from .review_images import ReviewImageService
+        ReviewImageService.delete_variants(previous_variants)
+        instance.image_variants = {}
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    """Агрегати відгуків події та організатора (до інвалідації кешів нижче)"""
+    from .ratings import RatingService
+    
+    RatingService.review_saved(instance, getattr(instance, "_previous_rating", None))
+    
+    if instance.image and getattr(instance, "_image_changed", False):
+        from .review_images import ReviewImageService
+        ReviewImageService.schedule(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    from .ratings import RatingService
+    from .review_images import ReviewImageService
+    
+    RatingService.review_deleted(instance)
+    ReviewImageService.delete_variants(instance.image_variants)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Відгуки та рейтинг на сторінці події"""
+    from .detail_cache import EventDetailCacheService
+    from .http_cache import PublicPageCacheService
+    
+    EventDetailCacheService.touch([instance.event_id])
+    PublicPageCacheService.purge_events([instance.event_id])
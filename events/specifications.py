@@ -46,6 +46,28 @@ class EventByLocationSpecification(Specification):
         return Q(location__icontains=self.location)
 
 
+class EventByCategorySpecification(Specification):
+    """
+    Фільтрація подій за категорією
+
+    Значення має точно відповідати slug або нормалізованій назві
+    категорії каталогу - тоді фільтр за цілочисельним ключем
+    category_ref_id. Невідома категорія дає порожній результат: ні
+    схожих написань, ні текстового пошуку по полю category.
+    """
+    
+    def __init__(self, category: str):
+        self.category = category
+    
+    def to_queryset_filter(self) -> Q:
+        from catalog.services import CategoryService
+        
+        info = CategoryService.find(self.category)
+        if info:
+            return Q(category_ref_id=info.id)
+        return Q(pk__in=[])
+
+
 def apply_specifications(queryset: QuerySet, *specs: Specification) -> QuerySet:
     """
     Застосовує список специфікацій до QuerySet.
@@ -3,7 +3,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
-from django.db.models import QuerySet
+from django.db.models import Case, F, FloatField, QuerySet, Value, When
+from django.db.models.functions import Cast
 
 
 class SortStrategy(ABC):
@@ -58,12 +59,28 @@ class SortByRsvpCountStrategy(SortStrategy):
         return queryset.order_by("-rsvp_count")
 
 
+class SortByRatingStrategy(SortStrategy):
+    slug = "top_rated"
+    label = "Найвищий рейтинг"
+
+    def sort(self, queryset: QuerySet) -> QuerySet:
+        # Збережені агрегати відгуків (events/ratings.py); події без відгуків - у кінці
+        return queryset.alias(
+            stored_avg_rating=Case(
+                When(reviews_count=0, then=Value(None)),
+                default=Cast("rating_sum", FloatField()) / F("reviews_count"),
+                output_field=FloatField(),
+            )
+        ).order_by(F("stored_avg_rating").desc(nulls_last=True), "-reviews_count", "-starts_at")
+
+
 AVAILABLE_STRATEGIES: List[SortStrategy] = [
     SortByDateStrategy(),
     SortByPopularityStrategy(),
     SortByAlphabetStrategy(),
     SortByEventDateStrategy(),
     SortByRsvpCountStrategy(),
+    SortByRatingStrategy(),
 ]
 
 STRATEGIES: Dict[str, SortStrategy] = {s.slug: s for s in AVAILABLE_STRATEGIES}
@@ -0,0 +1,117 @@
+"""
+Тести віконного API календаря (calendar/events/) та ScheduleWindow
+"""
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .models import Event
+from .schedule_services import PersonalScheduleService, ScheduleWindow
+
+User = get_user_model()
+
+
+class CalendarWindowTestCase(TestCase):
+    """Події навколо березня 2030: до, всередині, на межах та через межу вікна"""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        self.start = timezone.make_aware(datetime(2030, 3, 1))
+        self.end = timezone.make_aware(datetime(2030, 4, 1))
+
+        def event(title, starts_at, hours=2, **kwargs):
+            kwargs.setdefault("status", Event.PUBLISHED)
+            kwargs.setdefault("organizer", self.organizer)
+            return Event.objects.create(
+                title=title, starts_at=starts_at, ends_at=starts_at + timedelta(hours=hours), **kwargs
+            )
+
+        self.before = event("Before", self.start - timedelta(days=3))
+        self.ends_at_start = event("Ends at start", self.start - timedelta(hours=2))
+        self.inside = event("Inside", self.start + timedelta(days=10))
+        self.spanning = event("Spanning", self.start - timedelta(days=1), hours=48)
+        self.starts_at_end = event("Starts at end", self.end)
+        self.draft = event("Draft", self.start + timedelta(days=5), status=Event.DRAFT)
+        self.foreign = event("Foreign", self.start + timedelta(days=6), organizer=self.user)
+        RSVP.objects.create(user=self.user, event=self.inside, status="going")
+        RSVP.objects.create(user=self.user, event=self.before, status="going")
+
+    def fetch(self, **params):
+        params.setdefault("start", self.start.isoformat())
+        params.setdefault("end", self.end.isoformat())
+        return self.client.get(reverse("calendar-events"), params)
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [event["title"] for event in response.json()["events"]]
+
+
+class ScheduleWindowTests(CalendarWindowTestCase):
+    def test_overlap_excludes_touching_boundaries(self):
+        window = ScheduleWindow(self.start, self.end)
+        titles = set(Event.objects.filter(window.overlap_q()).values_list("title", flat=True))
+        self.assertEqual(titles, {"Inside", "Spanning", "Draft", "Foreign"})
+
+    def test_user_entries_limited_to_window(self):
+        window = ScheduleWindow(self.start, self.end)
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user, window)
+        self.assertEqual([entry.title for entry in entries], ["Foreign", "Inside"])
+        self.assertEqual(PersonalScheduleService.get_user_rsvp_event_ids(self.user, window), {self.inside.pk})
+
+    def test_without_window_returns_full_schedule(self):
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user)
+        self.assertEqual(len(entries), 3)
+
+
+class CalendarEventsViewTests(CalendarWindowTestCase):
+    def test_anonymous_gets_published_events_in_window(self):
+        response = self.fetch()
+        self.assertEqual(self.titles(response), ["Spanning", "Foreign", "Inside"])
+        self.assertNotIn("is_organizer", response.json()["events"][0])
+
+    def test_authenticated_gets_own_schedule_with_filters(self):
+        self.client.force_login(self.organizer)
+        self.assertEqual(self.titles(self.fetch()), ["Spanning", "Draft", "Inside"])
+        self.assertEqual(self.titles(self.fetch(schedule_filter="published")), ["Spanning", "Inside"])
+
+        response = self.fetch(highlight="organizer")
+        self.assertTrue(all(event["highlight_reason"] == "organizer" for event in response.json()["events"]))
+
+    def test_accepts_dates_and_naive_datetimes(self):
+        response = self.fetch(start="2030-03-01", end="2030-04-01T00:00:00")
+        self.assertEqual(len(self.titles(response)), 3)
+
+    def test_invalid_windows(self):
+        self.assertEqual(self.client.get(reverse("calendar-events")).status_code, 400)
+        self.assertEqual(self.fetch(start="not-a-date").status_code, 400)
+        self.assertEqual(self.fetch(start=self.end.isoformat(), end=self.start.isoformat()).status_code, 400)
+        self.assertEqual(self.fetch(end=(self.start + timedelta(days=400)).isoformat()).status_code, 400)
+
+    def test_window_query_count_does_not_grow_with_history(self):
+        self.client.force_login(self.user)
+        for day in range(30):
+            Event.objects.create(
+                title=f"Old {day}", starts_at=self.start - timedelta(days=100 + day),
+                ends_at=self.start - timedelta(days=100 + day) + timedelta(hours=1),
+                organizer=self.user, status=Event.PUBLISHED,
+            )
+        with self.assertNumQueries(4):
+            titles = self.titles(self.fetch())
+        self.assertEqual(titles, ["Foreign", "Inside"])
+
+
+class CalendarShellTests(CalendarWindowTestCase):
+    def test_page_runs_no_schedule_queries(self):
+        self.client.force_login(self.user)
+        # Сесія, користувач, секрет підписок, лічильник сповіщень у шапці - жодних запитів до подій
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("calendar") + "?schedule_filter=upcoming&highlight=soon")
+        self.assertNotIn("events_json", response.context)
+        self.assertContains(response, reverse("calendar-events"))
+        self.assertEqual(response.context["schedule_filter"], "upcoming")
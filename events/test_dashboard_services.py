@@ -0,0 +1,126 @@
+"""
+Тести для DashboardStatsService (знімки статистики staff-дашбордів)
+"""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from events.dashboard_services import DashboardStatsService
+from events.models import Event
+from tickets.models import RSVP
+
+
+class DashboardStatsServiceTests(TestCase):
+    """Тести підрахунку та кешування статистики"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        now = timezone.now()
+        self.published = Event.objects.create(
+            title="Published", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=1),
+            organizer=self.staff, status=Event.PUBLISHED,
+        )
+        self.archived = Event.objects.create(
+            title="Archived", starts_at=now - timedelta(days=2), ends_at=now - timedelta(days=2) + timedelta(hours=1),
+            organizer=self.staff, status=Event.ARCHIVED,
+        )
+        for i in range(2):
+            user = User.objects.create_user(username=f"u{i}", password="testpass123")
+            RSVP.objects.create(user=user, event=self.published, status="going")
+
+    def test_compute_counters(self):
+        snapshot = DashboardStatsService.compute()
+        stats = snapshot["stats"]
+
+        self.assertEqual(stats["total_events"], 2)
+        self.assertEqual(stats["published_events"], 1)
+        self.assertEqual(stats["upcoming_events"], 1)
+        self.assertEqual(stats["archived_events"], 1)
+        self.assertEqual(stats["total_users"], 3)
+        self.assertEqual(stats["new_users_week"], 3)
+        self.assertEqual(stats["total_rsvps"], 2)
+        self.assertEqual(stats["rsvps_month"], 2)
+        self.assertEqual(snapshot["top_events"][0], self.published)
+        self.assertEqual(snapshot["top_events"][0].rsvp_count, 2)
+
+    def test_compute_query_count(self):
+        """По одному запиту на таблицю + топ-події"""
+        with self.assertNumQueries(4):
+            snapshot = DashboardStatsService.compute()
+            [event.organizer.username for event in snapshot["top_events"]]
+
+    def test_compute_with_period(self):
+        """Період обмежує лічильники за датою створення"""
+        future = timezone.now() + timedelta(days=1)
+        snapshot = DashboardStatsService.compute(start=future, end=future + timedelta(days=1))
+
+        self.assertEqual(snapshot["stats"]["total_events"], 0)
+        self.assertEqual(snapshot["top_events"], [])
+
+    def test_period_snapshot_has_all_mode_keys(self):
+        period = DashboardStatsService.compute(start=timezone.now() - timedelta(days=1))["stats"]
+
+        self.assertLessEqual(set(DashboardStatsService.compute()["stats"]), set(period))
+        self.assertEqual(period["upcoming_events"], 1)
+
+    def test_snapshot_cached(self):
+        DashboardStatsService.get_snapshot()
+
+        with self.assertNumQueries(0):
+            DashboardStatsService.get_snapshot()
+
+    def test_stale_snapshot_served_while_locked(self):
+        """Під час перерахунку іншим запитом віддається застарілий знімок"""
+        DashboardStatsService.get_snapshot("all")
+        key = f"{DashboardStatsService.CACHE_PREFIX}:all"
+        payload = cache.get(key)
+        payload["fresh_until"] = time.time() - 1
+        cache.set(key, payload)
+        cache.add(f"{key}:lock", 1)
+
+        with patch.object(DashboardStatsService, "compute") as compute:
+            snapshot = DashboardStatsService.get_snapshot("all")
+
+        compute.assert_not_called()
+        self.assertEqual(snapshot["stats"]["total_events"], 2)
+
+    def test_expired_snapshot_recomputed(self):
+        DashboardStatsService.get_snapshot("all")
+        key = f"{DashboardStatsService.CACHE_PREFIX}:all"
+        payload = cache.get(key)
+        payload["fresh_until"] = time.time() - 1
+        cache.set(key, payload)
+        Event.objects.create(
+            title="New", starts_at=timezone.now() + timedelta(days=3),
+            ends_at=timezone.now() + timedelta(days=3, hours=1), organizer=self.staff,
+        )
+
+        snapshot = DashboardStatsService.get_snapshot("all")
+
+        self.assertEqual(snapshot["stats"]["total_events"], 3)
+        self.assertIsNone(cache.get(f"{key}:lock"))
+
+    def test_cold_start_with_lock_computes(self):
+        cache.add(f"{DashboardStatsService.CACHE_PREFIX}:all:lock", 1)
+
+        snapshot = DashboardStatsService.get_snapshot("all")
+
+        self.assertEqual(snapshot["stats"]["total_events"], 2)
+
+    def test_dashboards_render_from_snapshot(self):
+        """Всі три дашборди рендеряться зі знімка"""
+        self.client.login(username="staff", password="testpass123")
+
+        for url in ("/", "/?period=week", "/admin/"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/?period=custom&date_from=2000-01-01&date_to=2000-01-02")
+        self.assertEqual(response.context["stats"]["total_events"], 0)
+        self.assertEqual(response.context["stats"]["period_label"], "з 2000-01-01 по 2000-01-02")
@@ -0,0 +1,249 @@
+"""
+Тести маршрутизації читань на репліку (event_organizer/db_routing.py)
+
+Primary і репліка - дві окремі SQLite-бази; репліка заповнюється вручну
+копіями рядків зі зміненою назвою події, тож зі сторінки видно, з якої
+бази прочитано дані.
+"""
+import copy
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import router, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from event_organizer.db_routing import (
+    PrimaryReplicaRouter,
+    get_config,
+    replica_reads_scope,
+    reset_routing_state,
+    service_writes,
+    wrote_to_primary,
+)
+from events.http_cache import PublicPageCacheService
+from events.ics_feeds import USER_FEED, IcsFeedService
+from events.models import DailyRollup, Event
+from events.schedule_cache import USER_KEY, ScheduleCacheService
+
+User = get_user_model()
+
+ROUTING = {"REPLICAS": ["replica"], "STICKY_SECONDS": 15, "COOKIE_NAME": "db_primary"}
+
+
+def mirror(*objects, **changes):
+    """Скопіювати рядки в репліку (bulk_create - без сигналів)"""
+    for obj in objects:
+        replica_copy = copy.copy(obj)
+        for field, value in changes.items():
+            setattr(replica_copy, field, value)
+        type(obj).objects.using("replica").bulk_create([replica_copy])
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class PrimaryReplicaRouterTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+
+    def test_reads_outside_request_scope_use_primary(self):
+        self.assertEqual(router.db_for_read(Event), "default")
+
+    def test_reads_in_scope_use_replica(self):
+        with replica_reads_scope():
+            self.assertEqual(router.db_for_read(Event), "replica")
+            self.assertEqual(router.db_for_read(Session), "default")
+
+    def test_write_pins_following_reads_to_primary(self):
+        with replica_reads_scope():
+            self.assertEqual(router.db_for_write(Event), "default")
+            self.assertTrue(wrote_to_primary())
+            self.assertEqual(router.db_for_read(Event), "default")
+
+    def test_pinned_scope_and_transactions_use_primary(self):
+        with replica_reads_scope(pinned=True):
+            self.assertEqual(router.db_for_read(Event), "default")
+        with replica_reads_scope(), transaction.atomic():
+            self.assertEqual(router.db_for_read(Event), "default")
+
+    def test_service_writes_do_not_pin_request(self):
+        with replica_reads_scope():
+            with service_writes():
+                self.assertEqual(router.db_for_write(Event), "default")
+            self.assertFalse(wrote_to_primary())
+            self.assertEqual(router.db_for_read(Event), "replica")
+
+    def test_router_inactive_without_replicas(self):
+        with override_settings(DATABASE_ROUTING={"REPLICAS": []}), replica_reads_scope():
+            self.assertEqual(get_config()["REPLICAS"], [])
+            self.assertIsNone(PrimaryReplicaRouter().db_for_read(Event))
+            self.assertIsNone(PrimaryReplicaRouter().db_for_write(Event))
+            self.assertFalse(wrote_to_primary())
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class ReplicaRoutingRequestTests(TransactionTestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="reader", password="pass12345")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Primary title", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        mirror(self.organizer, self.user)
+        mirror(self.event, title="Replica title")
+
+    def test_marked_get_views_read_from_replica(self):
+        response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertContains(response, "Replica title")
+        self.assertNotIn("db_primary", response.cookies)
+
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.json()["results"][0]["title"], "Replica title")
+
+    def test_unmarked_views_read_from_primary(self):
+        self.client.force_login(self.organizer)
+        response = self.client.get(f"/events/{self.event.pk}/edit/")
+        self.assertContains(response, "Primary title")
+
+    def test_write_sticks_client_to_primary(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(f"/events/{self.event.pk}/rsvp/")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.cookies["db_primary"]["max-age"], 15)
+
+        response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertContains(response, "Primary title")
+        self.assertEqual(response.context["user_rsvp"].user, self.user)
+
+        self.client.cookies.pop("db_primary")
+        response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertContains(response, "Replica title")
+
+    def test_page_read_from_replica_right_after_purge_has_no_validators(self):
+        caches["shared"].clear()
+        self.addCleanup(caches["shared"].clear)
+        PublicPageCacheService.purge_events([self.event.pk])
+
+        response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertNotIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+
+        with override_settings(DATABASE_ROUTING={**ROUTING, "STICKY_SECONDS": 0}):
+            response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertIn("ETag", response)
+        self.assertIn("public", response["Cache-Control"])
+
+    def test_ics_feed_reads_primary(self):
+        url = reverse("calendar-feed", kwargs={
+            "kind": USER_FEED, "user_id": self.organizer.pk, "token": IcsFeedService.token(USER_FEED, self.organizer.pk),
+        })
+        body = b"".join(self.client.get(url).streaming_content).decode()
+        self.assertIn("SUMMARY:Primary title", body)
+
+    def test_middleware_disabled_without_replicas(self):
+        self.client.force_login(self.user)
+        with override_settings(DATABASE_ROUTING={"REPLICAS": []}):
+            response = self.client.post(f"/events/{self.event.pk}/rsvp/")
+            self.assertNotIn("db_primary", response.cookies)
+            response = self.client.get(f"/events/{self.event.pk}/")
+        self.assertContains(response, "Primary title")
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class ArchiveOnListRequestTests(TransactionTestCase):
+    """Архівування з GET списку: кандидати з primary, без sticky-cookie"""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+        caches["shared"].clear()
+        self.addCleanup(caches["shared"].clear)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        past = timezone.now() - timedelta(days=2)
+        self.event = Event.objects.create(
+            title="Past event", starts_at=past, ends_at=past + timedelta(hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        mirror(self.organizer)
+        mirror(self.event)
+
+    def test_cancelled_on_primary_is_not_archived_from_stale_replica(self):
+        Event.objects.filter(pk=self.event.pk).update(status=Event.CANCELLED)
+
+        response = self.client.get("/events/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Event.objects.get(pk=self.event.pk).status, Event.CANCELLED)
+
+    def test_archives_once_without_sticky_cookie(self):
+        response = self.client.get("/events/")
+        self.assertNotIn("db_primary", response.cookies)
+        self.assertEqual(Event.objects.get(pk=self.event.pk).status, Event.ARCHIVED)
+
+        self.client.get("/events/")
+        self.assertEqual(DailyRollup.objects.get(date=timezone.localdate()).events_archived, 1)
+
+    def test_list_archives_at_most_once_per_interval(self):
+        self.client.get("/events/")
+        Event.objects.filter(pk=self.event.pk).update(status=Event.PUBLISHED)
+
+        with self.assertNumQueries(0, using="default"):
+            self.client.get("/events/")
+        self.assertEqual(Event.objects.get(pk=self.event.pk).status, Event.PUBLISHED)
+
+        with override_settings(EVENT_ARCHIVE={"LIST_INTERVAL_SECONDS": 0}):
+            self.client.get("/events/")
+        self.assertEqual(Event.objects.get(pk=self.event.pk).status, Event.ARCHIVED)
+
+
+@override_settings(DATABASE_ROUTING=ROUTING)
+class ScheduleSnapshotReplicaTests(TransactionTestCase):
+    """Знімок розкладу з репліки не кешується зі свіжими штампами"""
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+        caches["shared"].clear()
+        self.addCleanup(caches["shared"].clear)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Primary title", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        mirror(self.organizer)
+        mirror(self.event, title="Lagging title")
+
+    def cached_snapshot(self):
+        return caches["shared"].get(USER_KEY.format(self.organizer.pk))
+
+    def test_replica_snapshot_with_fresh_stamps_is_not_cached(self):
+        with replica_reads_scope():
+            snapshot = ScheduleCacheService.get_snapshot(self.organizer)
+        self.assertEqual(snapshot["rows"][0][1], "Lagging title")
+        self.assertIsNone(self.cached_snapshot())
+
+        ScheduleCacheService.get_snapshot(self.organizer)
+        self.assertEqual(self.cached_snapshot()["rows"][0][1], "Primary title")
+
+    def test_settled_replica_snapshot_is_cached(self):
+        with override_settings(DATABASE_ROUTING={**ROUTING, "STICKY_SECONDS": 0}):
+            with replica_reads_scope():
+                ScheduleCacheService.get_snapshot(self.organizer)
+        self.assertIsNotNone(self.cached_snapshot())
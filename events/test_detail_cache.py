@@ -0,0 +1,151 @@
+"""
+Тести кешу сторінки події (events/detail_cache.py, EventDetailView)
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .detail_cache import VERSION_KEY, EventDetailCacheService
+from .models import Event, Review
+
+User = get_user_model()
+
+
+class EventDetailCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(caches["shared"].clear)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Meetup", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, capacity=10,
+        )
+        self.past = Event.objects.create(
+            title="Past", starts_at=now - timedelta(days=3), ends_at=now - timedelta(days=3, hours=-2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+
+    def get(self, event=None):
+        return self.client.get(f"/events/{(event or self.event).pk}/")
+
+
+class EventDetailQueriesTests(EventDetailCacheTestCase):
+    def test_anonymous_cache_hit_runs_no_queries(self):
+        self.get()
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertContains(response, "Meetup")
+        self.assertContains(response, "organizer")
+
+    def test_authenticated_cache_hit_runs_one_overlay_query(self):
+        RSVP.objects.create(user=self.user, event=self.event)
+        self.client.force_login(self.user)
+        self.get()
+        # Сесія, користувач і лічильник сповіщень (base.html) + overlay
+        with self.assertNumQueries(4):
+            response = self.get()
+        self.assertEqual(response.context["user_rsvp"].user_id, self.user.pk)
+        self.assertEqual(response.context["rsvp_count"], 1)
+        self.assertEqual(response.context["remaining_places"], 9)
+
+    def test_build_queries(self):
+        with self.assertNumQueries(2):
+            detail = EventDetailCacheService.build(self.event.pk)
+        self.assertEqual(detail["event"].organizer.username, "organizer")
+        self.assertIsNone(EventDetailCacheService.build(0))
+
+        # Рейтинг - зі збережених агрегатів, відгуки - лише якщо вони є
+        Review.objects.create(event=self.event, user=self.user, rating=3)
+        with self.assertNumQueries(3):
+            detail = EventDetailCacheService.build(self.event.pk)
+        self.assertEqual((detail["avg_rating"], detail["reviews_count"]), (3, 1))
+
+    def test_missing_event_is_404(self):
+        self.assertEqual(self.client.get("/events/0/").status_code, 404)
+
+
+class EventDetailInvalidationTests(EventDetailCacheTestCase):
+    def test_event_change_is_visible(self):
+        self.get()
+        self.event.title = "Renamed"
+        self.event.save()
+        self.assertContains(self.get(), "Renamed")
+
+    def test_rsvp_changes_counts(self):
+        self.get()
+        rsvp = RSVP.objects.create(user=self.user, event=self.event)
+        self.assertEqual(self.get().context["rsvp_count"], 1)
+        rsvp.delete()
+        self.assertEqual(self.get().context["rsvp_count"], 0)
+
+    def test_reviews_and_can_review(self):
+        RSVP.objects.create(user=self.user, event=self.past)
+        self.client.force_login(self.user)
+        self.assertTrue(self.get(self.past).context["can_review"])
+
+        Review.objects.create(event=self.past, user=self.user, rating=4)
+        response = self.get(self.past)
+        self.assertFalse(response.context["can_review"])
+        self.assertEqual((response.context["avg_rating"], response.context["reviews_count"]), (4, 1))
+        self.assertEqual([review.user.username for review in response.context["reviews"]], ["attendee"])
+
+    def test_archiving_touches_version(self):
+        self.get(self.past)
+        self.assertEqual(self.get(self.past).context["event"].status, Event.PUBLISHED)
+        from .services import EventArchiveService
+
+        EventArchiveService().archive_past_events()
+        self.assertEqual(self.get(self.past).context["event"].status, Event.ARCHIVED)
+
+    def test_version_lives_in_cache_shared_by_workers(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, True)
+        shared = {"BACKEND": "monitoring.cache.InstrumentedFileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={"default": {"BACKEND": "monitoring.cache.InstrumentedLocMemCache"}, "shared": shared}):
+            self.get()
+            self.assertIsNone(caches["default"].get(VERSION_KEY.format(self.event.pk)))
+
+            # Подію змінено в іншому воркері: він записує нову версію в той самий кеш
+            Event.objects.filter(pk=self.event.pk).update(title="Renamed")
+            FileBasedCache(location, {}).set(VERSION_KEY.format(self.event.pk), 0, None)
+
+            self.assertContains(self.get(), "Renamed")
+
+    def test_draft_stays_private_on_cache_hit(self):
+        draft = Event.objects.create(
+            title="Draft", starts_at=self.event.starts_at, ends_at=self.event.ends_at,
+            organizer=self.organizer, status=Event.DRAFT,
+        )
+        self.client.force_login(self.organizer)
+        self.assertEqual(self.get(draft).status_code, 200)
+        self.client.force_login(self.user)
+        self.assertEqual(self.get(draft).status_code, 404)
+
+
+class EventDetailConfigTests(EventDetailCacheTestCase):
+    @override_settings(EVENT_DETAIL_CACHE={"REVIEWS_LIMIT": 2})
+    def test_reviews_limit(self):
+        for i in range(3):
+            reviewer = User.objects.create_user(username=f"reviewer{i}", password="pass12345")
+            Review.objects.create(event=self.past, user=reviewer, rating=5)
+        response = self.get(self.past)
+        self.assertEqual(len(response.context["reviews"]), 2)
+        self.assertContains(response, "Показано 2 з 3 відгуків")
+
+    @override_settings(EVENT_DETAIL_CACHE={"ENABLED": False})
+    def test_disabled_cache_builds_each_time(self):
+        self.get()
+        with self.assertNumQueries(2):
+            self.get()
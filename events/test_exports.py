@@ -0,0 +1,190 @@
+"""
+Тести для потокових експортів (events/exports.py)
+"""
+import csv
+import hashlib
+import io
+import tracemalloc
+import zipfile
+from datetime import timedelta
+from xml.etree import ElementTree
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from events.exports import ExportService, stream_csv, stream_xlsx
+from events.models import Event
+from tickets.models import RSVP
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def read_xlsx_rows(content: bytes):
+    """Прочитати рядки першого аркуша XLSX як списки рядків"""
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = []
+    for row in root.iter(f"{SHEET_NS}row"):
+        cells = []
+        for cell in row:
+            text = cell.find(f"{SHEET_NS}is/{SHEET_NS}t")
+            cells.append(text.text if text is not None else cell.find(f"{SHEET_NS}v").text)
+        rows.append(cells)
+    return rows
+
+
+class StreamWriterTests(TestCase):
+    """Тести CSV/XLSX писачів без БД"""
+
+    def test_csv_has_bom_and_formats_values(self):
+        when = timezone.now()
+        content = b"".join(stream_csv(("Назва", "Дата", "Порожнє"), [("Подія, \"лапки\"", when, None)]))
+
+        self.assertTrue(content.startswith("\ufeff".encode("utf-8")))
+        rows = list(csv.reader(io.StringIO(content.decode("utf-8-sig"))))
+        self.assertEqual(rows[0], ["Назва", "Дата", "Порожнє"])
+        self.assertEqual(rows[1], ["Подія, \"лапки\"", timezone.localtime(when).strftime("%Y-%m-%d %H:%M"), ""])
+
+    def test_csv_neutralizes_formulas(self):
+        """Текст, що починається як формула, лишається текстом; числа не змінюються"""
+        values = ("=HYPERLINK(\"http://x\")", "+1", "-2", "@SUM(A1)", "\tcmd", "\rcmd", "Київ", -3)
+        content = b"".join(stream_csv([str(i) for i in range(len(values))], [values]))
+
+        row = list(csv.reader(io.StringIO(content.decode("utf-8-sig"), newline="")))[1]
+        self.assertEqual(row, [
+            "'=HYPERLINK(\"http://x\")", "'+1", "'-2", "'@SUM(A1)", "'\tcmd", "'\rcmd", "Київ", "-3",
+        ])
+
+    def test_xlsx_formula_text_is_inline_string(self):
+        content = b"".join(stream_xlsx(("Назва",), [("=1+1",)]))
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertIn('<c t="inlineStr"><is><t xml:space="preserve">=1+1</t></is></c>', sheet)
+        self.assertNotIn("<f>", sheet)
+
+    def test_xlsx_is_valid_workbook(self):
+        content = b"".join(stream_xlsx(("ID", "Назва"), [(1, "Кав'ярня <&>"), (2, "bad\x01char")]))
+
+        self.assertEqual(read_xlsx_rows(content), [["ID", "Назва"], ["1", "Кав'ярня <&>"], ["2", "badchar"]])
+
+    def test_xlsx_streams_in_chunks(self):
+        rows = ((i, hashlib.sha256(str(i).encode()).hexdigest()) for i in range(5000))
+        chunks = list(stream_xlsx(("ID", "Хеш"), rows, flush_every=500))
+
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(len(read_xlsx_rows(b"".join(chunks))), 5001)
+
+    def test_memory_does_not_grow_with_rows(self):
+        """Пік пам'яті при 20 000 рядках майже такий самий, як при 2 000"""
+
+        def peak(count):
+            now = timezone.now()
+            tracemalloc.start()
+            for writer in (stream_csv, stream_xlsx):
+                rows = ((i, f"Подія номер {i}", "Київ", now) for i in range(count))
+                for _chunk in writer(("ID", "Назва", "Місто", "Дата"), rows):
+                    pass
+            _current, peak_size = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_size
+
+        small = peak(2_000)
+        large = peak(20_000)
+        self.assertLess(large, small * 2)
+
+
+class ExportViewsTests(TestCase):
+    """Тести експорту учасників та адмінських експортів"""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="org", password="testpass123")
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        self.other = User.objects.create_user(username="other", password="testpass123")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Концерт", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, location="Львів",
+        )
+        for i in range(3):
+            user = User.objects.create_user(username=f"guest{i}", email=f"g{i}@example.com", password="testpass123")
+            RSVP.objects.create(user=user, event=self.event, status="going")
+
+    def test_participants_csv_export(self):
+        self.client.login(username="org", password="testpass123")
+        response = self.client.get(f"/events/{self.event.pk}/participants/export/csv/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("event-", response["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row[0] for row in rows[1:]}, {"guest0", "guest1", "guest2"})
+
+    def test_participants_xlsx_export(self):
+        self.client.login(username="org", password="testpass123")
+        response = self.client.get(f"/events/{self.event.pk}/participants/export/xlsx/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(read_xlsx_rows(b"".join(response.streaming_content))), 4)
+
+    def test_participants_export_forbidden_for_other_user(self):
+        self.client.login(username="other", password="testpass123")
+        response = self.client.get(f"/events/{self.event.pk}/participants/export/csv/")
+        self.assertEqual(response.status_code, 302)
+
+    def test_unknown_format_is_404(self):
+        self.client.login(username="org", password="testpass123")
+        response = self.client.get(f"/events/{self.event.pk}/participants/export/pdf/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_participants_page_is_paginated(self):
+        from events import ui_views
+
+        self.client.login(username="org", password="testpass123")
+        original = ui_views.PARTICIPANTS_PAGE_SIZE
+        ui_views.PARTICIPANTS_PAGE_SIZE = 2
+        try:
+            response = self.client.get(f"/events/{self.event.pk}/participants/?page=2")
+        finally:
+            ui_views.PARTICIPANTS_PAGE_SIZE = original
+
+        self.assertEqual(response.context["participants_total"], 3)
+        self.assertEqual(len(response.context["participants"]), 1)
+        self.assertContains(response, "Сторінка 2 з 2")
+
+    def test_admin_events_export_with_status(self):
+        self.client.login(username="staff", password="testpass123")
+        response = self.client.get("/dashboard/events/export/csv/?status=published")
+
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], "Концерт")
+        self.assertEqual(rows[1][-1], "3")
+
+    def test_admin_rsvps_export_staff_only(self):
+        self.client.login(username="other", password="testpass123")
+        response = self.client.get("/dashboard/rsvps/export/csv/")
+        self.assertEqual(response.status_code, 302)
+
+        self.client.login(username="staff", password="testpass123")
+        response = self.client.get("/dashboard/rsvps/export/xlsx/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(read_xlsx_rows(b"".join(response.streaming_content))), 4)
+
+    def test_export_rows_are_tuples(self):
+        """Експорт читає values_list, а не екземпляри моделей"""
+        rows = list(ExportService.rsvps().rows)
+        self.assertTrue(all(isinstance(row, tuple) for row in rows))
+
+    def test_admin_lists_paginated(self):
+        self.client.login(username="staff", password="testpass123")
+
+        response = self.client.get("/dashboard/rsvps/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["page_obj"].paginator.count, 3)
+
+        response = self.client.get("/dashboard/events/?status=published")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["events"][0].rsvp_count, 3)
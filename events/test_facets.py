@@ -0,0 +1,202 @@
+"""
+Тести для facet engine списку подій (events/facets.py)
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.utils import timezone
+
+from events.facets import (
+    EventFacetService,
+    FACET_VERSION_KEY,
+    bump_facets_version,
+    facet_filters,
+    get_facets_version,
+    normalize_filter_key,
+)
+from events.models import Event
+from tickets.models import RSVP
+
+
+class EventFacetServiceTests(TestCase):
+    """Тести підрахунку фасетів"""
+
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.organizer = User.objects.create_user(username="org", password="testpass123")
+        now = timezone.now()
+
+        self.popular = Event.objects.create(
+            title="Popular", starts_at=now + timedelta(days=40), ends_at=now + timedelta(days=40, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, category="tech", capacity=5,
+        )
+        self.medium = Event.objects.create(
+            title="Medium", starts_at=now + timedelta(days=40), ends_at=now + timedelta(days=40, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, category="tech",
+        )
+        self.empty = Event.objects.create(
+            title="Empty", starts_at=now + timedelta(days=40), ends_at=now + timedelta(days=40, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, category="music", capacity=10,
+        )
+        self.draft = Event.objects.create(
+            title="Draft", starts_at=now + timedelta(days=40), ends_at=now + timedelta(days=40, hours=2),
+            organizer=self.organizer, status=Event.DRAFT,
+        )
+
+        for i in range(5):
+            user = User.objects.create_user(username=f"u{i}", password="testpass123")
+            RSVP.objects.create(user=user, event=self.popular, status="going")
+        RSVP.objects.create(user=self.organizer, event=self.medium, status="going")
+
+    def test_compute_counts_all_facets(self):
+        """Усі фасети рахуються коректно"""
+        facets = EventFacetService.compute(Event.objects.all())
+
+        self.assertEqual(facets["total"], 4)
+        self.assertEqual(
+            [(tag["slug"], tag["label"], tag["count"]) for tag in facets["category"]],
+            [("tech", "tech", 2), ("music", "music", 1)],
+        )
+        self.assertEqual(facets["category"][0]["id"], self.popular.category_ref_id)
+        self.assertEqual(facets["status"][Event.PUBLISHED], 3)
+        self.assertEqual(facets["status"][Event.DRAFT], 1)
+        self.assertEqual(facets["date"]["upcoming"], 4)
+        self.assertEqual(facets["date"]["today"], 0)
+        self.assertEqual(facets["popularity"], {"popular": 1, "medium": 1, "none": 2})
+        self.assertEqual(facets["availability"], {"available": 3, "full": 1})
+
+    def test_compute_is_single_query(self):
+        """Всі фасети - один SQL-запит"""
+        with self.assertNumQueries(1):
+            EventFacetService.compute(Event.objects.filter(status=Event.PUBLISHED))
+
+    def test_compute_respects_aggregated_queryset(self):
+        """QuerySet з агрегатною анотацією та HAVING обробляється як підзапит"""
+        from django.db.models import Count, Q
+
+        qs = Event.objects.annotate(
+            rsvp_count=Count("rsvps", filter=Q(rsvps__status="going"), distinct=True)
+        ).filter(rsvp_count__gte=1)
+
+        facets = EventFacetService.compute(qs)
+
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["category"][0]["count"], 2)
+
+    def test_selected_dimension_keeps_its_other_values(self):
+        """Фільтр виміру не звужує лічильники самого виміру (диз'юнктивні фасети)"""
+        filters = facet_filters({"category": "tech", "popularity": "none"})
+        facets = EventFacetService.compute(Event.objects.filter(status=Event.PUBLISHED), filters)
+
+        self.assertEqual(facets["total"], 0)
+        # Категорії - з фільтром популярності, але без фільтра категорії
+        self.assertEqual([(tag["slug"], tag["count"]) for tag in facets["category"]], [("music", 1)])
+        # Популярність - з фільтром категорії, але без власного
+        self.assertEqual(facets["popularity"], {"popular": 1, "medium": 1, "none": 0})
+        self.assertEqual(facets["status"][Event.PUBLISHED], 0)
+
+    def test_filtered_compute_is_single_query(self):
+        filters = facet_filters({"category": "tech", "status": "published", "availability": "full"})
+        with self.assertNumQueries(1):
+            EventFacetService.compute(Event.objects.all(), filters)
+
+    def test_get_facets_cached(self):
+        """Повторний виклик з тими ж фільтрами не робить запитів"""
+        params = {"view": "all"}
+        EventFacetService.get_facets(Event.objects.all(), params, AnonymousUser())
+
+        with self.assertNumQueries(0):
+            EventFacetService.get_facets(Event.objects.all(), params, AnonymousUser())
+
+    def test_rsvp_change_invalidates_facets(self):
+        """Новий RSVP змінює версію фасетів"""
+        version = get_facets_version()
+        RSVP.objects.create(user=self.organizer, event=self.empty, status="going")
+        self.assertGreater(get_facets_version(), version)
+
+    def test_bump_without_version_key(self):
+        """bump працює і без попередньо збереженої версії"""
+        caches["shared"].clear()
+        bump_facets_version()
+        self.assertTrue(get_facets_version())
+
+    def test_version_lives_in_shared_cache(self):
+        """Версія - у спільному кеші, тож бачать її всі воркери"""
+        version = get_facets_version()
+        cache.clear()
+
+        self.assertEqual(caches["shared"].get(FACET_VERSION_KEY), version)
+        bump_facets_version()
+        self.assertEqual(caches["shared"].get(FACET_VERSION_KEY), version + 1)
+        self.assertIsNone(cache.get(FACET_VERSION_KEY))
+
+
+class NormalizeFilterKeyTests(TestCase):
+    """Тести нормалізації ключа фільтрів"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="alice", password="testpass123")
+        self.other = User.objects.create_user(username="bob", password="testpass123")
+
+    def test_ignores_page_sort_and_whitespace(self):
+        """page, sort, регістр та пробіли не впливають на ключ"""
+        a = normalize_filter_key({"category": " Tech ", "page": "2", "sort": "popular"}, self.user)
+        b = normalize_filter_key({"category": "tech", "q": ""}, self.user)
+        self.assertEqual(a, b)
+
+    def test_personal_views_are_scoped_per_user(self):
+        """view=my не змішує кеш різних користувачів"""
+        a = normalize_filter_key({"view": "my"}, self.user)
+        b = normalize_filter_key({"view": "my"}, self.other)
+        self.assertNotEqual(a, b)
+
+    def test_public_view_shared_between_users(self):
+        """Загальний список має спільний ключ для авторизованих"""
+        a = normalize_filter_key({"view": "all"}, self.user)
+        b = normalize_filter_key({"view": "all"}, self.other)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, normalize_filter_key({"view": "all"}, AnonymousUser()))
+
+
+class EventListFacetsViewTests(TestCase):
+    """Фасети у контексті EventListView"""
+
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.user = User.objects.create_user(username="viewer", password="testpass123")
+        now = timezone.now()
+        Event.objects.create(
+            title="Tech talk", starts_at=now + timedelta(days=3), ends_at=now + timedelta(days=3, hours=1),
+            organizer=self.user, status=Event.PUBLISHED, category="tech",
+        )
+
+    def test_list_context_contains_facets(self):
+        response = self.client.get("/events/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["facets"]["total"], 1)
+        self.assertEqual(response.context["popular_tags"][0]["slug"], "tech")
+        self.assertEqual(list(response.context["category_choices"]), ["tech"])
+
+    def test_selected_category_keeps_other_categories(self):
+        now = timezone.now()
+        Event.objects.create(
+            title="Concert", starts_at=now + timedelta(days=4), ends_at=now + timedelta(days=4, hours=1),
+            organizer=self.user, status=Event.PUBLISHED, category="music",
+        )
+        response = self.client.get("/events/?category=tech")
+
+        self.assertEqual(len(response.context["events"]), 1)
+        self.assertEqual(response.context["facets"]["total"], 1)
+        self.assertEqual(list(response.context["category_choices"]), ["music", "tech"])
+
+    def test_list_with_popularity_filter(self):
+        response = self.client.get("/events/?popularity=none&availability=available&date_filter=upcoming")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["events"]), 1)
+        self.assertEqual(response.context["facets"]["popularity"]["none"], 1)
@@ -0,0 +1,142 @@
+"""
+Тести для генератора синтетичних даних (events/dataset_generator.py)
+"""
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+
+from events.dataset_generator import DatasetGenerator, DatasetSize, allocate, zipf_weights
+from events.detail_cache import VERSION_KEY
+from events.http_cache import LIST_KEY, STAMP_KEY, event_key
+from events.models import Event, Review
+from events.schedule_cache import EVENT_STAMP_KEY, USER_KEY
+from notifications.models import Notification
+from tickets.models import RSVP
+
+SMALL = DatasetSize(users=60, events=40, rsvps=600, reviews=40, notifications=80)
+
+
+def snapshot():
+    """Вміст згенерованих таблиць без первинних ключів"""
+    usernames = dict(User.objects.values_list("id", "username"))
+    titles = dict(Event.objects.values_list("id", "title"))
+    return {
+        "events": sorted(Event.objects.values_list("title", "starts_at", "status", "capacity")),
+        "rsvps": sorted((usernames[u], titles[e]) for u, e in RSVP.objects.values_list("user_id", "event_id")),
+        "reviews": sorted(Review.objects.values_list("rating", "created_at")),
+    }
+
+
+class AllocationTests(TestCase):
+    """Розподіл RSVP між подіями"""
+
+    def test_allocate_respects_total_and_caps(self):
+        counts = allocate(100, zipf_weights(10), [30] * 10)
+
+        self.assertEqual(sum(counts), 100)
+        self.assertTrue(all(count <= 30 for count in counts))
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+    def test_allocate_stops_when_caps_exhausted(self):
+        self.assertEqual(sum(allocate(100, [1.0, 1.0], [10, 5])), 15)
+
+
+class DatasetGeneratorTests(TestCase):
+    """Генерація невеликого набору даних"""
+
+    def test_counts_and_demo_accounts(self):
+        counts = DatasetGenerator(SMALL, seed=1).generate()
+
+        self.assertEqual(counts["users"], 60)
+        self.assertEqual(counts["events"], 40)
+        self.assertEqual(counts["rsvps"], RSVP.objects.count())
+        self.assertEqual(counts["notifications"], 80)
+        self.assertLessEqual(counts["reviews"], 40)
+        self.assertTrue(User.objects.get(username="admin").check_password("admin123"))
+        self.assertTrue(User.objects.get(username="ivan_petrov").check_password("password123"))
+        self.assertTrue(User.objects.get(username="gen0000059").check_password("password123"))
+
+    def test_same_seed_same_data(self):
+        DatasetGenerator(SMALL, seed=7).generate()
+        first = snapshot()
+        for model in (Notification, Review, RSVP, Event):
+            model.objects.all().delete()
+        User.objects.all().delete()
+
+        DatasetGenerator(SMALL, seed=7).generate()
+        self.assertEqual(snapshot(), first)
+
+    def test_refreshes_shared_cache_stamps(self):
+        """Штампи, закешовані для тих самих id до flush, не переживають генерацію"""
+        shared = caches["shared"]
+        shared.clear()
+        self.addCleanup(shared.clear)
+        event_id = (Event.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+        user_id = (User.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+        stale = {
+            EVENT_STAMP_KEY.format(event_id): 1,
+            VERSION_KEY.format(event_id): 1,
+            STAMP_KEY.format(event_key(event_id)): 1,
+            STAMP_KEY.format(LIST_KEY): 1,
+            USER_KEY.format(user_id): {"stale": True},
+        }
+        shared.set_many(stale, None)
+
+        DatasetGenerator(SMALL, seed=2).generate()
+
+        self.assertTrue(Event.objects.filter(pk=event_id).exists())
+        current = shared.get_many(list(stale))
+        self.assertNotIn(USER_KEY.format(user_id), current)
+        for key in list(stale)[:4]:
+            self.assertGreater(current[key], 1)
+
+    def test_popularity_is_skewed(self):
+        DatasetGenerator(DatasetSize(users=200, events=100, rsvps=3000, reviews=0, notifications=0), seed=3).generate()
+        counts = sorted(
+            Event.objects.annotate(n=Count("rsvps")).values_list("n", flat=True), reverse=True
+        )
+
+        # Топ-10% подій збирають більше половини реєстрацій
+        self.assertGreater(sum(counts[:10]), sum(counts) / 2)
+        self.assertFalse(Event.objects.filter(status=Event.DRAFT, rsvps__isnull=False).exists())
+
+    def test_rows_are_consistent(self):
+        DatasetGenerator(SMALL, seed=5).generate()
+
+        # Місткість не менша за кількість реєстрацій
+        overbooked = Event.objects.exclude(capacity=None).annotate(n=Count("rsvps")).filter(n__gt=F("capacity"))
+        self.assertFalse(overbooked.exists())
+        # Відгуки лише від учасників завершених подій
+        for review in Review.objects.select_related("event"):
+            self.assertTrue(RSVP.objects.filter(user_id=review.user_id, event_id=review.event_id).exists())
+            self.assertLess(review.event.ends_at, review.created_at)
+        self.assertTrue(all(event.category_ref_id for event in Event.objects.all()))
+        # created_at розкидані в часі, а не дорівнюють моменту генерації
+        self.assertGreater(Event.objects.values("created_at").distinct().count(), 10)
+
+
+class GenerateDatasetCommandTests(TestCase):
+    """Management-команда generate_dataset"""
+
+    def test_command_generates_and_refuses_duplicate_prefix(self):
+        out = StringIO()
+        call_command(
+            "generate_dataset", users=20, events=10, rsvps=50, reviews=5, notifications=5,
+            skip_rollups=True, stdout=out,
+        )
+        self.assertIn("rsvps=50", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("generate_dataset", users=5, events=1, rsvps=0, stdout=StringIO())
+
+    def test_demo_only(self):
+        call_command("generate_dataset", demo_only=True, stdout=StringIO())
+        call_command("generate_dataset", demo_only=True, stdout=StringIO())
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Event.objects.count(), 0)
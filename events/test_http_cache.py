@@ -0,0 +1,169 @@
+"""
+Тести HTTP-кешування публічних сторінок (events/http_cache.py)
+"""
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .http_cache import LIST_KEY, STAMP_KEY, PublicPageCacheService, event_key
+from .models import Event, Review
+
+User = get_user_model()
+
+purged = []
+
+
+def record_purge(keys):
+    purged.append(keys)
+
+
+class PublicPageCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(caches["shared"].clear)
+        purged.clear()
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Meetup", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, capacity=10,
+        )
+        self.detail_url = f"/events/{self.event.pk}/"
+
+    def revalidate(self, url, response, **headers):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"], **headers)
+
+
+class ConditionalGetTests(PublicPageCacheTestCase):
+    def test_public_headers(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("s-maxage=60", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+        self.assertEqual(response["Surrogate-Key"], event_key(self.event.pk))
+        self.assertEqual(self.client.get("/events/")["Surrogate-Key"], LIST_KEY)
+
+    def test_unchanged_detail_is_304_without_queries(self):
+        response = self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            not_modified = self.revalidate(self.detail_url, response)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_if_modified_since(self):
+        response = self.client.get("/events/")
+        not_modified = self.client.get("/events/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_list_304_skips_rendering(self):
+        response = self.client.get("/events/")
+        # Архівування вже запущене першим запитом (EVENT_ARCHIVE) - 304 без запитів
+        with self.assertNumQueries(0):
+            not_modified = self.revalidate("/events/", response)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_time_period_changes_validators(self):
+        # Період пізніше за штамп ключа - інакше Last-Modified визначає штамп
+        later = time.time() + 3600
+        with mock.patch("events.http_cache.time.time", return_value=later):
+            first = PublicPageCacheService.validators([LIST_KEY])
+        with mock.patch("events.http_cache.time.time", return_value=later + 300):
+            second = PublicPageCacheService.validators([LIST_KEY])
+        self.assertNotEqual(first.etag, second.etag)
+        self.assertGreater(second.last_modified, first.last_modified)
+
+    def test_draft_is_404_even_with_etag(self):
+        response = self.client.get(self.detail_url)
+        Event.objects.filter(pk=self.event.pk).update(status=Event.DRAFT)
+        cache.clear()
+        caches["shared"].clear()
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code, 404)
+
+
+class PrivatePageTests(PublicPageCacheTestCase):
+    def test_authenticated_page_is_private(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.detail_url)
+        self.assertNotIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH="*").status_code, 200)
+
+    @override_settings(HTTP_CACHE={"ENABLED": False})
+    def test_disabled(self):
+        response = self.client.get("/events/")
+        self.assertNotIn("ETag", response)
+        self.assertIn("private", response["Cache-Control"])
+
+
+class PurgeTests(PublicPageCacheTestCase):
+    def assertChanged(self, url, change):
+        response = self.client.get(url)
+        change()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_event_change(self):
+        def change():
+            self.event.title = "Renamed"
+            self.event.save()
+
+        self.assertChanged(self.detail_url, change)
+        self.assertChanged("/events/", change)
+
+    def test_rsvp_change(self):
+        self.assertChanged("/events/", lambda: RSVP.objects.create(user=self.user, event=self.event))
+        self.assertChanged(self.detail_url, lambda: RSVP.objects.filter(user=self.user).delete())
+
+    def test_review_change(self):
+        self.assertChanged(
+            self.detail_url, lambda: Review.objects.create(event=self.event, user=self.user, rating=5)
+        )
+
+    def test_other_event_keeps_etag(self):
+        other = Event.objects.create(
+            title="Other", starts_at=self.event.starts_at, ends_at=self.event.ends_at,
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        response = self.client.get(self.detail_url)
+        other.title = "Other renamed"
+        other.save()
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code, 304)
+
+    def test_stamps_live_in_cache_shared_by_workers(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, True)
+        shared = {"BACKEND": "monitoring.cache.InstrumentedFileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={"default": {"BACKEND": "monitoring.cache.InstrumentedLocMemCache"}, "shared": shared}):
+            response = self.client.get(self.detail_url)
+            self.assertIsNone(caches["default"].get(STAMP_KEY.format(event_key(self.event.pk))))
+            self.assertEqual(self.revalidate(self.detail_url, response).status_code, 304)
+
+            # purge() в іншому воркері змінює ETag і для цього процесу
+            FileBasedCache(location, {}).set(STAMP_KEY.format(event_key(self.event.pk)), 0, None)
+            self.assertEqual(self.revalidate(self.detail_url, response).status_code, 200)
+
+    @override_settings(HTTP_CACHE={"PURGE_HANDLER": "events.test_http_cache.record_purge"})
+    def test_purge_handler_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            RSVP.objects.create(user=self.user, event=self.event)
+        self.assertIn([event_key(self.event.pk), LIST_KEY], purged)
+
+    def test_purge_handler_not_configured(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PublicPageCacheService.purge_events([self.event.pk])
+        self.assertEqual(purged, [])
@@ -0,0 +1,211 @@
+"""
+Тести підписок iCalendar (events/ics_feeds.py, calendar/feeds/...)
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .ics_feeds import (
+    LINE_LIMIT,
+    ORGANIZER_FEED,
+    USER_FEED,
+    IcsFeedService,
+    escape_text,
+    fold_line,
+    format_utc,
+)
+from .models import Event
+
+User = get_user_model()
+
+
+class IcsWriterTests(TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text("a,b;c\\d\r\ne\nf"), "a\\,b\\;c\\\\d\\ne\\nf")
+
+    def test_short_line_is_not_folded(self):
+        self.assertEqual(fold_line("SUMMARY:Meetup"), b"SUMMARY:Meetup\r\n")
+
+    def test_long_lines_fold_at_octets_without_splitting_characters(self):
+        for text in ("x" * 200, "Зустріч " * 30, "a" + "ї" * 100):
+            folded = fold_line(f"DESCRIPTION:{text}")
+            lines = folded[:-2].split(b"\r\n")
+            self.assertTrue(all(len(line) <= LINE_LIMIT for line in lines))
+            self.assertTrue(all(line.startswith(b" ") for line in lines[1:]))
+            unfolded = b"".join([lines[0]] + [line[1:] for line in lines[1:]])
+            self.assertEqual(unfolded.decode(), f"DESCRIPTION:{text}")
+
+
+class IcsFeedTestCase(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        now = timezone.now()
+
+        def event(title, starts_at, **kwargs):
+            kwargs.setdefault("status", Event.PUBLISHED)
+            kwargs.setdefault("organizer", self.organizer)
+            return Event.objects.create(
+                title=title, starts_at=starts_at, ends_at=starts_at + timedelta(hours=2), **kwargs
+            )
+
+        self.meetup = event(
+            "Meetup, Python; Kyiv", now + timedelta(days=3), location="Київ", description="Рядок 1\nРядок 2"
+        )
+        self.draft = event("Draft", now + timedelta(days=4), status=Event.DRAFT)
+        self.old = event("Old", now - timedelta(days=400))
+        self.own = event("Own", now + timedelta(days=5), organizer=self.user)
+        RSVP.objects.create(user=self.user, event=self.meetup, status="going")
+
+    def url(self, kind=USER_FEED, user=None, token=None):
+        user_id = (user or self.user).pk
+        return reverse("calendar-feed", kwargs={
+            "kind": kind, "user_id": user_id,
+            "token": token or IcsFeedService.token(kind, user_id, IcsFeedService.secret(user_id)),
+        })
+
+    def body(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def summaries(self, response):
+        return [line[len("SUMMARY:"):] for line in self.body(response).split("\r\n") if line.startswith("SUMMARY:")]
+
+
+class IcsFeedViewTests(IcsFeedTestCase):
+    def test_user_feed_contains_schedule_in_window(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = self.body(response)
+
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertIn(f"UID:event-{self.meetup.pk}@event-organizer\r\n", body)
+        self.assertIn("SUMMARY:Meetup\\, Python\\; Kyiv\r\n", body)
+        self.assertIn("DESCRIPTION:Рядок 1\\nРядок 2\r\n", body)
+        self.assertIn(f"URL:http://testserver/events/{self.meetup.pk}/\r\n", body)
+        self.assertIn(f"DTSTART:{format_utc(self.meetup.starts_at)}", body)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertNotIn("SUMMARY:Old", body)
+
+    def test_organizer_feed_contains_only_published_own_events(self):
+        self.assertEqual(
+            self.summaries(self.client.get(self.url(ORGANIZER_FEED, self.organizer))), ["Meetup\\, Python\\; Kyiv"]
+        )
+        self.assertEqual(self.summaries(self.client.get(self.url(ORGANIZER_FEED))), ["Own"])
+
+    def test_invalid_access_returns_404(self):
+        self.assertEqual(self.client.get(self.url(token="0" * 32)).status_code, 404)
+        organizer_token = IcsFeedService.token(ORGANIZER_FEED, self.user.pk)
+        self.assertEqual(self.client.get(self.url(token=organizer_token)).status_code, 404)
+        self.assertEqual(self.client.get(self.url(kind="admin", token="0" * 32)).status_code, 404)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url()).status_code, 404)
+
+    def test_salt_change_revokes_urls(self):
+        url = self.url()
+        with override_settings(ICS_FEEDS={"SALT": "rotated"}):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(ICS_FEEDS={"ENABLED": False})
+    def test_disabled_feeds(self):
+        self.assertEqual(self.client.get(self.url()).status_code, 404)
+
+    def test_post_is_not_allowed(self):
+        self.assertEqual(self.client.post(self.url()).status_code, 405)
+
+
+class IcsFeedConditionalTests(IcsFeedTestCase):
+    def poll(self, response):
+        return self.client.get(
+            self.url(), HTTP_IF_NONE_MATCH=response["ETag"], HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+    def test_unchanged_feed_returns_304_without_rendering(self):
+        url = self.url()
+        first = self.client.get(url)
+        self.assertIn("private", first["Cache-Control"])
+        # Користувач із секретом і два агрегати валідаторів - без запиту записів розкладу
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=first["ETag"], HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], first["ETag"])
+
+    def test_if_modified_since_alone(self):
+        first = self.client.get(self.url())
+        response = self.client.get(self.url(), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_event_change_returns_new_feed(self):
+        first = self.client.get(self.url())
+        # Last-Modified має секундну точність
+        Event.objects.filter(pk=self.meetup.pk).update(
+            title="Renamed", updated_at=timezone.now() + timedelta(seconds=2)
+        )
+
+        response = self.poll(first)
+        self.assertIn("SUMMARY:Renamed\r\n", self.body(response))
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_rsvp_changes_change_etag(self):
+        first = self.client.get(self.url())
+        other = Event.objects.create(
+            title="Other", starts_at=self.meetup.starts_at, ends_at=self.meetup.ends_at,
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        RSVP.objects.create(user=self.user, event=other)
+        second = self.poll(first)
+        self.assertIn("SUMMARY:Other\r\n", self.body(second))
+
+        RSVP.objects.filter(user=self.user, event=other).delete()
+        self.assertNotEqual(self.client.get(self.url())["ETag"], second["ETag"])
+
+    def test_status_change_of_registered_event_changes_etag(self):
+        first = self.client.get(self.url())
+        Event.objects.filter(pk=self.meetup.pk).update(
+            status=Event.CANCELLED, updated_at=timezone.now() + timedelta(seconds=2)
+        )
+        response = self.poll(first)
+        self.assertEqual(self.summaries(response), ["Own"])
+
+
+class CalendarFeedLinksTests(IcsFeedTestCase):
+    def test_authenticated_calendar_shows_feed_urls(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("calendar"))
+        self.assertEqual(response.context["feed_url"], "http://testserver" + self.url())
+        self.assertContains(response, self.url(ORGANIZER_FEED))
+
+    def test_anonymous_calendar_has_no_feeds(self):
+        response = self.client.get(reverse("calendar"))
+        self.assertNotIn("feed_url", response.context)
+
+    def test_rotation_revokes_only_own_urls(self):
+        old_url = self.url()
+        organizer_url = self.url(ORGANIZER_FEED, self.organizer)
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("calendar-feed-rotate"))
+        self.assertRedirects(response, reverse("calendar"))
+
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        new_url = self.client.get(reverse("calendar")).context["feed_url"]
+        self.assertNotEqual(new_url, "http://testserver" + old_url)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+        self.assertEqual(self.client.get(organizer_url).status_code, 200)
+
+    def test_rotation_requires_login_and_post(self):
+        response = self.client.post(reverse("calendar-feed-rotate"))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(IcsFeedService.secret(self.user.pk), "")
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("calendar-feed-rotate")).status_code, 405)
@@ -0,0 +1,275 @@
+"""
+Тести пулу з'єднань (event_organizer/mysql_pool)
+
+Пул не залежить від драйвера: замість з'єднань MySQL використовуються
+прості об'єкти з ping/rollback/close. MySQL-сервер для тестів не потрібен.
+"""
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from event_organizer.mysql_pool.base import DatabaseWrapper
+from event_organizer.mysql_pool.pool import ConnectionPool, PoolClosed, PoolOptions, PoolTimeout, all_pools
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.alive = True
+        self.pings = 0
+        self.resets = 0
+
+    def ping(self):
+        self.pings += 1
+        if not self.alive:
+            raise OSError("gone")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeFactory:
+    def __init__(self):
+        self.created = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            connection = FakeConnection(len(self.created))
+            self.created.append(connection)
+            return connection
+
+
+def make_pool(factory=None, events=None, **options):
+    factory = factory or FakeFactory()
+    return ConnectionPool(
+        "test",
+        factory,
+        PoolOptions(**options),
+        ping=lambda raw: raw.ping(),
+        reset=lambda raw: setattr(raw, "resets", raw.resets + 1),
+        listener=(lambda event, value: events.append(event)) if events is not None else None,
+    ), factory
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_reuses_returned_connection(self):
+        pool, factory = make_pool(max_size=2)
+
+        raw, fresh = pool.getconn()
+        self.assertTrue(fresh)
+        pool.putconn(raw)
+        again, fresh = pool.getconn()
+
+        self.assertIs(again, raw)
+        self.assertFalse(fresh)
+        self.assertEqual(len(factory.created), 1)
+        self.assertEqual(raw.resets, 1)
+        self.assertEqual(pool.snapshot()["checkouts"], 2)
+
+    def test_prefills_min_size(self):
+        pool, factory = make_pool(min_size=3, max_size=5)
+        raw, _fresh = pool.getconn()
+        snapshot = pool.snapshot()
+        self.assertEqual(len(factory.created), 3)
+        self.assertEqual((snapshot["in_use"], snapshot["idle"]), (1, 2))
+        pool.putconn(raw)
+
+    def test_timeout_when_exhausted(self):
+        events = []
+        pool, _factory = make_pool(max_size=1, timeout=0.05, events=events)
+        raw, _fresh = pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.snapshot()["timeouts"], 1)
+        self.assertIn("timeout", events)
+        pool.putconn(raw)
+
+    def test_waiter_gets_connection_released_by_other_thread(self):
+        pool, factory = make_pool(max_size=1, timeout=2)
+        raw, _fresh = pool.getconn()
+        released = threading.Timer(0.05, pool.putconn, args=[raw])
+        released.start()
+
+        again, _fresh = pool.getconn()
+
+        self.assertIs(again, raw)
+        snapshot = pool.snapshot()
+        self.assertEqual(snapshot["waits"], 1)
+        self.assertGreater(snapshot["wait_seconds_max"], 0)
+        self.assertEqual(len(factory.created), 1)
+
+    def test_failed_health_check_replaces_connection(self):
+        events = []
+        pool, factory = make_pool(max_size=2, check_after=0, events=events)
+        raw, _fresh = pool.getconn()
+        pool.putconn(raw)
+        raw.alive = False
+
+        replacement, fresh = pool.getconn()
+
+        self.assertIsNot(replacement, raw)
+        self.assertTrue(fresh)
+        self.assertTrue(raw.closed)
+        self.assertEqual(pool.snapshot()["check_failures"], 1)
+        self.assertIn("check_failed", events)
+
+    def test_recently_used_connection_is_not_pinged(self):
+        pool, _factory = make_pool(check_after=60)
+        raw, _fresh = pool.getconn()
+        pool.putconn(raw)
+        pool.getconn()
+        self.assertEqual(raw.pings, 0)
+
+    def test_max_lifetime_and_discard(self):
+        pool, factory = make_pool(max_size=2, max_lifetime=0)
+        raw, _fresh = pool.getconn()
+        pool.putconn(raw)
+        self.assertTrue(raw.closed)
+
+        pool.options.max_lifetime = 1800
+        raw, _fresh = pool.getconn()
+        pool.putconn(raw, discard=True)
+        self.assertTrue(raw.closed)
+        self.assertEqual(pool.snapshot()["size"], 0)
+        self.assertEqual(len(factory.created), 2)
+
+    def test_idle_connections_above_min_size_are_trimmed(self):
+        pool, _factory = make_pool(min_size=1, max_size=3, max_idle=0.01)
+        first, _fresh = pool.getconn()
+        second, _fresh = pool.getconn()
+        pool.putconn(first)
+        time.sleep(0.02)
+        pool.putconn(second)
+
+        snapshot = pool.snapshot()
+        self.assertEqual(snapshot["size"], 1)
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+
+    def test_failed_reset_discards_connection(self):
+        pool = ConnectionPool("test", FakeFactory(), PoolOptions(), reset=lambda raw: 1 / 0)
+        raw, _fresh = pool.getconn()
+        pool.putconn(raw)
+        self.assertTrue(raw.closed)
+        self.assertEqual(pool.snapshot()["idle"], 0)
+
+    def test_close_pool(self):
+        pool, _factory = make_pool(max_size=2)
+        idle, _fresh = pool.getconn()
+        busy, _fresh = pool.getconn()
+        pool.putconn(idle)
+
+        pool.close()
+
+        self.assertTrue(idle.closed)
+        self.assertFalse(busy.closed)
+        pool.putconn(busy)
+        self.assertTrue(busy.closed)
+        with self.assertRaises(PoolClosed):
+            pool.getconn()
+
+    def test_concurrent_checkouts_never_exceed_max_size(self):
+        pool, factory = make_pool(max_size=3, timeout=5)
+        peak = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(50):
+                raw, _fresh = pool.getconn()
+                with lock:
+                    peak.append(pool.snapshot()["in_use"])
+                pool.putconn(raw)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(max(peak), 3)
+        self.assertLessEqual(len(factory.created), 3)
+        self.assertEqual(pool.snapshot()["checkouts"], 400)
+        self.assertEqual(pool.snapshot()["in_use"], 0)
+
+    def test_options_validation(self):
+        self.assertEqual(PoolOptions.from_settings(True), PoolOptions())
+        with self.assertRaises(ValueError):
+            PoolOptions.from_settings({"max_size": 0})
+        with self.assertRaises(ValueError):
+            PoolOptions.from_settings({"maxsize": 5})
+
+
+def mysql_settings(**overrides):
+    settings_dict = {
+        "ENGINE": "event_organizer.mysql_pool", "NAME": "event_organizer", "USER": "root", "PASSWORD": "",
+        "HOST": "localhost", "PORT": "3306", "OPTIONS": {"charset": "utf8mb4", "pool": {"max_size": 2}},
+        "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False, "AUTOCOMMIT": True, "ATOMIC_REQUESTS": False,
+        "TIME_ZONE": None, "TEST": {},
+    }
+    settings_dict.update(overrides)
+    return settings_dict
+
+
+class PooledDatabaseWrapperTests(SimpleTestCase):
+    """Налаштування пулу у бекенді (без підключення до MySQL)"""
+
+    def setUp(self):
+        self.wrapper = DatabaseWrapper(mysql_settings(), alias="pool_test")
+        self.addCleanup(self.wrapper.close_pool)
+
+    def test_pool_option_is_not_passed_to_driver(self):
+        params = self.wrapper.get_connection_params()
+        self.assertNotIn("pool", params)
+        self.assertEqual(self.wrapper.pool.options.max_size, 2)
+        self.assertIn(self.wrapper.pool, all_pools())
+
+    def test_pool_replaced_when_connection_params_change(self):
+        pool = self.wrapper.pool
+        self.assertIs(self.wrapper.pool, pool)
+
+        self.wrapper.settings_dict["NAME"] = "test_event_organizer"
+
+        self.assertIsNot(self.wrapper.pool, pool)
+        self.assertTrue(pool.closed)
+
+    def test_close_returns_connection_to_pool(self):
+        pool = ConnectionPool("pool_test", FakeFactory())
+        raw, _fresh = pool.getconn()
+        self.wrapper.connection = raw
+        self.wrapper._connection_pool = pool
+
+        self.wrapper.close()
+
+        self.assertIsNone(self.wrapper.connection)
+        self.assertFalse(raw.closed)
+        self.assertEqual(pool.snapshot()["idle"], 1)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseWrapper(mysql_settings(CONN_MAX_AGE=60), alias="pool_bad").pool
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseWrapper(
+                mysql_settings(OPTIONS={"pool": {"max_size": 1, "min_size": 2}}), alias="pool_bad"
+            ).pool
+
+    def test_without_pool_option(self):
+        wrapper = DatabaseWrapper(mysql_settings(OPTIONS={}), alias="pool_none")
+        self.assertIsNone(wrapper.pool)
+
+    def test_pool_events_reach_metrics(self):
+        from event_organizer.mysql_pool.base import _listener
+        from monitoring.metrics import DB_POOL_EVENTS, DB_POOL_WAIT, _db_pool_connections
+
+        pool = ConnectionPool("pool_metrics", FakeFactory(), listener=_listener("pool_metrics"))
+        self.addCleanup(pool.close)
+        raw, _fresh = pool.getconn()
+
+        self.assertEqual(DB_POOL_EVENTS.series[("pool_metrics", "created")], 1)
+        self.assertIn(("pool_metrics",), DB_POOL_WAIT.series)
+        self.assertIn((("pool_metrics", "in_use"), 1), _db_pool_connections())
+        pool.putconn(raw)
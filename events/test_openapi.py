@@ -0,0 +1,84 @@
+"""
+Тести попередньо згенерованої OpenAPI-схеми (event_organizer/openapi.py)
+"""
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from event_organizer import openapi
+
+
+class OpenAPISchemaTests(TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        override = override_settings(OPENAPI_SCHEMA={"DIR": self.tmpdir, "MAX_AGE": 600})
+        override.enable()
+        self.addCleanup(override.disable)
+        openapi.STORE.reset()
+        self.addCleanup(openapi.STORE.reset)
+
+    def test_schema_served_from_file_with_etag(self):
+        response = self.client.get("/api/schema/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("application/vnd.oai.openapi"))
+        self.assertIn(b"openapi: 3", response.content)
+        self.assertIn("max-age=600", response["Cache-Control"])
+        self.assertTrue((self.tmpdir / "schema.yaml").exists())
+
+        cached = self.client.get("/api/schema/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_json_format(self):
+        response = self.client.get("/api/schema/?format=json")
+
+        schema = json.loads(response.content)
+        self.assertIn("/api/events/", schema["paths"])
+        self.assertNotEqual(response["ETag"], self.client.get("/api/schema/")["ETag"])
+
+    def test_generated_once_per_process(self):
+        self.client.get("/api/schema/")
+        with mock.patch.object(openapi, "generate_schema") as generate:
+            for _ in range(3):
+                self.client.get("/api/schema/")
+        generate.assert_not_called()
+
+    def test_versioned_url_is_immutable_and_used_by_docs(self):
+        checksum = openapi.STORE.checksum()
+
+        response = self.client.get(f"/api/schema/?v={checksum}")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        for path in ("/api/docs/", "/api/redoc/"):
+            self.assertContains(self.client.get(path), checksum)
+
+    def test_stale_checksum_triggers_regeneration(self):
+        openapi.generate_schema(self.tmpdir, checksum="stale")
+        openapi.STORE.reset()
+
+        self.client.get("/api/schema/")
+
+        meta = openapi.read_meta(self.tmpdir)
+        self.assertEqual(meta["checksum"], openapi.source_checksum())
+
+    def test_checksum_covers_models(self):
+        """Зміна полів моделі (help_text, choices) змінює схему - і контрольну суму"""
+        paths = {str(path) for path in openapi.source_paths()}
+        self.assertIn(str(Path(openapi.settings.BASE_DIR, "events", "models.py").resolve()), paths)
+
+    def test_command_check(self):
+        with self.assertRaises(CommandError):
+            call_command("generate_openapi_schema", "--check", stdout=StringIO())
+
+        call_command("generate_openapi_schema", stdout=StringIO())
+        out = StringIO()
+        call_command("generate_openapi_schema", "--check", stdout=out)
+        self.assertIn("актуальна", out.getvalue())
@@ -0,0 +1,133 @@
+"""
+Тести денормалізованих агрегатів відгуків (events/ratings.py)
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Event, OrganizerRating, Review
+from .ratings import RatingService
+
+User = get_user_model()
+
+
+class RatingTestCase(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.other_organizer = User.objects.create_user(username="other", password="pass12345")
+        self.reviewers = [User.objects.create_user(username=f"reviewer{i}", password="pass12345") for i in range(3)]
+        self.event = self.create_event("Past")
+        self.second_event = self.create_event("Second")
+
+    def create_event(self, title, organizer=None):
+        now = timezone.now()
+        return Event.objects.create(
+            title=title, starts_at=now - timedelta(days=2), ends_at=now - timedelta(days=2, hours=-2),
+            organizer=organizer or self.organizer, status=Event.PUBLISHED,
+        )
+
+    def assertAggregates(self, event, rating_sum, reviews_count):
+        event.refresh_from_db()
+        self.assertEqual((event.rating_sum, event.reviews_count), (rating_sum, reviews_count))
+
+    def assertOrganizer(self, organizer, rating_sum, reviews_count):
+        rating = OrganizerRating.objects.filter(organizer=organizer).first()
+        self.assertEqual((rating.rating_sum, rating.reviews_count) if rating else (0, 0), (rating_sum, reviews_count))
+
+
+class IncrementalAggregatesTests(RatingTestCase):
+    def test_create_edit_delete(self):
+        review = Review.objects.create(event=self.event, user=self.reviewers[0], rating=4)
+        Review.objects.create(event=self.second_event, user=self.reviewers[1], rating=2)
+        self.assertAggregates(self.event, 4, 1)
+        self.assertOrganizer(self.organizer, 6, 2)
+        self.assertEqual(self.event.avg_rating, 4)
+
+        review.rating = 1
+        review.save()
+        self.assertAggregates(self.event, 1, 1)
+        self.assertOrganizer(self.organizer, 3, 2)
+
+        review.delete()
+        self.assertAggregates(self.event, 0, 0)
+        self.assertIsNone(self.event.avg_rating)
+        self.assertOrganizer(self.organizer, 2, 1)
+
+    def test_review_moved_to_other_event(self):
+        review = Review.objects.create(event=self.event, user=self.reviewers[0], rating=5)
+        review.event = self.second_event
+        review.save()
+        self.assertAggregates(self.event, 0, 0)
+        self.assertAggregates(self.second_event, 5, 1)
+        self.assertOrganizer(self.organizer, 5, 1)
+
+    def test_event_save_keeps_aggregates(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=5)
+        stale.title = "Renamed"
+        stale.save()
+        self.assertAggregates(self.event, 5, 1)
+
+    def test_organizer_change_moves_rollup(self):
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=5)
+        event = Event.objects.get(pk=self.event.pk)
+        event.organizer = self.other_organizer
+        event.save()
+        self.assertOrganizer(self.organizer, 0, 0)
+        self.assertOrganizer(self.other_organizer, 5, 1)
+
+    def test_event_deletion_updates_organizer(self):
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=5)
+        Review.objects.create(event=self.second_event, user=self.reviewers[0], rating=3)
+        self.event.delete()
+        self.assertOrganizer(self.organizer, 3, 1)
+
+    def test_drifted_aggregates_do_not_go_negative(self):
+        review = Review.objects.create(event=self.event, user=self.reviewers[0], rating=5)
+        Event.objects.filter(pk=self.event.pk).update(rating_sum=0, reviews_count=0)
+        review.delete()
+        self.assertAggregates(self.event, 0, 0)
+
+
+class RebuildTests(RatingTestCase):
+    def test_rebuild_fixes_only_drift(self):
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=4)
+        Review.objects.create(event=self.event, user=self.reviewers[1], rating=2)
+        self.assertEqual(RatingService.rebuild(), (0, 0))
+
+        Event.objects.filter(pk=self.event.pk).update(rating_sum=100, reviews_count=1)
+        OrganizerRating.objects.all().delete()
+        Review.objects.filter(user=self.reviewers[1]).update(rating=5)
+        self.assertEqual(RatingService.rebuild(dry_run=True), (1, 1))
+        self.assertAggregates(self.event, 100, 1)
+
+        self.assertEqual(RatingService.rebuild(), (1, 1))
+        self.assertAggregates(self.event, 9, 2)
+        self.assertOrganizer(self.organizer, 9, 2)
+
+    def test_rebuild_zeroes_organizer_without_reviews(self):
+        OrganizerRating.objects.create(organizer=self.other_organizer, rating_sum=7, reviews_count=2)
+        self.assertEqual(RatingService.rebuild(), (0, 1))
+        self.assertOrganizer(self.other_organizer, 0, 0)
+
+    def test_repair_command(self):
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=4)
+        Event.objects.filter(pk=self.event.pk).update(reviews_count=3)
+        out = StringIO()
+        call_command("repair_ratings", stdout=out)
+        self.assertIn("подій 1", out.getvalue())
+        self.assertAggregates(self.event, 4, 1)
+
+
+class ProfileRatingTests(RatingTestCase):
+    def test_profile_reads_rollup(self):
+        Review.objects.create(event=self.event, user=self.reviewers[0], rating=4)
+        Review.objects.create(event=self.second_event, user=self.reviewers[1], rating=5)
+        self.client.force_login(self.organizer)
+        response = self.client.get("/accounts/profile/")
+        self.assertEqual(response.context["my_events_avg_rating"], 4.5)
+        self.assertEqual(response.context["my_events_reviews_count"], 2)
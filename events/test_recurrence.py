@@ -0,0 +1,423 @@
+"""
+Тести повторюваних подій (events/recurrence.py) та їх розгортки в розкладі
+"""
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tickets.models import RSVP, SINGLE_OCCURRENCE
+
+from .forms import EventForm
+from .ics_feeds import USER_FEED, IcsFeedService, format_utc
+from .models import Event, EventOccurrence
+from .recurrence import OPEN_END, OccurrenceService, Recurrence
+from .schedule_cache import MaterializedScheduleProvider
+from .schedule_services import BaseScheduleProvider, PersonalScheduleService, ScheduleWindow
+from .services import EventArchiveService, RSVPService
+
+User = get_user_model()
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class RecurrenceParseTests(TestCase):
+    def test_parse_and_round_trip(self):
+        rule = Recurrence.parse("RRULE:freq=weekly;interval=2;byday=we,mo;count=10")
+        self.assertEqual((rule.freq, rule.interval, rule.count, rule.byday), ("WEEKLY", 2, 10, (0, 2)))
+        self.assertEqual(rule.to_rule(), "FREQ=WEEKLY;INTERVAL=2;COUNT=10;BYDAY=MO,WE")
+        self.assertEqual(Recurrence.parse(rule.to_rule()), rule)
+
+    def test_until_date_includes_whole_local_day(self):
+        rule = Recurrence.parse("FREQ=DAILY;UNTIL=20300105")
+        self.assertEqual(rule.until, local(2030, 1, 6) - timedelta(microseconds=1))
+
+    def test_invalid_rules(self):
+        for rule in (
+            "", "FREQ=YEARLY", "FREQ=DAILY;COUNT=0", "FREQ=DAILY;INTERVAL=x", "FREQ=DAILY;COUNT=2;UNTIL=20300101",
+            "FREQ=DAILY;BYDAY=MO", "FREQ=WEEKLY;BYDAY=XX", "FREQ=DAILY;BYMONTH=1", "FREQ=DAILY;UNTIL=tomorrow",
+            "FREQ",
+        ):
+            with self.subTest(rule=rule), self.assertRaises(ValueError):
+                Recurrence.parse(rule)
+
+
+class RecurrenceExpansionTests(TestCase):
+    def starts(self, rule, dtstart, exdates=(), **kwargs):
+        recurrence = Recurrence.parse(rule, exdates)
+        return [start for start, _ in recurrence.occurrences(dtstart, timedelta(hours=1), **kwargs)]
+
+    def test_weekly_keeps_local_time_across_dst(self):
+        # Перехід на літній час у Києві - 31.03.2030
+        starts = self.starts("FREQ=WEEKLY;COUNT=3", local(2030, 3, 18, 19))
+        self.assertEqual([timezone.localtime(start).hour for start in starts], [19, 19, 19])
+        self.assertEqual([format_utc(start) for start in starts], [
+            "20300318T170000Z", "20300325T170000Z", "20300401T160000Z",
+        ])
+
+    def test_byday_count_and_exdates(self):
+        first = local(2030, 1, 7, 10)  # понеділок
+        starts = self.starts("FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4", first, exdates=[local(2030, 1, 9, 10).isoformat()])
+        # COUNT рахує і виключене повторення
+        self.assertEqual(starts, [local(2030, 1, 7, 10), local(2030, 1, 14, 10), local(2030, 1, 16, 10)])
+
+    def test_until_and_interval(self):
+        starts = self.starts("FREQ=DAILY;INTERVAL=2;UNTIL=20300105", local(2030, 1, 1, 9))
+        self.assertEqual(starts, [local(2030, 1, 1, 9), local(2030, 1, 3, 9), local(2030, 1, 5, 9)])
+
+    def test_monthly_skips_months_without_day(self):
+        starts = self.starts("FREQ=MONTHLY;COUNT=4", local(2030, 1, 31, 18))
+        self.assertEqual(starts, [local(2030, 1, 31, 18), local(2030, 3, 31, 18), local(2030, 5, 31, 18),
+                                  local(2030, 7, 31, 18)])
+
+    def test_window_expansion_is_lazy_for_open_series(self):
+        first = local(2030, 1, 1, 9)
+        window_start, window_end = local(2080, 6, 1), local(2080, 6, 4)
+        starts = self.starts("FREQ=DAILY", first, window_start=window_start, window_end=window_end)
+        self.assertEqual(starts, [local(2080, 6, 1, 9), local(2080, 6, 2, 9), local(2080, 6, 3, 9)])
+        self.assertEqual(len(self.starts("FREQ=DAILY", first, window_start=window_start, limit=5)), 5)
+
+    def test_occurrence_in_progress_overlaps_window(self):
+        starts = self.starts("FREQ=DAILY", local(2030, 1, 1, 9), window_start=local(2030, 1, 3, 9, 30),
+                             window_end=local(2030, 1, 4))
+        self.assertEqual(starts, [local(2030, 1, 3, 9, 30) - timedelta(minutes=30)])
+
+    def test_series_end(self):
+        first, duration = local(2030, 1, 1, 9), timedelta(hours=2)
+        self.assertEqual(Recurrence.parse("FREQ=DAILY").series_end(first, duration), OPEN_END)
+        self.assertEqual(Recurrence.parse("FREQ=DAILY;COUNT=3").series_end(first, duration), local(2030, 1, 3, 11))
+        until = Recurrence.parse("FREQ=DAILY;UNTIL=20300110T000000Z")
+        self.assertEqual(until.series_end(first, duration), until.until + duration)
+
+    def test_is_occurrence(self):
+        recurrence = Recurrence.parse("FREQ=WEEKLY;COUNT=3")
+        first = local(2030, 1, 7, 10)
+        self.assertTrue(recurrence.is_occurrence(first, local(2030, 1, 21, 10)))
+        self.assertFalse(recurrence.is_occurrence(first, local(2030, 1, 28, 10)))
+        self.assertFalse(recurrence.is_occurrence(first, local(2030, 1, 14, 11)))
+
+
+class RecurringEventTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(caches["shared"].clear)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        self.other = User.objects.create_user(username="other", password="pass12345")
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.first = timezone.make_aware(datetime.combine(tomorrow, time(19)))
+        self.series = Event.objects.create(
+            title="Weekly", starts_at=self.first, ends_at=self.first + timedelta(hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED, recurrence_rule="FREQ=WEEKLY;COUNT=4",
+        )
+        self.window = ScheduleWindow(self.first - timedelta(days=1), self.first + timedelta(days=60))
+
+    def occurrence(self, index):
+        return self.first + timedelta(weeks=index)
+
+    def rsvp(self, index, user=None):
+        return RSVP.objects.create(user=user or self.user, event=self.series, occurrence_start=self.occurrence(index))
+
+
+class RecurringEventModelTests(RecurringEventTestCase):
+    def test_series_ends_at_is_maintained_on_save(self):
+        self.assertEqual(self.series.series_ends_at, self.occurrence(3) + timedelta(hours=2))
+        self.series.recurrence_rule = ""
+        self.series.save()
+        self.assertEqual(self.series.series_ends_at, self.series.ends_at)
+        self.assertFalse(self.series.is_recurring)
+
+    def test_single_event_rsvp_key(self):
+        single = Event.objects.create(
+            title="Once", starts_at=self.first, ends_at=self.first + timedelta(hours=1), organizer=self.organizer,
+        )
+        self.assertEqual(RSVP.objects.create(user=self.user, event=single).occurrence_start, SINGLE_OCCURRENCE)
+
+
+@override_settings(SCHEDULE_CACHE={"ENABLED": False})
+class RecurringScheduleTests(RecurringEventTestCase):
+    def test_organizer_sees_each_occurrence_in_window(self):
+        entries = PersonalScheduleService.get_user_schedule_entries(self.organizer, self.window)
+        self.assertEqual([entry.starts_at for entry in entries], [self.occurrence(i) for i in range(4)])
+        self.assertTrue(all(entry.to_dict()["recurring"] for entry in entries))
+
+        narrow = ScheduleWindow(self.occurrence(1) - timedelta(hours=1), self.occurrence(2) - timedelta(hours=1))
+        entries = PersonalScheduleService.get_user_schedule_entries(self.organizer, narrow)
+        self.assertEqual([entry.starts_at for entry in entries], [self.occurrence(1)])
+
+    def test_attendee_sees_registered_occurrences_with_counts(self):
+        self.rsvp(1)
+        self.rsvp(1, self.other)
+        self.rsvp(3, self.other)
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user, self.window)
+        self.assertEqual([(entry.starts_at, entry.has_rsvp, entry.rsvp_count) for entry in entries],
+                         [(self.occurrence(1), True, 2)])
+
+        organizer_counts = [
+            entry.rsvp_count for entry in PersonalScheduleService.get_user_schedule_entries(self.organizer, self.window)
+        ]
+        self.assertEqual(organizer_counts, [0, 2, 0, 1])
+
+    def test_upcoming_filter_keeps_started_series(self):
+        series = Event.objects.create(
+            title="Daily", starts_at=self.first - timedelta(days=10), ends_at=self.first - timedelta(days=10, hours=-1),
+            organizer=self.organizer, status=Event.PUBLISHED, recurrence_rule="FREQ=DAILY;COUNT=20",
+        )
+        from .schedule_services import ScheduleCriteria
+
+        entries = PersonalScheduleService.get_user_schedule_entries(
+            self.organizer, criteria=ScheduleCriteria(only_upcoming=True)
+        )
+        daily = [entry.starts_at for entry in entries if entry.event_id == series.pk]
+        now = timezone.now()
+        expected = [series.starts_at + timedelta(days=day) for day in range(20)]
+        self.assertEqual(daily, [start for start in expected if start > now])
+        self.assertGreaterEqual(len(daily), 10)
+
+    def test_materialized_snapshot_matches_sql(self):
+        self.rsvp(0)
+        self.rsvp(2)
+        for user in (self.user, self.organizer):
+            self.assertEqual(
+                MaterializedScheduleProvider().get_entries(user, self.window),
+                BaseScheduleProvider().get_entries(user, self.window),
+            )
+
+    def test_public_rows_and_calendar_json(self):
+        rows = PersonalScheduleService.get_public_schedule_rows(self.window)
+        self.assertEqual([row[2] for row in rows], [self.occurrence(i) for i in range(4)])
+
+        response = self.client.get(reverse("calendar-events"), {
+            "start": self.window.start.isoformat(), "end": self.window.end.isoformat(),
+        })
+        self.assertEqual(len(response.json()["events"]), 4)
+
+    def test_ics_feed_has_one_vevent_per_occurrence(self):
+        self.rsvp(0)
+        self.rsvp(2)
+        url = reverse("calendar-feed", kwargs={
+            "kind": USER_FEED, "user_id": self.user.pk, "token": IcsFeedService.token(USER_FEED, self.user.pk),
+        })
+        body = b"".join(self.client.get(url).streaming_content).decode()
+        for index in (0, 2):
+            self.assertIn(f"UID:event-{self.series.pk}-{format_utc(self.occurrence(index))}@event-organizer\r\n", body)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+
+
+class RecurringRsvpTests(RecurringEventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def post(self, action="rsvp", occurrence=None):
+        data = {"occurrence": occurrence.isoformat()} if occurrence else {}
+        return self.client.post(f"/events/{self.series.pk}/{action}/", data)
+
+    def test_rsvp_per_occurrence(self):
+        self.post(occurrence=self.occurrence(1))
+        self.post(occurrence=self.occurrence(2))
+        self.assertEqual(
+            sorted(RSVP.objects.filter(user=self.user).values_list("occurrence_start", flat=True)),
+            [self.occurrence(1), self.occurrence(2)],
+        )
+
+        self.post("rsvp/cancel", self.occurrence(1))
+        self.assertEqual(list(RSVP.objects.filter(user=self.user).values_list("occurrence_start", flat=True)),
+                         [self.occurrence(2)])
+
+    def test_rsvp_requires_valid_occurrence(self):
+        self.post()
+        self.post(occurrence=self.occurrence(1) + timedelta(hours=1))
+        self.post(occurrence=self.occurrence(4))
+        self.assertFalse(RSVP.objects.exists())
+
+    def test_capacity_is_per_occurrence(self):
+        Event.objects.filter(pk=self.series.pk).update(capacity=1)
+        self.series.refresh_from_db()
+        self.rsvp(1, self.other)
+        can_create, error = RSVPService.can_create_rsvp(self.user, self.series, self.occurrence(1))
+        self.assertFalse(can_create)
+        self.assertIn("місця", error)
+        self.assertEqual(RSVPService.can_create_rsvp(self.user, self.series, self.occurrence(2)), (True, None))
+
+    def test_time_conflict_with_single_event(self):
+        Event.objects.create(
+            title="Clash", starts_at=self.occurrence(2), ends_at=self.occurrence(2) + timedelta(hours=1),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        clash = Event.objects.get(title="Clash")
+        RSVP.objects.create(user=self.user, event=clash)
+        self.assertEqual(RSVPService.can_create_rsvp(self.user, self.series, self.occurrence(1)), (True, None))
+        self.assertFalse(RSVPService.can_create_rsvp(self.user, self.series, self.occurrence(2))[0])
+
+    def test_started_series_accepts_future_occurrences(self):
+        Event.objects.filter(pk=self.series.pk).update(
+            starts_at=self.first - timedelta(weeks=1), ends_at=self.first - timedelta(weeks=1, hours=-2),
+            recurrence_rule="FREQ=WEEKLY",
+        )
+        self.post(occurrence=self.first)
+        self.assertTrue(RSVP.objects.filter(user=self.user, occurrence_start=self.first).exists())
+        self.post(occurrence=self.first - timedelta(weeks=1))
+        self.assertEqual(RSVP.objects.filter(user=self.user).count(), 1)
+
+    def test_api_rsvp_with_occurrence(self):
+        url = f"/api/events/{self.series.pk}/rsvp/"
+        self.assertEqual(self.client.post(url, {}, content_type="application/json").status_code, 400)
+        response = self.client.post(url, {"occurrence": self.occurrence(3).isoformat()},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNotNone(response.json()["occurrence_start"])
+
+    def test_detail_lists_upcoming_occurrences(self):
+        self.rsvp(0)
+        response = self.client.get(f"/events/{self.series.pk}/")
+        occurrences = response.context["occurrences"]
+        self.assertEqual([item["starts_at"] for item in occurrences], [self.occurrence(i) for i in range(4)])
+        self.assertEqual([item["has_rsvp"] for item in occurrences], [True, False, False, False])
+        self.assertContains(response, f'value="{self.occurrence(1).isoformat()}"')
+
+
+class RecurringRsvpRemapTests(RecurringEventTestCase):
+    """RSVP після зміни початку чи правила серії (OccurrenceService.remap_rsvps)"""
+
+    def keys(self, user=None):
+        return sorted(RSVP.objects.filter(user=user or self.user).values_list("occurrence_start", flat=True))
+
+    def test_moved_series_shifts_rsvps(self):
+        self.rsvp(1)
+        self.rsvp(2)
+        self.series.starts_at += timedelta(hours=1)
+        self.series.ends_at += timedelta(hours=1)
+        self.series.save()
+        self.assertEqual(self.keys(), [self.occurrence(1) + timedelta(hours=1), self.occurrence(2) + timedelta(hours=1)])
+
+    def test_occurrences_still_in_series_are_kept(self):
+        self.rsvp(0)
+        self.rsvp(2)
+        self.series.starts_at += timedelta(weeks=1)
+        self.series.ends_at += timedelta(weeks=1)
+        self.series.save()
+        # Повторення 0 зникло - зсувається на тиждень; 2 лишилося в серії
+        self.assertEqual(self.keys(), [self.occurrence(1), self.occurrence(2)])
+
+    def test_removed_occurrences_are_deleted(self):
+        self.rsvp(1)
+        self.rsvp(3, self.other)
+        self.series.recurrence_rule = "FREQ=WEEKLY;COUNT=2"
+        self.series.save()
+        self.assertEqual(self.keys(), [self.occurrence(1)])
+        self.assertEqual(self.keys(self.other), [])
+
+    def test_series_to_single_keeps_one_rsvp_per_user(self):
+        self.rsvp(1)
+        self.rsvp(2)
+        self.series.recurrence_rule = ""
+        self.series.save()
+        self.assertEqual(self.keys(), [SINGLE_OCCURRENCE])
+
+    def test_single_to_series_maps_to_first_occurrence(self):
+        Event.objects.filter(pk=self.series.pk).update(recurrence_rule="")
+        self.series.refresh_from_db()
+        RSVP.objects.create(user=self.user, event=self.series)
+        Event.objects.filter(pk=self.series.pk).update(capacity=1)
+        self.series.refresh_from_db()
+
+        self.series.recurrence_rule = "FREQ=WEEKLY;COUNT=4"
+        self.series.save()
+        self.assertEqual(self.keys(), [self.first])
+
+        # Повторна реєстрація на те саме повторення неможлива, скасування працює
+        self.client.force_login(self.user)
+        self.client.post(f"/events/{self.series.pk}/rsvp/", {"occurrence": self.first.isoformat()})
+        self.assertEqual(RSVP.objects.filter(event=self.series).count(), 1)
+        self.client.post(f"/events/{self.series.pk}/rsvp/cancel/", {"occurrence": self.first.isoformat()})
+        self.assertFalse(RSVP.objects.filter(event=self.series).exists())
+
+    def test_cancel_by_stored_key_outside_current_rule(self):
+        stale = self.occurrence(1) + timedelta(minutes=30)
+        RSVP.objects.create(user=self.user, event=self.series, occurrence_start=stale)
+        self.client.force_login(self.user)
+        self.client.post(f"/events/{self.series.pk}/rsvp/cancel/", {"occurrence": stale.isoformat()})
+        self.assertEqual(self.keys(), [])
+
+
+class RecurringArchiveTests(RecurringEventTestCase):
+    def test_active_series_is_not_archived(self):
+        Event.objects.filter(pk=self.series.pk).delete()
+        now = timezone.now()
+        active = Event.objects.create(
+            title="Active", starts_at=now - timedelta(days=7), ends_at=now - timedelta(days=7, hours=-1),
+            organizer=self.organizer, status=Event.PUBLISHED, recurrence_rule="FREQ=WEEKLY;COUNT=3",
+        )
+        finished = Event.objects.create(
+            title="Finished", starts_at=now - timedelta(days=30), ends_at=now - timedelta(days=30, hours=-1),
+            organizer=self.organizer, status=Event.PUBLISHED, recurrence_rule="FREQ=DAILY;COUNT=3",
+        )
+        self.assertEqual(EventArchiveService().archive_past_events(), 1)
+        active.refresh_from_db()
+        finished.refresh_from_db()
+        self.assertEqual((active.status, finished.status), (Event.PUBLISHED, Event.ARCHIVED))
+
+
+class OccurrenceMaterializationTests(RecurringEventTestCase):
+    def starts(self):
+        return list(EventOccurrence.objects.filter(event=self.series).values_list("starts_at", flat=True))
+
+    def test_disabled_by_default(self):
+        self.assertEqual(OccurrenceService.materialize(), (0, 0))
+        self.assertFalse(EventOccurrence.objects.exists())
+        with self.assertRaises(CommandError):
+            call_command("materialize_occurrences", stdout=StringIO())
+
+    def test_horizon_and_exdates(self):
+        # Друге повторення - не пізніше ніж за 9 днів, третє - пізніше ніж за 14
+        self.assertEqual(OccurrenceService.materialize(horizon_days=10), (2, 0))
+        self.assertEqual(self.starts(), [self.occurrence(0), self.occurrence(1)])
+
+        self.series.recurrence_exdates = [self.occurrence(1).isoformat()]
+        self.series.save()
+        self.assertEqual(OccurrenceService.materialize(horizon_days=10), (0, 1))
+        self.assertEqual(self.starts(), [self.occurrence(0)])
+
+    @override_settings(RECURRENCE={"MATERIALIZE_DAYS": 60})
+    def test_save_and_command_materialize(self):
+        self.series.save()
+        self.assertEqual(self.starts(), [self.occurrence(i) for i in range(4)])
+
+        self.series.status = Event.CANCELLED
+        self.series.save()
+        self.assertEqual(self.starts(), [])
+
+        out = StringIO()
+        call_command("materialize_occurrences", "--days", "10", stdout=out)
+        self.assertIn("створено: 0", out.getvalue())
+
+
+class RecurrenceFormTests(TestCase):
+    def form(self, rule):
+        starts_at = timezone.now() + timedelta(days=1)
+        return EventForm(data={
+            "title": "Series", "description": "", "location": "Київ", "status": Event.PUBLISHED,
+            "starts_at": timezone.localtime(starts_at).strftime("%Y-%m-%dT%H:%M"),
+            "ends_at": timezone.localtime(starts_at + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+            "recurrence_rule": rule,
+        })
+
+    def test_rule_is_normalized(self):
+        form = self.form("rrule:freq=weekly;byday=fr,mo")
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["recurrence_rule"], "FREQ=WEEKLY;BYDAY=MO,FR")
+
+    def test_invalid_rule(self):
+        form = self.form("FREQ=YEARLY")
+        self.assertFalse(form.is_valid())
+        self.assertIn("recurrence_rule", form.errors)
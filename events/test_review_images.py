@@ -0,0 +1,253 @@
+"""
+Тести обробки зображень відгуків (events/image_processing.py, events/review_images.py)
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from tickets.models import RSVP
+
+from .image_processing import process_image
+from .models import Event, Review
+from . import review_images
+from .review_images import ReviewImageService, config_version, make_pool
+
+User = get_user_model()
+
+
+def make_jpeg(size=(800, 600), orientation=None) -> bytes:
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0110] = "Test Phone"
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+class ProcessImageTests(TestCase):
+    def test_orientation_downscale_and_metadata(self):
+        result = process_image(make_jpeg((800, 600), orientation=6), max_dimension=400, widths=(100, 200))
+
+        self.assertEqual((result.width, result.height), (300, 400))
+        original = Image.open(BytesIO(result.files["original"]))
+        self.assertEqual(original.size, (300, 400))
+        self.assertEqual(dict(original.getexif()), {})
+        self.assertEqual(
+            sorted(key for key in result.files if key != "original"),
+            [(100, "jpeg"), (100, "webp"), (200, "jpeg"), (200, "webp")],
+        )
+        self.assertEqual(Image.open(BytesIO(result.files[(100, "webp")])).size, (100, 133))
+
+    def test_small_image_is_not_upscaled(self):
+        result = process_image(make_jpeg((150, 100)), widths=(320, 640), formats=("jpeg",))
+
+        self.assertEqual((result.width, result.height), (150, 100))
+        self.assertEqual([key for key in result.files if key != "original"], [(150, "jpeg")])
+
+    def test_transparent_png_is_flattened_for_jpeg(self):
+        buffer = BytesIO()
+        Image.new("RGBA", (50, 40), (255, 0, 0, 0)).save(buffer, "PNG")
+        result = process_image(buffer.getvalue(), widths=(50,))
+
+        self.assertEqual(Image.open(BytesIO(result.files["original"])).mode, "RGB")
+        self.assertEqual(Image.open(BytesIO(result.files["original"])).getpixel((0, 0)), (255, 255, 255))
+
+    def test_not_an_image(self):
+        with self.assertRaises(UnidentifiedImageError):
+            process_image(b"not an image")
+
+    def test_decompression_bomb(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            with self.assertRaises(Image.DecompressionBombError):
+                process_image(make_jpeg())
+
+
+class ReviewImagesTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            REVIEW_IMAGES={"ASYNC": False, "MAX_DIMENSION": 400, "WIDTHS": [100, 200]},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        caches["shared"].clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(caches["shared"].clear)
+
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Past", starts_at=now - timedelta(days=2), ends_at=now - timedelta(days=2, hours=-2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        RSVP.objects.create(user=self.user, event=self.event)
+
+    def create_review(self, content=None, name="photo.jpg"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Review.objects.create(
+                event=self.event, user=self.user, rating=5,
+                image=SimpleUploadedFile(name, content or make_jpeg(orientation=6), content_type="image/jpeg"),
+            )
+
+
+class ReviewImagePipelineTests(ReviewImagesTestCase):
+    def test_upload_is_processed(self):
+        review = self.create_review()
+        review.refresh_from_db()
+
+        variants = review.image_variants
+        self.assertEqual(variants["version"], config_version())
+        self.assertEqual((variants["width"], variants["height"]), (300, 400))
+        self.assertEqual([size["width"] for size in variants["sizes"]], [100, 200])
+        for name in ReviewImageService.variant_files(variants):
+            self.assertTrue(default_storage.exists(name))
+        # Оригінал замінено зменшеним JPEG без EXIF
+        with default_storage.open(review.image.name) as stored:
+            original = Image.open(stored)
+            self.assertEqual(original.size, (300, 400))
+            self.assertEqual(dict(original.getexif()), {})
+        self.assertNotEqual(review.image.name, "review_photos/photo.jpg")
+        self.assertFalse(default_storage.exists("review_photos/photo.jpg"))
+
+    def test_detail_page_serves_variants(self):
+        self.create_review()
+        response = self.client.get(f"/events/{self.event.pk}/")
+
+        self.assertContains(response, '<source type="image/webp"')
+        self.assertContains(response, "-100.webp 100w")
+        self.assertContains(response, "-200.jpg 200w")
+
+    def test_replacing_image_removes_old_variants(self):
+        review = self.create_review()
+        review.refresh_from_db()
+        old_files = ReviewImageService.variant_files(review.image_variants)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.image = SimpleUploadedFile("second.png", make_png(), content_type="image/png")
+            review.save()
+        review.refresh_from_db()
+
+        self.assertTrue(review.image.name.endswith(".jpg"))
+        self.assertIn("second", review.image.name)
+        for name in old_files:
+            self.assertFalse(default_storage.exists(name))
+        self.assertEqual(len(ReviewImageService.variant_files(review.image_variants)), 4)
+
+    def test_deleting_review_removes_variants(self):
+        review = self.create_review()
+        review.refresh_from_db()
+        files = ReviewImageService.variant_files(review.image_variants)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+        for name in files:
+            self.assertFalse(default_storage.exists(name))
+
+    def test_broken_image_keeps_original(self):
+        review = self.create_review(content=b"broken", name="broken.jpg")
+        review.refresh_from_db()
+
+        self.assertIn("error", review.image_variants)
+        self.assertEqual(review.image.name, "review_photos/broken.jpg")
+        self.assertIsNone(review.image_picture)
+        self.assertContains(self.client.get(f"/events/{self.event.pk}/"), review.image.url)
+
+    def test_result_from_replaced_image_is_discarded(self):
+        review = self.create_review()
+        review.refresh_from_db()
+        result = process_image(make_jpeg(), max_dimension=400, widths=(100,))
+
+        stored = ReviewImageService.store(review.pk, "review_photos/old.jpg", {}, result)
+
+        self.assertFalse(stored)
+        self.assertFalse(default_storage.exists(f"review_photos/variants/{review.pk}/old-100.jpg"))
+
+    def test_failed_future_is_returned_as_error(self):
+        future = Future()
+        future.set_exception(OSError("cannot identify image file"))
+        self.assertIsInstance(ReviewImageService.result(future), OSError)
+
+    def test_decompression_bomb_is_stored_as_error(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+            review = self.create_review()
+        review.refresh_from_db()
+        self.assertIn("error", review.image_variants)
+        self.assertEqual(review.image.name, "review_photos/photo.jpg")
+
+    def test_broken_pool_is_stored_as_error_and_discarded(self):
+        with override_settings(REVIEW_IMAGES={"ENABLED": False}):
+            review = self.create_review()
+        pool = make_pool(1)
+        review_images._pool = pool
+        self.addCleanup(review_images.shutdown_pool)
+        future = Future()
+        future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+
+        ReviewImageService._done(review.pk, review.image.name, {}, review_images.get_config(), pool, future)
+
+        review.refresh_from_db()
+        self.assertIn("terminated abruptly", review.image_variants["error"])
+        self.assertIsNone(review_images._pool)
+
+    @override_settings(REVIEW_IMAGES={"ENABLED": False})
+    def test_disabled(self):
+        review = self.create_review()
+        review.refresh_from_db()
+        self.assertEqual(review.image_variants, {})
+
+
+class BackfillCommandTests(ReviewImagesTestCase):
+    def test_backfill_processes_pending_images(self):
+        with override_settings(REVIEW_IMAGES={"ENABLED": False}):
+            review = self.create_review()
+        self.assertEqual(Review.objects.get(pk=review.pk).image_variants, {})
+
+        out = StringIO()
+        call_command("process_review_images", workers=1, stdout=out)
+        self.assertIn("Оброблено: 1", out.getvalue())
+        review.refresh_from_db()
+        self.assertEqual(review.image_variants["version"], config_version())
+
+        out = StringIO()
+        call_command("process_review_images", workers=1, stdout=out)
+        self.assertIn("Усі зображення відгуків оброблено", out.getvalue())
+
+    def test_backfill_replaces_broken_pool(self):
+        if not review_images.pool_available():
+            self.skipTest("Воркер паралельного запуску тестів не може створити пул процесів")
+        with override_settings(REVIEW_IMAGES={"ENABLED": False}):
+            review = self.create_review()
+        broken = make_pool(1)
+        with self.assertRaises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+
+        with mock.patch.object(review_images, "make_pool", side_effect=[broken, make_pool(1)]):
+            results = list(ReviewImageService.backfill([review.pk], workers=1))
+
+        self.assertEqual(results, [(review.pk, True)])
+
+
+def make_png() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (500, 250), (0, 128, 255)).save(buffer, "PNG")
+    return buffer.getvalue()
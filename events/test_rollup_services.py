@@ -0,0 +1,202 @@
+"""
+Тести для денних rollup-лічильників (RollupService, rollup_daily_stats)
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import DailyRollup, Event
+from events.rollup_services import RollupService
+from tickets.models import RSVP
+
+
+class RollupServiceTests(TestCase):
+    """Інкрементальне оновлення та читання rollup-рядків"""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.organizer = User.objects.create_user(username="org", password="testpass123")
+        self.participant = User.objects.create_user(username="guest", password="testpass123")
+
+    def _event(self, status=Event.DRAFT):
+        now = timezone.now()
+        return Event.objects.create(
+            title="Event", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=1),
+            organizer=self.organizer, status=status,
+        )
+
+    def test_signals_maintain_today_row(self):
+        """Сигнали оновлюють рядок поточного дня"""
+        event = self._event()
+        event.status = Event.PUBLISHED
+        event.save()
+        rsvp = RSVP.objects.create(user=self.participant, event=event)
+        rsvp.delete()
+        event.status = Event.CANCELLED
+        event.save()
+
+        row = DailyRollup.objects.get(date=self.today)
+        self.assertEqual(row.users_joined, 2)
+        self.assertEqual(row.events_created, 1)
+        self.assertEqual(row.events_published, 1)
+        self.assertEqual(row.events_cancelled, 1)
+        self.assertEqual(row.rsvps_created, 1)
+        self.assertEqual(row.rsvps_cancelled, 1)
+
+    def test_record_rejects_unknown_field(self):
+        with self.assertRaises(ValueError):
+            RollupService.record("unknown")
+
+    def test_auto_archive_recorded(self):
+        """Масове архівування (update без сигналів) теж потрапляє в rollup"""
+        from events.services import EventArchiveService
+
+        past = timezone.now() - timedelta(days=3)
+        Event.objects.create(
+            title="Past", starts_at=past, ends_at=past + timedelta(hours=1),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        EventArchiveService().archive_past_events()
+
+        self.assertEqual(DailyRollup.objects.get(date=self.today).events_archived, 1)
+
+    def test_rebuild_reconciles_derived_counters(self):
+        """Перерахунок виправляє лічильники, не чіпаючи переходи статусів"""
+        self._event(status=Event.PUBLISHED)
+        DailyRollup.objects.filter(date=self.today).update(events_created=100, users_joined=0)
+
+        RollupService.rebuild(self.today, self.today)
+
+        row = DailyRollup.objects.get(date=self.today)
+        self.assertEqual(row.events_created, 1)
+        self.assertEqual(row.users_joined, 2)
+        self.assertEqual(row.events_published, 1)
+
+    def test_period_stats_single_query(self):
+        self._event()
+        DailyRollup.objects.create(date=self.today - timedelta(days=20), rsvps_created=4, users_joined=3)
+        start = timezone.now() - timedelta(days=60)
+
+        with self.assertNumQueries(1):
+            stats = RollupService.period_stats(start)
+
+        self.assertEqual(stats["total_events"], 1)
+        self.assertEqual(stats["total_users"], 5)
+        self.assertEqual(stats["new_users_week"], 2)
+        self.assertEqual(stats["rsvps_month"], 4)
+
+    def test_time_series_buckets(self):
+        monday = self.today - timedelta(days=self.today.weekday() + 14)
+        DailyRollup.objects.create(date=monday, events_created=1)
+        DailyRollup.objects.create(date=monday + timedelta(days=2), events_created=2)
+        DailyRollup.objects.create(date=monday + timedelta(days=7), events_created=5)
+
+        daily = RollupService.time_series(monday, monday + timedelta(days=7), "day")
+        weekly = RollupService.time_series(monday, monday + timedelta(days=7), "week")
+
+        self.assertEqual([row["events_created"] for row in daily], [1, 2, 5])
+        self.assertEqual([row["events_created"] for row in weekly], [3, 5])
+        self.assertEqual(weekly[0]["period"], monday.isoformat())
+        with self.assertRaises(ValueError):
+            RollupService.time_series(monday, monday, "month")
+
+
+class RollupCommandTests(TestCase):
+    """Тести команди rollup_daily_stats"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="org", password="testpass123")
+        DailyRollup.objects.all().delete()
+
+    def test_scheduled_run(self):
+        out = StringIO()
+        call_command("rollup_daily_stats", stdout=out)
+
+        self.assertIn("Оновлено", out.getvalue())
+        self.assertEqual(DailyRollup.objects.get(date=timezone.localdate()).users_joined, 1)
+
+    def test_backfill_estimates_transitions(self):
+        now = timezone.now()
+        Event.objects.create(
+            title="Cancelled", starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=1),
+            organizer=self.user, status=Event.CANCELLED,
+        )
+        DailyRollup.objects.all().delete()
+
+        out = StringIO()
+        call_command("rollup_daily_stats", "--since", "all", stdout=out)
+
+        row = DailyRollup.objects.get(date=timezone.localdate())
+        self.assertEqual(row.events_created, 1)
+        self.assertEqual(row.events_cancelled, 1)
+        self.assertIn("Backfill", out.getvalue())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(CommandError):
+            call_command("rollup_daily_stats", "--since", "yesterday", stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("rollup_daily_stats", "--days", "0", stdout=StringIO())
+
+
+class StatsTimeseriesViewTests(TestCase):
+    """Тести JSON-ендпоінта часового ряду"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        User.objects.create_user(username="plain", password="testpass123")
+
+    def test_staff_gets_series(self):
+        self.client.login(username="staff", password="testpass123")
+        today = timezone.localdate().isoformat()
+
+        response = self.client.get(f"/stats/timeseries/?start={today}&end={today}&bucket=day")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["series"][0]["users_joined"], 2)
+
+    def test_non_staff_forbidden(self):
+        self.client.login(username="plain", password="testpass123")
+        self.assertEqual(self.client.get("/stats/timeseries/").status_code, 403)
+
+    def test_bad_parameters(self):
+        self.client.login(username="staff", password="testpass123")
+        self.assertEqual(self.client.get("/stats/timeseries/?start=bad").status_code, 400)
+        self.assertEqual(self.client.get("/stats/timeseries/?bucket=year").status_code, 400)
+        self.assertEqual(
+            self.client.get("/stats/timeseries/?start=2025-02-01&end=2025-01-01").status_code, 400
+        )
+
+
+class RollupBackfillMigrationTests(TestCase):
+    """Дані міграції 0017: історія до появи DailyRollup"""
+
+    def test_backfill_fills_history_and_keeps_signal_counters(self):
+        from importlib import import_module
+
+        from django.apps import apps
+
+        backfill = import_module("events.migrations.0017_backfill_daily_rollups").backfill_daily_rollups
+        organizer = User.objects.create_user(username="org", password="testpass123")
+        now = timezone.now()
+        event = Event.objects.create(
+            title="Old", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=1),
+            organizer=organizer, status=Event.PUBLISHED,
+        )
+        ten_days_ago = now - timedelta(days=10)
+        Event.objects.filter(pk=event.pk).update(created_at=ten_days_ago)
+        User.objects.filter(pk=organizer.pk).update(date_joined=ten_days_ago)
+        DailyRollup.objects.all().delete()
+        DailyRollup.objects.create(date=timezone.localdate(), events_cancelled=3)
+
+        backfill(apps, None)
+
+        old = DailyRollup.objects.get(date=timezone.localdate(ten_days_ago))
+        self.assertEqual((old.events_created, old.events_published, old.users_joined), (1, 1, 1))
+        today = DailyRollup.objects.get(date=timezone.localdate())
+        self.assertEqual((today.events_created, today.events_cancelled), (0, 3))
@@ -0,0 +1,223 @@
+"""
+Тести матеріалізованого розкладу (events/schedule_cache.py)
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .models import Event
+from .schedule_cache import (
+    EVENT_STAMP_KEY,
+    USER_KEY,
+    MaterializedScheduleProvider,
+    ScheduleCacheService,
+)
+from .schedule_services import (
+    BaseScheduleProvider,
+    FilteredScheduleDecorator,
+    HighlightedScheduleDecorator,
+    ScheduleWindow,
+)
+from .services import EventArchiveService
+
+User = get_user_model()
+
+
+class ScheduleCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(caches["shared"].clear)
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.attendees = [
+            User.objects.create_user(username=f"attendee{i}", password="pass12345") for i in range(3)
+        ]
+        self.user = self.attendees[0]
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="Meetup", starts_at=now + timedelta(days=2), ends_at=now + timedelta(days=2, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        self.past = Event.objects.create(
+            title="Past", starts_at=now - timedelta(days=5), ends_at=now - timedelta(days=5) + timedelta(hours=2),
+            organizer=self.organizer, status=Event.DRAFT,
+        )
+        for attendee in self.attendees:
+            RSVP.objects.create(user=attendee, event=self.event, status="going")
+
+    def entries(self, user, **kwargs):
+        return MaterializedScheduleProvider().get_entries(user, **kwargs)
+
+    def titles(self, user):
+        return [entry.title for entry in self.entries(user)]
+
+
+class MaterializedScheduleTests(ScheduleCacheTestCase):
+    def test_snapshots_live_in_cache_shared_by_workers(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, True)
+        shared = {"BACKEND": "monitoring.cache.InstrumentedFileBasedCache", "LOCATION": location}
+        with override_settings(CACHES={"default": {"BACKEND": "monitoring.cache.InstrumentedLocMemCache"}, "shared": shared}):
+            self.assertEqual(self.titles(self.user), ["Meetup"])
+            self.assertIsNone(caches["default"].get(USER_KEY.format(self.user.pk)))
+
+            # Інший воркер бачить той самий знімок і змінює штамп події
+            other_worker = FileBasedCache(location, {})
+            self.assertIsNotNone(other_worker.get(USER_KEY.format(self.user.pk)))
+            Event.objects.filter(pk=self.event.pk).update(title="Renamed")
+            other_worker.set(EVENT_STAMP_KEY.format(self.event.pk), 0, None)
+
+            self.assertEqual(self.titles(self.user), ["Renamed"])
+
+    def test_repeat_reads_do_not_query(self):
+        self.entries(self.user)
+        with self.assertNumQueries(0):
+            entries = self.entries(self.user)
+        self.assertEqual([(e.title, e.has_rsvp, e.is_organizer) for e in entries], [("Meetup", True, False)])
+
+    def test_matches_sql_schedule_for_every_filter(self):
+        window = ScheduleWindow(timezone.now() - timedelta(days=7), timezone.now() + timedelta(days=7))
+        for flags in ({}, {"only_upcoming": True}, {"only_organizer": True}, {"only_published": True}):
+            for user in (self.organizer, self.user):
+                for kwargs in ({}, {"window": window}):
+                    cached = HighlightedScheduleDecorator(
+                        FilteredScheduleDecorator(MaterializedScheduleProvider(), **flags), "organizer"
+                    ).get_entries(user, **kwargs)
+                    direct = HighlightedScheduleDecorator(
+                        FilteredScheduleDecorator(BaseScheduleProvider(), **flags), "organizer"
+                    ).get_entries(user, **kwargs)
+                    self.assertEqual(cached, direct, (flags, user.username, kwargs))
+
+    def test_rsvp_invalidates_only_its_user(self):
+        self.entries(self.user)
+        self.entries(self.organizer)
+        other = Event.objects.create(
+            title="Other", starts_at=self.event.starts_at, ends_at=self.event.ends_at,
+            organizer=self.attendees[2], status=Event.PUBLISHED,
+        )
+
+        RSVP.objects.create(user=self.user, event=other)
+
+        self.assertIsNone(caches["shared"].get(USER_KEY.format(self.user.pk)))
+        self.assertIsNotNone(caches["shared"].get(USER_KEY.format(self.organizer.pk)))
+        self.assertEqual(self.titles(self.user), ["Meetup", "Other"])
+
+        RSVP.objects.filter(user=self.user, event=other).delete()
+        self.assertEqual(self.titles(self.user), ["Meetup"])
+
+    def test_event_change_uses_stamp_instead_of_attendee_keys(self):
+        for attendee in self.attendees:
+            self.entries(attendee)
+        stamp = caches["shared"].get(EVENT_STAMP_KEY.format(self.event.pk))
+
+        self.event.title = "Renamed"
+        self.event.save()
+
+        self.assertNotEqual(caches["shared"].get(EVENT_STAMP_KEY.format(self.event.pk)), stamp)
+        for attendee in self.attendees:
+            self.assertIsNotNone(caches["shared"].get(USER_KEY.format(attendee.pk)))
+            self.assertEqual(self.titles(attendee), ["Renamed"])
+
+    def test_unrelated_field_change_keeps_snapshots_fresh(self):
+        self.entries(self.user)
+        self.event.capacity = 100
+        self.event.save()
+        with self.assertNumQueries(0):
+            self.entries(self.user)
+
+    def test_status_round_trip_hides_and_restores_registered_event(self):
+        self.assertEqual(self.titles(self.user), ["Meetup"])
+
+        self.event.status = Event.CANCELLED
+        self.event.save()
+        self.assertEqual(self.titles(self.user), [])
+        self.assertEqual(self.titles(self.organizer), ["Past", "Meetup"])
+
+        self.event.status = Event.PUBLISHED
+        self.event.save()
+        self.assertEqual(self.titles(self.user), ["Meetup"])
+
+    def test_new_event_and_organizer_change(self):
+        self.entries(self.organizer)
+        self.entries(self.user)
+        event = Event.objects.create(
+            title="New", starts_at=self.event.starts_at, ends_at=self.event.ends_at,
+            organizer=self.organizer, status=Event.DRAFT,
+        )
+        self.assertIn("New", self.titles(self.organizer))
+
+        event.organizer = self.user
+        event.save()
+        self.assertNotIn("New", self.titles(self.organizer))
+        self.assertIn("New", self.titles(self.user))
+
+    def test_archive_service_bumps_stamps(self):
+        self.entries(self.organizer)
+        self.past.status = Event.PUBLISHED
+        self.past.save()
+        self.assertEqual(self.entries(self.organizer)[0].status, Event.PUBLISHED)
+
+        self.assertEqual(EventArchiveService().archive_past_events(), 1)
+
+        self.assertEqual(self.entries(self.organizer)[0].status, Event.ARCHIVED)
+
+    def test_popular_threshold_crossing_touches_event(self):
+        popular = HighlightedScheduleDecorator(MaterializedScheduleProvider(), "popular")
+        self.assertEqual(popular.get_entries(self.organizer)[1].highlight_reason, "")
+
+        for i in range(2):
+            RSVP.objects.create(user=User.objects.create_user(username=f"extra{i}"), event=self.event)
+
+        entry = popular.get_entries(self.organizer)[1]
+        self.assertEqual((entry.highlight_reason, entry.rsvp_count), ("popular", 5))
+
+        RSVP.objects.create(user=User.objects.create_user(username="extra2"), event=self.event)
+        stamp = caches["shared"].get(EVENT_STAMP_KEY.format(self.event.pk))
+        RSVP.objects.create(user=User.objects.create_user(username="extra3"), event=self.event)
+        self.assertEqual(caches["shared"].get(EVENT_STAMP_KEY.format(self.event.pk)), stamp)
+
+    def test_evicted_stamp_forces_rebuild(self):
+        self.entries(self.user)
+        Event.objects.filter(pk=self.event.pk).update(title="Changed behind signals")
+        caches["shared"].delete(EVENT_STAMP_KEY.format(self.event.pk))
+        self.assertEqual(self.titles(self.user), ["Changed behind signals"])
+
+    @override_settings(SCHEDULE_CACHE={"MAX_ENTRIES": 1})
+    def test_oversized_schedule_reads_database(self):
+        self.assertEqual(self.titles(self.organizer), ["Past", "Meetup"])
+        self.assertTrue(caches["shared"].get(USER_KEY.format(self.organizer.pk))["oversized"])
+        with self.assertNumQueries(2):
+            self.entries(self.organizer)
+
+
+class CalendarEventsCacheTests(ScheduleCacheTestCase):
+    def fetch(self):
+        now = timezone.now()
+        return self.client.get(reverse("calendar-events"), {
+            "start": (now - timedelta(days=30)).isoformat(), "end": (now + timedelta(days=30)).isoformat(),
+        })
+
+    def test_repeat_calendar_loads_skip_schedule_queries(self):
+        self.client.force_login(self.user)
+        self.fetch()
+        # Лише сесія та користувач
+        with self.assertNumQueries(2):
+            response = self.fetch()
+        self.assertEqual([event["title"] for event in response.json()["events"]], ["Meetup"])
+
+    @override_settings(SCHEDULE_CACHE={"ENABLED": False})
+    def test_disabled_cache_reads_database(self):
+        self.client.force_login(self.user)
+        self.fetch()
+        self.assertIsNone(caches["shared"].get(USER_KEY.format(self.user.pk)))
+        self.assertEqual(ScheduleCacheService.build(self.user)["rows"][0][1], "Meetup")
@@ -0,0 +1,118 @@
+"""
+Тести компактного ScheduleEntry та ScheduleJsonEncoder
+"""
+import dataclasses
+import json
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tickets.models import RSVP
+
+from .models import Event
+from .schedule_services import (
+    BaseScheduleProvider,
+    HighlightedScheduleDecorator,
+    PersonalScheduleService,
+    ScheduleJsonEncoder,
+    ScheduleWindow,
+)
+
+User = get_user_model()
+
+
+class ScheduleEncodingTestCase(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizer", password="pass12345")
+        self.user = User.objects.create_user(username="attendee", password="pass12345")
+        self.start = timezone.make_aware(datetime(2030, 3, 1))
+        self.window = ScheduleWindow(self.start, self.start + timedelta(days=31))
+        self.meetup = Event.objects.create(
+            title='Зустріч "Python" \\ Київ', description="Опис\nз переносом", location="Київ",
+            starts_at=self.start + timedelta(days=3), ends_at=self.start + timedelta(days=3, hours=2),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+        self.draft = Event.objects.create(
+            title="Draft", starts_at=self.start + timedelta(days=5), ends_at=self.start + timedelta(days=5, hours=1),
+            organizer=self.user, status=Event.DRAFT,
+        )
+        RSVP.objects.create(user=self.user, event=self.meetup, status="going")
+
+
+class ScheduleEntryTests(ScheduleEncodingTestCase):
+    def test_entry_is_slotted_and_frozen(self):
+        entry = PersonalScheduleService.get_user_schedule_entries(self.user)[0]
+        self.assertFalse(hasattr(entry, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            entry.title = "Changed"
+
+    def test_description_loaded_only_on_request(self):
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user)
+        self.assertIsNone(entries[0].description)
+        self.assertNotIn("description", entries[0].to_dict())
+
+        with_description = PersonalScheduleService.get_user_schedule_entries(self.user, include_description=True)
+        self.assertEqual(with_description[0].description, "Опис\nз переносом")
+        self.assertEqual(with_description[1].description, "")
+
+    def test_load_descriptions_uses_one_query(self):
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user)
+        with self.assertNumQueries(1):
+            loaded = PersonalScheduleService.load_descriptions(entries)
+        self.assertEqual([entry.description for entry in loaded], ["Опис\nз переносом", ""])
+        self.assertEqual([entry.event_id for entry in loaded], [entry.event_id for entry in entries])
+        with self.assertNumQueries(0):
+            PersonalScheduleService.load_descriptions(loaded)
+
+
+class ScheduleJsonEncoderTests(ScheduleEncodingTestCase):
+    def decoded(self, **kwargs):
+        return json.loads(ScheduleJsonEncoder.encode(self.window, **kwargs))
+
+    def test_entries_match_to_dict(self):
+        entries = HighlightedScheduleDecorator(BaseScheduleProvider(), "organizer").get_entries(self.user)
+        entries = PersonalScheduleService.load_descriptions(entries)
+        data = self.decoded(entries=entries)
+        self.assertEqual(data["start"], self.window.start.isoformat())
+        self.assertEqual(data["end"], self.window.end.isoformat())
+        self.assertEqual(data["events"], [entry.to_dict() for entry in entries])
+
+    def test_rows_match_public_format(self):
+        rows = PersonalScheduleService.get_public_schedule_rows(self.window, include_description=True)
+        self.meetup.refresh_from_db()
+        self.assertEqual(self.decoded(rows=rows)["events"], [{
+            "id": self.meetup.pk, "title": self.meetup.title,
+            "starts_at": self.meetup.starts_at.isoformat(), "ends_at": self.meetup.ends_at.isoformat(),
+            "status": Event.PUBLISHED, "location": "Київ", "description": "Опис\nз переносом",
+        }])
+
+    def test_empty_schedule(self):
+        self.assertEqual(self.decoded()["events"], [])
+
+    def test_output_is_utf8_without_ascii_escaping(self):
+        entries = PersonalScheduleService.get_user_schedule_entries(self.user)
+        payload = ScheduleJsonEncoder.encode(self.window, entries=entries)
+        self.assertIn("Київ".encode(), payload)
+
+
+@override_settings(SCHEDULE_CACHE={"ENABLED": False})
+class CalendarEventsDescriptionTests(ScheduleEncodingTestCase):
+    def fetch(self, **params):
+        params.update(start=self.window.start.isoformat(), end=self.window.end.isoformat())
+        return self.client.get(reverse("calendar-events"), params)
+
+    def test_user_schedule_omits_description_by_default(self):
+        self.client.force_login(self.user)
+        response = self.fetch()
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertNotIn("description", response.json()["events"][0])
+
+        events = self.fetch(include="description").json()["events"]
+        self.assertEqual([event["description"] for event in events], ["Опис\nз переносом", ""])
+
+    def test_anonymous_schedule_description(self):
+        self.assertNotIn("description", self.fetch().json()["events"][0])
+        self.assertEqual(self.fetch(include="description").json()["events"][0]["description"], "Опис\nз переносом")
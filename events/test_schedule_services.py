@@ -538,3 +538,56 @@ class DecoratorChainTests(PersonalScheduleServiceTests):
         for entry in entries:
             self.assertGreater(entry.starts_at, now)
             self.assertEqual(entry.status, "published")
+
+
+class ScheduleCriteriaPushdownTests(PersonalScheduleServiceTests):
+    """Фільтри декораторів виконуються в SQL, а не над готовим списком"""
+
+    def test_criteria_narrow_accumulates_flags(self):
+        from .schedule_services import ScheduleCriteria
+        
+        criteria = ScheduleCriteria(only_upcoming=True).narrow(only_published=True, only_upcoming=False)
+        
+        self.assertEqual(criteria, ScheduleCriteria(only_upcoming=True, only_published=True))
+
+    def test_filters_reach_the_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        chain = FilteredScheduleDecorator(
+            FilteredScheduleDecorator(BaseScheduleProvider(), only_published=True), only_upcoming=True
+        )
+        with CaptureQueriesContext(connection) as queries:
+            entries = chain.get_entries(self.organizer)
+        
+        self.assertEqual(
+            {e.event_id for e in entries}, {self.organized_event.id, self.registered_event.id}
+        )
+        events_sql = next(q["sql"] for q in queries.captured_queries if "events_event" in q["sql"])
+        self.assertIn("UNION ALL", events_sql)
+        self.assertIn('"starts_at" >', events_sql)
+
+    def test_only_organizer_skips_registered_branch(self):
+        from .schedule_services import ScheduleCriteria
+        
+        qs = PersonalScheduleService.get_user_events_queryset(self.organizer)
+        self.assertIn("UNION", str(qs.query))
+        
+        organized = PersonalScheduleService.get_user_events_queryset(
+            self.organizer, criteria=ScheduleCriteria(only_organizer=True)
+        )
+        self.assertNotIn("UNION", str(organized.query))
+        self.assertEqual(
+            list(organized.values_list("id", flat=True)), [self.organized_event.id, self.draft_event.id]
+        )
+
+    def test_own_event_with_rsvp_listed_once(self):
+        RSVP.objects.create(user=self.organizer, event=self.organized_event)
+        RSVP.objects.create(user=self.participant, event=self.organized_event, status="going")
+        
+        entries = PersonalScheduleService.get_user_schedule_entries(self.organizer)
+        own = [e for e in entries if e.event_id == self.organized_event.id]
+        
+        self.assertEqual(len(own), 1)
+        self.assertTrue(own[0].is_organizer and own[0].has_rsvp)
+        self.assertEqual(own[0].rsvp_count, 2)
@@ -191,7 +191,7 @@ class EventSerializerTestCase(APITestCase):
         expected_fields = [
             "id", "title", "description", "location",
             "starts_at", "ends_at", "status", "organizer",
-            "rsvp_count", "created_at", "updated_at"
+            "rsvp_count", "recurrence_rule", "recurrence_exdates", "created_at", "updated_at"
         ]
         self.assertEqual(serializer.Meta.fields, expected_fields)
         
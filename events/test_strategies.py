@@ -6,13 +6,14 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
-from events.models import Event
+from events.models import Event, Review
 from events.strategies import (
     SortByDateStrategy,
     SortByPopularityStrategy,
     SortByAlphabetStrategy,
     SortByEventDateStrategy,
     SortByRsvpCountStrategy,
+    SortByRatingStrategy,
     get_sort_strategy,
     STRATEGIES,
     AVAILABLE_STRATEGIES
@@ -199,9 +200,22 @@ class StrategyPatternTestCase(TestCase):
         # Перевіряємо що кількість стратегій відповідає
         self.assertEqual(len(STRATEGIES), len(AVAILABLE_STRATEGIES))
 
+    def test_sort_by_rating_strategy(self):
+        """Тест сортування за збереженим середнім рейтингом (без відгуків - у кінці)"""
+        strategy = get_sort_strategy("top_rated")
+        self.assertIsInstance(strategy, SortByRatingStrategy)
+
+        reviewers = list(User.objects.filter(username__startswith="user"))
+        Review.objects.create(event=self.event1, user=reviewers[0], rating=3)
+        Review.objects.create(event=self.event3, user=reviewers[0], rating=5)
+        Review.objects.create(event=self.event3, user=reviewers[1], rating=4)
+
+        sorted_qs = strategy.sort(Event.objects.all())
+        self.assertEqual(list(sorted_qs), [self.event3, self.event1, self.event2])
+
     def test_available_strategies_list(self):
         """Тест що AVAILABLE_STRATEGIES містить всі стратегії"""
-        self.assertEqual(len(AVAILABLE_STRATEGIES), 5)
+        self.assertEqual(len(AVAILABLE_STRATEGIES), 6)
         
         # Перевіряємо типи
         strategy_types = [type(s) for s in AVAILABLE_STRATEGIES]
@@ -210,7 +224,8 @@ class StrategyPatternTestCase(TestCase):
             SortByPopularityStrategy, 
             SortByAlphabetStrategy,
             SortByEventDateStrategy,
-            SortByRsvpCountStrategy
+            SortByRsvpCountStrategy,
+            SortByRatingStrategy,
         ]
         
         for expected_type in expected_types:
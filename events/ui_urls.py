@@ -1,29 +1,43 @@
 from django.urls import path
 from .ui_views import (
     home_view,
+    stats_timeseries_view,
     EventListView, 
     EventDetailView, 
     EventCreateView, 
     EventUpdateView, 
     CalendarView,
+    calendar_events_view,
+    calendar_feed_view,
+    calendar_feed_rotate_view,
     rsvp_view, 
     rsvp_cancel_view,
     event_cancel_view,
     event_archive_view,
     event_participants_view,
+    event_participants_export_view,
     event_review_create_view,
 )
 
 urlpatterns = [
     path("", home_view, name="home"),
+    path("stats/timeseries/", stats_timeseries_view, name="stats-timeseries"),
     path("events/", EventListView.as_view(), name="event_list"),
     path("calendar/", CalendarView.as_view(), name="calendar"),
+    path("calendar/events/", calendar_events_view, name="calendar-events"),
+    path("calendar/feeds/rotate/", calendar_feed_rotate_view, name="calendar-feed-rotate"),
+    path("calendar/feeds/<slug:kind>/<int:user_id>/<slug:token>.ics", calendar_feed_view, name="calendar-feed"),
     path("events/create/", EventCreateView.as_view(), name="event-create"),
     path("events/<int:pk>/", EventDetailView.as_view(), name="event_detail"),
     path("events/<int:pk>/edit/", EventUpdateView.as_view(), name="event-edit"),
     path("events/<int:pk>/cancel/", event_cancel_view, name="event-cancel"),
     path("events/<int:pk>/archive/", event_archive_view, name="event-archive"),
     path("events/<int:pk>/participants/", event_participants_view, name="event-participants"),
+    path(
+        "events/<int:pk>/participants/export/<str:fmt>/",
+        event_participants_export_view,
+        name="event-participants-export",
+    ),
     path("events/<int:pk>/rsvp/", rsvp_view, name="event-rsvp"),
     path("events/<int:pk>/rsvp/cancel/", rsvp_cancel_view, name="event-rsvp-cancel"),
     path("events/<int:pk>/review/", event_review_create_view, name="event-review-create"),
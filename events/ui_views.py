@@ -2,22 +2,26 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
-from django.views.generic import ListView, DetailView, CreateView, UpdateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, TemplateView
+from django.views.decorators.http import require_POST, require_safe
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.db.models import Count, Q, F
 from django.utils import timezone
-from datetime import timedelta, date
-import json
+from datetime import datetime, time, timedelta, date
 
 from .models import Event, Review
 from .forms import EventForm, ReviewForm
 from .services import EventArchiveService
 from .states import EventStateManager
 from .schedule_services import PersonalScheduleService
+from .dashboard_services import DashboardStatsService
+from .exports import EXPORT_FORMATS, ExportService, export_response
+from .facets import EventFacetService, facet_filters
 from .specifications import (
-    EventByStatusSpecification,
     EventByTitleSpecification,
     EventByLocationSpecification,
+    EventByCategorySpecification,
     apply_specifications,
 )
 from .decorators import (
@@ -27,13 +31,19 @@ from .decorators import (
     event_not_started,
 )  # Всі декоратори реально використовуються в цьому файлі
 from tickets.models import RSVP
+from catalog.services import CategoryService
+from users.services import UserListService
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+PARTICIPANTS_PAGE_SIZE = 50
+
 from .strategies import get_sort_strategy
+from event_organizer.db_routing import replica_reads
 
 
+@replica_reads
 def home_view(request):
     """Головна сторінка - адмін панель для staff, список подій для користувачів"""
     
@@ -87,39 +97,13 @@ def home_view(request):
             end_date = None
             period_label = "за весь час"
         
-        if start_date:
-            events_qs = Event.objects.filter(created_at__gte=start_date)
-            users_qs = User.objects.filter(date_joined__gte=start_date)
-            rsvps_qs = RSVP.objects.filter(created_at__gte=start_date)
-            
-            if end_date:
-                events_qs = events_qs.filter(created_at__lte=end_date)
-                users_qs = users_qs.filter(date_joined__lte=end_date)
-                rsvps_qs = rsvps_qs.filter(created_at__lte=end_date)
-        else:
-            events_qs = Event.objects.all()
-            users_qs = User.objects.all()
-            rsvps_qs = RSVP.objects.all()
-        
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        stats = {
-            'total_events': events_qs.count(),
-            'published_events': events_qs.filter(status=Event.PUBLISHED).count(),
-            'upcoming_events': events_qs.filter(starts_at__gte=now, status=Event.PUBLISHED).count(),
-            'archived_events': events_qs.filter(status=Event.ARCHIVED).count(),
-            
-            'total_users': users_qs.count(),
-            'new_users_week': users_qs.filter(date_joined__gte=week_ago).count(),
-            'new_users_month': users_qs.filter(date_joined__gte=month_ago).count(),
-            
-            'total_rsvps': rsvps_qs.count(),
-            'rsvps_week': rsvps_qs.filter(created_at__gte=week_ago).count(),
-            'rsvps_month': rsvps_qs.filter(created_at__gte=month_ago).count(),
-            
-            'period_label': period_label,
-        }
+        # Лічильники та топ-події - один кешований знімок DashboardStatsService
+        snapshot = DashboardStatsService.get_snapshot(
+            period_key=f"{period}:{date_from}:{date_to}" if start_date else "all",
+            start=start_date,
+            end=end_date,
+        )
+        stats = dict(snapshot['stats'], period_label=period_label)
         
         tab = request.GET.get('tab', 'stats')
         
@@ -145,7 +129,7 @@ def home_view(request):
                 events_qs = events_qs.filter(organizer_id=organizer_filter)
 
             if category_filter:
-                events_qs = events_qs.filter(category__icontains=category_filter)
+                events_qs = apply_specifications(events_qs, EventByCategorySpecification(category_filter))
             
             if date_filter:
                 today = timezone.now().date()
@@ -191,30 +175,38 @@ def home_view(request):
                 events_qs = events_qs.order_by('starts_at')
         
         events_count = events_qs.count()
-        recent_events = events_qs[:100]
+        recent_events = events_qs.select_related('organizer')[:100]
         
-        if (tab == 'stats' or not tab) and start_date:
-            top_events_qs = Event.objects.filter(created_at__gte=start_date)
-            if end_date:
-                top_events_qs = top_events_qs.filter(created_at__lte=end_date)
-            top_events = top_events_qs.annotate(rsvp_count=Count('rsvps', filter=Q(rsvps__status='going'), distinct=True)).order_by('-rsvp_count')[:5]
-        else:
-            top_events = Event.objects.annotate(rsvp_count=Count('rsvps', filter=Q(rsvps__status='going'), distinct=True)).order_by('-rsvp_count')[:5]
+        top_events = snapshot['top_events']
         
-        recent_users = User.objects.order_by('-date_joined')[:50]
+        # Користувачі з лічильниками (корельовані підзапити) та keyset-пагінацією
+        users_after = request.GET.get('after', '')
+        if tab == 'users':
+            recent_users, users_next_cursor = UserListService.page(after=users_after)
+        else:
+            recent_users, users_next_cursor = [], None
         recent_rsvps = RSVP.objects.select_related('user', 'event').order_by('-created_at')[:50]
-        all_users = User.objects.all().order_by('username')
+
+        # Фільтр організатора - автодоповнення через admin_user_search, тут лише обраний
+        organizer_name = ''
+        if organizer_filter.isdigit():
+            organizer_name = (
+                User.objects.filter(pk=organizer_filter).values_list('username', flat=True).first() or ''
+            )
         
-        category_options = (
-            Event.objects.exclude(category="")
-            .values_list("category", flat=True)
-            .distinct()
-            .order_by("category")
-        )
+        category_options = [info.name for info in CategoryService.get_catalog()]
 
+        # Межі часового ряду для графіка (дані - з stats_timeseries_view)
+        series_end = timezone.localdate(end_date) if end_date else timezone.localdate()
+        series_start = timezone.localdate(start_date) if start_date else series_end - timedelta(days=364)
+        series_bucket = 'day' if (series_end - series_start).days <= 62 else 'week'
+        
         context = {
             'tab': tab,
             'stats': stats,
+            'series_start': series_start.isoformat(),
+            'series_end': series_end.isoformat(),
+            'series_bucket': series_bucket,
             'period': period,
             'date_from': date_from,
             'date_to': date_to,
@@ -222,11 +214,13 @@ def home_view(request):
             'recent_events': recent_events,
             'events_count': events_count,
             'recent_users': recent_users,
+            'users_after': users_after,
+            'users_next_cursor': users_next_cursor,
             'recent_rsvps': recent_rsvps,
-            'all_users': all_users,
             'q': q,
             'status': status_filter,
             'organizer': organizer_filter,
+            'organizer_name': organizer_name,
             'category': category_filter,
             'date_filter': date_filter,
             'popularity': popularity_filter,
@@ -239,15 +233,59 @@ def home_view(request):
         return redirect('event_list')
 
 
+@replica_reads
+def stats_timeseries_view(request):
+    """
+    JSON часовий ряд денних rollup-лічильників для графіків дашборда
+
+    GET-параметри: start, end (YYYY-MM-DD), bucket=day|week
+    """
+    from django.http import JsonResponse
+    from .rollup_services import BUCKETS, RollupService
+    
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({"error": "Доступ лише для адміністраторів"}, status=403)
+    
+    today = timezone.localdate()
+    try:
+        end = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else today
+        start = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({"error": "Дати мають бути у форматі YYYY-MM-DD"}, status=400)
+    
+    bucket = request.GET.get("bucket", "day")
+    if bucket not in BUCKETS:
+        return JsonResponse({"error": f"bucket має бути одним з: {', '.join(BUCKETS)}"}, status=400)
+    if start > end or (end - start).days > 366 * 3:
+        return JsonResponse({"error": "Некоректний період (максимум 3 роки)"}, status=400)
+    
+    return JsonResponse({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket": bucket,
+        "series": RollupService.time_series(start, end, bucket),
+    })
+
+
 class EventListView(ListView):
     model = Event
+    replica_reads = True
     template_name = "events/list.html"
     context_object_name = "events"
     paginate_by = 10
 
-    def get_queryset(self):
-        EventArchiveService().archive_past_events()
+    def get(self, request, *args, **kwargs):
+        """Список з умовним GET для анонімів (events/http_cache.py)"""
+        from .http_cache import LIST_KEY, PublicPageCacheService
 
+        # Архівування до валідаторів - воно змінює штамп списку;
+        # не частіше EVENT_ARCHIVE["LIST_INTERVAL_SECONDS"] на всі воркери
+        EventArchiveService().archive_past_events_throttled()
+        return PublicPageCacheService.respond(
+            request, [LIST_KEY], lambda: super(EventListView, self).get(request, *args, **kwargs)
+        )
+
+    def get_queryset(self):
         from django.db.models import Case, When, Value, IntegerField
         from django.db.models.functions import Greatest, Cast
         
@@ -279,8 +317,10 @@ class EventListView(ListView):
             ).exclude(status=Event.ARCHIVED)
         elif view == "upcoming":
             now = timezone.now()
+            # Для серії - RSVP на майбутнє повторення (у разових подій
+            # occurrence_start - SINGLE_OCCURRENCE у минулому)
             qs = qs.filter(
-                starts_at__gte=now,
+                Q(starts_at__gte=now) | Q(rsvps__occurrence_start__gte=now),
                 status=Event.PUBLISHED,
                 rsvps__user=self.request.user
             ).distinct()
@@ -301,60 +341,17 @@ class EventListView(ListView):
         if q:
             specs.append(EventByTitleSpecification(q))
         
-        status = self.request.GET.get("status")
-        if status:
-            specs.append(EventByStatusSpecification(status))
-        
         location = self.request.GET.get("location")
         if location:
             specs.append(EventByLocationSpecification(location))
         
-        filtered_qs = apply_specifications(qs, *specs)
-
-        category = self.request.GET.get("category")
-        if category:
-            filtered_qs = filtered_qs.filter(category__icontains=category)
-        
-        date_filter = self.request.GET.get("date_filter")
-        if date_filter:
-            today = timezone.now().date()
-            
-            if date_filter == 'upcoming':
-                filtered_qs = filtered_qs.filter(starts_at__gte=timezone.now())
-            elif date_filter == 'today':
-                filtered_qs = filtered_qs.filter(starts_at__date=today)
-            elif date_filter == 'this_week':
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=7)
-                filtered_qs = filtered_qs.filter(
-                    starts_at__date__gte=week_start,
-                    starts_at__date__lt=week_end
-                )
-            elif date_filter == 'this_month':
-                filtered_qs = filtered_qs.filter(
-                    starts_at__year=today.year,
-                    starts_at__month=today.month
-                )
+        # Фільтри-фасети окремо: бічна панель рахує кожен вимір без власного фільтра
+        self.facet_queryset = apply_specifications(qs, *specs)
+        self.facet_filters = facet_filters(self.request.GET)
         
-        popularity = self.request.GET.get("popularity")
-        if popularity:
-            if popularity == 'popular':
-                filtered_qs = filtered_qs.filter(rsvp_count__gte=5)
-            elif popularity == 'medium':
-                filtered_qs = filtered_qs.filter(rsvp_count__gte=1, rsvp_count__lt=5)
-            elif popularity == 'none':
-                filtered_qs = filtered_qs.filter(rsvp_count=0)
-
-        availability = self.request.GET.get("availability")
-        if availability == "available":
-            filtered_qs = filtered_qs.filter(
-                Q(capacity__isnull=True) | Q(capacity__gt=F("rsvp_count"))
-            )
-        elif availability == "full":
-            filtered_qs = filtered_qs.filter(
-                capacity__isnull=False,
-                capacity__lte=F("rsvp_count"),
-            )
+        filtered_qs = self.facet_queryset
+        for condition in facet_filters(self.request.GET, "rsvp_count").values():
+            filtered_qs = filtered_qs.filter(condition)
 
         sort_slug = self.request.GET.get("sort", "date")
         
@@ -375,62 +372,83 @@ class EventListView(ListView):
         ctx["sort"] = getattr(self, "_current_sort", self.request.GET.get("sort", "date"))
         ctx["category"] = self.request.GET.get("category", "")
 
-        ctx["category_choices"] = (
-            Event.objects.exclude(category="")
-            .values_list("category", flat=True)
-            .distinct()
-            .order_by("category")
+        # Усі фасети бічної панелі - один запит з умовною агрегацією (з кешем)
+        facets = EventFacetService.get_facets(
+            self.facet_queryset, self.request.GET, self.request.user, self.facet_filters
         )
+        ctx["facets"] = facets
+        ctx["category_choices"] = sorted(tag["label"] for tag in facets["category"])
         ctx["status_choices"] = [
-            (Event.DRAFT, "Чернетка"),
-            (Event.PUBLISHED, "Опубліковано"),
-            (Event.CANCELLED, "Скасовано"),
-            (Event.ARCHIVED, "Архів"),
-        ]
-
-        popular_tags_qs = (
-            Event.objects.filter(status=Event.PUBLISHED)
-            .exclude(category="")
-            .values("category")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-        ctx["popular_tags"] = [
-            {"slug": row["category"], "label": row["category"], "count": row["count"]}
-            for row in popular_tags_qs
+            (value, label, facets["status"][value])
+            for value, label in Event.STATUS_CHOICES
         ]
+        ctx["popular_tags"] = facets["category"]
+
+        # Наступне повторення - лише для серій на поточній сторінці
+        from .recurrence import OccurrenceService
+        for event in ctx["events"]:
+            if event.is_recurring:
+                upcoming = OccurrenceService.upcoming(event, limit=1)
+                event.next_occurrence = upcoming[0][0] if upcoming else None
         return ctx
 
 
 class EventDetailView(DetailView):
     model = Event
+    replica_reads = True
     template_name = "events/detail.html"
     context_object_name = "event"
     
     def get_object(self, queryset=None):
-        """Перевіряє доступ до draft-подій"""
-        event = super().get_object(queryset)
+        """
+        Подія зі спільної частини сторінки в кеші (events/detail_cache.py)
+        
+        Перевіряє доступ до draft-подій.
+        """
+        from django.http import Http404
+        from .detail_cache import EventDetailCacheService
+        
+        self.detail = EventDetailCacheService.get(self.kwargs["pk"])
+        if self.detail is None:
+            raise Http404("Подія не знайдена")
+        event = self.detail["event"]
         
         # Draft події можуть бачити тільки їх організатори
         if event.status == Event.DRAFT:
-            if not self.request.user.is_authenticated or event.organizer != self.request.user:
-                from django.http import Http404
+            if not self.request.user.is_authenticated or event.organizer_id != self.request.user.pk:
                 raise Http404("Подія не знайдена")
         
         return event
     
+    def get(self, request, *args, **kwargs):
+        """
+        Сторінка з умовним GET для анонімів (events/http_cache.py)
+        
+        Подія береться до перевірки валідаторів: чернетка чи відсутня
+        подія - 404 навіть для клієнта з ETag.
+        """
+        from .http_cache import PublicPageCacheService, event_key
+        
+        self.object = self.get_object()
+        
+        def render():
+            return self.render_to_response(self.get_context_data(object=self.object))
+        
+        return PublicPageCacheService.respond(request, [event_key(self.object.pk)], render)
+    
     def get_context_data(self, **kwargs):
+        from .detail_cache import EventDetailCacheService
+        
         ctx = super().get_context_data(**kwargs)
         event = self.object
+        detail = self.detail
+        now = timezone.now()
 
-        if self.request.user.is_authenticated:
-            user_rsvp = RSVP.objects.filter(event=event, user=self.request.user).first()
-            ctx["user_rsvp"] = user_rsvp
-        else:
-            user_rsvp = None
-            ctx["user_rsvp"] = None
+        # Персональна частина - один запит
+        overlay = EventDetailCacheService.overlay(self.request.user, event)
+        ctx["user_rsvp"] = overlay.user_rsvp
 
-        ctx["rsvp_count"] = RSVP.objects.filter(event=event, status="going").count()
+        ctx["rsvp_count"] = detail["rsvp_count"]
 
         if event.capacity is not None:
             remaining = event.capacity - ctx["rsvp_count"]
@@ -438,24 +456,33 @@ class EventDetailView(DetailView):
         else:
             ctx["remaining_places"] = None
 
-        ctx["event_started"] = event.starts_at <= timezone.now()
-
-        from django.db.models import Avg, Count
-
-        reviews_qs = event.reviews.select_related("user")
-        agg = reviews_qs.aggregate(avg_rating=Avg("rating"), reviews_count=Count("id"))
-        ctx["reviews"] = reviews_qs
-        ctx["avg_rating"] = agg["avg_rating"]
-        ctx["reviews_count"] = agg["reviews_count"]
-
-        can_review = False
-        if self.request.user.is_authenticated:
-            event_ended = event.ends_at <= timezone.now()
-            has_rsvp = RSVP.objects.filter(event=event, user=self.request.user).exists()
-            has_review = Review.objects.filter(event=event, user=self.request.user).exists()
-            can_review = event_ended and has_rsvp and not has_review
-
-        ctx["can_review"] = can_review
+        ctx["event_started"] = event.starts_at <= now
+
+        if event.is_recurring:
+            from .recurrence import OccurrenceService
+
+            going = detail["occurrence_going"]
+            ctx["occurrences"] = [
+                {
+                    "starts_at": start,
+                    "ends_at": end,
+                    "key": start.isoformat(),
+                    "has_rsvp": start in overlay.occurrence_starts,
+                    "going": going.get(start, 0),
+                    "full": event.capacity is not None and going.get(start, 0) >= event.capacity,
+                }
+                for start, end in OccurrenceService.upcoming(event, now=now)
+            ]
+
+        ctx["reviews"] = detail["reviews"]
+        ctx["avg_rating"] = detail["avg_rating"]
+        ctx["reviews_count"] = detail["reviews_count"]
+        ctx["can_review"] = (
+            self.request.user.is_authenticated
+            and event.ends_at <= now
+            and overlay.user_rsvp is not None
+            and not overlay.has_review
+        )
         
         from urllib.parse import urlencode
         from datetime import timezone as dt_timezone
@@ -592,12 +619,14 @@ def rsvp_view(request, pk: int):
     
     event = request.event  # Отримуємо з декоратора
 
-    can_create, error_message = RSVPService.can_create_rsvp(request.user, event)
-    if not can_create:
+    occurrence_start, error_message = RSVPService.parse_occurrence(event, request.POST.get("occurrence"))
+    if error_message is None:
+        can_create, error_message = RSVPService.can_create_rsvp(request.user, event, occurrence_start)
+    if error_message is not None:
         messages.warning(request, error_message)
         return redirect("event_detail", pk=pk)
 
-    RSVP.objects.create(user=request.user, event=event)
+    RSVP.objects.create(user=request.user, event=event, occurrence_start=occurrence_start)
     messages.success(request, "Ваш RSVP збережено")
     return redirect("event_detail", pk=pk)
 
@@ -605,11 +634,22 @@ def rsvp_view(request, pk: int):
 @login_required
 @event_not_archived
 def rsvp_cancel_view(request, pk: int):
-    """Скасування реєстрації на подію"""
+    """Скасування реєстрації на подію (для серії - на одне повторення)"""
+    from .services import RSVPService
+    
     if request.method == "POST":
         event = request.event  # Отримуємо з декоратора
 
-        deleted_count, _ = RSVP.objects.filter(user=request.user, event=event).delete()
+        # Ключ - як збережено в RSVP, без звірки з поточним правилом серії
+        occurrence_start, error_message = RSVPService.parse_occurrence(
+            event, request.POST.get("occurrence"), check_rule=False
+        )
+        if error_message is not None:
+            messages.warning(request, error_message)
+            return redirect("event_detail", pk=pk)
+        deleted_count, _ = RSVP.objects.filter(
+            user=request.user, event=event, occurrence_start=occurrence_start
+        ).delete()
         if deleted_count > 0:
             messages.success(request, "Реєстрацію скасовано")
         else:
@@ -669,88 +709,205 @@ def event_participants_view(request, pk: int):
     event = request.event  # Отримуємо з декоратора
     
     participants = RSVP.objects.filter(event=event).select_related('user').order_by('-created_at')
+    page_obj = Paginator(participants, PARTICIPANTS_PAGE_SIZE).get_page(request.GET.get('page'))
     
     context = {
         'event': event,
-        'participants': participants,
+        'participants': page_obj.object_list,
+        'page_obj': page_obj,
+        'participants_total': page_obj.paginator.count,
+        'export_formats': EXPORT_FORMATS,
     }
     
     return render(request, 'events/participants.html', context)
 
 
-class CalendarView(ListView):
+@login_required
+@organizer_required
+def event_participants_export_view(request, pk: int, fmt: str):
+    """Потоковий експорт учасників події у CSV/XLSX"""
+    return export_response(ExportService.participants(request.event), fmt)
+
+
+CALENDAR_MAX_WINDOW_DAYS = 92
+
+
+def _build_schedule_provider(schedule_filter: str, highlight: str):
+    """
+    Побудувати ланцюжок декораторів на основі GET-параметрів
+    
+    Decorator Pattern: обгортки для фільтрації та підсвічування
+    """
+    from .schedule_cache import MaterializedScheduleProvider, get_config as get_schedule_cache_config
+    from .schedule_services import (
+        BaseScheduleProvider,
+        FilteredScheduleDecorator,
+        HighlightedScheduleDecorator,
+    )
+    
+    # Матеріалізований розклад у кеші: повторні завантаження - без запитів до БД
+    if get_schedule_cache_config()["ENABLED"]:
+        provider = MaterializedScheduleProvider()
+    else:
+        provider = BaseScheduleProvider()
+    
+    if schedule_filter == "upcoming":
+        provider = FilteredScheduleDecorator(provider, only_upcoming=True)
+    elif schedule_filter == "organized":
+        provider = FilteredScheduleDecorator(provider, only_organizer=True)
+    elif schedule_filter == "published":
+        provider = FilteredScheduleDecorator(provider, only_published=True)
+    
+    if highlight and highlight != "none":
+        provider = HighlightedScheduleDecorator(provider, highlight_mode=highlight)
+    
+    return provider
+
+
+def _parse_window_bound(value: str):
+    """ISO-дата або дата-час межі вікна; наївні значення - у поточній часовій зоні"""
+    from django.utils.dateparse import parse_date, parse_datetime
+    
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class CalendarView(TemplateView):
     """
     Календар подій з місячним та тижневим виглядом
     
+    Сторінка - лише оболонка без запитів до розкладу: JS завантажує
+    події вікнами з calendar_events_view (видимий період + сусідні).
+    Автентифікованому користувачу показуються URL підписок iCalendar.
+    
     Підтримує GET-параметри для фільтрації та підсвічування:
     - schedule_filter: all|upcoming|organized|published
     - highlight: none|soon|organizer|popular
     """
-    model = Event
     template_name = "events/calendar.html"
-    context_object_name = "events"
-
-    def get_queryset(self):
-        if self.request.user.is_authenticated:
-            return PersonalScheduleService.get_user_events_queryset(self.request.user)
-        else:
-            return Event.objects.filter(status=Event.PUBLISHED).order_by("starts_at")
-
-    def _build_schedule_provider(self):
-        """
-        Побудувати ланцюжок декораторів на основі GET-параметрів
-        
-        Decorator Pattern: обгортки для фільтрації та підсвічування
-        """
-        from .schedule_services import (
-            BaseScheduleProvider,
-            FilteredScheduleDecorator,
-            HighlightedScheduleDecorator,
-        )
-        
-        schedule_filter = self.request.GET.get("schedule_filter", "all")
-        highlight = self.request.GET.get("highlight", "none")
-        
-        provider = BaseScheduleProvider()
-        
-        if schedule_filter == "upcoming":
-            provider = FilteredScheduleDecorator(provider, only_upcoming=True)
-        elif schedule_filter == "organized":
-            provider = FilteredScheduleDecorator(provider, only_organizer=True)
-        elif schedule_filter == "published":
-            provider = FilteredScheduleDecorator(provider, only_published=True)
-        
-        if highlight and highlight != "none":
-            provider = HighlightedScheduleDecorator(provider, highlight_mode=highlight)
-        
-        return provider
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["schedule_filter"] = self.request.GET.get("schedule_filter", "all")
+        context["highlight"] = self.request.GET.get("highlight", "none")
+        context["max_window_days"] = CALENDAR_MAX_WINDOW_DAYS
         
-        schedule_filter = self.request.GET.get("schedule_filter", "all")
-        highlight = self.request.GET.get("highlight", "none")
-        
-        context["schedule_filter"] = schedule_filter
-        context["highlight"] = highlight
-        
-        if self.request.user.is_authenticated:
-            provider = self._build_schedule_provider()
-            entries = provider.get_entries(self.request.user)
-            events_data = [entry.to_dict() for entry in entries]
-            context['events_json'] = json.dumps(events_data)
-        else:
-            events_data = []
-            for event in self.get_queryset():
-                events_data.append({
-                    'id': event.id,
-                    'title': event.title,
-                    'starts_at': event.starts_at.isoformat(),
-                    'ends_at': event.ends_at.isoformat(),
-                    'status': event.status,
-                    'location': event.location or '',
-                    'description': event.description or '',
-                })
-            context['events_json'] = json.dumps(events_data)
-        
-        return context
\ No newline at end of file
+        from .ics_feeds import ORGANIZER_FEED, USER_FEED, IcsFeedService, get_config as get_ics_config
+        if self.request.user.is_authenticated and get_ics_config()["ENABLED"]:
+            user_id = self.request.user.pk
+            secret = IcsFeedService.secret(user_id)
+            context["feed_url"] = IcsFeedService.feed_url(self.request, USER_FEED, user_id, secret)
+            context["organizer_feed_url"] = IcsFeedService.feed_url(self.request, ORGANIZER_FEED, user_id, secret)
+        return context
+
+
+@replica_reads
+def calendar_events_view(request):
+    """
+    JSON записів календаря, що перетинаються з вікном [start, end)
+    
+    GET-параметри: start, end (ISO-дата або дата-час, обов'язкові),
+    schedule_filter та highlight - як у CalendarView, include=description -
+    додати описи подій (для експорту). Автентифікований користувач отримує
+    власний розклад, анонім - опубліковані події.
+    """
+    from django.http import HttpResponse, JsonResponse
+    from .schedule_services import ScheduleJsonEncoder, ScheduleWindow
+    
+    try:
+        start = _parse_window_bound(request.GET["start"])
+        end = _parse_window_bound(request.GET["end"])
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "Параметри start та end обов'язкові (ISO-дата або дата-час)"}, status=400)
+    if start >= end or end - start > timedelta(days=CALENDAR_MAX_WINDOW_DAYS):
+        return JsonResponse(
+            {"error": f"Некоректне вікно (максимум {CALENDAR_MAX_WINDOW_DAYS} днів)"}, status=400
+        )
+    
+    window = ScheduleWindow(start, end)
+    with_description = request.GET.get("include") == "description"
+    if request.user.is_authenticated:
+        provider = _build_schedule_provider(
+            request.GET.get("schedule_filter", "all"), request.GET.get("highlight", "none")
+        )
+        entries = provider.get_entries(request.user, window)
+        if with_description:
+            entries = PersonalScheduleService.load_descriptions(entries)
+        payload = ScheduleJsonEncoder.encode(window, entries=entries)
+    else:
+        rows = PersonalScheduleService.get_public_schedule_rows(window, include_description=with_description)
+        payload = ScheduleJsonEncoder.encode(window, rows=rows)
+    
+    return HttpResponse(payload, content_type="application/json")
+
+
+@login_required
+@require_POST
+def calendar_feed_rotate_view(request):
+    """Нові URL підписок iCalendar: видані раніше посилання перестають діяти"""
+    from .ics_feeds import IcsFeedService
+    
+    IcsFeedService.rotate(request.user)
+    messages.success(request, "Посилання на підписки оновлено. Старі посилання більше не працюють.")
+    return redirect("calendar")
+
+
+@require_safe
+def calendar_feed_view(request, kind: str, user_id: int, token: str):
+    """
+    Підписка iCalendar: персональний розклад (kind=user) або опубліковані
+    події організатора (kind=organizer)
+    
+    Доступ - за токеном у URL, без сесії. Незмінена стрічка - 304 за
+    ETag/Last-Modified без побудови календаря. Читання з primary (не
+    replica_reads): валідатори й записи мають бути з однієї актуальної
+    бази, інакше клієнт отримав би 304 на стару стрічку з новим ETag.
+    """
+    from django.http import Http404, StreamingHttpResponse
+    from django.urls import reverse
+    from django.utils.cache import get_conditional_response, patch_cache_control
+    from django.utils.http import http_date
+    from .ics_feeds import USER_FEED, IcsFeedService, get_config as get_ics_config, stream_ics
+    
+    config = get_ics_config()
+    if not config["ENABLED"]:
+        raise Http404("Календар не знайдено")
+    # Власник разом із секретом стрічок - один запит
+    owner = (
+        User.objects.filter(pk=user_id, is_active=True)
+        .annotate(feed_secret=F("calendar_feed_key__secret"))
+        .only("pk", "username")
+        .first()
+    )
+    if owner is None or not IcsFeedService.check_token(kind, user_id, token, owner.feed_secret or ""):
+        raise Http404("Календар не знайдено")
+    
+    window = IcsFeedService.window()
+    validators = IcsFeedService.validators(kind, owner, window)
+    last_modified = int(validators.last_modified.timestamp()) if validators.last_modified else None
+    response = get_conditional_response(request, etag=validators.etag, last_modified=last_modified)
+    if response is None:
+        name = f"Event Organizer: {owner.username}" if kind == USER_FEED else f"Події {owner.username}"
+        response = StreamingHttpResponse(
+            stream_ics(
+                IcsFeedService.entries(kind, owner, window),
+                name=name,
+                stamp=validators.last_modified or window.start,
+                event_url=lambda pk: request.build_absolute_uri(reverse("event_detail", args=[pk])),
+            ),
+            content_type="text/calendar; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'inline; filename="{kind}-{user_id}.ics"'
+    
+    response["ETag"] = validators.etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=config["MAX_AGE"])
+    return response
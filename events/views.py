@@ -6,6 +6,7 @@ from .models import Event
 from .serializers import EventSerializer
 from tickets.models import RSVP
 from tickets.serializers import RSVPSerializer
+from users.authentication import HasTokenScope
 
 
 class IsOrganizerOrReadOnly(permissions.BasePermission):
@@ -49,9 +50,10 @@ class EventFilter(filters.FilterSet):
 
 class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly, IsOrganizerOrReadOnly]
+    permission_classes = [IsAuthenticatedOrReadOnly, HasTokenScope, IsOrganizerOrReadOnly]
     pagination_class = EventPagination
     filterset_class = EventFilter
+    replica_reads = True  # GET-запити читають з репліки (event_organizer/db_routing.py)
     
     def get_queryset(self):
         """Додаємо анотацію з кількістю RSVP до кожної події"""
@@ -61,19 +63,24 @@ class EventViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
-    @decorators.action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @decorators.action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated, HasTokenScope])
     def rsvp(self, request, pk=None):
         from .services import RSVPService
         
         event = self.get_object()
         
-        can_create, error_message = RSVPService.can_create_rsvp(request.user, event)
-        if not can_create:
+        # Серія: {"occurrence": "<ISO-початок повторення>"}
+        occurrence_start, error_message = RSVPService.parse_occurrence(event, request.data.get("occurrence"))
+        if error_message is None:
+            can_create, error_message = RSVPService.can_create_rsvp(request.user, event, occurrence_start)
+        if error_message is not None:
             return response.Response(
                 {"error": error_message}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        rsvp, created = RSVP.objects.get_or_create(user=request.user, event=event)
+        rsvp, created = RSVP.objects.get_or_create(
+            user=request.user, event=event, occurrence_start=occurrence_start
+        )
         ser = RSVPSerializer(rsvp)
         return response.Response(ser.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
\ No newline at end of file
@@ -0,0 +1,26 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+
+    def ready(self):
+        """Підключення лічильника SQL-запитів, gauges для /metrics та захоплення повільних запитів"""
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        from .metrics import get_config, install_query_counter, register_default_gauges
+        from .slow_queries import get_config as get_slow_queries_config, install_slow_query_recorder
+
+        if get_slow_queries_config()["ENABLED"]:
+            connection_created.connect(install_slow_query_recorder, dispatch_uid="monitoring.slow_queries")
+            for connection in connections.all(initialized_only=True):
+                install_slow_query_recorder(sender=None, connection=connection)
+
+        if not get_config()["ENABLED"]:
+            return
+        connection_created.connect(install_query_counter, dispatch_uid="monitoring.query_counter")
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(sender=None, connection=connection)
+        register_default_gauges()
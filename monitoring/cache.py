@@ -0,0 +1,62 @@
+"""
+Кеш-бекенди з обліком hit/miss для метрик
+
+MetricsCacheMixin можна поєднати з будь-яким бекендом Django; мітка кешу -
+LOCATION бекенда.
+"""
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import record_cache
+
+_MISSING = object()
+
+
+class MetricsCacheMixin:
+    """Рахує влучання та промахи get/get_many (get_or_set працює через get)"""
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.metrics_label = location or "default"
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache(self.metrics_label, 0, 1)
+            return default
+        record_cache(self.metrics_label, 1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        parent = super().get_many
+        if getattr(parent, "__func__", None) is BaseCache.get_many:
+            # Базова реалізація викликає self.get() - облік уже відбувається там
+            return parent(keys, version)
+        keys = list(keys)
+        found = parent(keys, version)
+        record_cache(self.metrics_label, len(found), len(keys) - len(found))
+        return found
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _MISSING, version)
+        if value is _MISSING:
+            if callable(default):
+                default = default()
+            self.add(key, default, timeout=timeout, version=version)
+            # Повторне читання після add - не окреме звернення клієнта, не рахуємо
+            return super().get(key, default, version)
+        return value
+
+
+class InstrumentedLocMemCache(MetricsCacheMixin, LocMemCache):
+    """LocMemCache з метриками"""
+
+
+class InstrumentedFileBasedCache(MetricsCacheMixin, FileBasedCache):
+    """FileBasedCache з метриками (спільний для процесів одного хоста)"""
+
+
+class InstrumentedRedisCache(MetricsCacheMixin, RedisCache):
+    """RedisCache з метриками (пакет redis імпортується при першому зверненні)"""
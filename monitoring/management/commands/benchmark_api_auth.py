@@ -0,0 +1,50 @@
+"""
+Management команда: запити/с до API з Basic-автентифікацією та з API-токеном.
+
+Приклади:
+      python manage.py benchmark_api_auth
+      python manage.py benchmark_api_auth --requests 300 --path "/api/events/?page_size=10"
+
+Вимірювання виконується в окремій тестовій БД з хешером паролів
+з PASSWORD_HASHERS (Argon2 у робочих налаштуваннях).
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.auth import DEFAULT_PATH, run_auth_benchmark
+
+
+class Command(BaseCommand):
+    help = "Порівнює пропускну здатність API з Basic-автентифікацією та з API-токенами"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100, help="Кількість запитів на режим")
+        parser.add_argument("--path", default=DEFAULT_PATH, help="URL API для запитів")
+        parser.add_argument("--json", action="store_true", help="Вивести результат у JSON")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests має бути не менше 1")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            rows = run_auth_benchmark(options["requests"], options["path"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"{options['path']}, {options['requests']} запитів на режим, хешер {rows[0]['hasher']}")
+        basic_rps = rows[0]["rps"] or 1e-9
+        for row in rows:
+            self.stdout.write(
+                f"  {row['mode']:<14} {row['rps']:>9.1f} req/s  медіана {row['ms_median']:>8.3f} ms  "
+                f"p95 {row['ms_p95']:>8.3f} ms  x{row['rps'] / basic_rps:.1f}"
+            )
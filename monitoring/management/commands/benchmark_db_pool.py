@@ -0,0 +1,47 @@
+"""
+Management команда: цикли connect/SELECT 1/close без пулу та з пулом з'єднань.
+
+Приклади:
+      python manage.py benchmark_db_pool
+      python manage.py benchmark_db_pool --threads 8 --cycles 500 --pool-size 4
+
+Потрібен MySQL-аліас; робочі дані не змінюються (лише SELECT 1).
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.db_pool import run_pool_benchmark
+
+
+class Command(BaseCommand):
+    help = "Порівнює вартість з'єднань з MySQL без пулу та з пулом (event_organizer.mysql_pool)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", default="default", help="Аліас DATABASES")
+        parser.add_argument("--cycles", type=int, default=200, help="Циклів на потік")
+        parser.add_argument("--threads", type=int, default=4, help="Кількість потоків")
+        parser.add_argument("--pool-size", type=int, default=0, help="max_size пулу (0 - за кількістю потоків)")
+        parser.add_argument("--json", action="store_true", help="Вивести результат у JSON")
+
+    def handle(self, *args, **options):
+        if options["cycles"] < 1 or options["threads"] < 1:
+            raise CommandError("--cycles та --threads мають бути не менше 1")
+        try:
+            rows = run_pool_benchmark(
+                options["alias"], options["cycles"], options["threads"], options["pool_size"]
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, ensure_ascii=False, indent=2))
+            return
+        for row in rows:
+            line = (
+                f"  {row['mode']:<8} {row['cycles_per_s']:>9.1f} циклів/с  медіана {row['ms_median']:>8.3f} ms  "
+                f"p95 {row['ms_p95']:>8.3f} ms  з'єднань створено {row['connections_created']}"
+            )
+            if "waits" in row:
+                line += f"  очікувань {row['waits']} (max {row['wait_ms_max']} ms)"
+            self.stdout.write(line)
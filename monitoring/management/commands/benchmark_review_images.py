@@ -0,0 +1,49 @@
+"""
+Management команда: швидкість обробки зображень відгуків (зображень/с на ядро).
+
+Приклади:
+      python manage.py benchmark_review_images
+      python manage.py benchmark_review_images --images 32 --workers 1,2,4,8
+      python manage.py benchmark_review_images --size 1600x1200 --json
+
+БД не використовується: синтетичні JPEG обробляються тим самим кодом,
+що й фонова обробка (events/image_processing.py) з REVIEW_IMAGES.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.images import PHONE_SIZE, run_image_benchmark
+
+
+class Command(BaseCommand):
+    help = "Вимірює обробку зображень відгуків послідовно та в пулі процесів"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--images", type=int, default=16, help="Зображень на режим")
+        parser.add_argument("--workers", default="1,2,4", help="Розміри пулу через кому")
+        parser.add_argument("--size", default="x".join(map(str, PHONE_SIZE)), help="Розмір фото, ШxВ")
+        parser.add_argument("--json", action="store_true", help="Вивести результат у JSON")
+
+    def handle(self, *args, **options):
+        try:
+            workers = [int(value) for value in options["workers"].split(",") if value.strip()]
+            size = tuple(int(value) for value in options["size"].lower().split("x"))
+        except ValueError:
+            raise CommandError("--workers - числа через кому, --size - ШxВ")
+        if options["images"] < 1 or any(count < 1 for count in workers) or len(size) != 2 or min(size) < 1:
+            raise CommandError("--images, --workers і --size мають бути додатними")
+
+        rows = run_image_benchmark(options["images"], workers, size)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"{size[0]}x{size[1]} JPEG, {options['images']} зображень на режим")
+        for row in rows:
+            self.stdout.write(
+                f"  {row['mode']:<8} {row['images_per_sec']:>7.2f} img/s  "
+                f"{row['images_per_sec_per_core']:>6.2f} img/s/ядро  "
+                f"{row['source_mb']:>7.2f} МБ -> {row['output_mb']:>6.2f} МБ"
+            )
@@ -0,0 +1,61 @@
+"""
+Management команда: персональний розклад користувача з великою історією.
+
+Приклади:
+      python manage.py benchmark_schedule
+      python manage.py benchmark_schedule --events 50000 --repeat 3
+
+Порівнює попередній запит (OR + DISTINCT, фільтри в Python) з UNION ALL
+та фільтрами в SQL, а також побудову JSON календаря (ORM-об'єкти + to_dict
+проти values_list + ScheduleJsonEncoder): час, пікову пам'ять і розмір.
+Вимірювання виконується в окремій тестовій БД.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.schedule import run_encoding_benchmark, run_schedule_benchmark
+
+
+class Command(BaseCommand):
+    help = "Порівнює побудову персонального розкладу: OR + DISTINCT проти UNION з фільтрами в SQL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=10_000, help="Кількість подій у розкладі користувача")
+        parser.add_argument("--repeat", type=int, default=5, help="Повторів на вимірювання")
+        parser.add_argument("--json", action="store_true", help="Вивести результат у JSON")
+
+    def handle(self, *args, **options):
+        if options["events"] < 2 or options["repeat"] < 1:
+            raise CommandError("--events має бути не менше 2, --repeat - не менше 1")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            rows = run_schedule_benchmark(options["events"], options["repeat"])
+            encoding = run_encoding_benchmark(options["events"], options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"queries": rows, "encoding": encoding}, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"{options['events']} подій у розкладі, медіана з {options['repeat']} повторів")
+        for row in rows:
+            legacy, union = row["legacy"], row["union"]
+            speedup = legacy["ms_median"] / union["ms_median"] if union["ms_median"] else 0.0
+            self.stdout.write(
+                f"  {row['filter']:<14} legacy {legacy['ms_median']:>9.1f} ms  union {union['ms_median']:>9.1f} ms  "
+                f"x{speedup:.1f}  записів {union['entries']}"
+            )
+
+        self.stdout.write("JSON календаря:")
+        for row in encoding:
+            self.stdout.write(
+                f"  {row['mode']:<8} {row['ms_median']:>9.1f} ms  пік {row['peak_kb']:>9.1f} KB  "
+                f"JSON {row['payload_kb']:>8.1f} KB  запис {row['entry_bytes']} B"
+            )
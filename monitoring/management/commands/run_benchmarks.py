@@ -0,0 +1,84 @@
+"""
+Management команда для запуску бенчмарків гарячих view та сервісів (пакет benchmarks).
+
+Приклади:
+      python manage.py run_benchmarks                              # small, medium
+      python manage.py run_benchmarks --sizes large --repeat 3
+      python manage.py run_benchmarks --only event_list --compare benchmarks/results/<базовий>.json
+
+Дані генеруються в окремій тестовій БД, робоча база не змінюється.
+Команда завершується з помилкою, якщо сценарій перевищив бюджет запитів.
+"""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.harness import build_report, check_budgets, compare_reports, save_report
+from benchmarks.runner import run_suite
+from benchmarks.scenarios import SIZES
+
+
+class Command(BaseCommand):
+    help = "Вимірює час, кількість SQL-запитів та пам'ять гарячих view і сервісів"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="small,medium", help=f"Набори даних через кому ({', '.join(SIZES)})"
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Кількість вимірювань часу на сценарій")
+        parser.add_argument("--seed", type=int, default=42, help="Seed генератора даних")
+        parser.add_argument("--only", help="Запускати лише сценарії, ім'я яких містить підрядок")
+        parser.add_argument("--output", help="Шлях JSON-звіту (за замовчуванням benchmarks/results/)")
+        parser.add_argument("--compare", help="JSON-звіт попереднього запуску для порівняння")
+        parser.add_argument(
+            "--no-budget-check", action="store_true", help="Не завершувати з помилкою при перевищенні бюджету"
+        )
+
+    def handle(self, *args, **options):
+        sizes = [name.strip() for name in options["sizes"].split(",") if name.strip()]
+        unknown = [name for name in sizes if name not in SIZES]
+        if unknown or not sizes:
+            raise CommandError(f"Невідомий набір даних: {', '.join(unknown)}. Доступні: {', '.join(SIZES)}")
+        if options["repeat"] < 1:
+            raise CommandError("--repeat має бути не менше 1")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Не вдалося прочитати {options['compare']}: {exc}")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            measurements = run_suite(
+                sizes,
+                repeat=options["repeat"],
+                seed=options["seed"],
+                only=options["only"],
+                progress=self.stdout.write,
+            )
+            report = build_report(measurements)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        path = save_report(report, options["output"])
+        self.stdout.write(self.style.SUCCESS(f"Звіт збережено: {path}"))
+
+        if baseline is not None:
+            self.stdout.write(f"Порівняння з {baseline.get('commit', '?')}:")
+            for row in compare_reports(baseline, report):
+                self.stdout.write(
+                    f"  {row['scenario']:<40} [{row['size']}] {row['wall_ms']:>9.2f} ms "
+                    f"({row['wall_change_pct']:+.1f}%)  запити {row['queries_delta']:+d}  "
+                    f"пам'ять {row['peak_kb_delta']:+.1f} KiB"
+                )
+
+        violations = check_budgets(measurements)
+        if violations and not options["no_budget_check"]:
+            raise CommandError("Перевищено бюджет запитів:\n" + "\n".join(violations))
@@ -0,0 +1,63 @@
+"""
+Management команда для перегляду повільних SQL-запитів (monitoring/slow_queries.py).
+
+Приклади:
+      python manage.py slow_queries                       # топ-20 за сумарним часом
+      python manage.py slow_queries --sort max_ms --explain
+      python manage.py slow_queries --json > slow.json
+      python manage.py slow_queries --clear
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from monitoring.slow_queries import get_buffer, get_config, top_offenders
+
+
+class Command(BaseCommand):
+    help = "Показує найгірші повільні SQL-запити з кільцевого буфера"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Скільки груп показати")
+        parser.add_argument(
+            "--sort", choices=("total_ms", "max_ms", "count"), default="total_ms", help="Критерій сортування"
+        )
+        parser.add_argument("--explain", action="store_true", help="Показати зібрані плани EXPLAIN")
+        parser.add_argument("--json", action="store_true", help="Вивести результат у JSON")
+        parser.add_argument("--clear", action="store_true", help="Очистити буфер")
+
+    def handle(self, *args, **options):
+        config = get_config()
+        buffer = get_buffer(config)
+
+        if options["clear"]:
+            buffer.clear()
+            self.stdout.write(self.style.SUCCESS("Буфер повільних запитів очищено"))
+            return
+
+        records = buffer.records()
+        rows = top_offenders(records, options["sort"], options["limit"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, ensure_ascii=False, indent=2))
+            return
+
+        if not config["ENABLED"]:
+            self.stdout.write(self.style.WARNING('Захоплення вимкнено: SLOW_QUERIES["ENABLED"] = False'))
+        if not rows:
+            self.stdout.write(f"Повільних запитів (>= {config['THRESHOLD_MS']} мс) не зафіксовано")
+            return
+
+        self.stdout.write(f"Записів у буфері: {len(records)}, поріг {config['THRESHOLD_MS']} мс\n")
+        for index, row in enumerate(rows, start=1):
+            self.stdout.write(self.style.SQL_KEYWORD(
+                f"{index}. {row['count']}× сумарно {row['total_ms']} мс, макс. {row['max_ms']} мс, "
+                f"сер. {row['avg_ms']} мс"
+            ))
+            self.stdout.write(f"   SQL:   {row['sql'][:300]}")
+            self.stdout.write(f"   Кадр:  {row['frame']}")
+            self.stdout.write(f"   View:  {', '.join(row['views'])}")
+            if options["explain"] and row["explain"]:
+                self.stdout.write("   EXPLAIN:")
+                for line in row["explain"]:
+                    self.stdout.write(f"     {line}")
@@ -0,0 +1,394 @@
+"""
+Метрики застосунку у форматі Prometheus
+
+Кожен процес (воркер gunicorn) веде власний реєстр у звичайних dict/list
+без блокувань - інкремент коштує доступ до словника та додавання. Раз на
+FLUSH_INTERVAL секунд процес атомарно (os.replace) записує знімок реєстру
+у файл METRICS_DIR/metrics-<pid>.json. Endpoint /metrics сумує файли живих
+воркерів і власний живий знімок. Файл процесу, якого вже немає, під час
+збору видаляється: після перезапусків воркерів сума не тягне їх значення
+вічно, а зменшення лічильника Prometheus сприймає як reset (rate/increase
+його враховують). Перевірка - за pid, тож METRICS_DIR має бути локальним
+для хоста (не спільним томом кількох контейнерів).
+
+Gauges (наприклад, глибина черги) не зберігаються у файлах - вони
+рахуються callback'ами в момент збору і описують лише живий процес.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+DEFAULTS = {
+    "ENABLED": True,
+    "DIR": None,
+    "FLUSH_INTERVAL": 5.0,
+    "ALLOWED_IPS": ("127.0.0.1", "::1"),
+}
+
+
+def get_config() -> dict:
+    """Налаштування метрик: settings.METRICS поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "METRICS", {}) or {})
+    if not config["DIR"]:
+        config["DIR"] = os.environ.get("METRICS_DIR") or Path(tempfile.gettempdir()) / "event_organizer_metrics"
+    return config
+
+
+class Counter:
+    """Монотонний лічильник з мітками"""
+
+    kind = "counter"
+    __slots__ = ("name", "help", "labelnames", "series")
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.series: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, labels: tuple = ()) -> None:
+        series = self.series
+        series[labels] = series.get(labels, 0) + amount
+
+    def dump(self) -> list:
+        return [[list(labels), value] for labels, value in self.series.items()]
+
+
+class Histogram:
+    """
+    Гістограма з фіксованими межами
+
+    Для кожної комбінації міток зберігається список: лічильники кошиків
+    (не накопичувальні, останній - +Inf) і сума спостережень в кінці.
+    """
+
+    kind = "histogram"
+    __slots__ = ("name", "help", "labelnames", "buckets", "series")
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        row = self.series.get(labels)
+        if row is None:
+            row = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def dump(self) -> list:
+        return [[list(labels), list(row)] for labels, row in self.series.items()]
+
+
+class MetricsRegistry:
+    """Реєстр метрик процесу"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.gauges: Dict[str, Tuple[str, Tuple[str, ...], Callable[[], Iterable]]] = {}
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help: str, labelnames: Tuple[str, ...], callback: Callable[[], Iterable]):
+        """
+        Зареєструвати gauge, значення якого рахуються під час збору
+
+        callback повертає ітерабельне [(labels_tuple, value), ...]
+        """
+        self.gauges[name] = (help, labelnames, callback)
+
+    def snapshot(self) -> dict:
+        return {name: metric.dump() for name, metric in self.metrics.items()}
+
+    # --- Файловий обмін між воркерами ---
+
+    def _path(self, directory) -> Path:
+        return Path(directory) / f"metrics-{os.getpid()}.json"
+
+    def flush(self, directory) -> None:
+        """Записати знімок процесу у файл (атомарно)"""
+        path = self._path(directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp, path)
+
+    def maybe_flush(self, directory, interval: float) -> None:
+        """Скинути знімок, якщо з попереднього минуло interval секунд"""
+        now = time.monotonic()
+        if now - self._last_flush < interval:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = now
+            self.flush(directory)
+        except OSError:
+            pass
+        finally:
+            self._flush_lock.release()
+
+    def collect(self, directory) -> Dict[str, list]:
+        """Знімки живих воркерів + живий знімок поточного процесу"""
+        own = self._path(directory)
+        snapshots = [self.snapshot()]
+        for path in Path(directory).glob("metrics-*.json"):
+            if path == own:
+                continue
+            if not _pid_alive(path.stem.rpartition("-")[2]):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    snapshots.append(json.load(fh))
+            except (OSError, ValueError):
+                continue
+        return merge_snapshots(snapshots)
+
+    def render(self, directory) -> str:
+        """Текстовий формат Prometheus (exposition format 0.0.4)"""
+        merged = self.collect(directory)
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            series = merged.get(name, [])
+            if metric.kind == "counter":
+                for labels, value in series:
+                    lines.append(f"{name}{_labels(metric.labelnames, labels)} {_number(value)}")
+            else:
+                for labels, row in series:
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), row[:-1]):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else _number(bound)
+                        lines.append(
+                            f"{name}_bucket{_labels(metric.labelnames + ('le',), list(labels) + [le])} {cumulative}"
+                        )
+                    lines.append(f"{name}_sum{_labels(metric.labelnames, labels)} {_number(row[-1])}")
+                    lines.append(f"{name}_count{_labels(metric.labelnames, labels)} {cumulative}")
+
+        for name, (help, labelnames, callback) in sorted(self.gauges.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            try:
+                values = list(callback())
+            except Exception:  # noqa: BLE001 - збій одного gauge не ламає весь /metrics
+                continue
+            for labels, value in values:
+                lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: str) -> bool:
+    """Чи існує процес з pid (невідоме ім'я файлу чи платформа - так)"""
+    if not pid.isdigit() or os.name == "nt":
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # PermissionError - процес є, але належить іншому користувачу
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: Iterable[dict]) -> Dict[str, list]:
+    """Підсумувати знімки: лічильники та кошики гістограм складаються"""
+    merged: Dict[str, Dict[tuple, object]] = {}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, value in series:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = target.get(key)
+                    target[key] = value[:] if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0) + value
+    return {name: [(labels, value) for labels, value in sorted(series.items())] for name, series in merged.items()}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "Тривалість HTTP-запиту за іменем URL", ("view", "method")
+)
+REQUESTS_TOTAL = REGISTRY.counter(
+    "http_requests_total", "Кількість HTTP-запитів за іменем URL та класом статусу", ("view", "status")
+)
+DB_QUERIES = REGISTRY.histogram(
+    "db_queries_per_request", "Кількість SQL-запитів на HTTP-запит", ("view",), SIZE_BUCKETS
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Звернення до кешу (hit/miss)", ("cache", "result")
+)
+DB_POOL_WAIT = REGISTRY.histogram(
+    "db_pool_wait_seconds", "Очікування з'єднання з пулу БД при видачі", ("alias",)
+)
+DB_POOL_EVENTS = REGISTRY.counter(
+    "db_pool_events_total", "Події пулу з'єднань БД (created/closed/check_failed/timeout)", ("alias", "event")
+)
+NOTIFICATION_FANOUT = REGISTRY.histogram(
+    "notification_fanout_size", "Кількість отримувачів одного розсилання сповіщень", ("type",), SIZE_BUCKETS
+)
+
+
+def record_cache(alias: str, hits: int, misses: int) -> None:
+    """Облік звернень до кешу (викликається instrumented-бекендом)"""
+    if hits:
+        CACHE_REQUESTS.inc(hits, (alias, "hit"))
+    if misses:
+        CACHE_REQUESTS.inc(misses, (alias, "miss"))
+
+
+def record_notification_fanout(notification_type: str, size: int) -> None:
+    NOTIFICATION_FANOUT.observe(size, (notification_type,))
+
+
+def record_pool_event(alias: str, event: str, value: float = 1) -> None:
+    """Облік подій пулу з'єднань (event_organizer/mysql_pool): wait - секунди очікування"""
+    if event == "wait":
+        DB_POOL_WAIT.observe(value, (alias,))
+    else:
+        DB_POOL_EVENTS.inc(value, (alias, event))
+
+
+def _flush_at_exit() -> None:
+    config = get_config()
+    if config["ENABLED"]:
+        try:
+            REGISTRY.flush(config["DIR"])
+        except OSError:
+            pass
+
+
+atexit.register(_flush_at_exit)
+
+
+# --- Лічильник SQL-запитів потоку (для db_queries_per_request) ---
+
+_local = threading.local()
+
+
+def query_counter(execute, sql, params, many, context):
+    """Постійна execute_wrapper-обгортка: рахує запити поточного потоку"""
+    _local.queries = getattr(_local, "queries", 0) + 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs) -> None:
+    """Обробник connection_created: підключає query_counter до нового з'єднання"""
+    if query_counter not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_counter)
+
+
+def thread_query_count() -> int:
+    return getattr(_local, "queries", 0)
+
+
+def view_label(request) -> str:
+    """Мітка endpoint'а: ім'я URL (без namespace-конфліктів) або <unresolved>"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match._func_path
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def reset_registry(registry: Optional[MetricsRegistry] = None) -> None:
+    """Очистити значення (для тестів)"""
+    registry = registry or REGISTRY
+    for metric in registry.metrics.values():
+        metric.series.clear()
+
+
+def _job_queue_depth():
+    """
+    Глибина черг фонових робіт
+
+    Окремої черги задач у проєкті немає; чергою є робота для cron-команд:
+    завершені, але ще не заархівовані події (archive_past_events).
+    """
+    from django.utils import timezone
+    from events.models import Event
+
+    backlog = Event.objects.filter(status=Event.PUBLISHED, series_ends_at__lt=timezone.now()).count()
+    return [(("archive",), backlog)]
+
+
+def _db_pool_connections():
+    """З'єднання пулів БД поточного процесу: зайняті та вільні"""
+    from event_organizer.mysql_pool.pool import all_pools
+
+    values = []
+    for pool in all_pools():
+        if pool.closed:
+            continue
+        snapshot = pool.snapshot()
+        values.append(((pool.name, "in_use"), snapshot["in_use"]))
+        values.append(((pool.name, "idle"), snapshot["idle"]))
+    return values
+
+
+def register_default_gauges(registry: Optional[MetricsRegistry] = None) -> None:
+    registry = registry or REGISTRY
+    registry.gauge_callback(
+        "job_queue_depth", "Кількість робіт, що очікують обробки", ("queue",), _job_queue_depth
+    )
+    registry.gauge_callback(
+        "db_pool_connections", "З'єднання пулу БД процесу за станом", ("alias", "state"), _db_pool_connections
+    )
@@ -0,0 +1,128 @@
+"""
+Middleware моніторингу
+
+SQLProfilerMiddleware - opt-in профілювання SQL. Вмикається налаштуванням
+SQL_PROFILER["ENABLED"]; інакше Django відкидає middleware при старті
+(MiddlewareNotUsed) і накладних витрат немає.
+Профілюється випадкова частка запитів (SAMPLE_RATE) та запити з
+?_sqlprofile=1 від staff (або будь-які при DEBUG).
+
+MetricsMiddleware - метрики для /metrics (див. monitoring/metrics.py).
+
+SlowQueryMiddleware - позначає ім'ям view повільні запити, які захоплює
+monitoring/slow_queries.py (вмикається SLOW_QUERIES["ENABLED"]).
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .metrics import (
+    DB_QUERIES,
+    REGISTRY,
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+    get_config as get_metrics_config,
+    status_class,
+    thread_query_count,
+    view_label,
+)
+from .slow_queries import get_config as get_slow_queries_config, set_current_view
+from .sql_profiler import HEADER_NAME, collect_queries, get_config, get_log, header_value
+
+FORCE_PARAM = "_sqlprofile"
+
+
+class SQLProfilerMiddleware:
+    """Рахує запити, час БД, повтори та N+1 для вибірки HTTP-запитів"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.log = get_log(self.config)
+
+    def _is_forced(self, request) -> bool:
+        if request.GET.get(FORCE_PARAM) != "1":
+            return False
+        user = getattr(request, "user", None)
+        return settings.DEBUG or bool(user and user.is_authenticated and user.is_staff)
+
+    def __call__(self, request):
+        forced = self._is_forced(request)
+        if not forced and random.random() >= self.config["SAMPLE_RATE"]:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with collect_queries() as collector:
+            response = self.get_response(request)
+        total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        profile = collector.analyze(
+            self.config["N_PLUS_ONE_THRESHOLD"], self.config["TOP_FINGERPRINTS"]
+        )
+        match = getattr(request, "resolver_match", None)
+        self.log.append({
+            "ts": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else "",
+            "status": response.status_code,
+            "total_ms": total_ms,
+            **profile,
+        })
+
+        if forced or self.config["EXPOSE_HEADER"]:
+            response[HEADER_NAME] = header_value(profile)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Латентність, статуси та кількість SQL-запитів за іменем URL
+
+    Стоїть першим у MIDDLEWARE, щоб міряти весь стек. На запит - два
+    perf_counter, bisect по кошиках і три оновлення словників.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_metrics_config()
+        if not config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.directory = config["DIR"]
+        self.flush_interval = config["FLUSH_INTERVAL"]
+
+    def __call__(self, request):
+        queries_before = thread_query_count()
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view = view_label(request)
+        REQUEST_LATENCY.observe(elapsed, (view, request.method))
+        REQUESTS_TOTAL.inc(1, (view, status_class(response.status_code)))
+        DB_QUERIES.observe(thread_query_count() - queries_before, (view,))
+        REGISTRY.maybe_flush(self.directory, self.flush_interval)
+        return response
+
+
+class SlowQueryMiddleware:
+    """Передає ім'я view поточного запиту записувачу повільних SQL"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not get_slow_queries_config()["ENABLED"]:
+            raise MiddlewareNotUsed
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            set_current_view(None)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_current_view(view_label(request))
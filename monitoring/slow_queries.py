@@ -0,0 +1,221 @@
+"""
+Захоплення повільних SQL-запитів
+
+SlowQueryRecorder - постійна execute_wrapper-обгортка (підключається до
+кожного нового з'єднання через connection_created). Для запитів, довших
+за THRESHOLD_MS, зберігається:
+- нормалізований SQL (fingerprint) і відбиток параметрів (без значень);
+- view поточного HTTP-запиту (SlowQueryMiddleware) або "<no request>";
+- перший кадр стеку з коду проєкту - ORM-виклик, що породив запит;
+- для вибірки SELECT (EXPLAIN_SAMPLE_RATE) - план виконання EXPLAIN.
+
+Записи складаються в кільцевий буфер фіксованого розміру в кеші
+(CACHE_ALIAS): номер слоту - cache.incr лічильника за модулем BUFFER_SIZE.
+Зі спільним кеш-бекендом (Redis/Memcached) буфер спільний для всіх воркерів.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .sql_profiler import fingerprint, params_fingerprint
+
+DEFAULTS = {
+    "ENABLED": False,
+    "THRESHOLD_MS": 200,
+    "EXPLAIN_SAMPLE_RATE": 0.1,
+    "BUFFER_SIZE": 500,
+    "CACHE_ALIAS": "default",
+}
+
+CACHE_PREFIX = "monitoring:slowq"
+NO_REQUEST = "<no request>"
+
+_PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+_MONITORING_DIR = str(Path(__file__).resolve().parent)
+_SKIP_PATHS = ("site-packages", "dist-packages")
+
+_local = threading.local()
+
+
+def get_config() -> dict:
+    """Налаштування: settings.SLOW_QUERIES поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SLOW_QUERIES", {}) or {})
+    return config
+
+
+def set_current_view(label: Optional[str]) -> None:
+    _local.view = label
+
+
+def current_view() -> str:
+    return getattr(_local, "view", None) or NO_REQUEST
+
+
+def origin_frame(frame=None) -> str:
+    """
+    Перший кадр стеку з коду проєкту: "events/ui_views.py:312 in get_queryset"
+
+    Кадри Django, сторонніх пакетів та обгорток monitoring пропускаються.
+    """
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_PROJECT_ROOT)
+            and not any(part in filename for part in _SKIP_PATHS)
+            and not (os.path.dirname(filename) == _MONITORING_DIR and not os.path.basename(filename).startswith("test"))
+        ):
+            relative = filename[len(_PROJECT_ROOT):].lstrip("/\\")
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class SlowQueryBuffer:
+    """Кільцевий буфер записів у кеші"""
+
+    def __init__(self, size: int = DEFAULTS["BUFFER_SIZE"], alias: str = DEFAULTS["CACHE_ALIAS"]):
+        self.size = size
+        self.cache = caches[alias]
+        self.head_key = f"{CACHE_PREFIX}:head"
+
+    def _slot_key(self, slot: int) -> str:
+        return f"{CACHE_PREFIX}:slot:{slot}"
+
+    def append(self, record: dict) -> None:
+        try:
+            position = self.cache.incr(self.head_key)
+        except ValueError:
+            self.cache.add(self.head_key, 0, None)
+            position = self.cache.incr(self.head_key)
+        self.cache.set(self._slot_key(position % self.size), record, None)
+
+    def records(self) -> List[dict]:
+        """Усі записи буфера, найновіші першими"""
+        values = self.cache.get_many([self._slot_key(slot) for slot in range(self.size)])
+        return sorted(values.values(), key=lambda record: record["ts"], reverse=True)
+
+    def clear(self) -> None:
+        self.cache.delete_many([self.head_key] + [self._slot_key(slot) for slot in range(self.size)])
+
+
+def get_buffer(config: Optional[dict] = None) -> SlowQueryBuffer:
+    config = config or get_config()
+    return SlowQueryBuffer(config["BUFFER_SIZE"], config["CACHE_ALIAS"])
+
+
+def explain(connection, sql: str, params) -> Optional[List[str]]:
+    """
+    План виконання SELECT-запиту (рядки EXPLAIN як текст) або None
+
+    Виконується на курсорі бекенду напряму, повз execute_wrappers: EXPLAIN
+    не потрапляє ні в лічильники запитів, ні знову в цей записувач.
+    """
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    try:
+        with connection.cursor() as wrapper:
+            cursor = wrapper.cursor
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return [" | ".join(str(value) for value in row) for row in cursor.fetchall()]
+    except Exception:  # noqa: BLE001 - EXPLAIN не має ламати основний запит
+        return None
+
+
+class SlowQueryRecorder:
+    """execute_wrapper: міряє запит і записує повільні в буфер"""
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = config or get_config()
+        self.threshold = self.config["THRESHOLD_MS"] / 1000
+        self.buffer = get_buffer(self.config)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = execute(sql, params, many, context)
+            failed = False
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= self.threshold:
+                self.record(sql, params, many, duration, context["connection"], failed)
+
+    def record(self, sql, params, many, duration, connection, failed: bool = False) -> None:
+        plan = None
+        # Після помилки транзакція може бути зламана - EXPLAIN лише для успішних запитів
+        if not (many or failed) and random.random() < self.config["EXPLAIN_SAMPLE_RATE"]:
+            plan = explain(connection, sql, params)
+        try:
+            self.buffer.append({
+                "ts": timezone.now().isoformat(),
+                "sql": fingerprint(sql),
+                "params": params_fingerprint(params),
+                "duration_ms": round(duration * 1000, 2),
+                "view": current_view(),
+                "frame": origin_frame(sys._getframe(2)),
+                "alias": connection.alias,
+                "vendor": connection.vendor,
+                "explain": plan,
+                "failed": failed,
+            })
+        except Exception:  # noqa: BLE001 - недоступний кеш не ламає запит
+            pass
+
+
+_recorder: Optional[SlowQueryRecorder] = None
+
+
+def install_slow_query_recorder(sender, connection, **kwargs) -> None:
+    """Обробник connection_created: підключає SlowQueryRecorder до нового з'єднання"""
+    global _recorder
+    if _recorder is None:
+        _recorder = SlowQueryRecorder()
+    if _recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_recorder)
+
+
+def top_offenders(records: List[dict], sort: str = "total_ms", limit: int = 20) -> List[dict]:
+    """
+    Групування записів за нормалізованим SQL
+
+    sort: total_ms (сумарний час), max_ms або count
+    """
+    groups: Dict[str, List[dict]] = defaultdict(list)
+    for record in records:
+        groups[record["sql"]].append(record)
+
+    rows = []
+    for sql, items in groups.items():
+        durations = [item["duration_ms"] for item in items]
+        plans = [item["explain"] for item in items if item.get("explain")]
+        rows.append({
+            "sql": sql,
+            "count": len(items),
+            "total_ms": round(sum(durations), 2),
+            "max_ms": max(durations),
+            "avg_ms": round(sum(durations) / len(durations), 2),
+            "views": [view for view, _count in Counter(item["view"] for item in items).most_common(3)],
+            "frame": Counter(item["frame"] for item in items).most_common(1)[0][0],
+            "params_variants": len({item["params"] for item in items}),
+            "explain": plans[0] if plans else None,
+            "last_seen": max(item["ts"] for item in items),
+        })
+
+    if sort not in ("total_ms", "max_ms", "count"):
+        sort = "total_ms"
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,235 @@
+"""
+Профілювання SQL-запитів у межах одного HTTP-запиту
+
+QueryCollector підключається через connection.execute_wrapper і для кожного
+запиту фіксує текст SQL (з плейсхолдерами), відбиток параметрів та час.
+За зібраними даними рахуються:
+- duplicates - однакові SQL з однаковими параметрами (зайві повтори);
+- n_plus_one - однаковий SQL, що повторюється з різними параметрами
+  щонайменше N_PLUS_ONE_THRESHOLD разів (типовий N+1 у циклі шаблону).
+
+Профілі дописуються у JSONL-лог (один рядок на запит), з якого staff-сторінка
+будує рейтинг найгірших endpoint'ів. Лог спільний для всіх воркерів.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+DEFAULTS = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.05,
+    "LOG_PATH": None,
+    "LOG_MAX_BYTES": 20 * 1024 * 1024,
+    "EXPOSE_HEADER": False,
+    "N_PLUS_ONE_THRESHOLD": 5,
+    "TOP_FINGERPRINTS": 5,
+}
+
+HEADER_NAME = "X-SQL-Profile"
+
+_IN_LIST = re.compile(r"\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACES = re.compile(r"\s+")
+
+
+def get_config() -> dict:
+    """Налаштування профайлера: settings.SQL_PROFILER поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "SQL_PROFILER", {}) or {})
+    if not config["LOG_PATH"]:
+        config["LOG_PATH"] = Path(settings.BASE_DIR) / "logs" / "sql_profile.jsonl"
+    return config
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Нормалізований SQL без значень
+
+    Списки IN (%s, %s, ...) згортаються в IN (?), щоб запити з різною
+    довжиною списку мали однаковий відбиток.
+    """
+    sql = _IN_LIST.sub("IN (?)", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    return _SPACES.sub(" ", sql).strip()
+
+
+def params_fingerprint(params) -> str:
+    """Короткий відбиток параметрів (самі значення в лог не потрапляють)"""
+    return hashlib.md5(repr(params).encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class QueryCollector:
+    """Обгортка execute_wrapper, що накопичує статистику запитів"""
+
+    queries: List[tuple] = field(default_factory=list)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params_fingerprint(params), time.perf_counter() - start))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time(self) -> float:
+        return sum(duration for _sql, _params, duration in self.queries)
+
+    def analyze(self, threshold: int, top: int) -> dict:
+        """Порахувати повтори та підозри на N+1"""
+        exact = Counter((sql, params) for sql, params, _duration in self.queries)
+        by_fingerprint: Dict[str, List[tuple]] = defaultdict(list)
+        for sql, params, duration in self.queries:
+            by_fingerprint[fingerprint(sql)].append((params, duration))
+
+        duplicates = Counter()
+        for (sql, _params), count in exact.items():
+            if count > 1:
+                duplicates[fingerprint(sql)] += count - 1
+
+        n_plus_one = []
+        for fp, calls in by_fingerprint.items():
+            distinct_params = len({params for params, _duration in calls})
+            if distinct_params >= threshold:
+                n_plus_one.append({
+                    "sql": fp,
+                    "count": len(calls),
+                    "time_ms": round(sum(duration for _params, duration in calls) * 1000, 2),
+                })
+        n_plus_one.sort(key=lambda item: -item["count"])
+
+        return {
+            "queries": self.count,
+            "db_ms": round(self.db_time * 1000, 2),
+            "duplicates": sum(duplicates.values()),
+            "duplicate_fingerprints": [
+                {"sql": fp, "count": count} for fp, count in duplicates.most_common(top)
+            ],
+            "n_plus_one": n_plus_one[:top],
+        }
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryCollector]:
+    """Зібрати запити до всіх підключень БД у межах блоку"""
+    collector = QueryCollector()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(collector))
+        yield collector
+
+
+class ProfileLog:
+    """JSONL-лог профілів з ротацією за розміром"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path, max_bytes: int = DEFAULTS["LOG_MAX_BYTES"]):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+
+    def append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                if self.path.stat().st_size > self.max_bytes:
+                    os.replace(self.path, self.path.with_suffix(self.path.suffix + ".1"))
+            except FileNotFoundError:
+                pass
+            # Один write() в режимі append - рядки різних воркерів не перемішуються
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+
+    def read_recent(self, limit: int = 5000) -> List[dict]:
+        """Останні limit записів (читається лише хвіст файлу)"""
+        try:
+            with open(self.path, "rb") as fh:
+                fh.seek(0, os.SEEK_END)
+                size = fh.tell()
+                fh.seek(max(0, size - limit * 2048))
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        if len(lines) > 1 and size > limit * 2048:
+            lines = lines[1:]  # перший рядок міг бути обрізаний
+        records = []
+        for raw in lines[-limit:]:
+            try:
+                records.append(json.loads(raw))
+            except ValueError:
+                continue
+        return records
+
+
+def summarize_endpoints(records: List[dict], sort: str = "queries") -> List[dict]:
+    """
+    Рейтинг endpoint'ів за профілями
+
+    sort: queries (середня кількість запитів), db_ms (середній час БД)
+    або n_plus_one (кількість запитів з підозрою на N+1)
+    """
+    groups: Dict[str, List[dict]] = defaultdict(list)
+    for record in records:
+        groups[record.get("view") or record.get("path", "?")].append(record)
+
+    rows = []
+    for view, items in groups.items():
+        queries = [item["queries"] for item in items]
+        db_ms = sorted(item["db_ms"] for item in items)
+        suspects = Counter()
+        for item in items:
+            for entry in item.get("n_plus_one", []):
+                suspects[entry["sql"]] += 1
+        rows.append({
+            "view": view,
+            "samples": len(items),
+            "avg_queries": round(sum(queries) / len(queries), 1),
+            "max_queries": max(queries),
+            "avg_db_ms": round(sum(db_ms) / len(db_ms), 2),
+            "p95_db_ms": db_ms[min(len(db_ms) - 1, int(len(db_ms) * 0.95))],
+            "duplicates": sum(item.get("duplicates", 0) for item in items),
+            "n_plus_one": sum(1 for item in items if item.get("n_plus_one")),
+            "top_suspect": suspects.most_common(1)[0][0] if suspects else "",
+        })
+
+    key = {
+        "queries": lambda row: row["avg_queries"],
+        "db_ms": lambda row: row["avg_db_ms"],
+        "n_plus_one": lambda row: row["n_plus_one"],
+    }.get(sort, lambda row: row["avg_queries"])
+    rows.sort(key=key, reverse=True)
+    return rows
+
+
+def header_value(profile: dict) -> str:
+    """Значення заголовка X-SQL-Profile"""
+    return "queries={queries}; db_ms={db_ms}; duplicates={duplicates}; n_plus_one={n}".format(
+        n=len(profile["n_plus_one"]), **profile
+    )
+
+
+def get_log(config: Optional[dict] = None) -> ProfileLog:
+    config = config or get_config()
+    return ProfileLog(config["LOG_PATH"], config["LOG_MAX_BYTES"])
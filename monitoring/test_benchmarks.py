@@ -0,0 +1,149 @@
+"""
+Тести для пакета benchmarks та команди run_benchmarks
+"""
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from benchmarks.budgets import budget_for
+from benchmarks.harness import Measurement, Scenario, check_budgets, compare_reports, measure
+from benchmarks.runner import run_suite
+from events.models import Event
+
+
+def make_measurement(**overrides):
+    values = dict(
+        scenario="event_detail[user]", size="tiny", wall_ms_median=10.0, wall_ms_min=9.0,
+        queries=5, queries_warm=5, insert_batches=0, peak_kb=100.0, budget=6,
+    )
+    values.update(overrides)
+    return Measurement(**values)
+
+
+class HarnessTests(TestCase):
+    """Вимірювання та звіти"""
+
+    def test_measure_counts_queries_and_rolls_back_mutations(self):
+        def create_event():
+            from django.contrib.auth.models import User
+            from django.utils import timezone
+
+            user = User.objects.create(username="bench")
+            Event.objects.create(title="x", starts_at=timezone.now(), ends_at=timezone.now(), organizer=user)
+
+        result = measure(Scenario("demo", create_event, mutates=True), "tiny", repeat=2)
+
+        self.assertGreaterEqual(result.insert_batches, 2)
+        self.assertGreaterEqual(result.queries, result.insert_batches)
+        self.assertGreater(result.peak_kb, 0)
+        self.assertFalse(Event.objects.exists())
+
+    def test_cold_call_starts_with_every_cache_empty(self):
+        self.addCleanup(caches["shared"].clear)
+        seen = []
+        caches["default"].set("bench:key", 1)
+        caches["shared"].set("bench:key", 1)
+
+        def read_caches():
+            seen.append((caches["default"].get("bench:key"), caches["shared"].get("bench:key")))
+
+        measure(Scenario("demo", read_caches), "tiny", repeat=1)
+
+        self.assertEqual(seen[0], (None, None))
+
+    def test_budget_ignores_insert_batches(self):
+        self.assertEqual(budget_for("event_list[sort=date]"), budget_for("event_list[anonymous]"))
+        self.assertIsNone(budget_for("unknown[x]"))
+
+        within = make_measurement(queries=9, insert_batches=4)
+        over = make_measurement(queries=9, insert_batches=0)
+        self.assertEqual(check_budgets([within]), [])
+        self.assertEqual(len(check_budgets([over])), 1)
+
+    def test_compare_reports(self):
+        baseline = {"results": [{"scenario": "a", "size": "tiny", "wall_ms_median": 10.0, "queries": 5, "peak_kb": 1.0}]}
+        current = {"results": [
+            {"scenario": "a", "size": "tiny", "wall_ms_median": 15.0, "queries": 7, "peak_kb": 2.0},
+            {"scenario": "b", "size": "tiny", "wall_ms_median": 1.0, "queries": 1, "peak_kb": 1.0},
+        ]}
+
+        rows = compare_reports(baseline, current)
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["wall_change_pct"], 50.0)
+        self.assertEqual(rows[0]["queries_delta"], 2)
+
+
+class BenchmarkSuiteTests(TestCase):
+    """Прогін усіх сценаріїв на мінімальному наборі: бюджети запитів як регресійний тест"""
+
+    def test_tiny_suite_within_budgets(self):
+        measurements = run_suite(["tiny"], repeat=1, reset=False)
+
+        names = {m.scenario for m in measurements}
+        self.assertIn("event_list[sort=rsvp_count]", names)
+        self.assertIn("notify_participants[popular_event]", names)
+        self.assertIn("home_admin[users]", names)
+        self.assertEqual(check_budgets(measurements), [])
+
+    def test_command_rejects_unknown_size(self):
+        with self.assertRaises(CommandError):
+            call_command("run_benchmarks", sizes="huge")
+
+
+class AuthBenchmarkTests(TestCase):
+    """benchmarks.auth: Basic проти API-токенів"""
+
+    def test_reports_every_mode(self):
+        from benchmarks.auth import run_auth_benchmark
+
+        rows = run_auth_benchmark(requests=2)
+
+        self.assertEqual([row["mode"] for row in rows], ["basic", "token[lru]", "token[db]", "anonymous"])
+        for row in rows:
+            self.assertGreater(row["rps"], 0)
+            self.assertEqual(row["requests"], 2)
+
+
+class ScheduleBenchmarkTests(TestCase):
+    """benchmarks.schedule: OR + DISTINCT проти UNION з фільтрами в SQL"""
+
+    def test_both_strategies_return_same_entries(self):
+        from benchmarks.schedule import run_schedule_benchmark
+
+        rows = run_schedule_benchmark(events=60, repeat=1)
+
+        self.assertEqual(
+            [row["filter"] for row in rows], ["all", "upcoming", "organized", "published", "window[month]"]
+        )
+        self.assertEqual(rows[0]["union"]["entries"], 60)
+        for row in rows:
+            self.assertEqual(row["legacy"]["entries"], row["union"]["entries"], row["filter"])
+
+    def test_encoding_benchmark_reports_both_modes(self):
+        from benchmarks.schedule import run_encoding_benchmark
+
+        rows = run_encoding_benchmark(events=40, repeat=1)
+
+        self.assertEqual([row["mode"] for row in rows], ["legacy", "compact"])
+        self.assertEqual(rows[0]["entries"], rows[1]["entries"])
+        self.assertLess(rows[1]["entry_bytes"], rows[0]["entry_bytes"])
+        self.assertLess(rows[1]["payload_kb"], rows[0]["payload_kb"])
+
+
+class ImageBenchmarkTests(TestCase):
+    """benchmarks.images: зображень/с послідовно та в пулі процесів"""
+
+    def test_reports_serial_and_pool(self):
+        from benchmarks.images import run_image_benchmark
+
+        from events.review_images import pool_available
+
+        rows = run_image_benchmark(images=2, workers=(1,), size=(320, 240))
+
+        expected = ["serial", "pool[1]"] if pool_available() else ["serial"]
+        self.assertEqual([row["mode"] for row in rows], expected)
+        for row in rows:
+            self.assertGreater(row["images_per_sec_per_core"], 0)
+            self.assertEqual(row["images"], 2)
@@ -0,0 +1,117 @@
+"""
+Тести захоплення повільних SQL-запитів (monitoring/slow_queries.py)
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from events.models import Event
+from monitoring.slow_queries import (
+    NO_REQUEST,
+    SlowQueryBuffer,
+    SlowQueryRecorder,
+    get_buffer,
+    top_offenders,
+)
+
+CONFIG = {"ENABLED": True, "THRESHOLD_MS": 0, "EXPLAIN_SAMPLE_RATE": 1.0, "BUFFER_SIZE": 50, "CACHE_ALIAS": "default"}
+
+
+@override_settings(SLOW_QUERIES=CONFIG)
+class SlowQueryRecorderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username="org", password="testpass123", is_staff=True)
+        now = timezone.now()
+        Event.objects.create(
+            title="Подія", starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=1),
+            organizer=self.organizer, status=Event.PUBLISHED,
+        )
+
+    def test_records_query_with_origin_and_explain(self):
+        with connection.execute_wrapper(SlowQueryRecorder(CONFIG)):
+            list(Event.objects.filter(title="Подія"))
+
+        record = get_buffer().records()[0]
+        self.assertIn('FROM "events_event"', record["sql"])
+        self.assertNotIn("Подія", json.dumps(record, ensure_ascii=False))
+        self.assertIn("monitoring/test_slow_queries.py", record["frame"])
+        self.assertIn("test_records_query_with_origin_and_explain", record["frame"])
+        self.assertEqual(record["view"], NO_REQUEST)
+        self.assertTrue(record["explain"])
+
+    def test_fast_queries_are_ignored(self):
+        config = dict(CONFIG, THRESHOLD_MS=10_000)
+        with connection.execute_wrapper(SlowQueryRecorder(config)):
+            list(Event.objects.all())
+
+        self.assertEqual(get_buffer().records(), [])
+
+    def test_explain_does_not_count_as_query(self):
+        with connection.execute_wrapper(SlowQueryRecorder(CONFIG)):
+            with self.assertNumQueries(1):
+                list(Event.objects.all())
+
+    def test_view_label_from_middleware(self):
+        with connection.execute_wrapper(SlowQueryRecorder(dict(CONFIG, EXPLAIN_SAMPLE_RATE=0.0))):
+            self.client.get("/events/")
+
+        views = {record["view"] for record in get_buffer().records()}
+        self.assertIn("event_list", views)
+
+    def test_command_and_staff_page(self):
+        with connection.execute_wrapper(SlowQueryRecorder(CONFIG)):
+            list(Event.objects.all())
+
+        out = StringIO()
+        call_command("slow_queries", "--explain", stdout=out)
+        self.assertIn("events_event", out.getvalue())
+
+        out = StringIO()
+        call_command("slow_queries", "--json", stdout=out)
+        self.assertEqual(json.loads(out.getvalue())[0]["count"], 1)
+
+        self.client.login(username="org", password="testpass123")
+        response = self.client.get("/dashboard/monitoring/slow/?sort=max_ms")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["offenders"])
+
+        call_command("slow_queries", "--clear", stdout=StringIO())
+        self.assertEqual(get_buffer().records(), [])
+
+    def test_staff_page_requires_staff(self):
+        User.objects.create_user(username="user", password="testpass123")
+        self.client.login(username="user", password="testpass123")
+        self.assertEqual(self.client.get("/dashboard/monitoring/slow/").status_code, 302)
+
+
+class SlowQueryBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_ring_buffer_is_bounded(self):
+        buffer = SlowQueryBuffer(size=3, alias="default")
+        for i in range(5):
+            buffer.append({"ts": f"2025-01-01T00:00:0{i}", "n": i})
+
+        self.assertEqual([record["n"] for record in buffer.records()], [4, 3, 2])
+
+    def test_top_offenders(self):
+        records = [
+            {"ts": "1", "sql": "A", "params": "p1", "duration_ms": 300.0, "view": "list", "frame": "f", "explain": None},
+            {"ts": "2", "sql": "A", "params": "p2", "duration_ms": 250.0, "view": "list", "frame": "f", "explain": ["x"]},
+            {"ts": "3", "sql": "B", "params": "p1", "duration_ms": 900.0, "view": "detail", "frame": "g", "explain": None},
+        ]
+
+        rows = top_offenders(records)
+        self.assertEqual([row["sql"] for row in rows], ["B", "A"])
+        self.assertEqual(rows[1]["params_variants"], 2)
+        self.assertEqual(rows[1]["explain"], ["x"])
+        self.assertEqual(top_offenders(records, "count")[0]["sql"], "A")
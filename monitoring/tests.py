@@ -0,0 +1,335 @@
+"""
+Тести моніторингу: SQL-профайлер та метрики Prometheus
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from events.models import Event
+from monitoring.metrics import (
+    CACHE_REQUESTS,
+    DB_QUERIES,
+    NOTIFICATION_FANOUT,
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+    MetricsRegistry,
+    merge_snapshots,
+    reset_registry,
+)
+from monitoring.middleware import MetricsMiddleware
+from monitoring.sql_profiler import (
+    HEADER_NAME,
+    ProfileLog,
+    collect_queries,
+    fingerprint,
+    summarize_endpoints,
+)
+
+
+class FingerprintTests(TestCase):
+    def test_values_and_in_lists_are_normalized(self):
+        a = fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND x = 5')
+        b = fingerprint('SELECT  *  FROM "t" WHERE "id" IN (%s) AND x = 12')
+        self.assertEqual(a, b)
+        self.assertEqual(a, 'SELECT * FROM "t" WHERE "id" IN (?) AND x = ?')
+
+
+class QueryCollectorTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(6):
+            organizer = User.objects.create_user(username=f"org{i}", password="testpass123")
+            Event.objects.create(
+                title=f"Event {i}", starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=1),
+                organizer=organizer, status=Event.PUBLISHED,
+            )
+
+    def test_detects_n_plus_one(self):
+        with collect_queries() as collector:
+            for event in Event.objects.all():
+                event.organizer.username
+
+        profile = collector.analyze(threshold=5, top=5)
+        self.assertEqual(profile["queries"], 7)
+        self.assertEqual(len(profile["n_plus_one"]), 1)
+        self.assertEqual(profile["n_plus_one"][0]["count"], 6)
+        self.assertEqual(profile["duplicates"], 0)
+
+    def test_select_related_is_clean(self):
+        with collect_queries() as collector:
+            for event in Event.objects.select_related("organizer"):
+                event.organizer.username
+
+        profile = collector.analyze(threshold=5, top=5)
+        self.assertEqual(profile["queries"], 1)
+        self.assertEqual(profile["n_plus_one"], [])
+
+    def test_counts_exact_duplicates(self):
+        with collect_queries() as collector:
+            for _ in range(3):
+                list(Event.objects.filter(title="Event 1"))
+
+        profile = collector.analyze(threshold=5, top=5)
+        self.assertEqual(profile["duplicates"], 2)
+        self.assertEqual(profile["duplicate_fingerprints"][0]["count"], 2)
+
+
+class ProfileLogTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_append_and_read_recent(self):
+        log = ProfileLog(Path(self.tmpdir) / "profile.jsonl")
+        for i in range(10):
+            log.append({"view": "a" if i % 2 else "b", "queries": i, "db_ms": 1.0})
+
+        records = log.read_recent(limit=4)
+        self.assertEqual([record["queries"] for record in records], [6, 7, 8, 9])
+
+    def test_rotation(self):
+        path = Path(self.tmpdir) / "profile.jsonl"
+        log = ProfileLog(path, max_bytes=100)
+        for i in range(10):
+            log.append({"view": "a", "queries": i, "db_ms": 1.0})
+
+        self.assertTrue(path.with_suffix(".jsonl.1").exists())
+        self.assertLess(path.stat().st_size, 200)
+
+    def test_summarize_endpoints(self):
+        records = [
+            {"view": "list", "queries": 10, "db_ms": 5.0, "n_plus_one": [{"sql": "SELECT ?", "count": 9}]},
+            {"view": "list", "queries": 20, "db_ms": 7.0, "n_plus_one": []},
+            {"view": "detail", "queries": 3, "db_ms": 9.0},
+        ]
+        rows = summarize_endpoints(records)
+        self.assertEqual(rows[0]["view"], "list")
+        self.assertEqual(rows[0]["avg_queries"], 15)
+        self.assertEqual(rows[0]["n_plus_one"], 1)
+        self.assertEqual(rows[0]["top_suspect"], "SELECT ?")
+        self.assertEqual(summarize_endpoints(records, "db_ms")[0]["view"], "detail")
+
+
+class SQLProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.log_path = Path(self.tmpdir) / "profile.jsonl"
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+
+    def _settings(self, **overrides):
+        config = {"ENABLED": True, "SAMPLE_RATE": 1.0, "LOG_PATH": self.log_path, "EXPOSE_HEADER": True}
+        config.update(overrides)
+        return override_settings(SQL_PROFILER=config)
+
+    def test_disabled_by_default(self):
+        response = self.client.get("/events/")
+        self.assertNotIn(HEADER_NAME, response)
+        self.assertFalse(self.log_path.exists())
+
+    def test_profiles_request(self):
+        with self._settings():
+            response = self.client.get("/events/")
+
+        self.assertIn("queries=", response[HEADER_NAME])
+        records = ProfileLog(self.log_path).read_recent()
+        self.assertEqual(records[0]["view"], "event_list")
+        self.assertEqual(records[0]["status"], 200)
+
+    def test_sampling_skips_requests(self):
+        with self._settings(SAMPLE_RATE=0.0):
+            response = self.client.get("/events/")
+
+        self.assertNotIn(HEADER_NAME, response)
+        self.assertFalse(self.log_path.exists())
+
+    def test_staff_can_force_profile(self):
+        self.client.login(username="staff", password="testpass123")
+        with self._settings(SAMPLE_RATE=0.0, EXPOSE_HEADER=False), override_settings(DEBUG=False):
+            response = self.client.get("/events/?_sqlprofile=1")
+
+        self.assertIn(HEADER_NAME, response)
+
+    def test_staff_page(self):
+        ProfileLog(self.log_path).append({"view": "event_list", "path": "/events/", "method": "GET",
+                                          "status": 200, "ts": "2025-01-01T00:00:00", "queries": 12,
+                                          "db_ms": 3.5, "total_ms": 9.0, "duplicates": 0, "n_plus_one": []})
+        self.client.login(username="staff", password="testpass123")
+
+        with override_settings(SQL_PROFILER={"LOG_PATH": self.log_path}):
+            response = self.client.get("/dashboard/monitoring/sql/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["endpoints"][0]["view"], "event_list")
+
+    def test_staff_page_requires_staff(self):
+        User.objects.create_user(username="user", password="testpass123")
+        self.client.login(username="user", password="testpass123")
+        response = self.client.get("/dashboard/monitoring/sql/")
+        self.assertEqual(response.status_code, 302)
+
+
+class MetricsRegistryTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_histogram_render_is_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Латентність", ("view",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, ("event_list",))
+
+        text = registry.render(self.tmpdir)
+
+        self.assertIn('latency_seconds_bucket{view="event_list",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{view="event_list",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{view="event_list",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{view="event_list"} 4', text)
+        self.assertIn("# TYPE latency_seconds histogram", text)
+
+    def test_aggregates_worker_files(self):
+        worker = MetricsRegistry()
+        worker.counter("hits_total", "Hits", ("view",)).inc(3, ("a",))
+        # Живий процес (батьківський) у ролі іншого воркера
+        snapshot_path = Path(self.tmpdir) / f"metrics-{os.getppid()}.json"
+        snapshot_path.write_text(json.dumps(worker.snapshot()))
+
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits", ("view",)).inc(2, ("a",))
+        registry.flush(self.tmpdir)  # власний файл не рахується двічі
+
+        self.assertIn('hits_total{view="a"} 5', registry.render(self.tmpdir))
+
+    def test_dead_worker_files_are_removed(self):
+        worker = MetricsRegistry()
+        worker.counter("hits_total", "Hits", ("view",)).inc(3, ("a",))
+        finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                  capture_output=True, text=True, check=True)
+        dead_path = Path(self.tmpdir) / f"metrics-{finished.stdout.strip()}.json"
+        dead_path.write_text(json.dumps(worker.snapshot()))
+
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits", ("view",)).inc(2, ("a",))
+
+        self.assertIn('hits_total{view="a"} 2', registry.render(self.tmpdir))
+        self.assertFalse(dead_path.exists())
+
+    def test_merge_snapshots(self):
+        merged = merge_snapshots([
+            {"h": [[["x"], [1, 0, 0.5]]], "c": [[[], 2]]},
+            {"h": [[["x"], [0, 2, 3.0]]], "c": [[[], 1]]},
+        ])
+        self.assertEqual(merged["h"], [(("x",), [1, 2, 3.5])])
+        self.assertEqual(merged["c"], [((), 3)])
+
+    def test_failing_gauge_does_not_break_render(self):
+        registry = MetricsRegistry()
+        registry.gauge_callback("broken", "Зламаний", (), lambda: 1 / 0)
+        registry.gauge_callback("depth", "Глибина", ("queue",), lambda: [(("archive",), 4)])
+
+        text = registry.render(self.tmpdir)
+        self.assertIn('depth{queue="archive"} 4', text)
+
+
+class MetricsInstrumentationTests(TestCase):
+    def setUp(self):
+        reset_registry()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_request_metrics_by_url_name(self):
+        self.client.get("/events/")
+
+        series = dict(REQUEST_LATENCY.series)
+        self.assertIn(("event_list", "GET"), series)
+        self.assertEqual(REQUESTS_TOTAL.series[("event_list", "2xx")], 1)
+        queries_row = DB_QUERIES.series[("event_list",)]
+        self.assertEqual(sum(queries_row[:-1]), 1)
+        self.assertGreater(queries_row[-1], 0)
+
+    def test_cache_hit_and_miss(self):
+        from django.core.cache import cache
+
+        cache.set("metrics-test", 1)
+        cache.get("metrics-test")
+        cache.get("metrics-test-missing")
+        cache.get_many(["metrics-test", "metrics-test-missing"])
+        cache.get_or_set("metrics-test-new", 5)
+
+        self.assertEqual(CACHE_REQUESTS.series[("default", "hit")], 2)
+        self.assertEqual(CACHE_REQUESTS.series[("default", "miss")], 3)
+
+    def test_notification_fanout(self):
+        from notifications.models import Notification
+        from notifications.services import NotificationService
+        from tickets.models import RSVP
+
+        organizer = User.objects.create_user(username="org", password="testpass123")
+        now = timezone.now()
+        event = Event.objects.create(
+            title="Fanout", starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=1),
+            organizer=organizer, status=Event.PUBLISHED,
+        )
+        for i in range(3):
+            RSVP.objects.create(user=User.objects.create_user(username=f"g{i}", password="x"), event=event)
+
+        NotificationService.create_event_cancelled_notification(event)
+
+        row = NOTIFICATION_FANOUT.series[(Notification.EVENT_CANCELLED,)]
+        self.assertEqual(row[-1], 3)
+
+    def test_metrics_endpoint(self):
+        self.client.get("/events/")
+        with override_settings(METRICS={"DIR": self.tmpdir}):
+            response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        content = response.content.decode()
+        self.assertIn('http_requests_total{view="event_list",status="2xx"}', content)
+        self.assertIn('job_queue_depth{queue="archive"} 0', content)
+
+    def test_metrics_endpoint_hidden_from_remote_hosts(self):
+        response = self.client.get("/metrics", REMOTE_ADDR="203.0.113.5")
+        self.assertEqual(response.status_code, 404)
+
+    def test_middleware_overhead(self):
+        """Накладні витрати MetricsMiddleware - менше 20 мкс на запит"""
+        from types import SimpleNamespace
+
+        from django.http import HttpResponse
+
+        response = HttpResponse()
+        request = SimpleNamespace(
+            method="GET", resolver_match=SimpleNamespace(view_name="event_list", _func_path="x")
+        )
+        with override_settings(METRICS={"DIR": self.tmpdir, "FLUSH_INTERVAL": 3600}):
+            middleware = MetricsMiddleware(lambda req: response)
+        baseline = lambda req: response  # noqa: E731
+
+        def best_of(handler, repeats=5, iterations=5000):
+            # CPU-час процесу та мінімум з кількох прогонів - стійкі до
+            # конкуренції за процесор під час паралельних тестів
+            timings = []
+            for _ in range(repeats):
+                started = time.process_time()
+                for _ in range(iterations):
+                    handler(request)
+                timings.append((time.process_time() - started) / iterations)
+            return min(timings)
+
+        base = best_of(baseline)
+        instrumented = best_of(middleware)
+
+        self.assertLess(instrumented - base, 20e-6)
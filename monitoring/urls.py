@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import slow_queries_view, sql_profile_view
+
+urlpatterns = [
+    path("sql/", sql_profile_view, name="sql_profile"),
+    path("slow/", slow_queries_view, name="slow_queries"),
+]
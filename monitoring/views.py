@@ -0,0 +1,78 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+from django.shortcuts import render
+
+from .metrics import REGISTRY, get_config as get_metrics_config
+from .slow_queries import get_buffer, get_config as get_slow_queries_config, top_offenders
+from .sql_profiler import get_config, get_log, summarize_endpoints
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SORT_CHOICES = (
+    ("queries", "Кількість запитів"),
+    ("db_ms", "Час БД"),
+    ("n_plus_one", "Підозри на N+1"),
+)
+
+
+@staff_member_required
+def sql_profile_view(request):
+    """Найгірші endpoint'и за даними SQL-профайлера"""
+    sort = request.GET.get("sort", "queries")
+    if sort not in dict(SORT_CHOICES):
+        sort = "queries"
+
+    config = get_config()
+    records = get_log(config).read_recent()
+    worst_requests = sorted(records, key=lambda record: record["queries"], reverse=True)[:20]
+
+    context = {
+        "enabled": config["ENABLED"],
+        "sample_rate": config["SAMPLE_RATE"],
+        "endpoints": summarize_endpoints(records, sort)[:50],
+        "worst_requests": worst_requests,
+        "records_count": len(records),
+        "sort": sort,
+        "sort_choices": SORT_CHOICES,
+    }
+    return render(request, "monitoring/sql_profile.html", context)
+
+
+SLOW_SORT_CHOICES = (
+    ("total_ms", "Сумарний час"),
+    ("max_ms", "Максимальний час"),
+    ("count", "Кількість"),
+)
+
+
+@staff_member_required
+def slow_queries_view(request):
+    """Найгірші повільні SQL-запити з кільцевого буфера"""
+    sort = request.GET.get("sort", "total_ms")
+    if sort not in dict(SLOW_SORT_CHOICES):
+        sort = "total_ms"
+
+    config = get_slow_queries_config()
+    records = get_buffer(config).records()
+    context = {
+        "enabled": config["ENABLED"],
+        "threshold_ms": config["THRESHOLD_MS"],
+        "offenders": top_offenders(records, sort, limit=50),
+        "recent": records[:20],
+        "records_count": len(records),
+        "sort": sort,
+        "sort_choices": SLOW_SORT_CHOICES,
+    }
+    return render(request, "monitoring/slow_queries.html", context)
+
+
+def metrics_view(request):
+    """Метрики у форматі Prometheus (з дозволених IP або для staff)"""
+    config = get_metrics_config()
+    allowed = request.META.get("REMOTE_ADDR") in config["ALLOWED_IPS"] or (
+        request.user.is_authenticated and request.user.is_staff
+    )
+    if not config["ENABLED"] or not allowed:
+        return HttpResponse(status=404)
+
+    return HttpResponse(REGISTRY.render(config["DIR"]), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -3,6 +3,7 @@
 """
 from django.utils import timezone
 from notifications.models import Notification
+from monitoring.metrics import record_notification_fanout
 
 
 class NotificationService:
@@ -121,4 +122,5 @@ class NotificationService:
         if notifications:
             Notification.objects.bulk_create(notifications)
         
+        record_notification_fanout(notification_type, len(notifications))
         return len(notifications)
@@ -11,10 +11,10 @@ class Command(BaseCommand):
     help = "Видаляє дублікати RSVP, залишаючи тільки найновіші записи"
 
     def handle(self, *args, **options):
-        # Знайти всі комбінації user+event, які мають більше 1 запису
+        # Знайти всі комбінації user+event(+повторення серії), які мають більше 1 запису
         duplicates = (
             RSVP.objects
-            .values('user', 'event')
+            .values('user', 'event', 'occurrence_start')
             .annotate(count=Count('id'))
             .filter(count__gt=1)
         )
@@ -28,7 +28,8 @@ class Command(BaseCommand):
             # Отримати всі RSVP для цієї комбінації
             rsvps = RSVP.objects.filter(
                 user_id=user_id,
-                event_id=event_id
+                event_id=event_id,
+                occurrence_start=dup['occurrence_start'],
             ).order_by('-created_at')
             
             # Залишити тільки найновіший
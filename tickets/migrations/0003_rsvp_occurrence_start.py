@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:46
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_event_recurrence'),
+        ('tickets', '0002_rsvp_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='rsvp',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='rsvp',
+            name='occurrence_start',
+            field=models.DateTimeField(default=datetime.datetime(1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rsvp',
+            unique_together={('user', 'event', 'occurrence_start')},
+        ),
+    ]
@@ -1,15 +1,24 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
+# occurrence_start RSVP на разову подію (NULL зробив би unique_together
+# неефективним: NULL-и різні між собою)
+SINGLE_OCCURRENCE = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
 
 class RSVP(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="rsvps")
     event = models.ForeignKey("events.Event", on_delete=models.CASCADE, related_name="rsvps")
     status = models.CharField(max_length=20, default="going")
+    # Початок повторення серії; SINGLE_OCCURRENCE - разова подія
+    occurrence_start = models.DateTimeField(default=SINGLE_OCCURRENCE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ("user", "event")
+        unique_together = ("user", "event", "occurrence_start")
 
     def __str__(self):
         return f"RSVP({self.user_id} -> {self.event_id})"
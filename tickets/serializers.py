@@ -5,5 +5,5 @@ from .models import RSVP
 class RSVPSerializer(serializers.ModelSerializer):
     class Meta:
         model = RSVP
-        fields = ["id", "user", "event", "status", "created_at"]
-        read_only_fields = ["id", "user", "event", "created_at"]
\ No newline at end of file
+        fields = ["id", "user", "event", "occurrence_start", "status", "created_at"]
+        read_only_fields = ["id", "user", "event", "occurrence_start", "created_at"]
\ No newline at end of file
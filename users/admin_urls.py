@@ -0,0 +1,18 @@
+from django.urls import path
+from .admin_views import (
+    admin_dashboard,
+    admin_events_list,
+    admin_events_export,
+    admin_users_list,
+    admin_rsvps_list,
+    admin_rsvps_export,
+)
+
+urlpatterns = [
+    path("", admin_dashboard, name="admin_dashboard"),
+    path("events/", admin_events_list, name="admin_events_list"),
+    path("events/export/<str:fmt>/", admin_events_export, name="admin_events_export"),
+    path("users/", admin_users_list, name="admin_users_list"),
+    path("rsvps/", admin_rsvps_list, name="admin_rsvps_list"),
+    path("rsvps/export/<str:fmt>/", admin_rsvps_export, name="admin_rsvps_export"),
+]
@@ -1,45 +1,29 @@
 from django.contrib.admin.views.decorators import staff_member_required
+from django.core.paginator import Paginator
 from django.shortcuts import render
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
 
 from events.models import Event
+from events.dashboard_services import DashboardStatsService
+from events.exports import EXPORT_FORMATS, ExportService, export_response
+from events.facets import going_count_subquery
 from tickets.models import RSVP
+from .services import UserListService
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+ADMIN_PAGE_SIZE = 50
+
 
 @staff_member_required
 def admin_dashboard(request):
     """Кастомна адмін панель з статистикою"""
     
-    now = timezone.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    stats = {
-        'total_events': Event.objects.count(),
-        'published_events': Event.objects.filter(status=Event.PUBLISHED).count(),
-        'upcoming_events': Event.objects.filter(starts_at__gte=now, status=Event.PUBLISHED).count(),
-        'archived_events': Event.objects.filter(status=Event.ARCHIVED).count(),
-        
-        'total_users': User.objects.count(),
-        'new_users_week': User.objects.filter(date_joined__gte=week_ago).count(),
-        'new_users_month': User.objects.filter(date_joined__gte=month_ago).count(),
-        
-        'total_rsvps': RSVP.objects.count(),
-        'rsvps_week': RSVP.objects.filter(created_at__gte=week_ago).count(),
-        'rsvps_month': RSVP.objects.filter(created_at__gte=month_ago).count(),
-    }
-    
-    from django.db.models import Q
-    top_events = Event.objects.annotate(
-        rsvp_count=Count('rsvps', filter=Q(rsvps__status='going'), distinct=True)
-    ).order_by('-rsvp_count')[:5]
+    snapshot = DashboardStatsService.get_snapshot()
+    stats = snapshot['stats']
+    top_events = snapshot['top_events']
     
-    recent_events = Event.objects.order_by('-created_at')[:5]
+    recent_events = Event.objects.select_related('organizer').order_by('-created_at')[:5]
     
     recent_users = User.objects.order_by('-date_joined')[:5]
     
@@ -59,34 +43,41 @@ def admin_dashboard(request):
 @staff_member_required
 def admin_events_list(request):
     """Список всіх подій для адміна"""
-    from django.db.models import Q
     events = Event.objects.annotate(
-        rsvp_count=Count('rsvps', filter=Q(rsvps__status='going'), distinct=True)
+        rsvp_count=going_count_subquery()
     ).select_related('organizer').order_by('-created_at')
     
     status = request.GET.get('status')
     if status:
         events = events.filter(status=status)
     
+    page_obj = Paginator(events, ADMIN_PAGE_SIZE).get_page(request.GET.get('page'))
+    
     context = {
-        'events': events,
+        'events': page_obj.object_list,
+        'page_obj': page_obj,
         'status_filter': status,
         'status_choices': Event.STATUS_CHOICES,
+        'export_formats': EXPORT_FORMATS,
     }
     
     return render(request, 'admin/events_list.html', context)
 
 
+@staff_member_required
+def admin_events_export(request, fmt):
+    """Потоковий експорт подій (з урахуванням фільтра статусу) у CSV/XLSX"""
+    return export_response(ExportService.events(request.GET.get('status') or None), fmt)
+
+
 @staff_member_required
 def admin_users_list(request):
     """Список всіх користувачів для адміна"""
-    users = User.objects.annotate(
-        events_count=Count('organized_events'),
-        rsvps_count=Count('rsvps')
-    ).order_by('-date_joined')
+    users, next_cursor = UserListService.page(after=request.GET.get('after'))
     
     context = {
         'users': users,
+        'next_cursor': next_cursor,
     }
     
     return render(request, 'admin/users_list.html', context)
@@ -96,9 +87,18 @@ def admin_users_list(request):
 def admin_rsvps_list(request):
     """Список всіх RSVP для адміна"""
     rsvps = RSVP.objects.select_related('user', 'event').order_by('-created_at')
+    page_obj = Paginator(rsvps, ADMIN_PAGE_SIZE).get_page(request.GET.get('page'))
     
     context = {
-        'rsvps': rsvps,
+        'rsvps': page_obj.object_list,
+        'page_obj': page_obj,
+        'export_formats': EXPORT_FORMATS,
     }
     
-    return render(request, 'admin/rsvps_list.html', context)
\ No newline at end of file
+    return render(request, 'admin/rsvps_list.html', context)
+
+
+@staff_member_required
+def admin_rsvps_export(request, fmt):
+    """Потоковий експорт усіх RSVP у CSV/XLSX"""
+    return export_response(ExportService.rsvps(), fmt)
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "users"
\ No newline at end of file
+    name = "users"
+
+    def ready(self):
+        """Підключення сигналів при завантаженні додатку"""
+        import users.signals  # noqa: F401
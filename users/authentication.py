@@ -0,0 +1,78 @@
+"""
+DRF-автентифікація API-токенами та перевірка областей доступу
+
+Заголовок: "Authorization: Token <ключ>" або "Authorization: Bearer <ключ>".
+"""
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework import exceptions, permissions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import ApiToken
+from .tokens import ApiTokenService, TokenInfo
+
+KEYWORDS = (b"token", b"bearer")
+
+
+class ApiTokenAuthentication(BaseAuthentication):
+    """
+    Автентифікація за API-токеном (users/tokens.py)
+
+    Запит без заголовка Token/Bearer пропускається далі (Session, Basic);
+    request.auth - TokenInfo з областями доступу токена.
+    """
+
+    keyword = "Token"
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if not parts or parts[0].lower() not in KEYWORDS:
+            return None
+        if len(parts) != 2:
+            raise exceptions.AuthenticationFailed("Некоректний заголовок токена")
+        try:
+            key = parts[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Некоректний заголовок токена")
+
+        found = ApiTokenService.authenticate(key)
+        if found is None:
+            raise exceptions.AuthenticationFailed("Недійсний токен")
+        user, info = found
+        if info.expired:
+            raise exceptions.AuthenticationFailed("Термін дії токена минув")
+        return user, info
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class HasTokenScope(permissions.BasePermission):
+    """
+    Область доступу токена: безпечні методи потребують read, решта - write
+
+    Запити, автентифіковані не токеном (сесія, Basic), не обмежуються.
+    """
+
+    message = "Токен не має потрібної області доступу"
+
+    def has_permission(self, request, view):
+        info = request.auth
+        if not isinstance(info, TokenInfo):
+            return True
+        scope = ApiToken.READ if request.method in permissions.SAFE_METHODS else ApiToken.WRITE
+        return info.allows(scope)
+
+
+class ApiTokenScheme(OpenApiAuthenticationExtension):
+    """Опис схеми автентифікації для OpenAPI"""
+
+    target_class = "users.authentication.ApiTokenAuthentication"
+    name = "apiToken"
+
+    def get_security_definition(self, auto_schema):
+        return {
+            "type": "apiKey",
+            "in": "header",
+            "name": "Authorization",
+            "description": 'API-токен з профілю: "Token <ключ>" або "Bearer <ключ>"',
+        }
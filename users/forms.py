@@ -2,7 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 
-from .models import UserProfile
+from .models import ApiToken, UserProfile
 
 
 class SignupForm(UserCreationForm):
@@ -96,4 +96,26 @@ class UserProfileForm(forms.ModelForm):
         profile.phone = self.cleaned_data.get("phone", "")
         if commit:
             profile.save()
-        return user
\ No newline at end of file
+        return user
+
+
+class ApiTokenForm(forms.Form):
+    """Створення API-токена в профілі"""
+    name = forms.CharField(
+        max_length=100,
+        label="Назва",
+        widget=forms.TextInput(attrs={"placeholder": "Наприклад, CI або мобільний застосунок"}),
+    )
+    scopes = forms.MultipleChoiceField(
+        choices=ApiToken.SCOPE_CHOICES,
+        initial=[ApiToken.READ],
+        label="Області доступу",
+        widget=forms.CheckboxSelectMultiple,
+    )
+    days = forms.IntegerField(
+        min_value=0,
+        max_value=365,
+        initial=90,
+        label="Термін дії, днів",
+        help_text="0 - безстроковий",
+    )
@@ -0,0 +1,46 @@
+"""
+Management команда для створення API-токена користувача.
+
+Приклади:
+      python manage.py create_api_token alice --name CI
+      python manage.py create_api_token alice --name deploy --scopes read,write --days 0
+
+Ключ виводиться один раз - у БД зберігається лише його хеш.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import ApiToken
+from users.tokens import ApiTokenService
+
+
+class Command(BaseCommand):
+    help = "Створює API-токен і виводить його ключ"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Власник токена")
+        parser.add_argument("--name", default="cli", help="Назва токена")
+        parser.add_argument(
+            "--scopes", default=ApiToken.READ,
+            help=f"Області доступу через кому ({', '.join(scope for scope, _label in ApiToken.SCOPE_CHOICES)})",
+        )
+        parser.add_argument("--days", type=int, help="Термін дії в днях (0 - безстроковий)")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Користувача {options['username']} не знайдено")
+
+        scopes = [scope.strip() for scope in options["scopes"].split(",") if scope.strip()]
+        known = {scope for scope, _label in ApiToken.SCOPE_CHOICES}
+        unknown = [scope for scope in scopes if scope not in known]
+        if unknown or not scopes:
+            raise CommandError(f"Невідомі області доступу: {', '.join(unknown) or '-'}")
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days не може бути від'ємним")
+
+        token, key = ApiTokenService.issue(user, options["name"], scopes=scopes, days=options["days"])
+        expires = token.expires_at.isoformat() if token.expires_at else "безстроково"
+        self.stderr.write(f"Токен {token.name} ({token.scopes}), діє до: {expires}")
+        self.stdout.write(key)
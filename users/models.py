@@ -13,4 +13,45 @@ class UserProfile(models.Model):
     phone = models.CharField(max_length=30, blank=True)
 
     def __str__(self) -> str:
-        return f"Profile({self.user_id})"
\ No newline at end of file
+        return f"Profile({self.user_id})"
+
+
+class ApiToken(models.Model):
+    """
+    API-токен користувача
+
+    Зберігається лише HMAC-SHA256 ключа (users/tokens.py): відкритий ключ
+    показується один раз при створенні. prefix - перші символи ключа, щоб
+    користувач міг відрізнити токени у списку.
+    """
+
+    READ = "read"
+    WRITE = "write"
+    SCOPE_CHOICES = [
+        (READ, "Читання"),
+        (WRITE, "Запис"),
+    ]
+
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="api_tokens",
+    )
+    name = models.CharField(max_length=100)
+    prefix = models.CharField(max_length=8)
+    key_hash = models.CharField(max_length=64, unique=True)
+    scopes = models.CharField(max_length=50, default=READ, help_text="Області доступу через пробіл")
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    revoked = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.prefix}…)"
+
+    @property
+    def scope_list(self) -> tuple:
+        return tuple(self.scopes.split())
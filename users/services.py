@@ -0,0 +1,141 @@
+"""
+Сервіси для staff-списків користувачів
+
+- лічильники подій та RSVP рахуються корельованими підзапитами, а не
+  двома JOIN з Count (JOIN organized_events x rsvps множить рядки);
+- списки гортаються keyset-пагінацією по (date_joined, id) замість OFFSET;
+- пошук організаторів для фільтрів (search-as-you-type) кешується.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+USER_PAGE_SIZE = 50
+SEARCH_LIMIT = 20
+SEARCH_CACHE_TIMEOUT = 60
+SEARCH_VERSION_KEY = "users:search:version"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _count_subquery(queryset: QuerySet, field: str) -> Coalesce:
+    """Корельований підзапит COUNT(*) по зовнішньому ключу field на користувача"""
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(c=Count("id"))
+        .values("c")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def encode_cursor(date_joined: datetime, pk: int) -> str:
+    """Курсор keyset-пагінації: мікросекунди від epoch та id"""
+    delta = date_joined - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return f"{micros}-{pk}"
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Розібрати курсор (None для некоректного значення)"""
+    try:
+        micros, pk = cursor.rsplit("-", 1)
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def get_search_version() -> int:
+    """Поточна версія кешу пошуку користувачів"""
+    return cache.get_or_set(SEARCH_VERSION_KEY, 1, None)
+
+
+def bump_search_version() -> None:
+    """Інвалідує кеш пошуку (новий користувач або зміна username)"""
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.set(SEARCH_VERSION_KEY, 1, None)
+
+
+class UserListService:
+    """
+    Сервіс списків користувачів для адмін-панелі
+
+    Використання:
+        users, next_cursor = UserListService.page(after=request.GET.get("after"))
+    """
+
+    @staticmethod
+    def with_activity_counts(queryset: Optional[QuerySet] = None) -> QuerySet:
+        """Додати events_count та rsvps_count без JOIN-вибуху"""
+        from events.models import Event
+        from tickets.models import RSVP
+
+        if queryset is None:
+            queryset = get_user_model().objects.all()
+        return queryset.annotate(
+            events_count=_count_subquery(Event.objects.all(), "organizer"),
+            rsvps_count=_count_subquery(RSVP.objects.all(), "user"),
+        )
+
+    @staticmethod
+    def page(
+        after: Optional[str] = None,
+        limit: int = USER_PAGE_SIZE,
+        queryset: Optional[QuerySet] = None,
+    ) -> Tuple[List, Optional[str]]:
+        """
+        Сторінка користувачів (новіші першими) з лічильниками активності
+
+        Returns:
+            (users, next_cursor) - next_cursor дорівнює None на останній сторінці
+        """
+        users_qs = UserListService.with_activity_counts(queryset).order_by("-date_joined", "-id")
+
+        position = decode_cursor(after) if after else None
+        if position:
+            date_joined, pk = position
+            users_qs = users_qs.filter(
+                Q(date_joined__lt=date_joined) | Q(date_joined=date_joined, id__lt=pk)
+            )
+
+        users = list(users_qs[:limit + 1])
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].date_joined, users[-1].pk)
+        return users, next_cursor
+
+    @staticmethod
+    def search(term: str, limit: int = SEARCH_LIMIT) -> List[dict]:
+        """
+        Пошук користувачів за початком username (для автодоповнення)
+
+        Returns:
+            [{"id": ..., "username": ...}, ...] відсортовані за username
+        """
+        term = (term or "").strip().lower()
+        if not term:
+            return []
+
+        key = "users:search:{}:{}:{}".format(
+            get_search_version(), limit, hashlib.md5(term.encode("utf-8")).hexdigest()
+        )
+        results = cache.get(key)
+        if results is None:
+            results = list(
+                get_user_model().objects.filter(username__istartswith=term)
+                .order_by("username")
+                .values("id", "username")[:limit]
+            )
+            cache.set(key, results, SEARCH_CACHE_TIMEOUT)
+        return results
@@ -0,0 +1,57 @@
+"""
+Observer Pattern: облік нових користувачів у денних rollup-лічильниках,
+інвалідація кешу API-токенів
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=get_user_model())
+def user_created(sender, instance, created, **kwargs):
+    """Новий користувач потрапляє в лічильник users_joined поточного дня"""
+    from events.rollup_services import RollupService
+
+    if created:
+        RollupService.record("users_joined")
+
+
+@receiver(pre_save, sender=get_user_model())
+def user_pre_save(sender, instance, update_fields=None, **kwargs):
+    """Запам'ятати попередній username (без запиту, якщо username не зберігається)"""
+    instance._previous_username = instance.username
+    if instance.pk and (update_fields is None or "username" in update_fields):
+        instance._previous_username = (
+            sender.objects.filter(pk=instance.pk).values_list("username", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, **kwargs):
+    """
+    Новий або перейменований користувач має з'явитися в пошуку організаторів
+
+    Решта збережень (last_login при кожному вході, зміна пароля чи профілю)
+    кеш пошуку не скидають.
+    """
+    from .services import bump_search_version
+
+    if created or getattr(instance, "_previous_username", None) != instance.username:
+        bump_search_version()
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, instance, **kwargs):
+    """Видалений користувач зникає з пошуку"""
+    from .services import bump_search_version
+
+    bump_search_version()
+
+
+@receiver(post_save, sender="users.ApiToken")
+@receiver(post_delete, sender="users.ApiToken")
+def api_token_changed(sender, instance, **kwargs):
+    """Відкликаний, змінений або видалений токен не має жити в кеші автентифікації"""
+    from .tokens import ApiTokenService
+
+    ApiTokenService.invalidate(instance.key_hash)
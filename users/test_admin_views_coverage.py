@@ -1,6 +1,6 @@
 """
 Тести для users/admin_views.py - покриття адмін view функцій
-Примітка: admin_views функції не підключені до URL, тому тестуємо їх напряму
+Примітка: функції тестуються напряму через RequestFactory (URL - users/admin_urls.py)
 """
 from django.test import TestCase, RequestFactory
 from django.contrib.auth.models import User
@@ -0,0 +1,179 @@
+"""
+Тести для users/services.py - лічильники, keyset-пагінація та пошук користувачів
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from events.models import Event
+from tickets.models import RSVP
+from users.services import UserListService, decode_cursor, encode_cursor, get_search_version
+
+
+class UserActivityCountsTests(TestCase):
+    """Лічильники подій та RSVP через корельовані підзапити"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="org", password="testpass123")
+        now = timezone.now()
+        self.events = [
+            Event.objects.create(
+                title=f"Event {i}", starts_at=now + timedelta(days=i + 1),
+                ends_at=now + timedelta(days=i + 1, hours=2), organizer=self.user,
+                status=Event.PUBLISHED,
+            )
+            for i in range(3)
+        ]
+        for event in self.events[:2]:
+            RSVP.objects.create(user=self.user, event=event, status="going")
+
+    def test_counts_are_not_multiplied(self):
+        """3 події x 2 RSVP не дають 6 в обох лічильниках"""
+        user = UserListService.with_activity_counts().get(pk=self.user.pk)
+
+        self.assertEqual(user.events_count, 3)
+        self.assertEqual(user.rsvps_count, 2)
+
+    def test_user_without_activity(self):
+        idle = User.objects.create_user(username="idle", password="testpass123")
+        user = UserListService.with_activity_counts().get(pk=idle.pk)
+
+        self.assertEqual((user.events_count, user.rsvps_count), (0, 0))
+
+
+class UserKeysetPaginationTests(TestCase):
+    """Keyset-пагінація по (date_joined, id)"""
+
+    def setUp(self):
+        joined = timezone.now() - timedelta(days=1)
+        self.users = []
+        for i in range(5):
+            user = User.objects.create_user(username=f"user{i}", password="testpass123")
+            # Дві пари з однаковою датою реєстрації - порядок вирішує id
+            user.date_joined = joined + timedelta(minutes=i // 2)
+            user.save(update_fields=["date_joined"])
+            self.users.append(user)
+
+    def test_pages_cover_all_users_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = UserListService.page(after=cursor, limit=2)
+            seen.extend(user.pk for user in page)
+            if cursor is None:
+                break
+
+        expected = [
+            user.pk for user in sorted(self.users, key=lambda u: (u.date_joined, u.pk), reverse=True)
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_page_is_single_query(self):
+        with self.assertNumQueries(1):
+            UserListService.page(limit=2)
+
+    def test_cursor_roundtrip(self):
+        user = self.users[0]
+        self.assertEqual(decode_cursor(encode_cursor(user.date_joined, user.pk)), (user.date_joined, user.pk))
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        self.assertIsNone(decode_cursor("garbage"))
+        page, _cursor = UserListService.page(after="garbage", limit=10)
+        self.assertEqual(len(page), 5)
+
+
+class UserSearchTests(TestCase):
+    """Пошук організаторів для автодоповнення"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        User.objects.create_user(username="olena", password="testpass123")
+        User.objects.create_user(username="oleh", password="testpass123")
+        User.objects.create_user(username="petro", password="testpass123")
+
+    def test_search_by_prefix(self):
+        results = UserListService.search(" OLE ")
+        self.assertEqual([row["username"] for row in results], ["oleh", "olena"])
+        self.assertEqual(UserListService.search(""), [])
+
+    def test_search_is_cached(self):
+        UserListService.search("ole")
+        with self.assertNumQueries(0):
+            UserListService.search("ole")
+
+    def test_new_user_invalidates_search(self):
+        UserListService.search("ole")
+        User.objects.create_user(username="oleksandr", password="testpass123")
+        self.assertEqual(len(UserListService.search("ole")), 3)
+
+    def test_rename_invalidates_search(self):
+        UserListService.search("ole")
+        user = User.objects.get(username="petro")
+        user.username = "oles"
+        user.save()
+        self.assertEqual(len(UserListService.search("ole")), 3)
+
+    def test_login_and_profile_edits_keep_search_cache(self):
+        """last_login при вході та зміни без username не скидають кеш"""
+        version = get_search_version()
+        self.client.login(username="staff", password="testpass123")
+        user = User.objects.get(username="olena")
+        user.first_name = "Олена"
+        user.save()
+        self.assertEqual(get_search_version(), version)
+
+    def test_search_endpoint_staff_only(self):
+        response = self.client.get("/accounts/admin/user-search/?q=pe")
+        self.assertEqual(response.status_code, 403)
+
+        self.client.login(username="staff", password="testpass123")
+        response = self.client.get("/accounts/admin/user-search/?q=pe")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["username"] for row in response.json()["results"]], ["petro"])
+
+
+class AdminUsersTabQueriesTests(TestCase):
+    """Вкладка користувачів не робить запитів на кожен рядок"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        self.client.login(username="staff", password="testpass123")
+
+    def _users_tab_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/?tab=users")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_users(self):
+        self._users_tab_queries()  # прогріти кеш знімка статистики
+        baseline = self._users_tab_queries()
+
+        for i in range(10):
+            User.objects.create_user(username=f"extra{i}", password="testpass123")
+        cache.delete("dashboard:stats:all")
+        self._users_tab_queries()
+
+        self.assertEqual(self._users_tab_queries(), baseline)
+
+    def test_users_tab_shows_counts_and_next_page(self):
+        for i in range(55):
+            User.objects.create_user(username=f"bulk{i}", password="testpass123")
+
+        response = self.client.get("/?tab=users")
+
+        self.assertEqual(len(response.context["recent_users"]), 50)
+        self.assertEqual(response.context["recent_users"][0].events_count, 0)
+        self.assertIsNotNone(response.context["users_next_cursor"])
+
+        response = self.client.get(f"/?tab=users&after={response.context['users_next_cursor']}")
+        self.assertEqual(len(response.context["recent_users"]), 6)
+        self.assertIsNone(response.context["users_next_cursor"])
@@ -0,0 +1,239 @@
+"""
+Тести API-токенів: видача, автентифікація з кешуванням, області доступу
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Event
+from users.models import ApiToken
+from users.tokens import ApiTokenService, LocalTokenCache, TokenInfo, get_local_cache, hash_key
+
+User = get_user_model()
+
+
+class TokenTestMixin:
+    def setUp(self):
+        cache.clear()
+        get_local_cache().clear()
+        self.user = User.objects.create_user(username="alice", password="pass12345")
+
+    def auth(self, key):
+        return {"Authorization": f"Token {key}"}
+
+
+class ApiTokenServiceTests(TokenTestMixin, TestCase):
+    """Видача та пошук токенів"""
+
+    def test_issue_stores_only_hash(self):
+        token, key = ApiTokenService.issue(self.user, "CI", scopes=["write", "read"], days=7)
+
+        self.assertEqual(token.key_hash, hash_key(key))
+        self.assertNotIn(key, (token.key_hash, token.prefix))
+        self.assertTrue(key.startswith("eo_"))
+        self.assertEqual(token.scopes, "read write")
+        self.assertAlmostEqual(token.expires_at, timezone.now() + timedelta(days=7), delta=timedelta(minutes=1))
+
+    def test_issue_without_expiry_and_without_scopes(self):
+        token, _key = ApiTokenService.issue(self.user, "forever", days=0)
+        self.assertIsNone(token.expires_at)
+        with self.assertRaises(ValueError):
+            ApiTokenService.issue(self.user, "none", scopes=["admin"])
+
+    def test_authenticate_cache_levels(self):
+        token, key = ApiTokenService.issue(self.user, "CI")
+
+        with self.assertNumQueries(2):  # токен з користувачем, last_used_at
+            user, info = ApiTokenService.authenticate(key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(info.id, token.pk)
+        token.refresh_from_db()
+        self.assertIsNotNone(token.last_used_at)
+
+        with self.assertNumQueries(0):
+            ApiTokenService.authenticate(key)
+
+        get_local_cache().clear()
+        with self.assertNumQueries(1):  # після LRU - знову БД (revoked перевіряється)
+            ApiTokenService.authenticate(key)
+
+    def test_revoked_elsewhere_rejected_after_local_ttl(self):
+        """Відкликання в іншому процесі (без сигналів тут) діє після LRU"""
+        token, key = ApiTokenService.issue(self.user, "CI")
+        self.assertIsNotNone(ApiTokenService.authenticate(key))
+
+        ApiToken.objects.filter(pk=token.pk).update(revoked=True)
+        self.assertIsNotNone(ApiTokenService.authenticate(key))  # LRU ще живий
+        get_local_cache().clear()  # минув LOCAL_CACHE_TTL
+
+        self.assertIsNone(ApiTokenService.authenticate(key))
+
+    def test_expiry_change_elsewhere_seen_after_local_ttl(self):
+        token, key = ApiTokenService.issue(self.user, "CI")
+        ApiTokenService.authenticate(key)
+
+        past = timezone.now() - timedelta(minutes=1)
+        ApiToken.objects.filter(pk=token.pk).update(expires_at=past)
+        get_local_cache().clear()
+
+        _user, info = ApiTokenService.authenticate(key)
+        self.assertTrue(info.expired)
+
+    def test_unknown_key_is_negative_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(ApiTokenService.authenticate("eo_unknown"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(ApiTokenService.authenticate("eo_unknown"))
+
+    def test_revoke_invalidates_cached_token(self):
+        token, key = ApiTokenService.issue(self.user, "CI")
+        self.assertIsNotNone(ApiTokenService.authenticate(key))
+
+        ApiTokenService.revoke(token)
+
+        self.assertIsNone(ApiTokenService.authenticate(key))
+
+    def test_delete_and_inactive_user(self):
+        token, key = ApiTokenService.issue(self.user, "CI")
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(ApiTokenService.authenticate(key))
+
+        token.delete()
+        self.assertIsNone(ApiTokenService.authenticate(key))
+
+    def test_authenticate_returns_user_copy(self):
+        _token, key = ApiTokenService.issue(self.user, "CI")
+        first, _info = ApiTokenService.authenticate(key)
+        second, _info = ApiTokenService.authenticate(key)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.pk, second.pk)
+
+    def test_write_scope_implies_read(self):
+        token, _key = ApiTokenService.issue(self.user, "CI", scopes=["write"])
+        info = TokenInfo.from_token(token)
+        self.assertTrue(info.allows("read"))
+        self.assertTrue(info.allows("write"))
+
+
+class LocalTokenCacheTests(TestCase):
+    """LRU з TTL"""
+
+    def test_evicts_least_recently_used(self):
+        lru = LocalTokenCache(maxsize=2, ttl=60)
+        info = TokenInfo(id=1, user_id=1, scopes=frozenset(), expires_at=None)
+        lru.set("a", info, object())
+        lru.set("b", info, object())
+        lru.get("a")
+        lru.set("c", info, object())
+
+        self.assertIsNotNone(lru.get("a"))
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(len(lru), 2)
+
+    def test_expires_after_ttl(self):
+        lru = LocalTokenCache(maxsize=2, ttl=0)
+        lru.set("a", TokenInfo(id=1, user_id=1, scopes=frozenset(), expires_at=None), object())
+        self.assertIsNone(lru.get("a"))
+
+
+class ApiTokenAuthenticationTests(TokenTestMixin, TestCase):
+    """Запити до API з токеном"""
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.event = Event.objects.create(
+            title="API", starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=2),
+            organizer=self.user, status=Event.PUBLISHED,
+        )
+
+    def test_read_token_can_list_but_not_write(self):
+        _token, key = ApiTokenService.issue(self.user, "ro", scopes=["read"])
+
+        response = self.client.get("/api/events/", headers=self.auth(key))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.patch(
+            f"/api/events/{self.event.pk}/", {"title": "Нова"}, content_type="application/json",
+            headers=self.auth(key),
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_write_token_can_update(self):
+        _token, key = ApiTokenService.issue(self.user, "rw", scopes=["read", "write"])
+        response = self.client.patch(
+            f"/api/events/{self.event.pk}/", {"title": "Нова"}, content_type="application/json",
+            headers={"Authorization": f"Bearer {key}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "Нова")
+
+    def test_invalid_and_expired_tokens_rejected(self):
+        response = self.client.get("/api/events/", headers=self.auth("eo_wrong"))
+        self.assertEqual(response.status_code, 403)
+
+        token, key = ApiTokenService.issue(self.user, "old")
+        ApiToken.objects.filter(pk=token.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        response = self.client.get("/api/events/", headers=self.auth(key))
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("Термін дії", response.json()["detail"])
+
+    def test_session_requests_are_not_scope_limited(self):
+        self.client.force_login(self.user)
+        response = self.client.patch(
+            f"/api/events/{self.event.pk}/", {"title": "Сесія"}, content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class ApiTokensViewTests(TokenTestMixin, TestCase):
+    """Сторінка токенів у профілі та команда create_api_token"""
+
+    def test_create_shows_key_once(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("api_tokens"), {"name": "CI", "scopes": ["read"], "days": 30})
+
+        self.assertEqual(response.status_code, 200)
+        key = response.context["new_key"]
+        self.assertContains(response, key)
+        self.assertIsNotNone(ApiTokenService.authenticate(key))
+
+        response = self.client.get(reverse("api_tokens"))
+        self.assertNotContains(response, key)
+        self.assertContains(response, "CI")
+
+    def test_revoke_only_own_token(self):
+        other = User.objects.create_user(username="bob", password="pass12345")
+        foreign, _key = ApiTokenService.issue(other, "bob")
+        own, _key = ApiTokenService.issue(self.user, "mine")
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("revoke_api_token", args=[foreign.pk]))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(reverse("revoke_api_token", args=[own.pk]))
+        self.assertRedirects(response, reverse("api_tokens"))
+        own.refresh_from_db()
+        self.assertTrue(own.revoked)
+
+    def test_create_api_token_command(self):
+        out = StringIO()
+        call_command("create_api_token", "alice", "--scopes", "read,write", "--days", "0", stdout=out, stderr=StringIO())
+
+        user, info = ApiTokenService.authenticate(out.getvalue().strip())
+        self.assertEqual(user, self.user)
+        self.assertTrue(info.allows("write"))
+
+        with self.assertRaises(CommandError):
+            call_command("create_api_token", "alice", "--scopes", "admin", stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("create_api_token", "nobody", stdout=StringIO())
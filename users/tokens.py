@@ -0,0 +1,265 @@
+"""
+API-токени замість Basic-автентифікації
+
+BasicAuthentication перевіряє пароль на кожен запит, а Argon2 навмисно
+повільний (десятки мілісекунд CPU і мегабайти пам'яті на перевірку).
+Токен - випадковий ключ високої ентропії, тому для зберігання достатньо
+швидкого ключового хешу (HMAC-SHA256 з SECRET_KEY) замість KDF.
+
+Пошук токена за ключем:
+1. LRU у пам'яті процесу (LOCAL_CACHE_SIZE записів, LOCAL_CACHE_TTL секунд):
+   токен разом з користувачем, без жодного запиту;
+2. БД: один запит за унікальним індексом key_hash разом з користувачем
+   (select_related) - з перевіркою revoked та is_active.
+
+Після LRU дані токена завжди беруться з БД, а не з Django-кешу: кеш за
+замовчуванням локальний для процесу, і відкликання в одному воркері не
+скинуло б його в інших. Тож відкликаний, видалений чи змінений токен
+приймається іншими процесами не довше ніж LOCAL_CACHE_TTL секунд (у
+поточному процесі сигнали users/signals.py скидають LRU одразу).
+У Django-кеші (CACHE_TIMEOUT) - лише відмови, щоб перебір ключів не
+доходив до БД.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import ApiToken
+
+DEFAULTS = {
+    "TTL_DAYS": 90,
+    "LOCAL_CACHE_SIZE": 1024,
+    "LOCAL_CACHE_TTL": 30,
+    "CACHE_TIMEOUT": 300,
+    "LAST_USED_RESOLUTION": 300,
+}
+
+CACHE_PREFIX = "users:apitoken"
+KEY_PREFIX = "eo_"
+PREFIX_LENGTH = 8
+
+# Область запису включає читання
+SCOPE_GRANTS = {
+    ApiToken.READ: frozenset({ApiToken.READ}),
+    ApiToken.WRITE: frozenset({ApiToken.READ, ApiToken.WRITE}),
+}
+
+# Кешований "токен не знайдено": перебір ключів не доходить до БД
+_MISSING = "missing"
+
+
+def get_config() -> dict:
+    """Налаштування: settings.API_TOKENS поверх DEFAULTS"""
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "API_TOKENS", {}) or {})
+    return config
+
+
+def hash_key(key: str) -> str:
+    """HMAC-SHA256 ключа токена (hex, 64 символи)"""
+    return hmac.new(settings.SECRET_KEY.encode(), key.encode(), hashlib.sha256).hexdigest()
+
+
+def generate_key() -> str:
+    return KEY_PREFIX + secrets.token_urlsafe(32)
+
+
+def cache_key(key_hash: str) -> str:
+    return f"{CACHE_PREFIX}:{key_hash}"
+
+
+@dataclass(frozen=True)
+class TokenInfo:
+    """Дані токена, потрібні автентифікації (request.auth)"""
+
+    id: int
+    user_id: int
+    scopes: frozenset
+    expires_at: Optional[datetime]
+
+    @classmethod
+    def from_token(cls, token: ApiToken) -> "TokenInfo":
+        return cls(
+            id=token.pk,
+            user_id=token.user_id,
+            scopes=frozenset().union(*(SCOPE_GRANTS.get(scope, ()) for scope in token.scope_list)),
+            expires_at=token.expires_at,
+        )
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    def allows(self, scope: str) -> bool:
+        return scope in self.scopes
+
+
+class LocalTokenCache:
+    """
+    LRU з TTL у пам'яті процесу: key_hash -> (користувач, TokenInfo)
+
+    Потокобезпечний (один замок на операцію); кожен get повертає копію
+    користувача, щоб паралельні запити не ділили один об'єкт.
+    """
+
+    def __init__(self, maxsize: int = DEFAULTS["LOCAL_CACHE_SIZE"], ttl: float = DEFAULTS["LOCAL_CACHE_TTL"]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, TokenInfo, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key_hash: str):
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            stored_at, info, user = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key_hash]
+                return None
+            self._entries.move_to_end(key_hash)
+        return copy.copy(user), info
+
+    def set(self, key_hash: str, info: TokenInfo, user) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic(), info, user)
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key_hash: str) -> None:
+        with self._lock:
+            self._entries.pop(key_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_local_cache: Optional[LocalTokenCache] = None
+
+
+def get_local_cache() -> LocalTokenCache:
+    global _local_cache
+    if _local_cache is None:
+        config = get_config()
+        _local_cache = LocalTokenCache(config["LOCAL_CACHE_SIZE"], config["LOCAL_CACHE_TTL"])
+    return _local_cache
+
+
+class ApiTokenService:
+    """
+    Видача, відкликання та пошук API-токенів
+
+    Використання:
+        token, key = ApiTokenService.issue(user, "CI", scopes=["read"])
+        found = ApiTokenService.authenticate(key)  # (user, TokenInfo) або None
+    """
+
+    @staticmethod
+    def issue(user, name: str, scopes: Iterable[str] = (ApiToken.READ,), days: Optional[int] = None) -> Tuple[ApiToken, str]:
+        """
+        Створити токен; повертає (токен, відкритий ключ)
+
+        Ключ ніде не зберігається - його треба показати користувачу одразу.
+        days=None - термін з налаштувань TTL_DAYS, days=0 - безстроковий.
+        """
+        scopes = [scope for scope, _label in ApiToken.SCOPE_CHOICES if scope in set(scopes)]
+        if not scopes:
+            raise ValueError("Потрібна хоча б одна область доступу")
+        if days is None:
+            days = get_config()["TTL_DAYS"]
+
+        key = generate_key()
+        token = ApiToken.objects.create(
+            user=user,
+            name=name,
+            prefix=key[len(KEY_PREFIX):len(KEY_PREFIX) + PREFIX_LENGTH],
+            key_hash=hash_key(key),
+            scopes=" ".join(scopes),
+            expires_at=timezone.now() + timedelta(days=days) if days else None,
+        )
+        return token, key
+
+    @staticmethod
+    def revoke(token: ApiToken) -> None:
+        token.revoked = True
+        token.save(update_fields=["revoked"])
+
+    @staticmethod
+    def invalidate(key_hash: str) -> None:
+        """Скинути кешовані дані токена (негативний запис Django-кешу та LRU процесу)"""
+        cache.delete(cache_key(key_hash))
+        get_local_cache().discard(key_hash)
+
+    @staticmethod
+    def _load(key_hash: str, config: dict):
+        """
+        (TokenInfo, користувач) з БД одним запитом
+
+        None - токена немає, його відкликано або користувач неактивний;
+        відмова запам'ятовується в Django-кеші (відмова, що застаріла, лише
+        безпечніша; відновлений токен у поточному процесі скидає сигнал).
+        """
+        if cache.get(cache_key(key_hash)) == _MISSING:
+            return None
+
+        token = (
+            ApiToken.objects.select_related("user")
+            .filter(key_hash=key_hash, revoked=False, user__is_active=True)
+            .first()
+        )
+        if token is None:
+            cache.set(cache_key(key_hash), _MISSING, config["CACHE_TIMEOUT"])
+            return None
+        return TokenInfo.from_token(token), token.user
+
+    @staticmethod
+    def _touch(info: TokenInfo, config: dict) -> None:
+        """last_used_at - не частіше ніж раз на LAST_USED_RESOLUTION секунд"""
+        resolution = config["LAST_USED_RESOLUTION"]
+        if cache.add(f"{CACHE_PREFIX}:used:{info.id}", 1, resolution):
+            ApiToken.objects.filter(pk=info.id).update(last_used_at=timezone.now())
+
+    @staticmethod
+    def authenticate(key: str):
+        """
+        (користувач, TokenInfo) для ключа або None
+
+        Прострочений токен повертається як є - перевірку терміну та
+        повідомлення про помилку робить викликач.
+        """
+        key_hash = hash_key(key)
+        local = get_local_cache()
+        found = local.get(key_hash)
+        if found is not None:
+            return found
+
+        config = get_config()
+        loaded = ApiTokenService._load(key_hash, config)
+        if loaded is None:
+            return None
+        info, user = loaded
+
+        local.set(key_hash, info, user)
+        ApiTokenService._touch(info, config)
+        return copy.copy(user), info
@@ -3,7 +3,10 @@ from .views import (
     LoginView,
     SignupView,
     ProfileView,
+    ApiTokensView,
+    revoke_api_token,
     admin_create_user,
+    admin_user_search,
     UserPasswordChangeView,
     UserPasswordChangeDoneView,
 )
@@ -12,7 +15,10 @@ urlpatterns = [
     path("login/", LoginView.as_view(), name="login"),
     path("signup/", SignupView.as_view(), name="signup"),
     path("profile/", ProfileView.as_view(), name="profile"),
+    path("tokens/", ApiTokensView.as_view(), name="api_tokens"),
+    path("tokens/<int:pk>/revoke/", revoke_api_token, name="revoke_api_token"),
     path("password/change/", UserPasswordChangeView.as_view(), name="password_change"),
     path("password/change/done/", UserPasswordChangeDoneView.as_view(), name="password_change_done"),
     path("admin/create-user/", admin_create_user, name="admin_create_user"),
+    path("admin/user-search/", admin_user_search, name="admin_user_search"),
 ]
\ No newline at end of file
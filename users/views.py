@@ -1,4 +1,5 @@
 from django.contrib.auth import login
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import (
     LoginView as DjangoLoginView,
@@ -6,15 +7,16 @@ from django.contrib.auth.views import (
     PasswordChangeDoneView,
 )
 from django.contrib.admin.views.decorators import staff_member_required
-from django.shortcuts import redirect, render
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.views.decorators.http import require_POST
 from django.views.generic import FormView, TemplateView
-from django.db.models import Avg, Count
 from django.utils import timezone
 from django.contrib import messages
-from .forms import SignupForm, AdminUserCreateForm, UserProfileForm
+from .forms import SignupForm, AdminUserCreateForm, UserProfileForm, ApiTokenForm
+from .models import ApiToken
 from tickets.models import RSVP
-from events.models import Event, Review
+from events.models import Event, OrganizerRating, Review
 
 
 class LoginView(DjangoLoginView):
@@ -72,13 +74,10 @@ class ProfileView(LoginRequiredMixin, FormView):
         ctx["recent_rsvps"] = base_rsvps.select_related("event").order_by("-created_at")[:5]
         ctx["recent_events"] = my_events.order_by("-created_at")[:5]
 
-        my_events_reviews = Review.objects.filter(event__organizer=user)
-        agg = my_events_reviews.aggregate(
-            avg_rating=Avg("rating"),
-            reviews_count=Count("id"),
-        )
-        ctx["my_events_avg_rating"] = agg["avg_rating"]
-        ctx["my_events_reviews_count"] = agg["reviews_count"]
+        # Рейтинг організатора підтримується інкрементально (events/ratings.py)
+        organizer_rating = OrganizerRating.objects.filter(organizer=user).first()
+        ctx["my_events_avg_rating"] = organizer_rating.avg_rating if organizer_rating else None
+        ctx["my_events_reviews_count"] = organizer_rating.reviews_count if organizer_rating else 0
 
         ctx["my_reviews_count"] = Review.objects.filter(user=user).count()
 
@@ -97,6 +96,53 @@ class ProfileView(LoginRequiredMixin, FormView):
         return super().form_valid(form)
 
 
+class ApiTokensView(LoginRequiredMixin, FormView):
+    """
+    API-токени користувача: список, створення, відкликання
+
+    Ключ нового токена показується лише у відповіді на створення - у БД
+    зберігається тільки його хеш.
+    """
+    template_name = "users/api_tokens.html"
+    form_class = ApiTokenForm
+
+    def get_initial(self):
+        from .tokens import get_config
+
+        return {"days": get_config()["TTL_DAYS"]}
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["tokens"] = ApiToken.objects.filter(user=self.request.user)
+        ctx["now"] = timezone.now()
+        return ctx
+
+    def form_valid(self, form):
+        from .tokens import ApiTokenService
+
+        token, key = ApiTokenService.issue(
+            self.request.user,
+            form.cleaned_data["name"],
+            scopes=form.cleaned_data["scopes"],
+            days=form.cleaned_data["days"],
+        )
+        return self.render_to_response(
+            self.get_context_data(form=self.form_class(initial=self.get_initial()), new_token=token, new_key=key)
+        )
+
+
+@login_required
+@require_POST
+def revoke_api_token(request, pk):
+    """Відкликання власного API-токена"""
+    from .tokens import ApiTokenService
+
+    token = get_object_or_404(ApiToken, pk=pk, user=request.user)
+    ApiTokenService.revoke(token)
+    messages.success(request, f'Токен "{token.name}" відкликано')
+    return redirect("api_tokens")
+
+
 class UserPasswordChangeView(LoginRequiredMixin, PasswordChangeView):
     template_name = "registration/password_change_form.html"
     success_url = reverse_lazy("password_change_done")
@@ -122,4 +168,19 @@ def admin_create_user(request):
     else:
         form = AdminUserCreateForm()
     
-    return render(request, 'users/admin_create_user.html', {'form': form})
\ No newline at end of file
+    return render(request, 'users/admin_create_user.html', {'form': form})
+
+
+def admin_user_search(request):
+    """
+    JSON-пошук користувачів для автодоповнення фільтра "Організатор"
+
+    GET-параметри: q (початок username)
+    """
+    from django.http import JsonResponse
+    from .services import UserListService
+
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({"error": "Доступ лише для адміністраторів"}, status=403)
+
+    return JsonResponse({"results": UserListService.search(request.GET.get("q", ""))})